@@ -0,0 +1,227 @@
+"""
+_hook_log: the shared structured log sink for Claude Code hook scripts.
+
+Hooks used to keep one pair of text logs each under ~/.claude/metrics/
+(<hook>-errors.log and <hook>.log), every one with its own copy of a
+stat-then-rename rotation helper, and hook-error-digest-hook re-read those
+files line by line on every SessionStart, re-parsing timestamps and
+re-running regex classifiers against text it had no structure for.
+
+Every hook now calls write(hook, level, message) instead. One row lands in
+the hook_log table of ~/.claude/metrics/hook-log.db:
+
+    id       INTEGER PRIMARY KEY AUTOINCREMENT  (never reused)
+    ts       "YYYY-MM-DDTHH:MM:SSZ"
+    hook     the hook's name, as in hookTelemetryShim
+    level    "error" or "info"
+    class    classify(hook, message), computed once, here, at write time
+    message  the message, capped at MAX_MESSAGE_CHARS
+
+RING
+====
+The table is a fixed-size ring: every _PRUNE_EVERY inserts, the writer that
+drew the id deletes every row more than RING_CAPACITY ids behind it, inside
+the same transaction as its insert. Because ids are AUTOINCREMENT they keep
+rising after a prune, so a reader's "last id seen" watermark stays valid and
+a gap between it and the oldest surviving id is exactly the number of rows
+the ring dropped before that reader got to them.
+
+CLASSIFICATION
+==============
+The class key is the label of the first matching curated regex for the
+hook (_CLASSIFIERS_BY_HOOK), else a generic fallback so no message is ever
+left unclassified -- see _fallback_classify. Messages interpolate paths,
+session ids, exit codes and card numbers, so grouping by exact message
+would give one "class" per occurrence. Classification runs on the FULL
+message, before the length cap, so a curated pattern that anchors on a
+suffix (e.g. "timed out after Ns") still matches an over-long message.
+
+The fallback label may contain a raw message prefix (a path fragment,
+session id, or exit code). That is deliberate: it is the operator's only
+signal that an uncurated class of error exists, so they can add a curated
+classifier for it. On this single-operator machine the paths and session
+ids are the operator's own.
+
+Logging must never change a hook's behaviour: every failure here is
+swallowed, and a write that cannot get the database lock within
+_BUSY_TIMEOUT_S is dropped rather than stalling the hook. sqlite3 is only
+imported once a hook actually logs, so a hook that never does pays nothing.
+CLAUDE_HOOK_LOG_DB overrides the database path (tests point it at a tmpdir).
+"""
+
+import os
+import re
+from datetime import datetime, timezone
+from pathlib import Path
+
+_PATH_ENV = "CLAUDE_HOOK_LOG_DB"
+_DEFAULT_PATH = Path.home() / ".claude" / "metrics" / "hook-log.db"
+
+# Rows kept in the ring. At a few hundred bytes per typical row this is a
+# few MB on disk -- the same order as the old per-hook 10 MB text logs
+# combined, without their one-backup-generation cliff.
+RING_CAPACITY = 50_000
+
+# How often (in ids) a writer prunes the ring. Amortizes the DELETE so the
+# common write is one INSERT.
+_PRUNE_EVERY = 256
+
+# Hard ceiling on the length of a single stored message. One pathological
+# interpolated value (an oversized cwd, a large nested payload field logged
+# via !r) would otherwise bloat every row read back by the digest.
+MAX_MESSAGE_CHARS = 4000
+
+# Hooks run on the critical path; a write that waits longer than this for a
+# concurrent writer is dropped.
+_BUSY_TIMEOUT_S = 1.0
+
+_SCHEMA_VERSION = 1
+
+_SCHEMA = f"""
+CREATE TABLE IF NOT EXISTS hook_log (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    ts TEXT NOT NULL,
+    hook TEXT NOT NULL,
+    level TEXT NOT NULL,
+    class TEXT NOT NULL,
+    message TEXT NOT NULL
+);
+PRAGMA user_version = {_SCHEMA_VERSION};
+"""
+
+# Hand-curated classifiers per hook, matched in order against the message;
+# first match wins, anything unmatched falls through to _fallback_classify().
+# Sourced from kanban-subagent-stop-hook.py's own log_error() call sites.
+# The other hooks have none today -- every message there resolves via the
+# fallback -- and entries can be added here without touching anything else.
+_CLASSIFIERS_BY_HOOK: dict[str, list[tuple[str, "re.Pattern[str]"]]] = {
+    "kanban-subagent-stop-hook": [
+        ("transcript-path-missing", re.compile(r"non-empty transcript_path that does not exist")),
+        ("unhandled-exception", re.compile(r"^Unhandled exception:")),
+        ("json-decode-error", re.compile(r"JSON decode error:")),
+        ("kanban-done-nonzero-exit", re.compile(r"kanban done exit \d+:")),
+        ("kanban-cli-not-found", re.compile(r"kanban CLI not found in PATH")),
+        ("kanban-command-timeout", re.compile(r"kanban .+ timed out after \d+s")),
+    ],
+}
+
+# This process's writer connection (a sqlite3.Connection) and its path.
+_conn = None
+_conn_path: "Path | None" = None
+
+
+# ---------------------------------------------------------------------------
+# Classification
+# ---------------------------------------------------------------------------
+
+
+def _fallback_classify(message: str) -> str:
+    """Generic classifier used when no curated regex matches.
+
+    Takes the substring up to and including the first ':' if one appears
+    before the first digit, quote, or '/' character; truncates to 60 chars.
+    Anything with no such colon buckets as "other: <first 60 chars>".
+    """
+    colon_idx = message.find(':')
+    stop_idx = -1
+    for i, ch in enumerate(message):
+        if ch.isdigit() or ch in ('"', "'", '/'):
+            stop_idx = i
+            break
+    if colon_idx != -1 and (stop_idx == -1 or colon_idx < stop_idx):
+        label = message[:colon_idx + 1]
+    else:
+        label = f"other: {message}"
+    return label[:60]
+
+
+def classify(hook: str, message: str) -> str:
+    """Class key for one message from `hook`: curated label or fallback."""
+    for label, pattern in _CLASSIFIERS_BY_HOOK.get(hook, ()):
+        if pattern.search(message):
+            return label
+    return _fallback_classify(message)
+
+
+def _cap_message(message: str) -> str:
+    """Truncate the tail past MAX_MESSAGE_CHARS, naming the original length."""
+    if len(message) <= MAX_MESSAGE_CHARS:
+        return message
+    return message[:MAX_MESSAGE_CHARS] + f"... [truncated, {len(message)} chars total]"
+
+
+# ---------------------------------------------------------------------------
+# Storage
+# ---------------------------------------------------------------------------
+
+
+def db_path() -> Path:
+    """The sink's database path (CLAUDE_HOOK_LOG_DB overrides the default)."""
+    return Path(os.environ.get(_PATH_ENV) or _DEFAULT_PATH)
+
+
+def connect(path: Path):
+    """Open (creating if needed) the sink database in autocommit mode.
+
+    A new file is created 0600 before SQLite opens it -- messages carry
+    paths and session ids -- and SQLite gives the -wal/-shm files the same
+    mode. The schema is applied once, keyed on user_version, so an
+    established database costs one PRAGMA read per connection.
+    synchronous=NORMAL is per connection: under WAL it skips the fsync on
+    every commit and can only lose the last rows on power loss, never
+    corrupt the file.
+    """
+    import sqlite3
+
+    if not path.exists():
+        path.parent.mkdir(parents=True, exist_ok=True)
+        os.close(os.open(path, os.O_WRONLY | os.O_CREAT, 0o600))
+    conn = sqlite3.connect(str(path), timeout=_BUSY_TIMEOUT_S, isolation_level=None)
+    if conn.execute("PRAGMA user_version").fetchone()[0] != _SCHEMA_VERSION:
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.executescript(_SCHEMA)
+    conn.execute("PRAGMA synchronous=NORMAL")
+    return conn
+
+
+def _connection():
+    """This process's writer connection, reopened if the path changed."""
+    global _conn, _conn_path
+    path = db_path()
+    if _conn is None or _conn_path != path:
+        if _conn is not None:
+            try:
+                _conn.close()
+            except Exception:
+                pass
+            _conn = None
+        _conn = connect(path)
+        _conn_path = path
+    return _conn
+
+
+def write(hook: str, level: str, message: str) -> None:
+    """Record one message from `hook` at `level`. Never raises."""
+    try:
+        row = (
+            datetime.now(timezone.utc).strftime('%Y-%m-%dT%H:%M:%SZ'),
+            hook,
+            level,
+            classify(hook, message),
+            _cap_message(message),
+        )
+        conn = _connection()
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            new_id = conn.execute(
+                "INSERT INTO hook_log (ts, hook, level, class, message) VALUES (?, ?, ?, ?, ?)",
+                row,
+            ).lastrowid
+            if new_id % _PRUNE_EVERY == 0:
+                conn.execute("DELETE FROM hook_log WHERE id <= ?", (new_id - RING_CAPACITY,))
+            conn.execute("COMMIT")
+        except BaseException:
+            conn.execute("ROLLBACK")
+            raise
+    except Exception:  # intentional: last-resort log utility must never raise
+        pass
@@ -0,0 +1,272 @@
+"""
+_hook_telemetry: per-invocation timing records for Claude Code hook scripts.
+
+Every Python hook in modules/claude is built with a shim (hookTelemetryShim
+in default.nix) that calls start("<hook name>") before the hook's own code
+runs. From then on the hook is observed, not modified:
+
+  - sys.stdin is wrapped so the payload the hook reads is also visible here
+    (hook_event_name, tool_name / source, session_id);
+  - sys.stdout is wrapped so the decision the hook prints can be classified;
+  - sys.exit is wrapped so the exit status is known at interpreter exit.
+
+At exit one JSON line is appended to ~/.claude/metrics/hook-timings.jsonl:
+
+    {"id", "hook", "event", "matcher", "exit_path", "exit_code",
+     "duration_ms", "started_at", "session_id", "parent"}
+
+duration_ms runs from the moment the OS started the hook's process to the
+moment it exits, so interpreter startup and the shim's own imports -- most
+of a short hook's cost -- are counted; see _process_age_ns. Where the start
+time cannot be read it falls back to time since start() ran.
+
+exit_path is one of:
+    deny   exit 2, permissionDecision "deny", or decision "block"
+    ask    permissionDecision "ask"
+    allow  anything else printed on stdout (allow, added context, output)
+    skip   exit 0 with nothing printed — the hook did not apply
+    error  any other non-zero exit or an uncaught exception
+
+The append is the whole cost on the hook's critical path: one os.open with
+O_APPEND and one write of a line well under PIPE_BUF, so concurrent hooks
+never interleave and no lock is taken. claudit-hook drains the file into the
+hook_timings table of claudit.db at Stop/SubagentStop, and
+`claude-inspect hooks` reports from there.
+
+A hook that execs other instrumented hooks (posttool-dispatch-hook) marks
+them through CLAUDE_HOOK_TELEMETRY_PARENT so their time is not counted twice
+in per-session overhead.
+
+Telemetry must never change a hook's behaviour: every failure here is
+swallowed. CLAUDE_HOOK_TELEMETRY=0 disables recording entirely.
+"""
+
+import atexit
+import json
+import os
+import struct
+import sys
+import time
+from datetime import datetime, timezone
+from pathlib import Path
+
+_DISABLE_ENV = "CLAUDE_HOOK_TELEMETRY"
+_PATH_ENV = "CLAUDE_HOOK_TELEMETRY_PATH"
+_PARENT_ENV = "CLAUDE_HOOK_TELEMETRY_PARENT"
+_DEFAULT_PATH = Path.home() / ".claude" / "metrics" / "hook-timings.jsonl"
+
+# Enough of stdout to parse a decision object; hooks that print more than
+# this are still classified as "allow" by the non-empty check.
+_STDOUT_CAPTURE_LIMIT = 64 * 1024
+
+
+class _StdinTee:
+    """sys.stdin stand-in that remembers what read() returned."""
+
+    def __init__(self, stream):
+        self._stream = stream
+        self.data = ""
+
+    def read(self, *args):
+        chunk = self._stream.read(*args)
+        if len(self.data) < _STDOUT_CAPTURE_LIMIT:
+            self.data += chunk
+        return chunk
+
+    def __getattr__(self, name):
+        return getattr(self._stream, name)
+
+
+class _StdoutTee:
+    """sys.stdout stand-in that keeps the first bytes the hook prints."""
+
+    def __init__(self, stream):
+        self._stream = stream
+        self.data = ""
+        self.written = False
+
+    def write(self, text):
+        if text:
+            self.written = True
+            if len(self.data) < _STDOUT_CAPTURE_LIMIT:
+                self.data += text
+        return self._stream.write(text)
+
+    def __getattr__(self, name):
+        return getattr(self._stream, name)
+
+
+def _process_age_ns() -> "int | None":
+    """Nanoseconds since the OS started this process, or None if unknown.
+
+    Linux: starttime (field 22 of /proc/self/stat, clock ticks since boot)
+    against CLOCK_BOOTTIME -- resolution one tick, 10ms at the usual
+    CLK_TCK of 100. macOS: p_starttime of sysctl kern.proc.pid (the first
+    member of struct kinfo_proc, a timeval) against the wall clock.
+    """
+    try:
+        if sys.platform.startswith("linux"):
+            with open("/proc/self/stat", "rb") as fh:
+                stat = fh.read()
+            # comm (field 2) may hold spaces or parens; count from its close.
+            start_ticks = int(stat[stat.rindex(b")") + 2:].split()[19])
+            start_ns = start_ticks * 1_000_000_000 // os.sysconf("SC_CLK_TCK")
+            return time.clock_gettime_ns(time.CLOCK_BOOTTIME) - start_ns
+        if sys.platform == "darwin":
+            import ctypes
+
+            libc = ctypes.CDLL(None, use_errno=True)
+            mib = (ctypes.c_int * 4)(1, 14, 1, os.getpid())  # CTL_KERN, KERN_PROC, KERN_PROC_PID
+            size = ctypes.c_size_t(1024)
+            buf = ctypes.create_string_buffer(size.value)
+            if libc.sysctl(mib, 4, buf, ctypes.byref(size), None, 0) != 0:
+                return None
+            sec, usec = struct.unpack_from("qi", buf.raw, 0)
+            return time.time_ns() - (sec * 1_000_000_000 + usec * 1000)
+    except Exception:
+        pass
+    return None
+
+
+class _Run:
+    def __init__(self, hook: str):
+        self.hook = hook
+        self.start_ns = time.perf_counter_ns()
+        self.started_at = datetime.now(timezone.utc).strftime('%Y-%m-%dT%H:%M:%S.%fZ')
+        self.exit_code = 0
+        self.crashed = False
+        self.parent = os.environ.get(_PARENT_ENV) or None
+        self.stdin = _StdinTee(sys.stdin)
+        self.stdout = _StdoutTee(sys.stdout)
+
+
+_run: "_Run | None" = None
+
+
+def classify_exit(exit_code: int, stdout: str, crashed: bool = False) -> str:
+    """Map a hook's exit status and printed output to an exit path."""
+    if crashed:
+        return "error"
+    if exit_code == 2:
+        return "deny"
+    if exit_code:
+        return "error"
+    if not stdout.strip():
+        return "skip"
+    try:
+        decision = json.loads(stdout)
+    except ValueError:
+        return "allow"
+    if isinstance(decision, dict):
+        specific = decision.get("hookSpecificOutput")
+        permission = specific.get("permissionDecision") if isinstance(specific, dict) else None
+        if permission == "deny" or decision.get("decision") == "block":
+            return "deny"
+        if permission == "ask":
+            return "ask"
+    return "allow"
+
+
+def _exit_code_of(arg) -> int:
+    if arg is None:
+        return 0
+    if isinstance(arg, int):
+        return arg
+    return 1  # sys.exit("message") prints it and exits 1
+
+
+def build_record(run: _Run, end_ns: int, age_ns: "int | None" = None) -> dict:
+    """The JSON record for a finished run.
+
+    age_ns is the process's age at end_ns (see _process_age_ns); without it
+    the duration is measured from start().
+    """
+    try:
+        payload = json.loads(run.stdin.data) if run.stdin.data.strip() else {}
+    except ValueError:
+        payload = {}
+    if not isinstance(payload, dict):
+        payload = {}
+    matcher = payload.get("tool_name") or payload.get("source") or payload.get("matcher") or ""
+    return {
+        "id": f"{os.getpid()}-{run.start_ns}",
+        "hook": run.hook,
+        "event": payload.get("hook_event_name") or "",
+        "matcher": matcher if isinstance(matcher, str) else "",
+        "exit_path": classify_exit(run.exit_code, run.stdout.data, run.crashed),
+        "exit_code": run.exit_code,
+        "duration_ms": round((age_ns if age_ns is not None else end_ns - run.start_ns) / 1e6, 3),
+        "started_at": run.started_at,
+        "session_id": payload.get("session_id") or "",
+        "parent": run.parent,
+    }
+
+
+def append_record(record: dict) -> None:
+    """Append one record as a single O_APPEND write. Never raises."""
+    try:
+        path = Path(os.environ.get(_PATH_ENV) or _DEFAULT_PATH)
+        line = (json.dumps(record, separators=(",", ":")) + "\n").encode("utf-8")
+        try:
+            fd = os.open(path, os.O_WRONLY | os.O_APPEND | os.O_CREAT, 0o600)
+        except FileNotFoundError:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            fd = os.open(path, os.O_WRONLY | os.O_APPEND | os.O_CREAT, 0o600)
+        try:
+            os.write(fd, line)
+        finally:
+            os.close(fd)
+    except Exception:
+        pass
+
+
+def _finish() -> None:
+    global _run
+    run, _run = _run, None
+    if run is None:
+        return
+    try:
+        end_ns = time.perf_counter_ns()
+        age_ns = _process_age_ns()
+        if age_ns is not None:
+            # Not the lookup's own cost: the age as of end_ns.
+            age_ns -= time.perf_counter_ns() - end_ns
+        append_record(build_record(run, end_ns, age_ns))
+    except Exception:
+        pass
+
+
+def start(hook: str) -> None:
+    """Begin observing this process as one run of `hook`.
+
+    Called once, from the shim, before the hook's own imports. A second call
+    (or CLAUDE_HOOK_TELEMETRY=0) is a no-op.
+    """
+    global _run
+    if _run is not None or os.environ.get(_DISABLE_ENV) == "0":
+        return
+    try:
+        run = _Run(hook)
+        sys.stdin = run.stdin
+        sys.stdout = run.stdout
+
+        real_exit = sys.exit
+        real_excepthook = sys.excepthook
+
+        def _exit(arg=None):
+            run.exit_code = _exit_code_of(arg)
+            real_exit(arg)
+
+        def _excepthook(exc_type, exc, tb):
+            run.crashed = True
+            run.exit_code = 1
+            real_excepthook(exc_type, exc, tb)
+
+        sys.exit = _exit
+        sys.excepthook = _excepthook
+        # Hooks this one execs report it as their parent.
+        os.environ[_PARENT_ENV] = hook
+        _run = run
+        atexit.register(_finish)
+    except Exception:
+        pass
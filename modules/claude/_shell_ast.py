@@ -0,0 +1,437 @@
+"""
+_shell_ast: One shell-command parse shared by every Bash-inspecting hook.
+
+bash-cd-compound-hook, git-no-verify-hook, kanban-subagent-cmd-hook,
+kanban-pretool-hook (rm and destructive-git guards) and kanban-mov-lint-hook
+all inspect the same PreToolUse(Bash) command. Each used to carry its own
+shlex tokenizer and operator splitter. They disagreed on edge cases: only one
+elided backslash-newline continuations, only one split fused `&&`/`||`/`&`,
+none could tell a quoted `;` from a real one. And every Bash call was parsed
+four or five times. This module is the single parser they all consume.
+
+The AST is plain JSON-able data:
+
+    {
+      "v": AST_VERSION,
+      "segments": [                       # one per simple command
+        {"words": ["git", "commit", "-m", "msg"],
+         "op": "&&",                      # control operator that ENDED it:
+                                          #   "&&" "||" ";" "|" "&" "\\n" or None
+         "unit": 0,                       # statement index (unquoted newlines)
+         "redirects": [["2>", "/dev/null"]],
+         "fallback": False},              # see "Unbalanced input" below
+        ...
+      ],
+      "pipelines": [[0, 1], [2]],         # segment indices joined by "|"
+      "operators": [[12, 14, "&&"], ...]  # top_level_operators(command)
+    }
+
+"words" keeps every token the way shlex.split() would have produced it —
+redirect tokens and `(`/`)` stay attached (`2>/dev/null`, `(cd`) — so each
+guard's token-walking logic sees what it always saw. "redirects" is an
+additional parsed view of those same tokens, not a replacement.
+
+Usage (via injected sys.path shim):
+    from _shell_ast import command_segments, parse_command
+
+    ast = parse_command(command)
+    for words in command_segments(ast):
+        ...
+"""
+
+import re
+
+# Bumped whenever the AST shape or the lexing rules change.
+AST_VERSION = 1
+
+# Control operators, longest first so "&&" wins over "&". "|&" (pipe stdout
+# and stderr) is a pipe for segmentation purposes and is recorded as "|".
+_CONTROL_OPERATORS = ("&&", "||", "|&", ";", "|", "&")
+
+# Operators the unbalanced-input fallback splits out of whitespace tokens.
+# '|' is deliberately absent: with quote boundaries lost, a regex alternation
+# like 'a|b' is far more common than a fused pipe (see _fallback_segments).
+_FALLBACK_FUSED_OPERATORS = ("&&", "||", ";", "&")
+
+# A redirect word: optional fd (or & for both streams), the operator, and an
+# optional fused target (`2>/dev/null`); a bare operator takes the next word.
+_REDIRECT_RE = re.compile(r"(?P<fd>\d+|&)?(?P<op>>>|>&|<&|<<<|<<|<>|>\||>|<)(?P<target>.*)", re.DOTALL)
+
+
+# ---------------------------------------------------------------------------
+# Lexer
+#
+# A single left-to-right pass with real quote state, modelled on bash rather
+# than on shlex:
+#
+#   - Single quotes: everything literal up to the closing quote, including
+#     backslashes and newlines.
+#   - Double quotes: backslash escapes only $ ` " \ and newline
+#     (backslash-newline inside double quotes is a continuation and vanishes).
+#   - Unquoted backslash-newline is a line continuation and vanishes; any
+#     other unquoted backslash makes the next character literal.
+#   - Unquoted control operators end the current segment whether or not
+#     whitespace surrounds them (`a;b`, `1&&kanban`, `kanban|cat`), while
+#     quoted or escaped ones are ordinary word characters (`'a;b'`, `a\\;b`).
+#     This is the quote-state tracking a post-shlex token scan cannot do.
+#   - `&` directly after an unquoted `<`/`>` in the same word, or directly
+#     before `>`, belongs to a redirect (`2>&1`, `&>/dev/null`), not to the
+#     background operator.
+#   - An unquoted newline ends the segment AND the statement ("unit").
+#
+# Everything else — `(`, `)`, `{`, `}`, `$`, `#`, `<`, `>` — is a word
+# character, exactly as in shlex.split(), so existing guards see the tokens
+# they were written against.
+# ---------------------------------------------------------------------------
+
+def _lex(command: str) -> "tuple[list, int, int, bool]":
+    """Lex command into balanced segments.
+
+    Returns (segments, unit, unit_start, balanced): when the input ends inside
+    a quote or on a dangling backslash, balanced is False and the caller
+    re-reads command[unit_start:] as the unresolved last statement.
+    """
+    segments: list = []
+    words: list = []
+    redirects: list = []  # [word_index, op, target_or_None]
+    word: list = []
+    quoted: list = []  # parallel to word: was this character quoted/escaped?
+    in_word = False
+    in_single = in_double = False
+    unit = 0
+    unit_start = 0
+    n = len(command)
+    i = 0
+
+    def end_word() -> None:
+        nonlocal word, quoted, in_word
+        if not in_word:
+            return
+        text = "".join(word)
+        m = _REDIRECT_RE.fullmatch(text)
+        if m and not any(quoted[: m.end("op")]):
+            target = m.group("target") or None
+            redirects.append([len(words), (m.group("fd") or "") + m.group("op"), target])
+        words.append(text)
+        word, quoted, in_word = [], [], False
+
+    def end_segment(op) -> None:
+        nonlocal words, redirects
+        end_word()
+        if words:
+            resolved = []
+            for idx, rop, target in redirects:
+                if target is None and idx + 1 < len(words):
+                    target = words[idx + 1]
+                resolved.append([rop, target])
+            segments.append({
+                "words": words, "op": op, "unit": unit,
+                "redirects": resolved, "fallback": False,
+            })
+        words, redirects = [], []
+
+    def add(ch: str, is_quoted: bool) -> None:
+        nonlocal in_word
+        in_word = True
+        word.append(ch)
+        quoted.append(is_quoted)
+
+    while i < n:
+        c = command[i]
+
+        if in_single:
+            if c == "'":
+                in_single = False
+            else:
+                add(c, True)
+            i += 1
+            continue
+
+        if in_double:
+            if c == '"':
+                in_double = False
+            elif c == "\\" and i + 1 < n and command[i + 1] in '$`"\\\n':
+                if command[i + 1] != "\n":
+                    add(command[i + 1], True)
+                i += 2
+                continue
+            else:
+                add(c, True)
+            i += 1
+            continue
+
+        if c == "\\":
+            if i + 1 >= n:
+                # Dangling escape: nothing left for it to escape.
+                return segments, unit, unit_start, False
+            if command[i + 1] != "\n":
+                add(command[i + 1], True)
+            i += 2
+            continue
+        if c == "'":
+            in_single, in_word = True, True
+            i += 1
+            continue
+        if c == '"':
+            in_double, in_word = True, True
+            i += 1
+            continue
+        if c in " \t\r":
+            end_word()
+            i += 1
+            continue
+        if c == "\n":
+            end_segment("\n")
+            unit += 1
+            unit_start = i + 1
+            i += 1
+            continue
+        if c in ";&|":
+            if c == "&" and (
+                (word and word[-1] in "<>" and not quoted[-1])
+                or command.startswith(">", i + 1)
+            ):
+                add(c, False)
+                i += 1
+                continue
+            op = next(o for o in _CONTROL_OPERATORS if command.startswith(o, i))
+            end_segment("|" if op == "|&" else op)
+            i += len(op)
+            continue
+        add(c, False)
+        i += 1
+
+    if in_single or in_double:
+        return segments, unit, unit_start, False
+    end_segment(None)
+    return segments, unit, unit_start, True
+
+
+# ---------------------------------------------------------------------------
+# Unbalanced input
+#
+# A statement that never closes its quote (or ends on a dangling backslash)
+# cannot be lexed. Dropping it would be fail-OPEN for the security guards: a
+# sub-agent could hide `kanban done 5` behind an unterminated quote. So the
+# unresolved statement is still turned into segments, by a naive whitespace
+# split with stray quote characters stripped and the fused operators split
+# back out, and those segments are marked "fallback": True.
+#
+# Each guard then picks its own failure direction. kanban-subagent-cmd-hook
+# (fail closed) reads fallback segments. The fail-open guards skip them,
+# because a best-effort split of malformed text must never block a command.
+# See command_segments(include_fallback=...).
+# ---------------------------------------------------------------------------
+
+def _split_fused(token: str) -> list:
+    """Split _FALLBACK_FUSED_OPERATORS out of one token, longest match first."""
+    pieces: list = []
+    buf = ""
+    i = 0
+    while i < len(token):
+        op = next((o for o in _FALLBACK_FUSED_OPERATORS if token.startswith(o, i)), None)
+        if op:
+            if buf:
+                pieces.append(buf)
+                buf = ""
+            pieces.append(op)
+            i += len(op)
+        else:
+            buf += token[i]
+            i += 1
+    if buf:
+        pieces.append(buf)
+    return pieces
+
+
+def _fallback_segments(text: str, unit: int) -> list:
+    """Best-effort segments for an unresolvable trailing statement."""
+    # Continuations still vanish; only the quote structure is lost.
+    text = text.replace("\\\n", "")
+    segments: list = []
+    words: list = []
+    for raw in text.split():
+        for piece in _split_fused(raw.strip("'\"")):
+            if piece in _FALLBACK_FUSED_OPERATORS:
+                if words:
+                    segments.append({"words": words, "op": piece, "unit": unit, "redirects": [], "fallback": True})
+                words = []
+            elif piece:
+                words.append(piece)
+    if words:
+        segments.append({"words": words, "op": None, "unit": unit, "redirects": [], "fallback": True})
+    return segments
+
+
+# ---------------------------------------------------------------------------
+# Top-level operators (exit-status view)
+#
+# Segments split on EVERY unquoted control operator, including ones inside
+# $(...) — the conservative view a guard wants, since a substitution still
+# runs its commands. kanban-mov-lint-hook asks a different question: which
+# operators decide the exit status the shell reports? For that, $(...) and
+# backtick substitutions are opaque (their status is discarded), while bare
+# (...) subshells are transparent (their last command's status propagates).
+# ---------------------------------------------------------------------------
+
+def skip_balanced_group(cmd: str, open_idx: int, open_char: str, close_char: str) -> int:
+    """Given cmd[open_idx] == open_char, return the index just past the
+    matching close_char, treating quoted content inside the group as opaque
+    (so a quoted paren/paren-like character inside doesn't unbalance it).
+
+    Deliberate fail-open on already-malformed input: if close_char is never
+    found (an unclosed $(...) or an unterminated quote inside it), this
+    scans to end-of-string and the caller treats everything from open_idx on
+    as swallowed/opaque. Such a cmd string is itself a shell syntax error
+    (an unclosed subshell/substitution never executes as literally written)
+    so this can never silently mis-scope a command that would actually run.
+    """
+    n = len(cmd)
+    depth = 1
+    j = open_idx + 1
+    while j < n and depth > 0:
+        c = cmd[j]
+        if c == "'":
+            j += 1
+            while j < n and cmd[j] != "'":
+                j += 1
+        elif c == '"':
+            j += 1
+            while j < n and cmd[j] != '"':
+                if cmd[j] == "\\":
+                    j += 1
+                j += 1
+        elif c == open_char:
+            depth += 1
+        elif c == close_char:
+            depth -= 1
+        j += 1
+    return j
+
+
+def top_level_operators(cmd: str) -> "list[tuple[int, int, str]]":
+    """Return [(start, end, op), ...] for every top-level shell operator
+    ('&&', '||', ';', '&', '|') in cmd, in order.
+
+    "Top-level" means outside single/double quotes and outside any $(...) or
+    `...` command substitution. Bare `(`/`)` are ordinary characters here, so
+    a pipe inside a subshell is scanned as if the parens were not there (see
+    the section comment above for why).
+    """
+    n = len(cmd)
+    i = 0
+    ops: "list[tuple[int, int, str]]" = []
+    while i < n:
+        c = cmd[i]
+        if c == "'":
+            i += 1
+            while i < n and cmd[i] != "'":
+                i += 1
+            i += 1
+            continue
+        if c == '"':
+            i += 1
+            while i < n and cmd[i] != '"':
+                if cmd[i] == "\\":
+                    i += 1
+                i += 1
+            i += 1
+            continue
+        if c == "\\" and i + 1 < n:
+            i += 2
+            continue
+        if c == "$" and i + 1 < n and cmd[i + 1] == "(":
+            i = skip_balanced_group(cmd, i + 1, "(", ")")
+            continue
+        if c == "`":
+            i += 1
+            while i < n and cmd[i] != "`":
+                i += 1
+            i += 1
+            continue
+        if c == "&":
+            if i + 1 < n and cmd[i + 1] == "&":
+                ops.append((i, i + 2, "&&"))
+                i += 2
+            else:
+                ops.append((i, i + 1, "&"))
+                i += 1
+            continue
+        if c == "|":
+            if i + 1 < n and cmd[i + 1] == "|":
+                ops.append((i, i + 2, "||"))
+                i += 2
+            else:
+                ops.append((i, i + 1, "|"))
+                i += 1
+            continue
+        if c == ";":
+            ops.append((i, i + 1, ";"))
+            i += 1
+            continue
+        i += 1
+    return ops
+
+
+# ---------------------------------------------------------------------------
+# Parse
+# ---------------------------------------------------------------------------
+
+def _parse(command: str) -> dict:
+    """Build the AST for command (uncached — see parse_command)."""
+    segments, unit, unit_start, balanced = _lex(command)
+    if not balanced:
+        segments = [seg for seg in segments if seg["unit"] < unit]
+        segments.extend(_fallback_segments(command[unit_start:], unit))
+
+    pipelines: list = []
+    current: list = []
+    for idx, seg in enumerate(segments):
+        current.append(idx)
+        if seg["op"] != "|":
+            pipelines.append(current)
+            current = []
+    if current:
+        pipelines.append(current)
+
+    return {
+        "v": AST_VERSION,
+        "segments": segments,
+        "pipelines": pipelines,
+        "operators": [list(op) for op in top_level_operators(command)],
+    }
+
+
+# ---------------------------------------------------------------------------
+# Memoization
+#
+# A dict memo covers guards in one process that consult the same command more
+# than once (kanban-pretool-hook's rm and destructive-git guards). Nothing is
+# persisted: every hook process parses the command itself. A shared on-disk
+# cache would let any process that can write under ~/.claude -- including the
+# sub-agents these guards restrict -- plant the parse a fail-closed guard then
+# trusts, and a parse costs tens of microseconds, about what reading a cached
+# one back would.
+# ---------------------------------------------------------------------------
+
+_memo: "dict[str, dict]" = {}
+
+
+def parse_command(command: str) -> dict:
+    """Return the AST for command, memoized for the life of this process.
+
+    The returned dict is shared between callers; treat it as read-only (use
+    command_segments for lists you can mutate).
+    """
+    ast = _memo.get(command)
+    if ast is None:
+        ast = _memo[command] = _parse(command)
+    return ast
+
+
+def command_segments(ast: dict, include_fallback: bool = True) -> "list[list[str]]":
+    """Fresh copies of each segment's words, optionally without fallback ones."""
+    return [
+        list(seg["words"]) for seg in ast["segments"]
+        if include_fallback or not seg["fallback"]
+    ]
@@ -39,31 +39,30 @@ hookSpecificOutput.permissionDecision = deny is emitted, which denies just
 the offending Bash call and leaves the agent free to retry the corrected
 form immediately.
 
-This hook is deliberately stateless — each invocation reads one JSON payload
-from stdin and exits, with no counter, cache, or state file carried between
-invocations. It therefore places no bound of its own on how many times an
-agent may re-issue the identical blocked cd-compound form; that bounding is
+This hook's decision is deliberately stateless — each invocation reads one
+JSON payload from stdin and exits, with no counter or state file carried
+between invocations. It therefore places no bound of its own on how many
+times an agent may re-issue the identical blocked cd-compound form; that bounding is
 left, intentionally, to the calling layer — agent-session maxTurns ceilings
 and per-card tool-use budgets — where turn and tool budgets are conventionally
 enforced, not inside PreToolUse hooks. A denied command never executes, so a
 repeated denial costs turns but cannot mutate any shared state.
 
-Fails open: any error (JSON parse failure, shlex error) results in allowing.
+Fails open: any error (JSON parse failure, unbalanced quotes) results in allowing.
 No bypass mechanism for the cd-compound form itself — use the subshell form
 or remove the `cd` prefix instead.
 """
 
 import json
-import shlex
 import sys
 
+from _shell_ast import parse_command
+
 
 # ---------------------------------------------------------------------------
 # Constants
 # ---------------------------------------------------------------------------
 
-_SHELL_OPS = frozenset(["&&", "||", ";", "|", "&"])
-
 _REJECTION_REASON = (
     "cd-compound anti-pattern detected. Shell state persists between Bash tool calls "
     "— the working directory is already set from previous calls, so prepending "
@@ -88,104 +87,35 @@ _REJECTION_REASON = (
 # Detection logic
 # ---------------------------------------------------------------------------
 
-def _normalize_semicolons(tokens: list) -> list:
+def is_cd_compound(command: str) -> bool:
     """
-    Expand tokens that embed bare semicolons into separate tokens.
-
-    shlex.split does not treat ';' as an operator — it merges it with adjacent
-    content when there is no surrounding whitespace (e.g., '/path;' or ';ls').
-    This function splits those embedded semicolons so that _split_on_operators
-    can correctly identify command segment boundaries.
+    Return True if the command contains a cd-compound anti-pattern.
 
-    Examples:
-      ['/path;', 'ls']   → ['/path', ';', 'ls']
-      ['/path', ';ls']   → ['/path', ';', 'ls']
-    """
-    result = []
-    for tok in tokens:
-        if ';' not in tok:
-            result.append(tok)
-            continue
-        # Split token on ';' and re-insert ';' as a standalone operator token
-        # between the parts. Empty parts (from leading/trailing ';') are omitted.
-        parts = tok.split(';')
-        for i, part in enumerate(parts):
-            if part:
-                result.append(part)
-            if i < len(parts) - 1:
-                result.append(';')
-    return result
-
-
-def _split_on_operators(tokens: list) -> list:
-    """Split token list on shell control operators into command segments."""
-    segments = []
-    current = []
-    for tok in tokens:
-        if tok in _SHELL_OPS:
-            if current:
-                segments.append(current)
-            current = []
-        else:
-            current.append(tok)
-    if current:
-        segments.append(current)
-    return segments
-
-
-def _check_line(line: str) -> bool:
-    """
-    Return True if this single command line contains a cd-compound pattern.
+    Uses the shared _shell_ast parse, so quoting is respected (cd inside
+    echo '...' or bash -c '...' is not a false positive) and fused operators
+    (`cd /x&&ls`, `cd /x;ls`) still count. A cd segment is a compound only
+    when another segment follows it in the same statement — `cd /x` alone on
+    its own line is not.
 
-    Uses shlex tokenization to correctly handle quoted strings (so cd inside
-    echo '...' or bash -c '...' is not a false positive).
+    Fails open (returns False) on any error; a statement whose quotes never
+    balance is skipped entirely.
     """
-    line = line.strip()
-    if not line or 'cd' not in line:
-        return False
-
-    try:
-        tokens = shlex.split(line)
-    except ValueError:
-        # Unterminated quotes or shlex error — fail open
-        return False
-
-    if not tokens:
+    if not command or 'cd' not in command:
         return False
 
-    segments = _split_on_operators(_normalize_semicolons(tokens))
-
-    # Block if cd is the first token of any segment that is NOT the last segment.
-    # "Not the last segment" means there's a command following it — the compound form.
-    for i, segment in enumerate(segments):
-        if not segment:
-            continue
-
-        first = segment[0]
+    segments = [
+        seg for seg in parse_command(command)["segments"]
+        if not seg["fallback"]
+    ]
+    for seg, following in zip(segments, segments[1:]):
+        first = seg["words"][0]
 
         # Subshell guard: token starts with '(' → skip (subshell, cd doesn't persist)
         if first.startswith('('):
             continue
 
         # Word-boundary check: must be exactly 'cd', not 'pcd', 'ccd', etc.
-        if first == 'cd' and i < len(segments) - 1:
-            return True
-
-    return False
-
-
-def is_cd_compound(command: str) -> bool:
-    """
-    Return True if the command contains a cd-compound anti-pattern.
-
-    Fails open (returns False) on any error.
-    """
-    if not command or 'cd' not in command:
-        return False
-
-    # Check each line (multi-line commands)
-    for line in command.splitlines():
-        if _check_line(line):
+        if first == 'cd' and following["unit"] == seg["unit"]:
             return True
 
     return False
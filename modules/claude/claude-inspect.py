@@ -19,6 +19,9 @@ Commands:
     [--agent AGENT] [--card-type TYPE] [--model MODEL]
     [--session SESSION] [--since DATE]
     [--summary]
+  hooks [--days N] [--session ID] [--hook NAME]
+                                   Hook latency p50/p95/p99 per hook per day
+                                   and total hook overhead per session
 """
 
 import argparse
@@ -1073,6 +1076,134 @@ def cmd_criterion_rejections(
     )
 
 
+# ---------------------------------------------------------------------------
+# Command: hooks
+# ---------------------------------------------------------------------------
+
+_EXIT_PATHS = ("skip", "allow", "ask", "deny", "error")
+
+
+def _hook_day_stats(rows: List[sqlite3.Row]) -> List[Dict[str, Any]]:
+    """Group hook_timings rows by (hook, day) into latency percentiles."""
+    groups: Dict[tuple, Dict[str, Any]] = {}
+    for r in rows:
+        key = (r["hook"], str(r["started_at"])[:10])
+        group = groups.setdefault(key, {"durations": [], "paths": {p: 0 for p in _EXIT_PATHS}})
+        group["durations"].append(float(r["duration_ms"]))
+        path = r["exit_path"] if r["exit_path"] in group["paths"] else "error"
+        group["paths"][path] += 1
+
+    stats = []
+    for (hook, day), group in sorted(groups.items(), key=lambda kv: (kv[0][1], kv[0][0]), reverse=True):
+        durations = sorted(group["durations"])
+        stats.append({
+            "hook": hook,
+            "day": day,
+            "runs": len(durations),
+            "p50_ms": round(_percentile(durations, 50), 1),
+            "p95_ms": round(_percentile(durations, 95), 1),
+            "p99_ms": round(_percentile(durations, 99), 1),
+            "max_ms": round(durations[-1], 1),
+            "total_ms": round(sum(durations), 1),
+            **group["paths"],
+        })
+    return stats
+
+
+def cmd_hooks(days: int, session: Optional[str], hook: Optional[str], fmt: str) -> None:
+    """Hook latency: p50/p95/p99 per hook per day, and total overhead per session."""
+    conn = connect()
+    try:
+        if not conn.execute(
+            "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'hook_timings'"
+        ).fetchone():
+            emit_error("No hook timings recorded yet (claudit-hook creates hook_timings on the next Stop).", fmt, "NOT_FOUND")
+            sys.exit(1)
+
+        conditions = ["started_at >= strftime('%Y-%m-%dT%H:%M:%SZ', 'now', ?)"]
+        params: List[Any] = [f"-{days} days"]
+        if session:
+            conditions.append("session_id = ?")
+            params.append(session)
+        if hook:
+            conditions.append("hook = ?")
+            params.append(hook)
+        where = " AND ".join(conditions)
+
+        rows_raw = conn.execute(
+            f"SELECT hook, started_at, duration_ms, exit_path FROM hook_timings WHERE {where}",
+            params,
+        ).fetchall()
+        if not rows_raw:
+            emit_error(f"No hook timings in the last {days} days for the given filters.", fmt, "NOT_FOUND")
+            sys.exit(1)
+
+        # Hooks exec'd by another hook (parent set) ran inside the parent's
+        # wall time; counting them again would overstate the overhead.
+        sessions_raw = conn.execute(
+            f"""
+            SELECT
+                session_id,
+                COUNT(*) as runs,
+                SUM(duration_ms) as total_ms,
+                MAX(duration_ms) as max_ms,
+                MIN(started_at) as first_at,
+                MAX(started_at) as last_at
+            FROM hook_timings
+            WHERE {where} AND parent IS NULL AND session_id != ''
+            GROUP BY session_id
+            ORDER BY MAX(started_at) DESC
+            LIMIT 20
+            """,
+            params,
+        ).fetchall()
+    finally:
+        conn.close()
+
+    by_day = _hook_day_stats(rows_raw)
+    sessions = [
+        {
+            "session_id": r["session_id"],
+            "runs": r["runs"],
+            "total_ms": round(r["total_ms"] or 0, 1),
+            "max_ms": round(r["max_ms"] or 0, 1),
+            "first_at": r["first_at"],
+            "last_at": r["last_at"],
+        }
+        for r in sessions_raw
+    ]
+
+    if fmt != "human":
+        emit_result({"days": days, "by_hook_day": by_day, "sessions": sessions}, fmt)
+        return
+
+    section(f"Hook latency per day, process start to exit (last {days} days)")
+    print_table(
+        ["Day", "Hook", "Runs", "p50 ms", "p95 ms", "p99 ms", "Max ms", "skip/allow/ask/deny/error"],
+        [
+            [
+                s["day"], s["hook"], fmt_int(s["runs"]),
+                fmt_float(s["p50_ms"], 1), fmt_float(s["p95_ms"], 1),
+                fmt_float(s["p99_ms"], 1), fmt_float(s["max_ms"], 1),
+                "/".join(str(s[p]) for p in _EXIT_PATHS),
+            ]
+            for s in by_day
+        ],
+    )
+
+    section("Hook overhead per session (top-level hooks only)")
+    print_table(
+        ["Session", "Runs", "Total s", "Max ms", "Last run"],
+        [
+            [
+                s["session_id"], fmt_int(s["runs"]), fmt_float(s["total_ms"] / 1000, 2),
+                fmt_float(s["max_ms"], 1), fmt_str(s["last_at"]),
+            ]
+            for s in sessions
+        ],
+    )
+
+
 # ---------------------------------------------------------------------------
 # Entry point
 # ---------------------------------------------------------------------------
@@ -1103,6 +1234,8 @@ Examples:
   claude-inspect criterion-rejections --card-type work --since 2025-01-01
   claude-inspect --verbose criterion-rejections
   claude-inspect criterion-rejections --summary
+  claude-inspect --format human hooks
+  claude-inspect hooks --days 1 --hook kanban-pretool-hook
 """,
     )
 
@@ -1168,6 +1301,12 @@ Examples:
     crit_rej_parser.add_argument("--since", help="Filter by date (ISO format, e.g., 2025-01-01)")
     crit_rej_parser.add_argument("--summary", action="store_true", help="Aggregate view: top rejection reason patterns by agent and card type")
 
+    # hooks
+    hooks_parser = subparsers.add_parser("hooks", help="Hook latency percentiles per day and overhead per session")
+    hooks_parser.add_argument("--days", type=int, default=7, help="Look-back window in days (default: 7)")
+    hooks_parser.add_argument("--session", help="Filter by Claude session_id")
+    hooks_parser.add_argument("--hook", help="Filter by hook name (e.g., kanban-pretool-hook)")
+
     args = parser.parse_args()
 
     if not args.command:
@@ -1194,6 +1333,8 @@ Examples:
             cmd_estimate(args.card_type, args.model, args.batch, fmt)
         elif args.command == "throughput":
             cmd_throughput(args.kanban_session, fmt)
+        elif args.command == "hooks":
+            cmd_hooks(args.days, args.session, args.hook, fmt)
         elif args.command in ("criterion-rejections", "ac-rejections"):
             cmd_criterion_rejections(
                 agent=args.agent,
@@ -5,7 +5,8 @@ claude-kanban-transition-hook: PostToolUse(Bash) hook for kanban state transitio
 Sends macOS notifications when a kanban card changes state via staff engineer
 or agent Bash commands (kanban start, defer, cancel, done).
 
-Trigger: PostToolUse(Bash) — fires after every Bash tool call.
+Trigger: PostToolUse(Bash) via posttool-dispatch-hook — runs only when the
+         command matches its trigger in the dispatch manifest.
 Input:   JSON from stdin (Claude Code hook format with tool_input.command).
 Output:  None (PostToolUse notification hook has no JSON output contract).
 """
@@ -16,9 +17,10 @@ import re
 import subprocess
 import sys
 import traceback
-from datetime import datetime, timezone
 from pathlib import Path
 
+import _hook_log
+
 # ---------------------------------------------------------------------------
 # Help text
 # ---------------------------------------------------------------------------
@@ -35,7 +37,8 @@ PURPOSE:
   staff engineer or agent Bash commands (kanban start, defer, cancel, done, review).
 
 TRIGGER:
-  PostToolUse(Bash) — fires after every Bash tool call.
+  PostToolUse(Bash), via posttool-dispatch-hook — exec'd only when the
+  command matches this hook's pattern in the trigger manifest.
   Only sends notification when the command is a kanban state-changing
   command: start, defer, cancel, or done.
   Does NOT fire on: kanban criteria check/uncheck.
@@ -45,14 +48,17 @@ STATE MAPPING:
   kanban defer  N → ⏸️ Deferred      (doing→todo)
   kanban cancel N → ❌ Canceled      (any→canceled)
   kanban done   N → ✅ Done          (doing→done)
+  Bulk forms (kanban done 3 5 8-10) send one notification for the group;
+  kanban done 2 7 is card #2 with the message "7", as in the CLI.
 
 NOTIFICATION FORMAT:
   Title: <emoji> <State Name>
   Body line 1: <tmux_session> → <tmux_window>
   Body line 2: #N — <card intent, truncated>
+               (bulk: #3, #5, #8 … (N cards) — no intent lookup)
 
 CONFIGURATION:
-  Configured in modules/claude/default.nix as PostToolUse(Bash) hook.
+  Listed in postToolBashTriggers in modules/claude/default.nix.
 """
 
 # ---------------------------------------------------------------------------
@@ -60,27 +66,28 @@ CONFIGURATION:
 # ---------------------------------------------------------------------------
 
 KANBAN_TIMEOUT = 10  # seconds
-_ERROR_LOG_PATH = Path.home() / ".claude" / "metrics" / "claude-kanban-transition-hook-errors.log"
 
 
 def _log_error(message: str) -> None:
-    """Append a timestamped error to the hook error log. Never raises."""
-    try:
-        _ERROR_LOG_PATH.parent.mkdir(parents=True, exist_ok=True)
-        timestamp = datetime.now(timezone.utc).strftime('%Y-%m-%dT%H:%M:%SZ')
-        with open(_ERROR_LOG_PATH, "a", encoding="utf-8") as fh:
-            fh.write(f"[{timestamp}] {message}\n")
-    except Exception:
-        pass
+    """Record an error in the shared hook log (_hook_log). Never raises."""
+    _hook_log.write("claude-kanban-transition-hook", "error", message)
 
 
-# Pattern: kanban <subcommand> <card_number> [options]
-# Matches: start, defer, cancel, done
+# Pattern: kanban <subcommand> <card refs> [options]
+# Matches: start, defer, cancel, done — with one card or a bulk list of
+# numbers, ranges (4-9, 4..9) and comma lists (3,5), as the CLI accepts.
 # Does NOT match: criteria (which covers check/uncheck)
 _TRANSITION_PATTERN = re.compile(
-    r"^\s*kanban\s+(start|defer|cancel|done)\s+(\d+)",
+    r"^\s*kanban\s+(start|defer|cancel|done)\s+"
+    r"(#?\d+(?:(?:-|\.\.)#?\d+)?(?:(?:,|[ \t]+)#?\d+(?:(?:-|\.\.)#?\d+)?)*)(?![\w.-])",
     re.IGNORECASE | re.MULTILINE,
 )
+_CARD_REF_PART = re.compile(r"#?(\d+)(?:(?:-|\.\.)#?(\d+))?")
+
+# Past this many cards the notification lists the first few and a count.
+_MAX_LISTED_CARDS = 5
+# Mirrors kanban's own range cap; a bigger range is rejected by the CLI anyway.
+_CARD_RANGE_MAX = 500
 
 # State mapping: command → (emoji, title, new_state, sound)
 _COMMAND_STATES = {
@@ -103,6 +110,58 @@ def _load_common():
     return claude_hook_common
 
 
+# ---------------------------------------------------------------------------
+# Card reference helpers
+# ---------------------------------------------------------------------------
+
+def expand_card_refs(refs: str) -> list[str]:
+    """Expand the matched card refs ("3 5,8-10") to card numbers, de-duplicated.
+
+    Same grammar as kanban's parse_card_refs; a reversed or oversized range
+    contributes nothing (the CLI rejected that command, so no card moved).
+    """
+    cards: list[str] = []
+    for part in re.split(r"[,\s]+", refs.strip()):
+        m = _CARD_REF_PART.fullmatch(part)
+        if not m:
+            continue
+        start = int(m.group(1))
+        end = int(m.group(2)) if m.group(2) is not None else start
+        if end < start or end - start >= _CARD_RANGE_MAX:
+            continue
+        for num in range(start, end + 1):
+            if str(num) not in cards:
+                cards.append(str(num))
+    return cards
+
+
+def drop_done_message(subcommand: str, refs: str, rest: str) -> str:
+    """Mirror kanban's cmd_done: with exactly two positionals the second is
+    the completion message, not a card (`kanban done 2 7`).
+
+    rest is the command text after the matched refs. Anything up to the next
+    shell separator that is a third positional, or -m/--message, means the
+    bulk form, where both refs are cards.
+    """
+    tokens = refs.split()
+    if subcommand != "done" or len(tokens) != 2:
+        return refs
+    following = re.split(r"[;&|\n]", rest, maxsplit=1)[0].split()
+    if following and not following[0].startswith("-"):
+        return refs
+    if any(t in ("-m", "--message") or t.startswith("--message=") for t in following):
+        return refs
+    return tokens[0]
+
+
+def format_card_list(cards: list[str]) -> str:
+    """'#3, #5, #8 (3 cards)', eliding past _MAX_LISTED_CARDS."""
+    listed = ", ".join(f"#{num}" for num in cards[:_MAX_LISTED_CARDS])
+    if len(cards) > _MAX_LISTED_CARDS:
+        listed += ", …"
+    return f"{listed} ({len(cards)} cards)"
+
+
 # ---------------------------------------------------------------------------
 # Card intent helpers
 # ---------------------------------------------------------------------------
@@ -171,7 +230,9 @@ def main() -> None:
         return
 
     subcommand = m.group(1).lower()
-    card_number = m.group(2)
+    cards = expand_card_refs(drop_done_message(subcommand, m.group(2), command[m.end():]))
+    if not cards:
+        return
 
     emoji, state_name, _new_state, sound = _COMMAND_STATES[subcommand]
     title = f"{emoji} {state_name}"
@@ -180,12 +241,17 @@ def main() -> None:
     session_m = re.search(r"--session\s+([a-z0-9][a-z0-9-]*)", command, re.IGNORECASE)
     session = session_m.group(1) if session_m else ""
 
-    # Fetch card intent
-    intent = get_card_intent(card_number, session)
-    snippet = truncate_intent(intent) if intent else f"card #{card_number}"
+    if len(cards) == 1:
+        # Fetch card intent
+        card_number = cards[0]
+        intent = get_card_intent(card_number, session)
+        snippet = truncate_intent(intent) if intent else f"card #{card_number}"
+        card_line = f"#{card_number} — {snippet}"
+    else:
+        # One `kanban show` per card would outlast the hook for a big group.
+        card_line = format_card_list(cards)
 
     tmux_ctx = common.get_tmux_context()
-    card_line = f"#{card_number} — {snippet}"
     body = f"{tmux_ctx}\n{card_line}" if tmux_ctx else card_line
 
     common.send_notification(title, body, sound)
@@ -361,7 +361,8 @@ def show_help() -> None:
     print("  Fails silently if session name or sentinel directory unavailable.")
     print()
     print("TRIGGER (PostToolUse):")
-    print("  PostToolUse(Bash) — fires after every Bash tool call.")
+    print("  PostToolUse(Bash), via posttool-dispatch-hook — exec'd only when the")
+    print("  command matches this hook's pattern in the trigger manifest.")
     print("  Only emits context when the command is 'crew create ...' or 'crew dismiss ...'.")
     print("  Silent for all other commands.")
     print("  Only fires for Senior Staff sessions (KANBAN_AGENT=senior-staff-engineer).")
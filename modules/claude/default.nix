@@ -24,6 +24,70 @@ let
     _sys.path.insert(0, "${sessionEnvDir}")
   '';
 
+  # Hook latency telemetry. Every Python hook below starts with this shim, so
+  # each run appends one timing record (event, matcher, allow/deny/skip exit
+  # path, duration) to ~/.claude/metrics/hook-timings.jsonl; claudit-hook
+  # drains that into claudit.db's hook_timings table and `claude-inspect hooks`
+  # reports p50/p95/p99 per hook per day plus overhead per session.
+  hookTelemetryDir = pkgs.writeTextDir "_hook_telemetry.py" (builtins.readFile ./_hook_telemetry.py);
+
+  hookTelemetryShim = name: ''
+    import sys as _sys
+    _sys.path.insert(0, "${hookTelemetryDir}")
+    import _hook_telemetry
+    _hook_telemetry.start("${name}")
+  '';
+
+  # Shared structured log sink. The kanban/orphan/transition hooks record
+  # log_error()/log_info() rows (ts, hook, level, class, message) in one
+  # fixed-size SQLite ring at ~/.claude/metrics/hook-log.db, classified at
+  # write time; hook-error-digest-hook reports grouped counts over new rows.
+  hookLogDir = pkgs.writeTextDir "_hook_log.py" (builtins.readFile ./_hook_log.py);
+
+  # sys.path shim injected into hook scripts so they can import _hook_log.py
+  hookLogPathShim = ''
+    import sys as _sys
+    _sys.path.insert(0, "${hookLogDir}")
+  '';
+
+  # Shared shell-command parser for every PreToolUse(Bash) guard (cd-compound,
+  # git-no-verify, kanban-subagent-cmd, kanban-pretool, kanban-mov-lint). One
+  # AST per command, so the guards stop re-tokenizing it.
+  shellAstDir = pkgs.writeTextDir "_shell_ast.py" (builtins.readFile ./_shell_ast.py);
+
+  # sys.path shim injected into Bash-inspecting hook scripts so they can import _shell_ast.py
+  shellAstPathShim = ''
+    import sys as _sys
+    _sys.path.insert(0, "${shellAstDir}")
+  '';
+
+  # PostToolUse(Bash) trigger manifest, read by posttool-dispatch-hook. Each
+  # hook declares the calls it cares about (tool name and/or a regex searched
+  # over tool_input.command); the dispatcher evaluates all of them in one
+  # process and execs only the matches, so the common Bash call starts one
+  # Python process instead of one per hook. Patterns are deliberately loose
+  # supersets of each hook's own check — the hooks still filter themselves.
+  postToolBashTriggers = pkgs.writeText "posttool-bash-triggers.json" (builtins.toJSON [
+    {
+      name = "claude-kanban-transition-hook";
+      command = [ "${shellapps.claude-kanban-transition-hook}/bin/claude-kanban-transition-hook" ];
+      tool = "Bash";
+      pattern = ''(?im)^\s*kanban\s+(start|defer|cancel|done)\s'';
+    }
+    {
+      name = "kanban-done-reminder-hook";
+      command = [ "${shellapps.kanban-done-reminder-hook}/bin/kanban-done-reminder-hook" ];
+      tool = "Bash";
+      pattern = ''^\s*kanban\s+done\s'';
+    }
+    {
+      name = "crew-lifecycle-hook";
+      command = [ "${shellapps.crew-lifecycle-hook}/bin/crew-lifecycle-hook" ];
+      tool = "Bash";
+      pattern = ''^\s*crew\s+(create|dismiss)\s'';
+    }
+  ]);
+
   # Shared Python utilities for prc/prr (and future Python CLIs)
   claudeToolingDir = pkgs.writeTextDir "claude_tooling.py" (builtins.readFile ./claude_tooling.py);
 
@@ -56,39 +120,39 @@ let
   # Kanban PreToolUse(Agent) hook — injects card content into sub-agent prompts
   kanbanPretoolHookScript = pkgs.writers.writePython3Bin "kanban-pretool-hook" {
     flakeIgnore = [ "E265" "E402" "E501" "W503" "W504" ];  # E402: shim injects sys.path before imports
-  } (sessionEnvPathShim + builtins.readFile ./kanban-pretool-hook.py);
+  } (hookTelemetryShim "kanban-pretool-hook" + hookLogPathShim + sessionEnvPathShim + shellAstPathShim + builtins.readFile ./kanban-pretool-hook.py);
 
   # Kanban SubagentStop hook — calls kanban done to gate card completion
   kanbanSubagentStopHookScript = pkgs.writers.writePython3Bin "kanban-subagent-stop-hook" {
     flakeIgnore = [ "E265" "E402" "E501" "W503" "W504" ];  # E402: shim injects sys.path before imports
-  } (sessionEnvPathShim + builtins.readFile ./kanban-subagent-stop-hook.py);
+  } (hookTelemetryShim "kanban-subagent-stop-hook" + hookLogPathShim + sessionEnvPathShim + builtins.readFile ./kanban-subagent-stop-hook.py);
 
   # Orphan agent tracker hook — tracks active background agents and warns coordinator
   # Subcommands: pretool (PreToolUse/Agent), subagent-stop (SubagentStop), user-prompt-submit (UserPromptSubmit)
   orphanAgentTrackerHookScript = pkgs.writers.writePython3Bin "orphan-agent-tracker-hook" {
     flakeIgnore = [ "E265" "E402" "E501" "W503" "W504" ];  # E402: shim injects sys.path before imports
-  } (sessionEnvPathShim + builtins.readFile ./orphan-agent-tracker-hook.py);
+  } (hookTelemetryShim "orphan-agent-tracker-hook" + hookLogPathShim + sessionEnvPathShim + builtins.readFile ./orphan-agent-tracker-hook.py);
 
   # Bash cd-compound PreToolUse hook — blocks `cd <dir> && cmd` / `cd <dir>; cmd` patterns
-  bashCdCompoundHookScript = pkgs.writers.writePython3Bin "bash-cd-compound-hook" { flakeIgnore = [ "E265" "E501" "W503" "W504" ]; } (builtins.readFile ./bash-cd-compound-hook.py); # Ignore shebang, line length, line breaks
+  bashCdCompoundHookScript = pkgs.writers.writePython3Bin "bash-cd-compound-hook" { flakeIgnore = [ "E265" "E402" "E501" "W503" "W504" ]; } (hookTelemetryShim "bash-cd-compound-hook" + shellAstPathShim + builtins.readFile ./bash-cd-compound-hook.py); # Ignore shebang, shim-before-imports, line length, line breaks
 
   # Kanban MoV lint PreToolUse hook — kept as thin pass-through (no-op); banned-pattern
   # validation now in kanban CLI (modules/kanban/kanban.py). Removing would require hms.
   kanbanMovLintHookScript = pkgs.writers.writePython3Bin "kanban-mov-lint-hook" { # thin pass-through; validation now in kanban CLI
-    flakeIgnore = [ "E265" "E501" "W503" "W504" ];
-  } (builtins.readFile ./kanban-mov-lint-hook.py);
+    flakeIgnore = [ "E265" "E402" "E501" "W503" "W504" ];  # E402: shim injects sys.path before imports
+  } (hookTelemetryShim "kanban-mov-lint-hook" + shellAstPathShim + builtins.readFile ./kanban-mov-lint-hook.py);
 
   # Kanban sub-agent command restriction PreToolUse(Bash) hook — denies kanban CLI
   # commands from sub-agents except `kanban criteria check` and `kanban criteria uncheck`
   kanbanSubagentCmdHookScript = pkgs.writers.writePython3Bin "kanban-subagent-cmd-hook" {
-    flakeIgnore = [ "E265" "E501" "W503" "W504" ];
-  } (builtins.readFile ./kanban-subagent-cmd-hook.py);
+    flakeIgnore = [ "E265" "E402" "E501" "W503" "W504" ];  # E402: shim injects sys.path before imports
+  } (hookTelemetryShim "kanban-subagent-cmd-hook" + shellAstPathShim + builtins.readFile ./kanban-subagent-cmd-hook.py);
 
   # Skill autoload SessionStart hook — injects CLI skill body (kanban-cli or crew-cli)
   # based on KANBAN_AGENT env var so agents never operate from a partial Quick Reference
   skillAutoloadHookScript = pkgs.writers.writePython3Bin "skill-autoload-hook" {
-    flakeIgnore = [ "E265" "E501" "W503" "W504" ];
-  } (builtins.readFile ./skill-autoload-hook.py);
+    flakeIgnore = [ "E265" "E402" "E501" "W503" "W504" ];
+  } (hookTelemetryShim "skill-autoload-hook" + builtins.readFile ./skill-autoload-hook.py);
 
   # Claude Inspect — CLI for introspecting Claude session metrics
   claudeInspectScript = pkgs.writers.writePython3Bin "claude-inspect" {
@@ -111,22 +175,22 @@ in {
   _module.args.claudeShellapps = rec {
     claude-notification-hook = pkgs.writers.writePython3Bin "claude-notification-hook" {
       flakeIgnore = [ "E265" "E402" "E501" "F401" "W503" "W504" ];
-    } (claudeHookCommonPathShim + builtins.readFile ./claude-notification-hook.py);
+    } (hookTelemetryShim "claude-notification-hook" + claudeHookCommonPathShim + builtins.readFile ./claude-notification-hook.py);
     claude-complete-hook = pkgs.writers.writePython3Bin "claude-complete-hook" {
-      flakeIgnore = [ "E265" "E501" "W503" "W504" ];
-    } (builtins.readFile ./claude-complete-hook.py);
+      flakeIgnore = [ "E265" "E402" "E501" "W503" "W504" ];
+    } (hookTelemetryShim "claude-complete-hook" + builtins.readFile ./claude-complete-hook.py);
     git-no-verify-hook = pkgs.writers.writePython3Bin "git-no-verify-hook" {
-      flakeIgnore = [ "E265" "E501" "W503" "W504" ];
-    } (builtins.readFile ./git-no-verify-hook.py);
+      flakeIgnore = [ "E265" "E402" "E501" "W503" "W504" ];
+    } (hookTelemetryShim "git-no-verify-hook" + shellAstPathShim + builtins.readFile ./git-no-verify-hook.py);
     kanban-done-reminder-hook = pkgs.writers.writePython3Bin "kanban-done-reminder-hook" {
-      flakeIgnore = [ "E265" "E501" "W503" "W504" ];
-    } (builtins.readFile ./kanban-done-reminder-hook.py);
+      flakeIgnore = [ "E265" "E402" "E501" "W503" "W504" ];
+    } (hookTelemetryShim "kanban-done-reminder-hook" + builtins.readFile ./kanban-done-reminder-hook.py);
     taskstop-reminder-hook = pkgs.writers.writePython3Bin "taskstop-reminder-hook" {
-      flakeIgnore = [ "E265" "E501" "W503" "W504" ];
-    } (builtins.readFile ./taskstop-reminder-hook.py);
+      flakeIgnore = [ "E265" "E402" "E501" "W503" "W504" ];
+    } (hookTelemetryShim "taskstop-reminder-hook" + builtins.readFile ./taskstop-reminder-hook.py);
     claude-kanban-transition-hook = pkgs.writers.writePython3Bin "claude-kanban-transition-hook" {
       flakeIgnore = [ "E265" "E402" "E501" "F401" "W503" "W504" ];
-    } (claudeHookCommonPathShim + builtins.readFile ./claude-kanban-transition-hook.py);
+    } (hookTelemetryShim "claude-kanban-transition-hook" + hookLogPathShim + claudeHookCommonPathShim + builtins.readFile ./claude-kanban-transition-hook.py);
     claude-session-start-hook = let
       extractKanbanName = pkgs.writeText "extract-kanban-name.py" ''
         import re, sys
@@ -400,24 +464,28 @@ $orphan_warning"
     };
 
     kanban-permission-hook = pkgs.writers.writePython3Bin "kanban-permission-hook" {
-      flakeIgnore = [ "E265" "E501" "W503" "W504" ];
-    } (builtins.readFile ./kanban-permission-hook.py);
+      flakeIgnore = [ "E265" "E402" "E501" "W503" "W504" ];
+    } (hookTelemetryShim "kanban-permission-hook" + builtins.readFile ./kanban-permission-hook.py);
 
     senior-staff-staleness-hook = pkgs.writers.writePython3Bin "senior-staff-staleness-hook" {
-      flakeIgnore = [ "E265" "E501" "W503" "W504" ];
-    } (builtins.readFile ./senior-staff-staleness-hook.py);
+      flakeIgnore = [ "E265" "E402" "E501" "W503" "W504" ];
+    } (hookTelemetryShim "senior-staff-staleness-hook" + builtins.readFile ./senior-staff-staleness-hook.py);
 
     senior-staff-cron-hook = pkgs.writers.writePython3Bin "senior-staff-cron-hook" {
-      flakeIgnore = [ "E265" "E501" "W503" "W504" ];
-    } (builtins.readFile ./senior-staff-cron-hook.py);
+      flakeIgnore = [ "E265" "E402" "E501" "W503" "W504" ];
+    } (hookTelemetryShim "senior-staff-cron-hook" + builtins.readFile ./senior-staff-cron-hook.py);
 
     hook-error-digest-hook = pkgs.writers.writePython3Bin "hook-error-digest-hook" {
-      flakeIgnore = [ "E265" "E501" "W503" "W504" ];
-    } (builtins.readFile ./hook-error-digest-hook.py);
+      flakeIgnore = [ "E265" "E402" "E501" "W503" "W504" ];
+    } (hookTelemetryShim "hook-error-digest-hook" + hookLogPathShim + builtins.readFile ./hook-error-digest-hook.py);
 
     crew-lifecycle-hook = pkgs.writers.writePython3Bin "crew-lifecycle-hook" {
-      flakeIgnore = [ "E265" "E501" "W503" "W504" ];
-    } (builtins.readFile ./crew-lifecycle-hook.py);
+      flakeIgnore = [ "E265" "E402" "E501" "W503" "W504" ];
+    } (hookTelemetryShim "crew-lifecycle-hook" + builtins.readFile ./crew-lifecycle-hook.py);
+
+    posttool-dispatch-hook = pkgs.writers.writePython3Bin "posttool-dispatch-hook" {
+      flakeIgnore = [ "E265" "E402" "E501" "W503" "W504" ];
+    } (hookTelemetryShim "posttool-dispatch-hook" + builtins.readFile ./posttool-dispatch-hook.py);
 
     skill-autoload-hook = skillAutoloadHookScript // {
       meta = {
@@ -1093,21 +1161,15 @@ $orphan_warning"
           ];
           PostToolUse = [
             {
+              # One dispatcher instead of one process per hook: the transition,
+              # done-reminder and crew-lifecycle hooks are listed with their
+              # trigger predicates in postToolBashTriggers and only run when
+              # those match (see posttool-dispatch-hook.py).
               matcher = "Bash";
-              hooks = [
-                {
-                  type = "command";
-                  command = "${shellapps.claude-kanban-transition-hook}/bin/claude-kanban-transition-hook";
-                }
-                {
-                  type = "command";
-                  command = "${shellapps.kanban-done-reminder-hook}/bin/kanban-done-reminder-hook";
-                }
-                {
-                  type = "command";
-                  command = "${shellapps.crew-lifecycle-hook}/bin/crew-lifecycle-hook";
-                }
-              ];
+              hooks = [{
+                type = "command";
+                command = "${shellapps.posttool-dispatch-hook}/bin/posttool-dispatch-hook --manifest ${postToolBashTriggers}";
+              }];
             }
             {
               matcher = "TaskStop";
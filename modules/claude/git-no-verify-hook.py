@@ -19,8 +19,8 @@ forbidden in any form): the agent is expected to stop attempting the bypass
 and report the block in its own final return rather than retry it, but the
 turn itself must remain free to produce that report.
 
-Fails open: any error (JSON parse failure, shlex error, missing fields) results
-in allowing. Never accidentally block innocent commands.
+Fails open: any error (JSON parse failure, unbalanced quotes, missing fields)
+results in allowing. Never accidentally block innocent commands.
 
 BYPASS FLAGS DETECTED:
   --no-verify
@@ -35,10 +35,11 @@ import argparse
 import datetime
 import json
 import os
-import shlex
 import sys
 from pathlib import Path
 
+from _shell_ast import command_segments, parse_command
+
 # Flags that consume the next token as their argument value.
 # Bypass-flag strings appearing as values to these flags are NOT bypass flags.
 # Note: -c is intentionally excluded here — it is handled via its own dedicated
@@ -237,49 +238,18 @@ def has_bypass_flag(command: str) -> bool:
     Return True if the command is a watched git operation containing a bypass
     flag in argument position (not in a message body or other value).
 
-    Fails open: returns False on any parsing error.
+    Each segment of the shared _shell_ast parse (split on &&, ||, ;, |, &
+    and newlines, fused or not) is checked on its own. Fails open: a
+    statement whose quotes never balance is skipped.
     """
-    try:
-        tokens = shlex.split(command)
-    except ValueError:
-        # Unterminated quotes or other shlex errors → fail open.
+    if not command:
         return False
-
-    if not tokens:
-        return False
-
-    # The command may contain multiple semicolon/&&/||-separated statements.
-    # shlex.split doesn't split on these operators — they remain as tokens.
-    # Walk through and find any git invocation segment.
-    # Split on shell operators to handle chained commands.
-    segments = _split_on_shell_operators(tokens)
-    for segment in segments:
-        if segment and _check_git_tokens(segment):
+    for segment in command_segments(parse_command(command), include_fallback=False):
+        if _check_git_tokens(segment):
             return True
     return False
 
 
-def _split_on_shell_operators(tokens: list[str]) -> list[list[str]]:
-    """
-    Split a token list on shell control operators (&&, ||, ;, |, etc.) to
-    produce individual command segments. Each segment is a list of tokens
-    for one command.
-    """
-    shell_ops = frozenset(["&&", "||", ";", "|", "&"])
-    segments: list[list[str]] = []
-    current: list[str] = []
-    for tok in tokens:
-        if tok in shell_ops:
-            if current:
-                segments.append(current)
-            current = []
-        else:
-            current.append(tok)
-    if current:
-        segments.append(current)
-    return segments
-
-
 def main() -> None:
     parser = argparse.ArgumentParser(add_help=False)
     parser.add_argument("-h", "--help", action="store_true")
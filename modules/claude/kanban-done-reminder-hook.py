@@ -34,7 +34,8 @@ def show_help() -> None:
     print("  silently skipped (the assembly-line anti-pattern).")
     print()
     print("TRIGGER:")
-    print("  PostToolUse(Bash) — fires after every Bash tool call.")
+    print("  PostToolUse(Bash), via posttool-dispatch-hook — exec'd only when the")
+    print("  command matches this hook's pattern in the trigger manifest.")
     print("  Only emits a reminder when the command starts with 'kanban done '")
     print("  followed by a card number or other arguments.")
     print("  Silent for all other commands.")
@@ -44,7 +45,7 @@ def show_help() -> None:
     print("  Silent (no stdout) when command does not match.")
     print()
     print("CONFIGURATION:")
-    print("  Configured in modules/claude/default.nix as PostToolUse(Bash) hook.")
+    print("  Listed in postToolBashTriggers in modules/claude/default.nix.")
 
 
 # Match "kanban done <something>" anchored to the start of the command (after
@@ -37,7 +37,7 @@ exit status (the exit status of the last command run inside it) propagates
 to whatever chain contains it — unlike $(...), whose exit status is
 discarded. `(rg -q x file | head -1)` is therefore exactly as unfailable as
 the unwrapped form and is denied identically; see
-_find_top_level_operators's docstring for the mechanism.
+_shell_ast.top_level_operators for the mechanism.
 
 IMPORTANT — layer boundary: this hook is registered on matcher="Bash" (every
 Bash tool call, from any agent), but it must only ever evaluate cmd strings
@@ -73,7 +73,7 @@ offending `kanban do`/`kanban todo` call and leaving the coordinator free to
 retry the corrected form in the same turn.
 
 Fails open: any error (JSON parse failure, empty stdin, non-UTF-8 stdin
-bytes, missing fields, a non-dict tool_input, shlex error, unreadable
+bytes, missing fields, a non-dict tool_input, unbalanced quotes, unreadable
 --file path, non-kanban-do/todo Bash command, or any other unexpected
 exception raised while deciding) results in allowing. This is a structural
 guarantee — main() wraps its entire decision logic in one outer
@@ -83,10 +83,11 @@ commands, by design.
 """
 
 import json
-import shlex
 import sys
 from pathlib import Path
 
+from _shell_ast import command_segments, parse_command, skip_balanced_group, top_level_operators
+
 # ---------------------------------------------------------------------------
 # Banned final-pipe-stage filters
 # ---------------------------------------------------------------------------
@@ -105,7 +106,7 @@ from pathlib import Path
 #            a command substitution (`test "$(... | wc -l)" -ge N`) because
 #            that shape is never reached by this check at all: $(...)
 #            content is opaque to the top-level chain scanner
-#            (_find_top_level_operators), so `wc` never becomes "the final
+#            (top_level_operators), so `wc` never becomes "the final
 #            stage of a top-level chain" in that shape — the substitution
 #            and bare-final-stage cases are structurally distinct, not just
 #            differently policied.
@@ -141,132 +142,19 @@ BANNED_FINAL_PIPE_FILTERS = frozenset(
 
 # ---------------------------------------------------------------------------
 # Top-level pipe-chain tokenizer
+#
+# The operator scan itself is _shell_ast.top_level_operators: quotes and
+# $(...)/`...` substitutions are opaque, bare (...) subshells are NOT — a
+# subshell's exit status propagates to the chain containing it, so
+# `(rg -q x file | head -1)` is exactly as unfailable as the unwrapped form.
 # ---------------------------------------------------------------------------
 
-def _skip_balanced_group(cmd: str, open_idx: int, open_char: str, close_char: str) -> int:
-    """Given cmd[open_idx] == open_char, return the index just past the
-    matching close_char, treating quoted content inside the group as opaque
-    (so a quoted paren/paren-like character inside doesn't unbalance it).
-
-    Deliberate fail-open on already-malformed input: if close_char is never
-    found (an unclosed $(...) or an unterminated quote inside it), this
-    scans to end-of-string and the caller treats everything from open_idx on
-    as swallowed/opaque. Such a cmd string is itself a shell syntax error
-    (an unclosed subshell/substitution never executes as literally written)
-    so this can never silently mis-scope a command that would actually run
-    — it's a deliberate consequence of fail-open-on-error, not a bug.
-    """
-    n = len(cmd)
-    depth = 1
-    j = open_idx + 1
-    while j < n and depth > 0:
-        c = cmd[j]
-        if c == "'":
-            j += 1
-            while j < n and cmd[j] != "'":
-                j += 1
-        elif c == '"':
-            j += 1
-            while j < n and cmd[j] != '"':
-                if cmd[j] == "\\":
-                    j += 1
-                j += 1
-        elif c == open_char:
-            depth += 1
-        elif c == close_char:
-            depth -= 1
-        j += 1
-    return j
-
-
-def _find_top_level_operators(cmd: str) -> "list[tuple[int, int, str]]":
-    """Return [(start, end, op), ...] for every top-level shell operator
-    ('&&', '||', ';', '&', '|') in cmd, in order.
-
-    "Top-level" means outside single/double quotes and outside any $(...) or
-    `...` command substitution — pipes inside a command substitution never
-    count, since a substitution's own exit status is discarded; only its
-    stdout TEXT feeds something else (usually a surrounding assertion), not
-    the shell's reported exit status.
-
-    Bare `(...)` subshells are the OPPOSITE case and are deliberately NOT
-    treated as opaque here (unlike $(...)): a subshell's own exit status —
-    which is the exit status of the last command executed inside it — DOES
-    propagate to whatever chain contains it. `(rg -q x file | head -1)` is
-    therefore exactly as unfailable as the unwrapped `rg -q x file | head
-    -1`, and ordinary command grouping (parens used for scoping/readability,
-    with zero evasive intent) must not be able to hide an unfailable final
-    pipe stage from this check. We achieve this by simply not skipping over
-    `(` / `)` at all — treating them as ordinary characters — which flattens
-    the subshell's contents into the same top-level scan, exposing any pipe
-    inside it exactly as if the parens weren't there.
-    """
-    n = len(cmd)
-    i = 0
-    ops: "list[tuple[int, int, str]]" = []
-    while i < n:
-        c = cmd[i]
-        if c == "'":
-            i += 1
-            while i < n and cmd[i] != "'":
-                i += 1
-            i += 1
-            continue
-        if c == '"':
-            i += 1
-            while i < n and cmd[i] != '"':
-                if cmd[i] == "\\":
-                    i += 1
-                i += 1
-            i += 1
-            continue
-        if c == "\\" and i + 1 < n:
-            i += 2
-            continue
-        if c == "$" and i + 1 < n and cmd[i + 1] == "(":
-            i = _skip_balanced_group(cmd, i + 1, "(", ")")
-            continue
-        if c == "`":
-            i += 1
-            while i < n and cmd[i] != "`":
-                i += 1
-            i += 1
-            continue
-        # NOTE: bare '(' / ')' are intentionally NOT special-cased here — see
-        # the docstring above. They fall through to the plain `i += 1` at
-        # the bottom of this loop, exactly like any other ordinary
-        # character, so a pipe inside a bare subshell is scanned as if the
-        # parens were never there.
-        if c == "&":
-            if i + 1 < n and cmd[i + 1] == "&":
-                ops.append((i, i + 2, "&&"))
-                i += 2
-            else:
-                ops.append((i, i + 1, "&"))
-                i += 1
-            continue
-        if c == "|":
-            if i + 1 < n and cmd[i + 1] == "|":
-                ops.append((i, i + 2, "||"))
-                i += 2
-            else:
-                ops.append((i, i + 1, "|"))
-                i += 1
-            continue
-        if c == ";":
-            ops.append((i, i + 1, ";"))
-            i += 1
-            continue
-        i += 1
-    return ops
-
-
 def _split_into_pipe_chains(cmd: str) -> "list[list[str]]":
     """Split cmd into pipe chains: each chain is a list of segment strings
     joined by top-level '|' operators. A chain breaks at any other top-level
     operator ('&&', '||', ';', '&').
     """
-    ops = _find_top_level_operators(cmd)
+    ops = top_level_operators(cmd)
     chains: "list[list[str]]" = []
     current: "list[str]" = []
     last_end = 0
@@ -438,7 +326,7 @@ def _scan_abutted_word(cmd: str, start: int) -> "tuple[int, bool]":
     substitutions, and ${...} parameter expansions all extend the current
     word rather than ending it — none of them is a shell operator the way
     `&&`/`|`/`;` are, so this scan walks past all of them (mirroring
-    _find_top_level_operators's own quote/substitution skipping, applied to
+    top_level_operators's own quote/substitution skipping, applied to
     one word instead of a whole command line) rather than stopping at the
     first one encountered. Only a real Bash word separator — whitespace, or
     one of the |&;()<> operator characters — ends the word.
@@ -474,10 +362,10 @@ def _scan_abutted_word(cmd: str, start: int) -> "tuple[int, bool]":
             i += 1
             continue
         if c == "$" and i + 1 < n and cmd[i + 1] == "(":
-            i = _skip_balanced_group(cmd, i + 1, "(", ")")
+            i = skip_balanced_group(cmd, i + 1, "(", ")")
             continue
         if c == "$" and i + 1 < n and cmd[i + 1] == "{":
-            i = _skip_balanced_group(cmd, i + 1, "{", "}")
+            i = skip_balanced_group(cmd, i + 1, "{", "}")
             continue
         if c == "`":
             i += 1
@@ -486,7 +374,7 @@ def _scan_abutted_word(cmd: str, start: int) -> "tuple[int, bool]":
             i += 1
             continue
         if c == "{":
-            group_end = _skip_balanced_group(cmd, i, "{", "}")
+            group_end = skip_balanced_group(cmd, i, "{", "}")
             if "," in cmd[i + 1:group_end - 1]:
                 saw_brace_expansion = True
             i = group_end
@@ -581,7 +469,7 @@ def find_abutted_quote_path_reason(cmd: str) -> "str | None":
 
 # This hook runs on the *full text* of every Bash tool call from every
 # session sharing this checkout (matcher = "Bash" in default.nix), so the
-# shlex.split() tokenization cost below is paid even for commands that have
+# tokenization cost below is paid even for commands that have
 # nothing to do with kanban — this guard's performance benefit applies to
 # every oversized Bash command, kanban-related or not. Measured
 # tokenization cost is super-linear: 600KB -> 0.415s, 2.4MB -> 4.137s. The
@@ -613,20 +501,18 @@ def _extract_kanban_do_todo_json(command: str) -> "str | None":
     """
     if len(command) > _MAX_COMMAND_BYTES:
         return None  # pathologically large command — fail open, skip parse
-    try:
-        tokens = shlex.split(command)
-    except ValueError:
-        return None  # unbalanced quotes etc. — fail open
-
-    kanban_idx = None
-    for i, tok in enumerate(tokens):
-        if tok.rsplit("/", 1)[-1] == "kanban":
-            kanban_idx = i
+
+    # Balanced segments only: a statement with unbalanced quotes fails open.
+    for segment in command_segments(parse_command(command), include_fallback=False):
+        kanban_idx = next(
+            (i for i, tok in enumerate(segment) if tok.rsplit("/", 1)[-1] == "kanban"), None,
+        )
+        if kanban_idx is not None:
             break
-    if kanban_idx is None:
+    else:
         return None  # not a kanban invocation at all
 
-    rest = tokens[kanban_idx + 1:]
+    rest = segment[kanban_idx + 1:]
     if not rest or rest[0] not in ("do", "todo"):
         return None  # a kanban subcommand other than do/todo — not a card creation
 
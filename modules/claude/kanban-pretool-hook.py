@@ -19,8 +19,9 @@ running — skip injection to avoid confusing the model with kanban context.
 Known Issues:
     - Claude Code displays 'PreToolUse:Agent hook error' in the UI even when
       this hook succeeds (exits 0, valid JSON, no stderr). This is a cosmetic
-      UI bug in Claude Code, not a hook failure. The hook's info log at
-      ~/.claude/metrics/kanban-pretool-hook.log confirms successful injection.
+      UI bug in Claude Code, not a hook failure. The hook's info records in
+      ~/.claude/metrics/hook-log.db (see _hook_log.py) confirm successful
+      injection.
       See: https://github.com/anthropics/claude-code/issues/17088
     - updatedInput may be silently dropped if multiple PreToolUse hooks match
       the same tool (we only register one for Agent, so this should not apply).
@@ -29,8 +30,8 @@ Known Issues:
 
 import fnmatch
 import json
+import os
 import re
-import shlex
 import sqlite3
 import subprocess
 import sys
@@ -39,7 +40,9 @@ import warnings
 import xml.etree.ElementTree as ET
 from pathlib import Path
 
+import _hook_log
 from _session_env import is_non_coordinator_session
+from _shell_ast import command_segments, parse_command
 
 # Suppress Python deprecation warnings to prevent stderr output,
 # which Claude Code interprets as hook errors.
@@ -49,8 +52,7 @@ warnings.filterwarnings("ignore", category=DeprecationWarning)
 # Constants
 # ---------------------------------------------------------------------------
 
-ERROR_LOG_PATH = Path.home() / ".claude" / "metrics" / "kanban-pretool-hook-errors.log"
-INFO_LOG_PATH = Path.home() / ".claude" / "metrics" / "kanban-pretool-hook.log"
+HOOK_NAME = "kanban-pretool-hook"
 
 # Patterns for extracting card number and session from agent prompts.
 # Priority order: most specific first.
@@ -81,83 +83,14 @@ _FOREGROUND_AUTHORIZED_RE = re.compile(r'^\s*FOREGROUND_AUTHORIZED\s*$', re.MULT
 # Error logging
 # ---------------------------------------------------------------------------
 
-_LOG_MAX_BYTES = 10 * 1024 * 1024  # 10 MB cap before rotation
-
-# Hard ceiling on the length of a SINGLE logged line, applied before it is
-# written to disk. Distinct from _LOG_MAX_BYTES above, which rotates the
-# WHOLE FILE once its total size crosses a threshold — this one caps a
-# single line.
-#
-# Note this is NOT primarily a classification-integrity fix (unlike the
-# sibling cap in kanban-subagent-stop-hook.py's log_error()):
-# hook-error-digest-hook.py's _CURATED_CLASSIFIERS_BY_FILENAME maps
-# "kanban-pretool-hook-errors.log" to an EMPTY classifier list, so every
-# line from this file already resolves via the generic fallback classifier
-# regardless of truncation — there is no curated anchor phrase here that
-# truncation could sever. The reason to cap is the whole-LINE re-read cost:
-# hook-error-digest-hook.py aggregates this log under the same per-run
-# PER_RUN_LINE_CAP (a per-run *line-count* cap, not a byte cap) as its
-# siblings, so one pathological line (e.g. an oversized interpolated
-# stderr/cwd/path field) would otherwise be re-read whole on every digest
-# run until the next 10 MB rotation. Capped here, applied inside
-# _write_log() so it covers both log_error() and log_info() in one place —
-# _write_log() is this file's single shared writer, unlike
-# kanban-subagent-stop-hook.py, which has two independent writer functions.
-_LOG_MAX_LINE_CHARS = 4000
-
-
-def _rotate_log_if_needed(path: Path) -> None:
-    """Rotate path → path.1 when the file exceeds _LOG_MAX_BYTES. Never raises."""
-    try:
-        if path.exists() and path.stat().st_size >= _LOG_MAX_BYTES:
-            rotated = path.with_suffix(path.suffix + ".1")
-            path.rename(rotated)
-    except Exception:  # intentional: last-resort log utility must never raise
-        pass
-
-
-def _truncate_log_line(message: str) -> str:
-    """Truncate a single log message to _LOG_MAX_LINE_CHARS.
-
-    Appends an elision marker with the original length so a reader of the
-    log knows the message was cut rather than assuming it is complete.
-    Truncates the TAIL (keeps the first _LOG_MAX_LINE_CHARS characters) —
-    see _LOG_MAX_LINE_CHARS above for why this file has no anchor-position
-    concern to preserve.
-    """
-    if len(message) <= _LOG_MAX_LINE_CHARS:
-        return message
-    return message[:_LOG_MAX_LINE_CHARS] + f"... [truncated, {len(message)} chars total]"
-
-
-def _write_log(path: Path, message: str) -> None:
-    """Append a timestamped message to a log file. Never raises.
-
-    Rotates the log file to <path>.1 when it exceeds _LOG_MAX_BYTES,
-    then starts a fresh file (one backup generation kept). The message
-    itself is capped to _LOG_MAX_LINE_CHARS before being written — see
-    _truncate_log_line.
-    """
-    try:
-        path.parent.mkdir(parents=True, exist_ok=True)
-        _rotate_log_if_needed(path)
-        from datetime import datetime, timezone
-        timestamp = datetime.now(timezone.utc).strftime('%Y-%m-%dT%H:%M:%SZ')
-        capped_message = _truncate_log_line(message)
-        with open(path, "a", encoding="utf-8") as fh:
-            fh.write(f"[{timestamp}] {capped_message}\n")
-    except Exception:  # intentional: last-resort log utility must never raise
-        pass
-
-
 def log_error(message: str) -> None:
-    """Append an error to the hook error log. Never raises."""
-    _write_log(ERROR_LOG_PATH, message)
+    """Record an error in the shared hook log (_hook_log). Never raises."""
+    _hook_log.write(HOOK_NAME, "error", message)
 
 
 def log_info(message: str) -> None:
-    """Append an info message to the hook info log. Never raises."""
-    _write_log(INFO_LOG_PATH, message)
+    """Record an info message in the shared hook log (_hook_log). Never raises."""
+    _hook_log.write(HOOK_NAME, "info", message)
 
 
 # ---------------------------------------------------------------------------
@@ -208,11 +141,84 @@ def extract_card_and_session(prompt: str) -> tuple[str, str] | None:
 # Kanban card fetch
 # ---------------------------------------------------------------------------
 
+# kanban.py's card render cache (§ Card render cache there): every
+# `kanban show N --output-style=xml` leaves root/.render-cache/N.render
+# holding the XML and the card's sorted editFiles, keyed by the card path
+# and card_render_key(). Reading it directly lets repeat injections and
+# guard lookups skip the fork (and the XML parse) whenever the card is
+# unchanged; a miss falls back to the subprocess, which refills the entry.
+# The layout and key are a contract with kanban.py — tests pin
+# _card_render_key to its card_render_key.
+_KANBAN_COLUMNS = ("todo", "doing", "done", "canceled")
+_RENDER_CACHE_VERSION = 1
+
+
+def _kanban_root() -> Path:
+    """The board root `kanban` would use from this cwd, without forking git.
+
+    Mirrors kanban.py's get_root: KANBAN_ROOT, else <git toplevel>/.kanban
+    (the nearest ancestor holding a .git entry), else ./.kanban.
+    """
+    if root_env := os.environ.get("KANBAN_ROOT"):
+        return Path(root_env)
+    cwd = Path.cwd()
+    for directory in (cwd, *cwd.parents):
+        if (directory / ".git").exists():
+            return directory / ".kanban"
+    return cwd / ".kanban"
+
+
+def _card_render_key(card_path: Path) -> list[int]:
+    """kanban.py's card_render_key: header (inode, mtime_ns, size) plus the
+    activity log's (mtime_ns, size), [0, 0] when there is none."""
+    st = card_path.stat()
+    try:
+        act = card_path.with_name(f"{card_path.stem}.activity.jsonl").stat()
+        activity = [act.st_mtime_ns, act.st_size]
+    except FileNotFoundError:
+        activity = [0, 0]
+    return [st.st_ino, st.st_mtime_ns, st.st_size, *activity]
+
+
+def _cached_card_render(card_number: str) -> dict | None:
+    """The render-cache entry for an active card if it is still current.
+
+    Returns {"xml": str, "editFiles": list[str], ...} or None on a miss —
+    no board, archived or unknown card, no entry, stale key. Never raises.
+    """
+    try:
+        num = str(int(card_number))
+        root = _kanban_root()
+        for col in _KANBAN_COLUMNS:
+            card_path = root / col / f"{num}.json"
+            if card_path.exists():
+                break
+        else:
+            return None
+        key = _card_render_key(card_path)
+        entry = json.loads((root / ".render-cache" / f"{num}.render").read_text(encoding="utf-8"))
+        if (
+            entry.get("version") != _RENDER_CACHE_VERSION
+            or entry.get("path") != f"{col}/{num}.json"
+            or entry.get("key") != key
+            or not isinstance(entry.get("xml"), str)
+            or not isinstance(entry.get("editFiles"), list)
+        ):
+            return None
+        return entry
+    except Exception:
+        return None
+
+
 def fetch_card_xml(card_number: str, session: str) -> str | None:
     """
-    Run `kanban show <card_number> --output-style=xml --session <session>`.
+    Return the card's XML from kanban's render cache when current, else run
+    `kanban show <card_number> --output-style=xml --session <session>`.
     Returns the XML string on success, None on any failure.
     """
+    cached = _cached_card_render(card_number)
+    if cached:
+        return cached["xml"]
     try:
         result = subprocess.run(
             ["kanban", "show", card_number, "--output-style=xml", "--session", session],
@@ -514,10 +520,6 @@ def _check_kanban_path_guard(tool_name: str, tool_input: dict) -> "tuple[bool, s
 # Destructive git operation validation (Bash tool calls from sub-agents)
 # ---------------------------------------------------------------------------
 
-# Shell operator tokens used to split compound commands.
-_SHELL_OPS = frozenset(["&&", "||", ";", "|", "&"])
-
-
 def _is_sub_agent(payload: dict) -> bool:
     """Return True if this hook call comes from inside a sub-agent.
 
@@ -534,65 +536,17 @@ def _is_sub_agent(payload: dict) -> bool:
     return bool(payload.get("agent_id"))
 
 
-def _normalize_semicolons(tokens: list) -> list:
-    """Expand tokens that embed bare semicolons into separate operator tokens.
-
-    shlex.split does not treat ';' as an operator — it merges it with adjacent
-    content when there is no surrounding whitespace (e.g., 'cmd;next'). This
-    function splits those embedded semicolons so _split_on_shell_ops can
-    correctly identify command segment boundaries.
-    """
-    result = []
-    for tok in tokens:
-        if ';' not in tok:
-            result.append(tok)
-            continue
-        parts = tok.split(';')
-        for i, part in enumerate(parts):
-            if part:
-                result.append(part)
-            if i < len(parts) - 1:
-                result.append(';')
-    return result
-
-
-def _split_on_shell_ops(tokens: list) -> list:
-    """Split token list on shell control operators into command segments."""
-    segments = []
-    current = []
-    for tok in tokens:
-        if tok in _SHELL_OPS:
-            if current:
-                segments.append(current)
-            current = []
-        else:
-            current.append(tok)
-    if current:
-        segments.append(current)
-    return segments
-
-
 def _tokenize_command(command: str) -> list:
-    """Tokenize a shell command string using shlex, splitting on operators.
+    """Split a shell command into segments (lists of tokens) via the shared
+    _shell_ast parse, memoized in-process so the rm and git guards share it.
 
-    Returns a list of segments where each segment is a list of tokens.
-    Fails open (returns empty list) on shlex errors.
+    Fails open: a statement whose quotes never balance is skipped (its
+    best-effort fallback segments are left out), so a parse problem never
+    blocks legitimate work.
     """
     if not command or not command.strip():
         return []
-    segments_out = []
-    for line in command.splitlines():
-        line = line.strip()
-        if not line:
-            continue
-        try:
-            tokens = shlex.split(line)
-        except ValueError:
-            # Unterminated quotes or other shlex error — fail open
-            continue
-        tokens = _normalize_semicolons(tokens)
-        segments_out.extend(_split_on_shell_ops(tokens))
-    return segments_out
+    return command_segments(parse_command(command), include_fallback=False)
 
 
 # Result type for destructive op detection:
@@ -764,10 +718,14 @@ def _fetch_doing_card_for_session(session_id: str) -> "tuple[str, list[str]] | N
 
 
 def _fetch_card_editfiles(card_number: str, session_id: str) -> "tuple[str, list[str]] | None":
-    """Fetch edit-files for a specific card via kanban show.
+    """Fetch edit-files for a specific card from kanban's render cache, or
+    via kanban show when the cache has no current entry.
 
     Returns (card_number, edit_files_list) or None on failure.
     """
+    cached = _cached_card_render(card_number)
+    if cached:
+        return (card_number, cached["editFiles"])
     try:
         result = subprocess.run(
             ["kanban", "show", card_number, "--output-style=xml", "--session", session_id],
@@ -880,8 +838,8 @@ def _validate_bash_destructive_git(payload: dict) -> "dict | None":
     - git checkout -p (no file) → rejected unconditionally (interactive session blocked).
 
     Fails-open paths (any of these allows the op through without blocking):
-    1. shlex parse error in _tokenize_command: unterminated quotes cause that line to be
-       skipped (fail open) — ensures a parse bug never blocks legitimate work.
+    1. Unbalanced quotes in _tokenize_command: a statement that never closes its
+       quotes is skipped (fail open) — ensures a parse bug never blocks legitimate work.
     2. kanban lookup failure: if _fetch_doing_card_for_session raises or returns None,
        the check is skipped with a log_error call. A sustained kanban outage creates a
        bypass window; monitor log_error calls for operational awareness.
@@ -1303,7 +1261,7 @@ def _strip_command_wrappers(segment: list) -> list:
     (its own -p flag — see _strip_command_own_flags_for_lookup_check),
     `xargs` (and its leading flag tokens, e.g. -0, -n1, -I{}), the block
     keywords `do`/`then`/`else`, and shell-grouping artifacts `(` / `{` that
-    shlex leaves either standalone (space before the wrapped command, e.g.
+    the tokenizer leaves either standalone (space before the wrapped command, e.g.
     `{ rm ...`) or attached to the first token (no space, e.g. `(rm ...`).
 
     FALSE-POSITIVE GUARD: `command -v rm` / `command -V rm` (with or without
@@ -1839,7 +1797,7 @@ def main() -> None:
     # Fail-open consequence: if this call fails (timeout, CLI unavailable), the flag
     # stays True. The Phase 2 phantom-doing detector will see the card as still-pending
     # after the actual launch — a false-positive phantom detection for this card.
-    # Logged to ERROR_LOG_PATH so the condition is observable.
+    # Logged via log_error() so the condition is observable.
     try:
         clear_result = subprocess.run(
             ["kanban", "clear-agent-launch-pending", card_number, "--session", session],
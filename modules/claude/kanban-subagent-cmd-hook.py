@@ -45,7 +45,7 @@ Neither class halts the surrounding agent turn: doing so would make same-turn
 recovery (mechanical) or the sub-agent's own final-return escalation
 (prohibition) structurally impossible.
 
-Fails open: any error (JSON parse failure, empty stdin, shlex error) results in
+Fails open: any error (JSON parse failure, empty stdin) results in
 allowing. Never accidentally block innocent commands.
 
 Sub-agent detection: `payload.get("agent_id")` is the discriminator. Present →
@@ -76,23 +76,21 @@ BYPASS MITIGATIONS:
   3. bare shell env-var prefixes: `KANBAN_SESSION=x kanban list`,
      `FOO=1 BAR=2 kanban done 5` — detected by stripping leading
      VAR=value tokens in _strip_leading_env_assignments().
-  4. fused shell operators (no whitespace around `&&`, `||`, `;`, `&`) —
-     operator characters are split out of single shlex tokens by
-     _normalize_fused_shell_operators() before segmentation.
+  4. fused shell operators (no whitespace around `&&`, `||`, `;`, `&`, `|`) —
+     the shared _shell_ast lexer splits every unquoted operator into its own
+     segment boundary, fused or not, while quoted ones stay inside their word.
 """
 
 import json
 import re
-import shlex
 import sys
 
+from _shell_ast import command_segments, parse_command
+
 # ---------------------------------------------------------------------------
 # Constants
 # ---------------------------------------------------------------------------
 
-# Shell operator tokens — used to split compound commands.
-_SHELL_OPS = frozenset(["&&", "||", ";", "|", "&"])
-
 # Wrapper executables that transparently invoke another binary.
 # When segment[0] is one of these, we advance past it to find the real binary.
 _ENV_WRAPPERS = frozenset(["env", "/usr/bin/env"])
@@ -188,417 +186,21 @@ def _is_sub_agent(payload: dict) -> bool:
 # Command tokenization
 # ---------------------------------------------------------------------------
 
-
-# Shell control operators that can appear FUSED onto adjacent content (no
-# surrounding whitespace) inside a single shlex token — e.g. 'cmd;next',
-# '1&&kanban', 'kanban&done'. `|` is DELIBERATELY EXCLUDED (issue #66) — see
-# the "PIPE DEFERRAL" note on _normalize_fused_shell_operators below.
-#
-# Sorted longest-first so a two-character operator is always matched before
-# its one-character prefix: '&&' must be recognized before '&' (a
-# left-to-right, shortest-first scan would split '&&' into two spurious
-# empty-buffer '&' pieces instead of one '&&' piece). '||' is similarly
-# ordered ahead of any future single-'|' handling, though no single-'|'
-# entry exists in this set today.
-_FUSED_SHELL_OPERATORS = (";", "&&", "||", "&")
-_FUSED_SHELL_OPERATORS_BY_LENGTH = tuple(
-    sorted(_FUSED_SHELL_OPERATORS, key=len, reverse=True)
-)
-
-
-def _normalize_fused_shell_operators(tokens: list) -> list:
-    """Expand tokens that embed bare shell control operators into separate
-    operator tokens, so _split_on_shell_ops can find every segment boundary.
-
-    shlex.split does not treat ';', '&&', '||', or '&' as operators — it
-    merges each of them with adjacent content whenever there is no
-    surrounding whitespace (e.g. 'cmd;next', '1&&kanban', 'kanban&done').
-    Whitespace-surrounded operators need no help here: shlex.split already
-    emits them as their own standalone tokens (e.g. 'a && b' -> ['a', '&&',
-    'b']), which _split_on_shell_ops already recognizes via _SHELL_OPS. This
-    function exists solely for the FUSED (no-whitespace) case.
-
-    Confirmed real bug this closes (issue #66): before this function existed
-    for &&/||/&, a fused compound like
-      'kanban criteria check 5 1&&kanban done 5'
-    tokenized as a single opaque token '1&&kanban' at the point where the
-    subcommand's last argument met the operator, so _split_on_shell_ops
-    never saw a second segment and the trailing 'kanban done 5' ran
-    unguarded as extra positional arguments to the (correctly resolved)
-    first segment.
-
-    Delegates to _split_token_on_fused_operators for the actual per-token
-    scan (longest-match-first: '&&'/'||' before their '&' prefix).
-
-    PIPE DEFERRAL (issue #66, deliberate): '|' is NOT included in
-    _FUSED_SHELL_OPERATORS. See the "Pipe deferral" section of this card's
-    demo file for the full analysis; in short, '|' is regex alternation and
-    appears inside ordinary quoted patterns (`rg -q 'a|b' file`) far more
-    often than ';'/'&&'/'||'/'&' do, and by the time this function runs,
-    shlex has already irreversibly discarded quote boundary information (see
-    the QUOTE-SAFETY note below), so there is no way to tell a quoted '|'
-    from a fused, unquoted one at this layer. Adding '|' here would multiply
-    an already-nonzero false-positive surface (see this function's own
-    QUOTE-SAFETY note) specifically on the shape of command a sub-agent runs
-    constantly (grep/rg pattern searches). A DIFFERENT, previously-recorded
-    finding (kanban|cat with NO surrounding whitespace) is a distinct defect
-    from the one this function fixes: there, the kanban BINARY TOKEN ITSELF
-    becomes invisible ('kanban|cat' matches neither the exact 'kanban'
-    string nor a '/bin/kanban' path suffix in _is_kanban_binary()), whereas
-    this function's fix addresses a SECOND kanban invocation being masked as
-    trailing arguments to an already-recognized first one. This function
-    does not close that other gap, and given the quote-collision risk above,
-    doing so safely would need genuine character-level quote tracking on the
-    raw command string (see QUOTE-SAFETY note) rather than this post-shlex
-    token scan — out of scope for this card.
-
-    QUOTE-SAFETY NOTE (verified empirically, issue #66): this function runs
-    strictly AFTER shlex.split() in the caller, and by that point quote
-    boundary information has already been irreversibly discarded —
-    shlex.split("'a;b'") and shlex.split("a;b") both yield the identical
-    token ['a;b']; there is no way, at this layer, to tell a ';' (or now
-    '&&'/'||'/'&') that was originally inside quotes from one that was not.
-    This is a PRE-EXISTING characteristic of the ';'-only version of this
-    function, not something newly introduced by extending it to &&/||/&:
-    replaying `rg -q 'a;kanban' file` (a benign, single, quoted command)
-    through this module's real main() already produces a false DENY on the
-    unmodified ';'-only code, because the quote-blind split manufactures a
-    spurious ['kanban', 'file'] segment from the quoted 'a;kanban' argument.
-    Extending the same token-scan mechanism to &&/||/& inherits the
-    identical, bounded limitation — e.g. `rg -q 'foo&&kanban' file` can
-    likewise be falsely denied — but does NOT introduce a new bypass
-    (DENY-to-ALLOW) risk: _find_kanban_segment's "forbidden segment anywhere
-    wins" rule means additional splitting can only ever ADD segments to
-    scan, never remove or hide one that would otherwise have been flagged
-    forbidden (the fused-operator bypass this function fixes is exactly the
-    reverse direction — too FEW segments, not too many). The failure
-    direction this limitation can produce is over-denial of an innocent
-    quoted command whose content happens to glue an operator character
-    directly against something that resolves to a forbidden kanban
-    invocation with no separating whitespace — a fail-closed-only edge
-    case. The incidence is NOT narrow: the false deny fires whenever a
-    quoted search term ends exactly at the six letters of the kanban
-    binary name, which is the natural shape of a search someone
-    investigating this very mechanism would run over this repo's own test
-    and notes files. Appending more content after those six letters inside
-    the same quoted argument correctly stays allowed, because the
-    resulting fused token no longer equals the bare binary name. This
-    remains consistent with this file's established accepted-trade
-    philosophy elsewhere (see _is_shell_wrapper_invocation's "Accepted
-    trade" comment: a loud, recoverable false deny beats a silent bypass).
-    """
-    result = []
-    for tok in tokens:
-        result.extend(_split_token_on_fused_operators(tok))
-    return result
-
-
-def _split_token_on_fused_operators(token: str) -> list:
-    """Split a single token into content pieces and operator tokens wherever
-    a member of _FUSED_SHELL_OPERATORS appears in it, longest-match-first.
-
-    Scans left to right. At each position, tries each operator in
-    _FUSED_SHELL_OPERATORS_BY_LENGTH (longest first) for a literal match at
-    that position; on a match, flushes any buffered content as its own
-    piece, emits the operator as its own piece, and advances past it.
-    Otherwise, accumulates the current character into the buffer and
-    advances by one. A token with no operator occurrence anywhere returns
-    unchanged as a single-element list.
-
-    Examples:
-      '1&&kanban'   -> ['1', '&&', 'kanban']
-      'kanban&done' -> ['kanban', '&', 'done']
-      'a;kanban'    -> ['a', ';', 'kanban']
-      'a|b'         -> ['a|b']   (lone '|' is deliberately never matched —
-                                   see PIPE DEFERRAL note above)
-      'kanban'      -> ['kanban']  (no operator present, unchanged)
-    """
-    pieces = []
-    buf = ""
-    i = 0
-    n = len(token)
-    while i < n:
-        matched_op = None
-        for op in _FUSED_SHELL_OPERATORS_BY_LENGTH:
-            if token.startswith(op, i):
-                matched_op = op
-                break
-        if matched_op:
-            if buf:
-                pieces.append(buf)
-                buf = ""
-            pieces.append(matched_op)
-            i += len(matched_op)
-        else:
-            buf += token[i]
-            i += 1
-    if buf:
-        pieces.append(buf)
-    return pieces
-
-
-def _split_on_shell_ops(tokens: list) -> list:
-    """Split token list on shell control operators into command segments."""
-    segments = []
-    current = []
-    for tok in tokens:
-        if tok in _SHELL_OPS:
-            if current:
-                segments.append(current)
-            current = []
-        else:
-            current.append(tok)
-    if current:
-        segments.append(current)
-    return segments
-
-
-def _join_continuation_lines(command: str) -> list:
-    """Elide real shell backslash-newline continuations before tokenizing.
-
-    Real bash removes a backslash immediately followed by a newline
-    entirely (both characters vanish, joining the two physical lines with
-    NO separator) whenever that backslash is the line's ODD-numbered
-    trailing backslash AND that backslash is not inside a single-quoted
-    region — an even trailing count, or a backslash inside single quotes,
-    means the newline stands on its own as a real separator (or, inside
-    single quotes, the backslash-newline pair is literal DATA, since bash
-    gives backslash no special meaning there at all). Python's shlex does
-    not model line-continuation at all: it treats a lone backslash as
-    "escape the next character," which stops the newline from acting as a
-    token SEPARATOR but leaves it embedded INSIDE the resulting token
-    (e.g. shlex.split('kanban\\\n done 5') corrupts the binary token to
-    'kanban\n', which then fails _is_kanban_binary's exact-string check).
-    Eliding real continuations here, before any shlex call, keeps tokens
-    clean and matches real shell execution:
-
-      'kanban\\\n done 5'          -> ['kanban done 5']
-      'python3 \\\n-c "import x"'  -> ['python3 -c "import x"']
-
-    Returns a list of LOGICAL lines. Non-continued lines remain separate
-    entries so the caller can still join them with a real embedded newline
-    character, preserving support for multi-line quoted arguments (e.g.
-    `kanban done 5 "summary\ntext"`).
-
-    Single-quote awareness: this function tracks quote/escape state via
-    the same _scan_quote_state used for balance detection, rather than a
-    second, divergent backslash-counting model — reusing the model that
-    already gates its escape branch on `not state["in_single"]`
-    (kanban-subagent-cmd-hook.py's _scan_quote_state). A trailing
-    backslash run only sets state["escaped"] when it appears outside a
-    single-quoted region, exactly matching real bash. Without this, a
-    backslash-newline spliced INSIDE a single-quoted kanban subcommand
-    argument (e.g. `kanban criteria 'chec\\<NL>k' 5 1`) would elide into
-    the allowlisted keyword "check", flipping a real DENY into an ALLOW.
-    """
-    logical: list = []
-    current = ""
-    state = _fresh_quote_state()
-    lines = command.splitlines()
-    last_index = len(lines) - 1
-    for i, line in enumerate(lines):
-        # Scan this physical line's characters into the running quote/escape
-        # state (persists across lines, since a single-quoted region can
-        # legitimately span several physical lines).
-        _scan_quote_state(line, state)
-        if state["escaped"] and i < last_index:
-            # This line's trailing (odd-count, non-single-quoted) backslash
-            # escapes its terminating newline, AND a further physical line
-            # exists to actually absorb it — elide both, keep accumulating
-            # into the same logical line. The escape is fully resolved by
-            # the elided newline, so reset it before scanning the next
-            # line's first character.
-            current += line[:-1]
-            state["escaped"] = False
-            continue
-        # Either this line ends balanced, or it is the LAST physical line
-        # and ends in a dangling escape with no further newline to elide
-        # (a genuinely incomplete/malformed command, not a continuation —
-        # there is nothing after it to weld with). In the dangling case the
-        # trailing backslash is left untouched here (never stripped), so
-        # the quote/escape scan in _tokenize_command still sees it as an
-        # unresolved trailing escape and correctly keeps buffering
-        # (fail-closed) instead of this function silently discarding it.
-        current += line
-        logical.append(current)
-        current = ""
-    return logical
-
-
-def _fresh_quote_state() -> dict:
-    """Return a fresh incremental quote/escape scan state."""
-    return {"in_single": False, "in_double": False, "escaped": False}
-
-
-def _scan_quote_state(text: str, state: dict) -> None:
-    """Advance the incremental quote/escape state by scanning `text`.
-
-    Mutates `state` in place. Mirrors just enough of shlex's posix-mode
-    quoting rules — backslash escapes the next character everywhere
-    except inside single quotes; a quote character only toggles its own
-    quote mode when not already inside the OTHER quote type — to cheaply
-    detect whether the accumulated buffer is still inside an open quote or
-    a dangling escape: the two conditions that make shlex.split() raise
-    ValueError.
-
-    This is an O(len(text)) pre-check that scans only the NEW text added
-    since the last call rather than the whole growing buffer, so the
-    caller can skip the expensive shlex.split() call on every line and
-    invoke it only when this scan suggests the buffer might already be
-    balanced. Being imprecise never trades correctness for speed:
-    shlex.split() remains the sole authority on whether a candidate is
-    actually a complete, valid token stream — if this scan under-reports
-    balance, the caller just waits for more input before retrying shlex,
-    never wrongly resolving a segment early.
-    """
-    for ch in text:
-        if state["escaped"]:
-            state["escaped"] = False
-            continue
-        if ch == "\\" and not state["in_single"]:
-            state["escaped"] = True
-            continue
-        if ch == "'" and not state["in_double"]:
-            state["in_single"] = not state["in_single"]
-            continue
-        if ch == '"' and not state["in_single"]:
-            state["in_double"] = not state["in_double"]
-            continue
-
-
-def _quote_state_balanced(state: dict) -> bool:
-    """Return True if the scan state represents a closed, non-escaping point."""
-    return not state["in_single"] and not state["in_double"] and not state["escaped"]
-
-
-def _strip_stray_quote_chars(token: str) -> str:
-    """Strip leading/trailing quote characters from a fallback token.
-
-    Only reached for genuinely malformed input that never balances (see
-    _tokenize_command's fallback branch) — its naive whitespace `.split()`
-    has no shlex-style quote awareness, so an unterminated quote fused
-    directly onto a security-relevant token (e.g. '"kanban', with no
-    closing quote anywhere in the command) would otherwise survive as
-    part of the token and defeat the exact-string matches in
-    _is_kanban_binary() / _is_shell_wrapper_invocation(). Stripping stray
-    leading/trailing quote characters only ever makes token
-    identification MORE likely to recognize kanban/-c/-e — it strengthens
-    rather than weakens the downstream exact-match checks, so it cannot
-    introduce a new bypass.
-    """
-    return token.strip("'\"")
-
-
-def _segments_from_logical_lines(logical_lines: list) -> list:
-    """Tokenize an already backslash-newline-elided logical-line list.
-
-    Returns a list of segments where each segment is a list of tokens.
-    Shared buffering/shlex core for _tokenize_command — factored out from
-    the continuation-line elision itself so the buffering logic lives in
-    one place.
-
-    A single logical shell command can span multiple PHYSICAL lines when a
-    quoted argument embeds a literal newline, e.g.:
-
-        kanban done 5 "summary
-        text"
-
-    shlex.split() on the first physical line alone sees an unterminated
-    quote and raises ValueError. The previous implementation caught that
-    ValueError and silently `continue`d past the line — discarding it
-    entirely, so no segment was ever produced and neither prohibition ever
-    saw the command. That is a fail-OPEN outcome for a security guard: a
-    sub-agent could bypass either prohibition (the shell-wrapper -c/-e
-    denial, or the kanban subcommand allowlist) simply by splitting the
-    interesting quoted argument across two lines.
-
-    To fail CLOSED instead, physical lines are accumulated into a buffer.
-    An incremental quote/escape scan (_scan_quote_state) decides cheaply,
-    in O(line length) per line, whether the buffer LOOKS balanced; only
-    then is the buffer joined and handed to the authoritative
-    shlex.split():
-      - If the scan says "not yet balanced" (inside an open quote or a
-        dangling escape), keep buffering without paying for a join or a
-        shlex call — this is what keeps the loop O(n) instead of O(n^2)
-        for a quote that only closes on the very last of many lines.
-      - If the scan says "looks balanced" and shlex.split() agrees, the
-        buffer was a complete, balanced logical unit. Emit its segments
-        and start a fresh buffer.
-      - If shlex still raises ValueError despite the scan saying balanced
-        (a rare escaping edge case the simplified scan doesn't model
-        exactly), keep buffering — shlex is always the final word, never
-        the cheap scan.
-      - If input is exhausted with an unresolved buffer, the text was
-        genuinely malformed (no continuation would ever balance it). Fail
-        CLOSED: fall back to a naive whitespace split (with stray quote
-        characters stripped from each token — see
-        _strip_stray_quote_chars) so the downstream substring/token
-        checks still get a chance to see this text, rather than the
-        content vanishing with no segment formed at all.
-    """
-    segments_out = []
-    buffer_lines: list = []
-    quote_state = _fresh_quote_state()
-    for line in logical_lines:
-        buffer_lines.append(line)
-        if len(buffer_lines) > 1:
-            _scan_quote_state("\n", quote_state)
-        _scan_quote_state(line, quote_state)
-        if not _quote_state_balanced(quote_state):
-            # Still inside an open quote or a dangling escape — the
-            # logical unit may continue on the next physical line. Keep
-            # buffering; skip the join + shlex call entirely.
-            continue
-
-        candidate = "\n".join(buffer_lines).strip()
-        if not candidate:
-            buffer_lines = []
-            quote_state = _fresh_quote_state()
-            continue
-        try:
-            tokens = shlex.split(candidate)
-        except ValueError:
-            # The cheap scan said "balanced" but shlex disagrees (a rare
-            # escaping edge case the simplified scan doesn't model
-            # exactly) — keep buffering; shlex is always the final
-            # authority.
-            continue
-        tokens = _normalize_fused_shell_operators(tokens)
-        segments_out.extend(_split_on_shell_ops(tokens))
-        buffer_lines = []
-        quote_state = _fresh_quote_state()
-
-    # Anything left in the buffer never became a balanced shlex unit, even
-    # after consuming every remaining line — genuinely malformed input.
-    # Fail CLOSED rather than discarding it.
-    if buffer_lines:
-        remainder = "\n".join(buffer_lines).strip()
-        if remainder:
-            raw_tokens = [_strip_stray_quote_chars(tok) for tok in remainder.split()]
-            tokens = _normalize_fused_shell_operators(raw_tokens)
-            segments_out.extend(_split_on_shell_ops(tokens))
-
-    return segments_out
-
-
 def _tokenize_command(command: str) -> list:
     """Tokenize a shell command string into shell-operator-delimited segments.
 
-    Returns a list of segments where each segment is a list of tokens.
+    Returns a list of segments where each segment is a list of tokens. The
+    parse is the shared one from _shell_ast (continuations elided, fused and
+    unquoted operators split, quoted ones left alone).
 
-    Elides real backslash-newline continuations with the single-quote-aware
-    _join_continuation_lines (the bash-accurate reading — see its docstring
-    for why single-quote awareness matters: a quote-blind elision would weld
-    a single-quote-corrupted subcommand argument like 'chec\\<NL>k' into the
-    allowlisted keyword "check", flipping a real DENY into a wrongly-granted
-    ALLOW), then hands the resulting logical lines to
-    _segments_from_logical_lines for shlex-based tokenization.
+    Fallback segments ARE included: a statement that never balances its
+    quotes is still split naively and checked, so hiding a forbidden kanban
+    call behind an unterminated quote fails CLOSED here (see _shell_ast's
+    "Unbalanced input" note).
     """
     if not command or not command.strip():
         return []
-
-    logical_lines = _join_continuation_lines(command)
-    return _segments_from_logical_lines(logical_lines)
+    return command_segments(parse_command(command))
 
 
 # ---------------------------------------------------------------------------
@@ -816,7 +418,7 @@ def _strip_leading_env_assignments(segment: list) -> list:
       FOO=val_with_punct/.path kanban done 5
       KANBAN_SESSION= kanban list  (empty value)
 
-    shlex.split preserves these as individual tokens (e.g. 'KANBAN_SESSION=x').
+    The tokenizer preserves these as individual tokens (e.g. 'KANBAN_SESSION=x').
     This function advances past all leading tokens that match the pattern
     [A-Za-z_][A-Za-z0-9_]*= (i.e., a valid shell identifier followed by '=')
     and returns the remainder.  The first token NOT matching the pattern is
@@ -1109,13 +711,13 @@ def main() -> None:
     # Tokenize the command into segments split by shell operators
     segments = _tokenize_command(command)
 
-    # If tokenization failed entirely (e.g., shlex errors), fail-open
+    # If tokenization produced nothing (whitespace-only command), fail-open
     if not segments:
         sys.exit(0)
 
     # Check for shell/script runner -c invocations before kanban detection.
     # These bypass static kanban analysis entirely by embedding the kanban call
-    # inside a string argument that shlex treats as a single opaque token.
+    # inside a string argument that the tokenizer treats as a single opaque token.
     # Deny them outright — sub-agents have direct Bash tool access.
     for segment in segments:
         if _is_shell_wrapper_invocation(segment):
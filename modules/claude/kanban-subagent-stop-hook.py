@@ -28,6 +28,7 @@ running — skip AC review. See _session_env.is_non_coordinator_session().
 
 import html
 import json
+import mmap
 import os
 import re
 import subprocess
@@ -35,9 +36,9 @@ import sys
 import time
 import traceback
 import warnings
-from datetime import datetime, timezone
 from pathlib import Path
 
+import _hook_log
 from _session_env import is_non_coordinator_session
 
 # Suppress Python deprecation warnings to prevent stderr output,
@@ -48,7 +49,7 @@ warnings.filterwarnings("ignore", category=DeprecationWarning)
 # Constants
 # ---------------------------------------------------------------------------
 
-ERROR_LOG_PATH = Path.home() / ".claude" / "metrics" / "kanban-subagent-stop-hook-errors.log"
+HOOK_NAME = "kanban-subagent-stop-hook"
 
 # Patterns for extracting card number and session from transcript lines
 _KANBAN_CMD_PATTERN = re.compile(
@@ -102,7 +103,9 @@ _HEDGE_CITATION_THRESHOLD = 3
 # Minimum character length of final return text before running hedge audit.
 _HEDGE_MIN_LENGTH = 400
 
-# Maximum transcript size before skipping transcript-reading operations.
+# Maximum transcript size before detect_stuck_criteria skips its forward scan.
+# The card/output/gaming scans read backwards from EOF instead (see
+# _iter_transcript_entries_reverse) and need no size cap.
 _TRANSCRIPT_MAX_BYTES = 50 * 1024 * 1024  # 50 MB
 
 # ---------------------------------------------------------------------------
@@ -151,114 +154,23 @@ _KANBAN_CRITERIA_BASH: re.Pattern[str] = re.compile(
 # Error logging
 # ---------------------------------------------------------------------------
 
-_LOG_MAX_BYTES = 10 * 1024 * 1024  # 10 MB cap before rotation
-
-# Hard ceiling on the length of a SINGLE log_error() message, applied before
-# it is written to disk. Distinct from the other two length-related limits
-# in this file: _LOG_MAX_BYTES (above) rotates the WHOLE FILE once its total
-# size crosses a threshold; _AUTO_ATTEMPT_MAX_OUTPUT_CHARS (near
-# _truncate_output, below) caps relayed subprocess stdout/stderr text. This
-# one caps a single log LINE. Without it, one pathological interpolated
-# value (e.g. an oversized cwd or a large nested payload field logged via
-# !r) can produce a single line large enough that
-# hook-error-digest-hook.py's PER_RUN_LINE_CAP (a per-run *line-count* cap,
-# not a byte cap — see that module's CAPS section) re-reads the same
-# enormous line, whole, on every digest run until the next rotation.
-#
-# Applied universally inside log_error() below (every call site), not just
-# the diagnostic-fields call site that surfaced the gap (card #3384, see
-# .scratchpad/review-payload-security.md § 3). The same unbounded pattern
-# was already accepted for `transcript_path` at this file's oldest
-# log_error() call site (line ~1413) before this change — capping only the
-# newly-added fields would draw an arbitrary line between "old" and "new"
-# interpolated content on the exact same message. Capping once, inside
-# log_error(), fixes the whole class consistently.
-_LOG_MAX_LINE_CHARS = 4000
-
-
-def _rotate_log_if_needed(path: Path) -> None:
-    """Rotate path → path.1 when the file exceeds _LOG_MAX_BYTES. Never raises."""
-    try:
-        if path.exists() and path.stat().st_size >= _LOG_MAX_BYTES:
-            rotated = path.with_suffix(path.suffix + ".1")
-            path.rename(rotated)
-    except Exception:
-        pass
-
-
-def _truncate_log_line(message: str) -> str:
-    """Truncate a log_error() message to _LOG_MAX_LINE_CHARS.
-
-    Appends an elision marker with the original length — same shape as
-    _truncate_output/_truncate_intent below — so a reader of the log knows
-    the message was cut rather than assuming it is complete.
-
-    Truncates the TAIL (keeps the first _LOG_MAX_LINE_CHARS characters).
-    This is safe for hook-error-digest-hook.py's classification for five of
-    the six _HOT_LOG_CLASSIFIERS patterns: each of those five matches text at
-    or very near the START of the message — e.g. the "transcript-path-missing"
-    classifier matches "non-empty transcript_path that does not exist", the
-    fixed preamble text this file writes BEFORE the appended session_id/
-    agent_id/agent_type/cwd/tool_use_id fields (kanban-subagent-stop-hook.py:
-    1413-1414, hook-error-digest-hook.py:154) — so cutting the tail never
-    removes the anchor phrase those classifiers search for.
-
-    Known exception: "kanban-command-timeout"
-    (hook-error-digest-hook.py:159, r"kanban .+ timed out after \\d+s") anchors
-    on a SUFFIX — "timed out after Ns" — that comes AFTER the unbounded
-    `' '.join(args)` field in this file's `f"kanban {' '.join(args)} timed out
-    after {timeout}s"` message (kanban-subagent-stop-hook.py:965). If that
-    joined `args` string ever grew past ~3990 characters, tail-truncation
-    would cut the required suffix away and this entry would fall through to
-    the generic fallback classifier instead of matching
-    "kanban-command-timeout". Not currently reachable: every run_kanban()
-    call site in this file passes a short, bounded argument list (subcommand
-    name, card number, --session, session name), never free-text content —
-    but this is an unenforced invariant, not a structural guarantee.
-    """
-    if len(message) <= _LOG_MAX_LINE_CHARS:
-        return message
-    return message[:_LOG_MAX_LINE_CHARS] + f"... [truncated, {len(message)} chars total]"
-
-
 def log_error(message: str) -> None:
-    """Append an error to the hook error log. Never raises.
+    """Record an error in the shared hook log (_hook_log). Never raises.
 
-    Rotates the log file to <path>.1 when it exceeds _LOG_MAX_BYTES,
-    then starts a fresh file (one backup generation kept). The message
-    itself is capped to _LOG_MAX_LINE_CHARS before being written — see
-    _truncate_log_line.
+    The sink classifies the full message at write time (the curated
+    "transcript-path-missing", "kanban-command-timeout", ... classes live in
+    _hook_log._CLASSIFIERS_BY_HOOK) and then caps its stored length.
     """
-    try:
-        ERROR_LOG_PATH.parent.mkdir(parents=True, exist_ok=True)
-        _rotate_log_if_needed(ERROR_LOG_PATH)
-        timestamp = datetime.now(timezone.utc).strftime('%Y-%m-%dT%H:%M:%SZ')
-        capped_message = _truncate_log_line(message)
-        with open(ERROR_LOG_PATH, "a", encoding="utf-8") as fh:
-            fh.write(f"[{timestamp}] {capped_message}\n")
-    except Exception:
-        pass
-
-
-INFO_LOG_PATH = Path.home() / ".claude" / "metrics" / "kanban-subagent-stop-hook.log"
+    _hook_log.write(HOOK_NAME, "error", message)
 
 
 def log_info(message: str) -> None:
-    """Log informational message to file. Never raises.
+    """Record an info message in the shared hook log (_hook_log). Never raises.
 
     Previously wrote to stderr, but Claude Code interprets any stderr output
     from hooks as errors — causing false 'hook error' labels in the UI.
-    Rotates the log file to <path>.1 when it exceeds _LOG_MAX_BYTES,
-    then starts a fresh file (one backup generation kept).
     """
-    try:
-        INFO_LOG_PATH.parent.mkdir(parents=True, exist_ok=True)
-        _rotate_log_if_needed(INFO_LOG_PATH)
-        timestamp = datetime.now(timezone.utc).strftime('%Y-%m-%dT%H:%M:%SZ')
-        with open(INFO_LOG_PATH, "a", encoding="utf-8") as fh:
-            fh.write(f"[{timestamp}] {message}\n")
-    except Exception:
-        pass
+    _hook_log.write(HOOK_NAME, "info", message)
 
 
 # ---------------------------------------------------------------------------
@@ -287,61 +199,76 @@ def block(reason: str, system_message: str = "") -> dict:
 # Transcript parsing
 # ---------------------------------------------------------------------------
 
-def extract_agent_output(transcript_path: str) -> str:
-    """
-    Extract the agent's final substantive output from the JSONL transcript.
-
-    Reads the transcript and returns the content of the last assistant message
-    before the agent stopped. This is the agent's findings/deliverable summary.
-
-    Returns the extracted output string, or empty string if not found.
+def _iter_transcript_entries_reverse(transcript_path: str):
+    """Yield the transcript's JSONL entries from the last line backwards.
+
+    The file is memory-mapped and split on newlines from EOF with
+    mmap.rfind, so a caller that stops after the last few entries touches
+    only those pages — cost is proportional to the distance from EOF, not
+    the transcript size. Every question the stop hook asks of a transcript
+    (latest card anchor, final assistant message, activity since the last
+    block feedback) is answered near the end, which is what made the old
+    forward scans plus a 50 MB give-up guard the wrong shape: the longest
+    running agents, the ones most worth un-stranding, were the ones skipped.
+
+    Blank lines and lines that are not valid JSON (including a final line
+    still being written) are skipped. Raises OSError if the file cannot be
+    opened; an empty file yields nothing.
     """
-    # Size guard: skip for very large transcripts (consistent with gaming detection).
-    try:
-        if Path(transcript_path).stat().st_size > _TRANSCRIPT_MAX_BYTES:
-            return ""
-    except OSError:
-        pass
-
-    last_assistant_content = ""
-    try:
-        with open(transcript_path, "r", encoding="utf-8") as fh:
-            for line in fh:
-                line = line.strip()
+    with open(transcript_path, "rb") as fh:
+        try:
+            mapped = mmap.mmap(fh.fileno(), 0, access=mmap.ACCESS_READ)
+        except ValueError:
+            return  # zero-length files cannot be mapped
+        with mapped:
+            end = len(mapped)
+            while end > 0:
+                start = mapped.rfind(b"\n", 0, end) + 1
+                line = mapped[start:end].strip()
+                end = start - 1
                 if not line:
                     continue
                 try:
-                    entry = json.loads(line, strict=False)
+                    yield json.loads(line.decode("utf-8", errors="replace"), strict=False)
                 except json.JSONDecodeError:
                     continue
 
-                # Look for assistant-role messages
-                if not isinstance(entry, dict):
-                    continue
 
-                role = entry.get("role", "")
-                if role != "assistant":
-                    continue
+def extract_agent_output(transcript_path: str) -> str:
+    """
+    Extract the agent's final substantive output from the JSONL transcript.
 
-                content = entry.get("content", "")
-                if isinstance(content, str) and content.strip():
-                    last_assistant_content = content.strip()
-                elif isinstance(content, list):
-                    # Content may be a list of blocks; extract text blocks
-                    text_parts = []
-                    for blk in content:
-                        if isinstance(blk, dict) and blk.get("type") == "text":
-                            text = blk.get("text", "")
-                            if text.strip():
-                                text_parts.append(text.strip())
-                        elif isinstance(blk, str) and blk.strip():
-                            text_parts.append(blk.strip())
-                    if text_parts:
-                        last_assistant_content = "\n".join(text_parts)
+    Returns the content of the last assistant message with non-empty text
+    before the agent stopped — its findings/deliverable summary. Reads
+    backwards from EOF and stops at that message.
+
+    Returns the extracted output string, or empty string if not found.
+    """
+    try:
+        for entry in _iter_transcript_entries_reverse(transcript_path):
+            # Look for assistant-role messages
+            if not isinstance(entry, dict) or entry.get("role", "") != "assistant":
+                continue
+
+            content = entry.get("content", "")
+            if isinstance(content, str) and content.strip():
+                return content.strip()
+            if isinstance(content, list):
+                # Content may be a list of blocks; extract text blocks
+                text_parts = []
+                for blk in content:
+                    if isinstance(blk, dict) and blk.get("type") == "text":
+                        text = blk.get("text", "")
+                        if text.strip():
+                            text_parts.append(text.strip())
+                    elif isinstance(blk, str) and blk.strip():
+                        text_parts.append(blk.strip())
+                if text_parts:
+                    return "\n".join(text_parts)
     except (OSError, IOError) as exc:
         log_error(f"Failed to read transcript for agent output at {transcript_path}: {exc}")
 
-    return last_assistant_content
+    return ""
 
 
 def _find_card_match_in_texts(text_to_search: list[str]) -> tuple[str, str] | None:
@@ -418,49 +345,10 @@ def _extract_trustworthy_texts_from_entry(entry) -> list[str]:
     return texts
 
 
-def _resolve_card_from_entries_info(
-    entries_info: list[tuple[bool, tuple[str, str] | None, tuple[str, str] | None]],
-) -> tuple[str, str] | None:
-    """Resolve the final (card_number, session) from per-entry scan results.
-
-    entries_info[i] = (is_anchor, match_all, match_trustworthy) for the i-th
-    JSONL entry, in file order. See extract_card_from_transcript for the
-    trust-anchor resolution algorithm this implements.
-    """
-    last_anchor_idx: int | None = None
-    for i in range(len(entries_info) - 1, -1, -1):
-        if entries_info[i][0]:
-            last_anchor_idx = i
-            break
-
-    if last_anchor_idx is None:
-        # No hook-injected anchor anywhere in the (scanned-so-far) transcript —
-        # fall back to latest-match-overall, unfiltered (the original
-        # latest-match-wins behavior, used when there's nothing trusted to
-        # anchor to, e.g. an un-injected SendMessage continuation).
-        found: tuple[str, str] | None = None
-        for _, match_all, _ in entries_info:
-            if match_all:
-                found = match_all
-        return found
-
-    # Anchor found: start from its own (inherently trustworthy) match, then
-    # only allow trustworthy matches STRICTLY AFTER it to override — this lets
-    # a continued agent's later, legitimate `kanban criteria check <newCard>`
-    # invocation win, while preventing the agent's own final-return prose from
-    # redirecting resolution to an unrelated card it merely mentions.
-    found = entries_info[last_anchor_idx][1]
-    for i in range(last_anchor_idx + 1, len(entries_info)):
-        _, _, match_trustworthy = entries_info[i]
-        if match_trustworthy:
-            found = match_trustworthy
-    return found
-
-
 def extract_card_from_transcript(transcript_path: str) -> tuple[str, str] | None:
     """
-    Parse the agent's transcript (JSONL) line by line to find the card number
-    and session ID.
+    Find the card number and session ID the agent was working on, scanning
+    the JSONL transcript backwards from EOF.
 
     Looks for:
     1. Injected card XML header from PreToolUse hook
@@ -478,50 +366,40 @@ def extract_card_from_transcript(transcript_path: str) -> tuple[str, str] | None
     override a stale anchor, while preventing the agent's own final-return
     prose from redirecting resolution to an unrelated card it merely mentions.
 
+    Walking backwards, the first trustworthy match seen is the latest one
+    after the anchor, and the scan stops at the anchor itself — so the usual
+    case (anchor near the end) reads only the tail of the file.
+
     If NO hook-injected anchor exists anywhere in the transcript (e.g. an
     un-injected SendMessage continuation), falls back to the latest match
     found ANYWHERE in the file, unfiltered (the original latest-match-wins
-    behavior). Pattern priority (XML > header > CLI) is preserved within a
-    single line/entry via _find_card_match_in_texts() in both cases.
+    behavior); proving there is no anchor is the one case that reads the
+    whole file. Pattern priority (XML > header > CLI) is preserved within a
+    single entry via _find_card_match_in_texts() in both cases.
 
     Returns (card_number_str, session_id), or None if no card reference is
     found anywhere in the transcript.
     """
-    # Size guard: skip for very large transcripts (consistent with sibling
-    # transcript-scanning functions extract_agent_output/detect_criteria_gaming).
+    latest_trustworthy: tuple[str, str] | None = None
+    latest_any: tuple[str, str] | None = None
     try:
-        if Path(transcript_path).stat().st_size > _TRANSCRIPT_MAX_BYTES:
-            return None
-    except OSError:
-        pass
-
-    entries_info: list[tuple[bool, tuple[str, str] | None, tuple[str, str] | None]] = []
-    try:
-        with open(transcript_path, "r", encoding="utf-8") as fh:
-            for line in fh:
-                line = line.strip()
-                if not line:
-                    continue
-                try:
-                    entry = json.loads(line, strict=False)
-                except json.JSONDecodeError:
-                    continue
-
-                # Search through all string values in the entry for patterns.
-                text_to_search = _extract_text_from_entry(entry)
-                match_all = _find_card_match_in_texts(text_to_search)
-                is_anchor = _entry_has_anchor_pattern(text_to_search)
-                match_trustworthy = _find_card_match_in_texts(
+        for entry in _iter_transcript_entries_reverse(transcript_path):
+            # Search through all string values in the entry for patterns.
+            text_to_search = _extract_text_from_entry(entry)
+            if _entry_has_anchor_pattern(text_to_search):
+                return latest_trustworthy or _find_card_match_in_texts(text_to_search)
+            if latest_trustworthy is None:
+                latest_trustworthy = _find_card_match_in_texts(
                     _extract_trustworthy_texts_from_entry(entry)
                 )
-                entries_info.append((is_anchor, match_all, match_trustworthy))
+            if latest_any is None:
+                latest_any = _find_card_match_in_texts(text_to_search)
     except (OSError, IOError) as exc:
         log_error(f"Failed to read transcript at {transcript_path}: {exc}")
-        # A match already accumulated before the read error survives —
-        # resolve from whatever was scanned so far rather than discarding it.
-        return _resolve_card_from_entries_info(entries_info)
+        # Resolve from whatever tail was scanned rather than discarding it.
+        return latest_trustworthy or latest_any
 
-    return _resolve_card_from_entries_info(entries_info)
+    return latest_any
 
 
 def detect_permission_stall(transcript_path: str) -> list[str]:
@@ -591,6 +469,36 @@ def _extract_text_from_entry(entry: dict | list | str, depth: int = 0) -> list[s
     return texts
 
 
+def _classify_tool_use_block(blk) -> str | None:
+    """Classify one assistant content block for detect_criteria_gaming.
+
+    Returns "substantive" for real work, "recheck" for a `kanban criteria
+    check` Bash call, or None for anything that is not a tool_use.
+    """
+    if not isinstance(blk, dict) or blk.get("type") != "tool_use":
+        return None
+
+    tool_name: str = blk.get("name", "")
+    if tool_name in _SUBSTANTIVE_TOOLS:
+        log_info(f"detect_criteria_gaming: substantive tool '{tool_name}' found after feedback")
+        return "substantive"
+    if tool_name.startswith("mcp__"):
+        log_info(f"detect_criteria_gaming: MCP tool '{tool_name}' found after feedback")
+        return "substantive"
+    if tool_name == "Bash":
+        cmd: str = ""
+        tool_input = blk.get("input", {})
+        if isinstance(tool_input, dict):
+            cmd = tool_input.get("command", "") or ""
+        if _KANBAN_CRITERIA_BASH.match(cmd):
+            log_info(f"detect_criteria_gaming: criteria recheck command found: {cmd[:80]!r}")
+            return "recheck"
+        # Non-kanban-criteria Bash command counts as substantive work.
+        log_info(f"detect_criteria_gaming: substantive Bash command found: {cmd[:80]!r}")
+        return "substantive"
+    return None
+
+
 def detect_criteria_gaming(transcript_path: str) -> bool:
     """Detect whether an agent is gaming the AC review gate.
 
@@ -598,16 +506,20 @@ def detect_criteria_gaming(transcript_path: str) -> bool:
     criteria), the agent immediately re-runs `kanban criteria check` on the
     same criteria WITHOUT doing any real work first.
 
-    Algorithm:
-    1. Scan all JSONL entries to find the LAST block-feedback message
+    Algorithm (reading backwards from EOF, so only the activity since the
+    last block feedback is ever parsed):
+    1. Walk entries from the end until the LAST block-feedback message
        (identified by _BLOCK_FEEDBACK_MARKERS phrases).
-    2. After that message, scan assistant-role entries for:
-       a. tool_use blocks naming a tool in _SUBSTANTIVE_TOOLS  → substantive work
-       b. tool_use blocks for "Bash" whose input.command does NOT match
+    2. On the way, classify assistant-role tool_use blocks:
+       a. a tool in _SUBSTANTIVE_TOOLS (or an mcp__ tool)   → substantive work
+       b. "Bash" whose input.command does NOT match
           _KANBAN_CRITERIA_BASH                               → substantive work
-       c. tool_use blocks for "Bash" whose input.command matches
+       c. "Bash" whose input.command matches
           _KANBAN_CRITERIA_BASH                               → criteria recheck
-    3. Gaming = at least one criteria recheck found AND no substantive work.
+       Substantive work anywhere after the feedback settles the answer
+       (not gaming), so the walk stops there too.
+    3. Gaming = a block-feedback message exists AND at least one criteria
+       recheck follows it AND no substantive work does.
 
     Fails open: any error returns False so normal hook flow is not interrupted.
 
@@ -618,116 +530,50 @@ def detect_criteria_gaming(transcript_path: str) -> bool:
         True if gaming is detected, False otherwise (including on any error).
     """
     try:
-        # Size guard: skip gaming detection for very large transcripts to avoid
-        # spiking Python memory usage (50 MB transcript → ~200-300 MB in-memory).
-        # Fail open: a large transcript is unlikely to be gaming anyway.
+        has_criteria_recheck = False
+        entries_after_feedback = 0
         try:
-            transcript_size = Path(transcript_path).stat().st_size
-            if transcript_size > _TRANSCRIPT_MAX_BYTES:
-                log_info(
-                    f"detect_criteria_gaming: transcript too large "
-                    f"({transcript_size} bytes > {_TRANSCRIPT_MAX_BYTES}) — skipping gaming check"
-                )
-                return False
-        except OSError:
-            pass  # file stat failure is non-fatal; proceed to load attempt
+            for entry in _iter_transcript_entries_reverse(transcript_path):
+                if not isinstance(entry, dict):
+                    continue
 
-        # --- Pass 1: load all entries and find the last block-feedback index ---
-        entries: list[dict] = []
-        try:
-            with open(transcript_path, "r", encoding="utf-8") as fh:
-                for line in fh:
-                    line = line.strip()
-                    if not line:
-                        continue
-                    try:
-                        entry = json.loads(line, strict=False)
-                    except json.JSONDecodeError:
-                        continue
-                    if isinstance(entry, dict):
-                        entries.append(entry)
+                # Block-feedback is delivered as a "user" role message injected
+                # by the hook; reaching it ends the window under inspection.
+                if any(
+                    marker in text
+                    for text in _extract_text_from_entry(entry)
+                    for marker in _BLOCK_FEEDBACK_MARKERS
+                ):
+                    log_info(
+                        f"detect_criteria_gaming: last block-feedback found "
+                        f"{entries_after_feedback} entries before EOF"
+                    )
+                    gaming = has_criteria_recheck
+                    log_info(
+                        f"detect_criteria_gaming: has_criteria_recheck={has_criteria_recheck} "
+                        f"has_substantive_work=False → gaming={gaming}"
+                    )
+                    return gaming
+
+                entries_after_feedback += 1
+                if entry.get("role") != "assistant":
+                    continue
+                content = entry.get("content", [])
+                if not isinstance(content, list):
+                    continue
+                for blk in content:
+                    kind = _classify_tool_use_block(blk)
+                    if kind == "substantive":
+                        log_info("detect_criteria_gaming: substantive work after feedback → gaming=False")
+                        return False
+                    if kind == "recheck":
+                        has_criteria_recheck = True
         except (OSError, IOError) as exc:
             log_error(f"detect_criteria_gaming: failed to read transcript {transcript_path}: {exc}")
             return False
 
-        if not entries:
-            return False
-
-        # Find the index of the LAST entry that contains a block-feedback marker.
-        # Block-feedback is delivered as a "user" role message injected by the hook.
-        last_feedback_index: int = -1
-        for idx, entry in enumerate(entries):
-            texts = _extract_text_from_entry(entry)
-            for text in texts:
-                if any(marker in text for marker in _BLOCK_FEEDBACK_MARKERS):
-                    last_feedback_index = idx
-                    break  # found a marker in this entry; move to next entry
-
-        if last_feedback_index < 0:
-            # No block-feedback message found — nothing to detect gaming against.
-            return False
-
-        log_info(
-            f"detect_criteria_gaming: last block-feedback at entry index {last_feedback_index} "
-            f"of {len(entries)} entries"
-        )
-
-        # --- Pass 2: scan entries AFTER the last feedback for tool_use blocks ---
-        has_substantive_work = False
-        has_criteria_recheck = False
-
-        for entry in entries[last_feedback_index + 1:]:
-            if entry.get("role") != "assistant":
-                continue
-
-            content = entry.get("content", [])
-            if not isinstance(content, list):
-                continue
-
-            for blk in content:
-                if not isinstance(blk, dict):
-                    continue
-                if blk.get("type") != "tool_use":
-                    continue
-
-                tool_name: str = blk.get("name", "")
-
-                if tool_name in _SUBSTANTIVE_TOOLS:
-                    has_substantive_work = True
-                    log_info(f"detect_criteria_gaming: substantive tool '{tool_name}' found after feedback")
-                    break  # one substantive tool is enough
-
-                if tool_name.startswith("mcp__"):
-                    has_substantive_work = True
-                    log_info(f"detect_criteria_gaming: MCP tool '{tool_name}' found after feedback")
-                    break  # one substantive tool is enough
-
-                if tool_name == "Bash":
-                    cmd: str = ""
-                    tool_input = blk.get("input", {})
-                    if isinstance(tool_input, dict):
-                        cmd = tool_input.get("command", "") or ""
-                    if _KANBAN_CRITERIA_BASH.match(cmd):
-                        has_criteria_recheck = True
-                        log_info(f"detect_criteria_gaming: criteria recheck command found: {cmd[:80]!r}")
-                    else:
-                        # Non-kanban-criteria Bash command counts as substantive work.
-                        has_substantive_work = True
-                        log_info(f"detect_criteria_gaming: substantive Bash command found: {cmd[:80]!r}")
-                        break
-
-            # Two-level break pattern: the inner `break` above exits the content
-            # block loop for *this* entry. This outer check exits the entry loop
-            # entirely once substantive work is confirmed — no need to scan further.
-            if has_substantive_work:
-                break
-
-        gaming = has_criteria_recheck and not has_substantive_work
-        log_info(
-            f"detect_criteria_gaming: has_criteria_recheck={has_criteria_recheck} "
-            f"has_substantive_work={has_substantive_work} → gaming={gaming}"
-        )
-        return gaming
+        # No block-feedback message found — nothing to detect gaming against.
+        return False
 
     except Exception as exc:
         log_error(f"detect_criteria_gaming: unexpected error for {transcript_path}: {exc}")
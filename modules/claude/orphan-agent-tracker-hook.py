@@ -7,25 +7,39 @@ Three subcommands (dispatched via argv[1]):
 
   pretool
     Triggered by PreToolUse(Agent). Reads hook payload from stdin, extracts
-    tool_use_id and description, appends an entry to the session-scoped
-    tracker file: .scratchpad/orphan-tracker-<session>.jsonl
+    tool_use_id and description, appends a start record to the
+    session-scoped tracker file: .scratchpad/orphan-tracker-<session>.jsonl
 
   subagent-stop
     Triggered by SubagentStop. Reads hook payload from stdin, extracts
-    tool_use_id, removes the matching entry from the tracker file.
+    tool_use_id, appends a stop tombstone for it to the tracker file.
 
   user-prompt-submit
-    Triggered by UserPromptSubmit. Reads the tracker file and emits a warning
-    to stdout if any agents are still running. The warning is injected into
-    coordinator context by Claude Code.
-
-Tracker file format (one JSON object per line):
-  {"id": "tool_use_id", "description": "...", "started_at": "ISO8601"}
+    Triggered by UserPromptSubmit. Folds the tracker file into the live set,
+    compacts it when it has accumulated enough dead records, and emits a
+    warning to stdout if any agents are still running. The warning is
+    injected into coordinator context by Claude Code.
+
+Tracker file format (append-only event log, one JSON object per line):
+  {"op": "start", "id": "tool_use_id", "description": "...", "started_at": "ISO8601"}
+  {"op": "stop", "id": "tool_use_id", "stopped_at": "ISO8601"}
+  A line without "op" (the pre-event-log format) is a start record.
+
+  The live set is every start whose id has no stop. pretool and
+  subagent-stop only ever append one line — O(1) per event — where they used
+  to re-read and rewrite the whole file, which made a fan-out session with
+  hundreds of agents O(n²) in tracker I/O. Dead records (stops and the starts
+  they cancel, plus stale starts) are dropped by compaction: user-prompt-submit
+  rewrites the file as a snapshot of the live starts once dead records reach
+  _COMPACT_DEAD_THRESHOLD or a stale entry needs pruning, so the file it
+  re-reads on every prompt stays close to the live set's size.
 
 Constraints:
   - Exit 0 always — hook must never block coordinator.
   - Broad try/except — no unhandled exceptions.
-  - Concurrent-safe writes via fcntl.flock (exclusive lock on the tracker file).
+  - Concurrent-safe via fcntl.flock on a sibling .lock file: appenders take
+    it shared (O_APPEND lines never interleave), compaction takes it
+    exclusive so no append can land in the file being replaced.
   - Session detection via KANBAN_SESSION env var; no-op cleanly if absent.
   - Stale entries (> 24h old) are pruned silently in user-prompt-submit.
   - PERSONAL_TRAINER_SESSION=1 → no-op (non-coordinator session).
@@ -47,6 +61,7 @@ import warnings
 from datetime import datetime, timedelta, timezone
 from pathlib import Path
 
+import _hook_log
 from _session_env import is_non_coordinator_session
 
 # Suppress Python deprecation warnings to prevent stderr output,
@@ -57,10 +72,7 @@ warnings.filterwarnings("ignore", category=DeprecationWarning)
 # Constants
 # ---------------------------------------------------------------------------
 
-ERROR_LOG_PATH = Path.home() / ".claude" / "metrics" / "orphan-agent-tracker-hook-errors.log"
-INFO_LOG_PATH = Path.home() / ".claude" / "metrics" / "orphan-agent-tracker-hook.log"
-
-_LOG_MAX_BYTES = 10 * 1024 * 1024  # 10 MB cap before rotation
+HOOK_NAME = "orphan-agent-tracker-hook"
 
 # Entries older than this are treated as stale and pruned.
 _STALE_THRESHOLD = timedelta(hours=24)
@@ -68,6 +80,10 @@ _STALE_THRESHOLD = timedelta(hours=24)
 # Entries younger than this are considered expected in-flight and do not trigger a warning.
 _INFLIGHT_THRESHOLD = timedelta(minutes=5)
 
+# Dead records (stop tombstones plus the starts they cancel) tolerated in the
+# tracker file before user-prompt-submit compacts it to a live snapshot.
+_COMPACT_DEAD_THRESHOLD = 64
+
 # Session ID validation pattern (matches kanban CLI constraints).
 _SESSION_ID_RE = re.compile(r'^[a-z0-9][a-z0-9-]{0,63}$')
 
@@ -76,37 +92,14 @@ _SESSION_ID_RE = re.compile(r'^[a-z0-9][a-z0-9-]{0,63}$')
 # Logging helpers
 # ---------------------------------------------------------------------------
 
-def _rotate_log_if_needed(path: Path) -> None:
-    """Rotate path → path.1 when the file exceeds _LOG_MAX_BYTES. Never raises."""
-    try:
-        if path.exists() and path.stat().st_size >= _LOG_MAX_BYTES:
-            rotated = path.with_suffix(path.suffix + ".1")
-            path.rename(rotated)
-    except Exception:
-        pass
-
-
-def _write_log(path: Path, message: str) -> None:
-    """Append a timestamped message to a log file. Never raises."""
-    try:
-        path.parent.mkdir(parents=True, exist_ok=True)
-        _rotate_log_if_needed(path)
-        timestamp = datetime.now(timezone.utc).strftime('%Y-%m-%dT%H:%M:%SZ')
-        with open(path, "a", encoding="utf-8") as fh:
-            fh.write(f"[{timestamp}] {message}\n")
-        os.chmod(path, 0o600)
-    except Exception:
-        pass
-
-
 def log_error(message: str) -> None:
-    """Append an error to the hook error log. Never raises."""
-    _write_log(ERROR_LOG_PATH, message)
+    """Record an error in the shared hook log (_hook_log). Never raises."""
+    _hook_log.write(HOOK_NAME, "error", message)
 
 
 def log_info(message: str) -> None:
-    """Append an info message to the hook info log. Never raises."""
-    _write_log(INFO_LOG_PATH, message)
+    """Record an info message in the shared hook log (_hook_log). Never raises."""
+    _hook_log.write(HOOK_NAME, "info", message)
 
 
 # ---------------------------------------------------------------------------
@@ -138,7 +131,7 @@ def get_tracker_path(session_id: str) -> Path | None:
 # ---------------------------------------------------------------------------
 
 def _read_entries(tracker_path: Path) -> list[dict]:
-    """Read all entries from the tracker file. Returns empty list on any error.
+    """Read all records from the tracker file. Returns empty list on any error.
 
     Does NOT acquire a lock — callers that need atomic read-modify-write must
     hold the lock themselves while calling this function.
@@ -166,9 +159,10 @@ def _read_entries(tracker_path: Path) -> list[dict]:
 def _write_entries_atomic(tracker_path: Path, entries: list[dict]) -> None:
     """Write entries to the tracker file atomically using a temp file + rename.
 
-    Must be called while holding a flock on the tracker file (or its parent
-    directory lock file). The atomic rename prevents partial writes from being
-    visible to concurrent readers.
+    Must be called while holding the EXCLUSIVE flock on the tracker's lock
+    file — an appender holding the shared lock could otherwise write into the
+    inode being replaced and lose its record. The atomic rename prevents
+    partial writes from being visible to concurrent readers.
 
     Never raises — errors are logged to stderr.
     """
@@ -208,6 +202,52 @@ def _lock_path_for(tracker_path: Path) -> Path:
     return tracker_path.with_suffix(".lock")
 
 
+def _append_record(tracker_path: Path, record: dict) -> None:
+    """Append one record to the tracker file as a single O_APPEND write.
+
+    Holds the lock file SHARED: concurrent appenders do not wait on each
+    other (each line is one write well under PIPE_BUF, so lines never
+    interleave), but compaction — which holds it exclusive — cannot swap the
+    file out from under an append. Raises on I/O errors; callers log them.
+    """
+    lock_path = _lock_path_for(tracker_path)
+    tracker_path.parent.mkdir(parents=True, exist_ok=True)
+    line = (json.dumps(record) + "\n").encode("utf-8")
+    with open(lock_path, "a", encoding="utf-8") as lock_fh:
+        os.chmod(lock_path, 0o600)
+        fcntl.flock(lock_fh, fcntl.LOCK_SH)
+        try:
+            fd = os.open(tracker_path, os.O_WRONLY | os.O_APPEND | os.O_CREAT, 0o600)
+            try:
+                os.write(fd, line)
+            finally:
+                os.close(fd)
+            os.chmod(tracker_path, 0o600)
+        finally:
+            fcntl.flock(lock_fh, fcntl.LOCK_UN)
+
+
+def _fold_records(records: list[dict]) -> list[dict]:
+    """Return the live start records: starts whose id has no stop record.
+
+    Order-independent, so a stop that lands before its start (the two hooks
+    race on a very short agent) still cancels it. Each live entry is returned
+    as a start record; the first start seen for an id wins.
+    """
+    stopped = {r.get("id") for r in records if r.get("op") == "stop"}
+    live: list[dict] = []
+    seen: set = set()
+    for record in records:
+        if record.get("op", "start") != "start":
+            continue
+        agent_id = record.get("id")
+        if agent_id in stopped or agent_id in seen:
+            continue
+        seen.add(agent_id)
+        live.append({**record, "op": "start"})
+    return live
+
+
 # ---------------------------------------------------------------------------
 # Subcommand: pretool
 # ---------------------------------------------------------------------------
@@ -216,7 +256,7 @@ def cmd_pretool(payload: dict) -> None:
     """PreToolUse(Agent): record the new agent in the tracker file.
 
     Reads tool_use_id and description from the hook payload and appends a
-    new entry to the session-scoped tracker file.
+    start record to the session-scoped tracker file.
 
     Fails open: any error is logged; the hook always exits 0.
     """
@@ -236,28 +276,18 @@ def cmd_pretool(payload: dict) -> None:
 
     now_iso = datetime.now(timezone.utc).strftime('%Y-%m-%dT%H:%M:%SZ')
     new_entry = {
+        "op": "start",
         "id": tool_use_id,
         "description": description,
         "started_at": now_iso,
     }
 
-    lock_path = _lock_path_for(tracker_path)
     try:
-        tracker_path.parent.mkdir(parents=True, exist_ok=True)
-        lock_path.parent.mkdir(parents=True, exist_ok=True)
-        with open(lock_path, "a", encoding="utf-8") as lock_fh:
-            os.chmod(lock_path, 0o600)
-            fcntl.flock(lock_fh, fcntl.LOCK_EX)
-            try:
-                existing = _read_entries(tracker_path)
-                existing.append(new_entry)
-                _write_entries_atomic(tracker_path, existing)
-                log_info(
-                    f"pretool: recorded agent id={tool_use_id!r} "
-                    f"description={description!r:.50} session={session_id}"
-                )
-            finally:
-                fcntl.flock(lock_fh, fcntl.LOCK_UN)
+        _append_record(tracker_path, new_entry)
+        log_info(
+            f"pretool: recorded agent id={tool_use_id!r} "
+            f"description={description!r:.50} session={session_id}"
+        )
     except Exception as exc:
         log_error(f"pretool: unexpected error for session={session_id}: {exc}")
 
@@ -267,13 +297,18 @@ def cmd_pretool(payload: dict) -> None:
 # ---------------------------------------------------------------------------
 
 def cmd_subagent_stop(payload: dict) -> None:
-    """SubagentStop: remove the stopped agent from the tracker file.
-
-    Reads tool_use_id from the hook payload and removes the matching entry
-    from the session-scoped tracker file.
-
-    Tolerates missing entry — a stop event may fire after a session restart
-    where the tracker file was already cleared. This is always exit 0.
+    """SubagentStop: mark the stopped agent as no longer running.
+
+    Reads tool_use_id from the hook payload and appends a stop tombstone for
+    it to the session-scoped tracker file. The matching start record stays
+    in place until user-prompt-submit compacts the file.
+
+    Tolerates a missing start record, and a missing tracker file: the stop
+    may fire after a session restart cleared the file, or before pretool has
+    appended the start (the two hooks race on a very short agent). The
+    tombstone is appended either way — in the race it cancels the start
+    when it lands; otherwise it is an orphan stop, dropped at the next
+    compaction. This is always exit 0.
     """
     session_id = get_session_id()
     tracker_path = get_tracker_path(session_id)
@@ -286,31 +321,14 @@ def cmd_subagent_stop(payload: dict) -> None:
         log_info("subagent-stop: no tool_use_id in payload — skipping")
         return
 
-    lock_path = _lock_path_for(tracker_path)
+    tombstone = {
+        "op": "stop",
+        "id": tool_use_id,
+        "stopped_at": datetime.now(timezone.utc).strftime('%Y-%m-%dT%H:%M:%SZ'),
+    }
     try:
-        tracker_path.parent.mkdir(parents=True, exist_ok=True)
-        lock_path.parent.mkdir(parents=True, exist_ok=True)
-        with open(lock_path, "a", encoding="utf-8") as lock_fh:
-            os.chmod(lock_path, 0o600)
-            fcntl.flock(lock_fh, fcntl.LOCK_EX)
-            try:
-                existing = _read_entries(tracker_path)
-                before_count = len(existing)
-                filtered = [e for e in existing if e.get("id") != tool_use_id]
-                after_count = len(filtered)
-                if before_count != after_count:
-                    _write_entries_atomic(tracker_path, filtered)
-                    log_info(
-                        f"subagent-stop: removed agent id={tool_use_id!r} session={session_id}"
-                    )
-                else:
-                    # Entry not found — tolerate gracefully (session restart, duplicate stop, etc.)
-                    log_info(
-                        f"subagent-stop: id={tool_use_id!r} not found in tracker "
-                        f"(already removed or session restart) — no-op"
-                    )
-            finally:
-                fcntl.flock(lock_fh, fcntl.LOCK_UN)
+        _append_record(tracker_path, tombstone)
+        log_info(f"subagent-stop: tombstoned agent id={tool_use_id!r} session={session_id}")
     except Exception as exc:
         log_error(f"subagent-stop: unexpected error for session={session_id}: {exc}")
 
@@ -392,9 +410,11 @@ def _truncate_description(description: str, max_len: int = 120) -> str:
 def cmd_user_prompt_submit(_payload: dict) -> None:
     """UserPromptSubmit: emit a warning if any non-recent agents are still running.
 
-    Reads the tracker file under lock, prunes stale entries (> 24h), and emits a
-    formatted warning to stdout if any active agents that are older than 5 minutes
-    remain. Entries younger than 5 minutes are expected in-flight and suppressed.
+    Reads the tracker file under the exclusive lock, folds it into the live
+    set, and compacts it to a snapshot of the live non-stale entries when a
+    stale entry (> 24h) needs pruning or dead records have reached
+    _COMPACT_DEAD_THRESHOLD. Emits a formatted warning to stdout if any
+    active agents that are older than 5 minutes remain. Entries younger than 5 minutes are expected in-flight and suppressed.
     The warning is injected into coordinator context by Claude Code.
 
     Empty output when no agents are running or all are recent (common path — no noise).
@@ -414,20 +434,23 @@ def cmd_user_prompt_submit(_payload: dict) -> None:
                 os.chmod(lock_path, 0o600)
                 fcntl.flock(lock_fh, fcntl.LOCK_EX)
                 try:
-                    entries = _read_entries(tracker_path)
-                    if not entries:
+                    records = _read_entries(tracker_path)
+                    if not records:
                         return
+                    entries = _fold_records(records)
+                    dead_count = len(records) - len(entries)
 
                     # Separate stale from non-stale entries
                     non_stale = [e for e in entries if not _is_stale(e)]
                     stale_count = len(entries) - len(non_stale)
 
-                    # Prune stale entries from the tracker file
-                    if stale_count:
+                    # Compact: prune stale entries and drop dead records
+                    if stale_count or dead_count >= _COMPACT_DEAD_THRESHOLD:
                         _write_entries_atomic(tracker_path, non_stale)
                         log_info(
-                            f"user-prompt-submit: pruned {stale_count} stale "
-                            f"entries for session={session_id}"
+                            f"user-prompt-submit: compacted tracker for session={session_id} "
+                            f"(pruned {stale_count} stale, dropped {dead_count} dead records, "
+                            f"{len(non_stale)} live)"
                         )
 
                     # Only warn about entries older than _INFLIGHT_THRESHOLD (5 min)
@@ -7,15 +7,19 @@ Tracks temporary vs permanent patterns for lifecycle cleanup.
 """
 
 import argparse
+import fcntl
 import fnmatch
+import hashlib
 import json
+import os
 import re
 import signal
 import subprocess
 import sys
 import time
+from contextlib import contextmanager
 from pathlib import Path
-from typing import List, Optional, Tuple
+from typing import Iterator, List, Optional, Tuple
 
 # ---------------------------------------------------------------------------
 # Pattern validation
@@ -107,6 +111,32 @@ def ensure_repo() -> None:
 # Settings file helpers
 # ---------------------------------------------------------------------------
 
+def _normalize_settings(data: dict) -> None:
+    """Ensure settings data has permissions.allow, in place."""
+    if "permissions" not in data:
+        data["permissions"] = {"allow": []}
+    elif "allow" not in data["permissions"]:
+        data["permissions"]["allow"] = []
+
+
+def _migrate_tracking(data: dict) -> None:
+    """Bring tracking data to the current shape, in place."""
+    data.setdefault("temporary", {})
+    data.setdefault("permanent", [])
+
+    # Migration 1: temporary was a flat array → now an object keyed by pattern
+    if isinstance(data.get("temporary"), list):
+        data["temporary"] = {}
+
+    # Migration 2: temporary values were session arrays → now session→timestamp objects
+    temp = data["temporary"]
+    if any(isinstance(v, list) for v in temp.values()):
+        now = int(time.time())
+        for pattern, value in temp.items():
+            if isinstance(value, list):
+                temp[pattern] = {session: now for session in value}
+
+
 def init_settings() -> None:
     """Initialize settings.local.json if absent or missing required keys."""
     ensure_repo()
@@ -117,14 +147,9 @@ def init_settings() -> None:
         return
 
     data = json.loads(_settings_file.read_text())
-
-    if "permissions" not in data:
-        data["permissions"] = {"allow": []}
-        _write_json(_settings_file, data)
-        return
-
-    if "allow" not in data["permissions"]:
-        data["permissions"]["allow"] = []
+    before = json.dumps(data)
+    _normalize_settings(data)
+    if json.dumps(data) != before:
         _write_json(_settings_file, data)
 
 
@@ -138,27 +163,15 @@ def init_tracking() -> None:
         return
 
     data = json.loads(_tracking_file.read_text())
-
-    # Migration 1: temporary was a flat array → now an object keyed by pattern
-    if isinstance(data.get("temporary"), list):
-        data["temporary"] = {}
-        _write_json(_tracking_file, data)
-
-    # Migration 2: temporary values were session arrays → now session→timestamp objects
-    temp = data.get("temporary", {})
-    needs_migration = any(isinstance(v, list) for v in temp.values())
-    if needs_migration:
-        now = int(time.time())
-        for pattern, value in temp.items():
-            if isinstance(value, list):
-                temp[pattern] = {session: now for session in value}
-        data["temporary"] = temp
+    before = json.dumps(data)
+    _migrate_tracking(data)
+    if json.dumps(data) != before:
         _write_json(_tracking_file, data)
 
 
 def _write_json(path: Path, data: object) -> None:
-    """Atomically write JSON to path via a .tmp file."""
-    tmp = Path(str(path) + ".tmp")
+    """Atomically write JSON to path via a per-process .tmp file."""
+    tmp = Path(f"{path}.{os.getpid()}.tmp")
     tmp.write_text(json.dumps(data, indent=2) + "\n")
     tmp.replace(path)
 
@@ -173,51 +186,285 @@ def _read_tracking() -> dict:
     return json.loads(_tracking_file.read_text())
 
 
-def pattern_in_settings(pattern: str) -> bool:
-    data = _read_settings()
-    return pattern in data.get("permissions", {}).get("allow", [])
+# ---------------------------------------------------------------------------
+# Transactions over settings.local.json + .perm-tracking.json
+# ---------------------------------------------------------------------------
+#
+# Every mutating subcommand (allow, always, cleanup, cleanup-stale, purge) runs as
+# one transaction: take an exclusive flock on the .claude/ directory, load both
+# files once (initializing and migrating in memory), apply every change to
+# the in-memory dicts, and on success write each file at most once,
+# atomically, and only if it changed. An exception inside the transaction
+# writes nothing.
+#
+# The per-pattern helpers used to re-read and rewrite .perm-tracking.json up
+# to three times (and settings.local.json once) for EACH pattern, so
+# cleanup-stale on SessionStart was O(patterns × file size) — and with no
+# lock, two sessions cleaning up at once could each rewrite the files from
+# a stale read and resurrect or drop each other's claims.
+
+@contextmanager
+def _transaction() -> Iterator[Tuple[dict, dict]]:
+    """Yield (settings, tracking) under the perm lock; persist them on success."""
+    ensure_repo()
+    assert _repo_root is not None and _settings_file is not None and _tracking_file is not None
 
+    # The lock is taken on the .claude/ directory itself: both files are
+    # replaced by rename, so a lock on either would be lost with its inode,
+    # and a directory lock leaves no extra file behind in the repository.
+    lock_fd = os.open(_repo_root / ".claude", os.O_RDONLY)
+    try:
+        fcntl.flock(lock_fd, fcntl.LOCK_EX)
+        settings = json.loads(_settings_file.read_text()) if _settings_file.exists() else None
+        tracking = json.loads(_tracking_file.read_text()) if _tracking_file.exists() else None
+        settings_before = json.dumps(settings)
+        tracking_before = json.dumps(tracking)
+        if settings is None:
+            settings = {"permissions": {"allow": []}}
+        if tracking is None:
+            tracking = {"temporary": {}, "permanent": []}
+        _normalize_settings(settings)
+        _migrate_tracking(tracking)
+
+        yield settings, tracking
+
+        if json.dumps(settings) != settings_before:
+            _write_json(_settings_file, settings)
+        if json.dumps(tracking) != tracking_before:
+            _write_json(_tracking_file, tracking)
+    finally:
+        os.close(lock_fd)  # releases the flock
+
+
+def add_to_settings(settings: dict, pattern: str) -> None:
+    """Add a pattern to permissions.allow (idempotent)."""
+    allow = settings["permissions"]["allow"]
+    if pattern not in allow:
+        allow.append(pattern)
+
+
+def add_to_temporary(tracking: dict, pattern: str, session: str, now: int) -> None:
+    """Add session claim with timestamp to the temporary pattern (idempotent, updates timestamp)."""
+    tracking["temporary"].setdefault(pattern, {})[session] = now
 
-def pattern_in_permanent(pattern: str) -> bool:
-    data = _read_tracking()
-    return pattern in data.get("permanent", [])
 
+def add_to_permanent(tracking: dict, pattern: str) -> None:
+    """Add a pattern to permanent tracking (idempotent)."""
+    if pattern not in tracking["permanent"]:
+        tracking["permanent"].append(pattern)
 
-def add_to_settings(pattern: str) -> None:
-    """Add a pattern to settings.local.json permissions.allow (idempotent)."""
-    if pattern_in_settings(pattern):
-        return
-    data = _read_settings()
-    data["permissions"]["allow"].append(pattern)
-    _write_json(_settings_file, data)
 
+def drop_unclaimed(settings: dict, tracking: dict, patterns: List[str]) -> int:
+    """Remove each pattern with no remaining temporary claims from both files.
 
-def add_to_temporary(pattern: str, session: str) -> None:
-    """Add session claim with timestamp to the temporary pattern (idempotent, updates timestamp)."""
-    data = _read_tracking()
-    now = int(time.time())
-    temp = data.setdefault("temporary", {})
-    if pattern in temp:
-        temp[pattern][session] = now
-    else:
-        temp[pattern] = {session: now}
-    _write_json(_tracking_file, data)
+    Returns how many patterns were removed. One pass over permissions.allow
+    regardless of how many patterns are dropped.
+    """
+    temp = tracking["temporary"]
+    dropped = {p for p in patterns if p in temp and not temp[p]}
+    for pattern in dropped:
+        del temp[pattern]
+    if dropped:
+        allow = settings["permissions"]["allow"]
+        settings["permissions"]["allow"] = [p for p in allow if p not in dropped]
+    return len(dropped)
 
 
-def add_to_permanent(pattern: str) -> None:
-    """Add a pattern to permanent tracking (idempotent)."""
-    if pattern_in_permanent(pattern):
-        return
-    data = _read_tracking()
-    data.setdefault("permanent", []).append(pattern)
-    _write_json(_tracking_file, data)
+# ---------------------------------------------------------------------------
+# Compiled allow-list matcher for cmd_hook
+# ---------------------------------------------------------------------------
+#
+# cmd_hook runs on every PermissionRequest. Done naively that is a
+# `git rev-parse`, a json parse of settings.local.json, and a linear walk of
+# permissions.allow calling fnmatch per pattern — and the allow list only
+# grows as `perm always` grants accumulate. Instead the list is compiled
+# once into a per-tool matcher:
+#
+#   {"Bash": {"any": false,
+#             "literals": ["npm test", ...],      # patterns with no glob chars
+#             "regex": "(?s:git\\ .*)\\Z|..."}}   # every glob, one alternation
+#
+# and cached on disk per payload cwd, together with the resolved root:
+#
+#   ~/.claude/cache/perm-hook/<sha256(cwd)[:16]>.json
+#   {"version", "cwd", "root", "fallback", "settings_stat": [mtime_ns, size, ino], "tools"}
+#
+# A hit costs a small json read, an ancestor walk for `.git`, one stat of
+# the settings file, and then a set lookup plus at most one regex match.
+# The cache is an optimization, never an input: a missing, corrupt or stale
+# file (settings stat changed, or the cwd's enclosing repository is no
+# longer the cached root) is rebuilt from scratch, and any cache I/O error
+# just falls through to the uncached path.
+
+_MATCHER_CACHE_VERSION = 1
+_MATCHER_CACHE_DIR_ENV = "PERM_HOOK_CACHE_DIR"
+_GLOB_CHARS = re.compile(r"[*?\[]")
+
+
+def _matcher_cache_dir() -> Path:
+    override = os.environ.get(_MATCHER_CACHE_DIR_ENV)
+    return Path(override) if override else Path.home() / ".claude" / "cache" / "perm-hook"
+
+
+def _split_allow_pattern(pattern: str) -> Tuple[str, Optional[str]]:
+    """Split an allow entry into (tool, content glob); content is None for a bare tool."""
+    if "(" not in pattern:
+        return pattern, None
+    tool = pattern[:pattern.index("(")]
+    content = pattern[pattern.index("(") + 1:]
+    if content.endswith(")"):
+        content = content[:-1]
+    return tool, content
+
+
+def compile_allow_patterns(allow_patterns: List[str]) -> dict:
+    """Compile permissions.allow into the per-tool matcher described above.
+
+    Matches exactly what the per-pattern fnmatch.fnmatch loop matched: a
+    bare tool name allows any input, a content without glob characters is
+    compared for equality, and globs go through fnmatch.translate.
+    """
+    tools: dict = {}
+    globs: dict = {}
+    for pattern in allow_patterns:
+        if not pattern or not isinstance(pattern, str):
+            continue
+        tool, content = _split_allow_pattern(pattern)
+        entry = tools.setdefault(tool, {"any": False, "literals": [], "regex": None})
+        if content is None:
+            entry["any"] = True
+        elif _GLOB_CHARS.search(content):
+            globs.setdefault(tool, []).append(fnmatch.translate(content))
+        else:
+            entry["literals"].append(content)
+    for tool, translated in globs.items():
+        tools[tool]["regex"] = "|".join(translated)
+    return tools
 
 
-def remove_from_settings(pattern: str) -> None:
-    """Remove a pattern from settings.local.json permissions.allow."""
-    data = _read_settings()
-    data["permissions"]["allow"] = [p for p in data["permissions"].get("allow", []) if p != pattern]
-    _write_json(_settings_file, data)
+def matcher_allows(tools: dict, tool_name: str, content: str) -> bool:
+    """True when the compiled matcher allows content for tool_name."""
+    entry = tools.get(tool_name)
+    if not entry:
+        return False
+    if entry.get("any") or content in set(entry.get("literals", ())):
+        return True
+    regex = entry.get("regex")
+    return bool(regex) and re.match(regex, content) is not None
+
+
+def _settings_stat(settings_file: Path) -> Optional[List[int]]:
+    try:
+        st = settings_file.stat()
+    except OSError:
+        return None
+    return [st.st_mtime_ns, st.st_size, st.st_ino]
+
+
+def _cached_root_still_valid(cwd: str, root: str, fallback: bool) -> bool:
+    """Re-check a cached _resolve_root() answer without running git.
+
+    The nearest ancestor of cwd (inclusive) holding a `.git` entry must
+    still be the cached root — or, for a cached cwd fallback, there must
+    still be none. GIT_DIR / GIT_WORK_TREE change git's discovery in ways
+    this walk cannot mirror, so they always force a real resolution.
+    """
+    if os.environ.get("GIT_DIR") or os.environ.get("GIT_WORK_TREE"):
+        return False
+    cwd_path = Path(cwd)
+    for directory in (cwd_path, *cwd_path.parents):
+        if (directory / ".git").exists():
+            return not fallback and str(directory) == root
+    return fallback
+
+
+def _cache_path_for(cwd: str) -> Path:
+    return _matcher_cache_dir() / f"{hashlib.sha256(cwd.encode('utf-8')).hexdigest()[:16]}.json"
+
+
+def _read_matcher_cache(cwd: str) -> Optional[dict]:
+    """Return the cached matcher for cwd if it is still current, else None."""
+    try:
+        data = json.loads(_cache_path_for(cwd).read_text())
+    except (OSError, ValueError):
+        return None
+    if not isinstance(data, dict) or data.get("version") != _MATCHER_CACHE_VERSION or data.get("cwd") != cwd:
+        return None
+    root = data.get("root")
+    if not isinstance(root, str) or not _cached_root_still_valid(cwd, root, bool(data.get("fallback"))):
+        return None
+    if data.get("settings_stat") != _settings_stat(Path(root) / ".claude" / "settings.local.json"):
+        return None
+    return data if isinstance(data.get("tools"), dict) else None
+
+
+def _write_matcher_cache(data: dict) -> None:
+    """Best-effort atomic write of a matcher cache entry."""
+    try:
+        path = _cache_path_for(data["cwd"])
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = path.with_name(f".{path.name}.{os.getpid()}.tmp")
+        tmp.write_text(json.dumps(data))
+        tmp.replace(path)
+    except OSError:
+        pass
+
+
+def _log_hook_error(message: str) -> None:
+    """Append to ~/.claude/metrics/perm-hook-errors.log. Never raises."""
+    try:
+        log_path = Path.home() / ".claude" / "metrics" / "perm-hook-errors.log"
+        log_path.parent.mkdir(parents=True, exist_ok=True)
+        with open(log_path, "a") as f:
+            f.write(f"{message}\n")
+    except Exception:
+        pass
+
+
+def load_allow_matcher(cwd: str) -> Optional[dict]:
+    """Return the compiled per-tool matcher for the settings governing cwd.
+
+    None when there is no settings file or it cannot be parsed (cmd_hook
+    fails open on both). Served from the disk cache when current.
+    """
+    cached = _read_matcher_cache(cwd)
+    if cached is not None:
+        return cached["tools"]
+
+    # Resolve the settings root the same way ensure_repo() does — git root,
+    # or the payload's cwd when there is no git repository — so this hook
+    # and the file `perm allow`/`perm always` actually write to never
+    # diverge. (Previously this resolved independently and bailed silently
+    # whenever the payload's cwd had no git repository, even after `perm
+    # allow` started succeeding there via ensure_repo()'s own fallback.)
+    repo_root, fallback = _resolve_root(cwd)
+    settings_file = repo_root / ".claude" / "settings.local.json"
+
+    stat_before = _settings_stat(settings_file)
+    if stat_before is None:
+        return None
+
+    try:
+        settings_data = json.loads(settings_file.read_text())
+        allow_patterns = settings_data.get("permissions", {}).get("allow", [])
+    except (json.JSONDecodeError, OSError) as e:
+        # Log silently; don't block the permission request (fail open)
+        _log_hook_error(f"[perm-hook parse error] {e}")
+        return None
+
+    tools = compile_allow_patterns(allow_patterns or [])
+    # Only cache what was compiled from a file that did not change underneath
+    # the read; otherwise the next call simply compiles again.
+    if _settings_stat(settings_file) == stat_before:
+        _write_matcher_cache({
+            "version": _MATCHER_CACHE_VERSION,
+            "cwd": cwd,
+            "root": str(repo_root),
+            "fallback": fallback,
+            "settings_stat": stat_before,
+            "tools": tools,
+        })
+    return tools
 
 
 # ---------------------------------------------------------------------------
@@ -240,13 +487,14 @@ def cmd_allow(session: str, patterns: List[str], verbose: bool) -> None:
             print(f"Error: invalid pattern {pattern!r} — expected 'Tool' or 'Tool(glob)'", file=sys.stderr)
             sys.exit(1)
 
-    init_settings()
-    init_tracking()
+    now = int(time.time())
+    with _transaction() as (settings, tracking):
+        for pattern in patterns:
+            add_to_settings(settings, pattern)
+            add_to_temporary(tracking, pattern, session, now)
 
-    for pattern in patterns:
-        add_to_settings(pattern)
-        add_to_temporary(pattern, session)
-        if verbose:
+    if verbose:
+        for pattern in patterns:
             print(f"Allowed (temporary): {pattern}")
 
 
@@ -261,13 +509,13 @@ def cmd_always(patterns: List[str], verbose: bool) -> None:
             print(f"Error: invalid pattern {pattern!r} — expected 'Tool' or 'Tool(glob)'", file=sys.stderr)
             sys.exit(1)
 
-    init_settings()
-    init_tracking()
+    with _transaction() as (settings, tracking):
+        for pattern in patterns:
+            add_to_settings(settings, pattern)
+            add_to_permanent(tracking, pattern)
 
-    for pattern in patterns:
-        add_to_settings(pattern)
-        add_to_permanent(pattern)
-        if verbose:
+    if verbose:
+        for pattern in patterns:
             print(f"Allowed (permanent): {pattern}")
 
 
@@ -318,45 +566,25 @@ def cmd_cleanup(session: str, verbose: bool) -> None:
         print("Usage: perm --session <id> cleanup", file=sys.stderr)
         sys.exit(1)
 
-    init_settings()
-    init_tracking()
+    with _transaction() as (settings, tracking):
+        temp = tracking["temporary"]
+        had_temporary = bool(temp)
 
-    data = _read_tracking()
-    temp = data.get("temporary", {})
+        # Find patterns that have a claim from this session, release them,
+        # and drop the ones no other session still holds.
+        owned_patterns = [p for p, claims in temp.items() if session in claims]
+        for pattern in owned_patterns:
+            del temp[pattern][session]
+        removed_count = drop_unclaimed(settings, tracking, owned_patterns)
 
-    if not temp:
+    if not had_temporary:
         _report_nothing_to_clean(session, verbose, "No temporary permissions to clean up.")
         return
 
-    # Find patterns that have a claim from this session
-    owned_patterns = [p for p, claims in temp.items() if session in claims]
-
     if not owned_patterns:
         _report_nothing_to_clean(session, verbose, f"No temporary permissions owned by session '{session}'.")
         return
 
-    removed_count = 0
-
-    for pattern in owned_patterns:
-        # Remove this session's claim
-        data = _read_tracking()
-        temp = data.get("temporary", {})
-        if pattern in temp and session in temp[pattern]:
-            del temp[pattern][session]
-            data["temporary"] = temp
-            _write_json(_tracking_file, data)
-
-        # If no claims remain, remove from both files
-        data = _read_tracking()
-        remaining = len(data.get("temporary", {}).get(pattern, {}))
-        if remaining == 0:
-            remove_from_settings(pattern)
-            data = _read_tracking()
-            if pattern in data.get("temporary", {}):
-                del data["temporary"][pattern]
-            _write_json(_tracking_file, data)
-            removed_count += 1
-
     total_owned = len(owned_patterns)
 
     if verbose:
@@ -385,52 +613,24 @@ def cmd_cleanup_stale(max_age_hours: int) -> None:
     if not tracking_file.exists():
         return
 
-    try:
-        init_settings()
-        init_tracking()
-    except Exception as e:
-        print(f"Warning: perm cleanup-stale failed to initialize: {e}", file=sys.stderr)
-        return
-
-    data = _read_tracking()
-    temp = data.get("temporary", {})
-
-    if not temp:
-        return
-
-    now = int(time.time())
-    max_age_seconds = max_age_hours * 3600
-    cutoff = now - max_age_seconds
+    cutoff = int(time.time()) - max_age_hours * 3600
 
-    # Find patterns that have at least one stale claim
-    stale_patterns = [
-        p for p, claims in temp.items()
-        if any(ts < cutoff for ts in claims.values())
-    ]
-
-    if not stale_patterns:
+    try:
+        with _transaction() as (settings, tracking):
+            temp = tracking["temporary"]
+
+            # Expire stale claims, then drop patterns nobody holds any more.
+            stale_patterns = []
+            for pattern, claims in temp.items():
+                fresh = {s: ts for s, ts in claims.items() if ts >= cutoff}
+                if len(fresh) != len(claims):
+                    temp[pattern] = fresh
+                    stale_patterns.append(pattern)
+            stale_count = drop_unclaimed(settings, tracking, stale_patterns)
+    except (OSError, ValueError) as e:
+        print(f"Warning: perm cleanup-stale failed: {e}", file=sys.stderr)
         return
 
-    stale_count = 0
-
-    for pattern in stale_patterns:
-        # Remove stale claims from this pattern
-        data = _read_tracking()
-        temp_entry = data.get("temporary", {}).get(pattern, {})
-        data["temporary"][pattern] = {s: ts for s, ts in temp_entry.items() if ts >= cutoff}
-        _write_json(_tracking_file, data)
-
-        # If no claims remain, remove from both files
-        data = _read_tracking()
-        remaining = len(data.get("temporary", {}).get(pattern, {}))
-        if remaining == 0:
-            remove_from_settings(pattern)
-            data = _read_tracking()
-            if pattern in data.get("temporary", {}):
-                del data["temporary"][pattern]
-            _write_json(_tracking_file, data)
-            stale_count += 1
-
     if stale_count > 0:
         print(f"Cleaned up {stale_count} stale temporary permission(s) (older than {max_age_hours}h).")
 
@@ -485,64 +685,14 @@ def cmd_hook() -> None:
     else:
         content = json.dumps(tool_input)
 
-    # Resolve the settings root the same way ensure_repo() does — git root,
-    # or the payload's cwd when there is no git repository — so this hook
-    # and the file `perm allow`/`perm always` actually write to never
-    # diverge. (Previously this resolved independently and bailed silently
-    # whenever the payload's cwd had no git repository, even after `perm
-    # allow` started succeeding there via ensure_repo()'s own fallback.)
-    repo_root, _ = _resolve_root(cwd)
-    settings_file = repo_root / ".claude" / "settings.local.json"
-
-    if not settings_file.exists():
-        sys.exit(0)
-
-    try:
-        settings_data = json.loads(settings_file.read_text())
-        allow_patterns = settings_data.get("permissions", {}).get("allow", [])
-    except (json.JSONDecodeError, OSError) as e:
-        # Log silently; don't block the permission request (fail open)
-        try:
-            log_path = Path.home() / ".claude" / "metrics" / "perm-hook-errors.log"
-            log_path.parent.mkdir(parents=True, exist_ok=True)
-            with open(log_path, "a") as f:
-                f.write(f"[perm-hook parse error] {e}\n")
-        except Exception:
-            pass
+    tools = load_allow_matcher(cwd)
+    if not tools:
         sys.exit(0)
 
-    if not allow_patterns:
+    if matcher_allows(tools, tool_name, content):
+        print('{"hookSpecificOutput":{"hookEventName":"PermissionRequest","decision":{"behavior":"allow"}}}', end="")
         sys.exit(0)
 
-    for pattern in allow_patterns:
-        if not pattern:
-            continue
-
-        if "(" in pattern:
-            # Format: Tool(content_glob)
-            pattern_tool = pattern[:pattern.index("(")]
-            pattern_content = pattern[pattern.index("(") + 1:]
-            if pattern_content.endswith(")"):
-                pattern_content = pattern_content[:-1]
-            has_content = True
-        else:
-            # Bare tool name — matches any input for that tool
-            pattern_tool = pattern
-            pattern_content = ""
-            has_content = False
-
-        if pattern_tool != tool_name:
-            continue
-
-        if not has_content:
-            print('{"hookSpecificOutput":{"hookEventName":"PermissionRequest","decision":{"behavior":"allow"}}}', end="")
-            sys.exit(0)
-
-        # Glob match content against pattern
-        if fnmatch.fnmatch(content, pattern_content):
-            print('{"hookSpecificOutput":{"hookEventName":"PermissionRequest","decision":{"behavior":"allow"}}}', end="")
-            sys.exit(0)
-
     # No pattern matched — fail open (empty stdout)
     sys.exit(0)
 
@@ -573,8 +723,9 @@ def cmd_purge() -> None:
         print("Aborted. No changes made.")
         return
 
-    data["permissions"]["allow"] = []
-    _write_json(_settings_file, data)
+    with _transaction() as (settings, _tracking):
+        current_count = len(settings["permissions"]["allow"])
+        settings["permissions"]["allow"] = []
     print(f"Purged: removed {current_count} permission(s) from permissions.allow.")
 
 
@@ -0,0 +1,316 @@
+#!/usr/bin/env python3
+"""
+posttool-dispatch-hook: single PostToolUse(Bash) entry point that runs only
+the hooks whose declared trigger matches the tool call.
+
+claude-kanban-transition-hook, kanban-done-reminder-hook and
+crew-lifecycle-hook each used to be registered directly on PostToolUse(Bash),
+so every Bash call paid three Python start-ups just for each hook to
+regex-match the command and exit silently — the outcome for the vast
+majority of calls. Now each hook declares its trigger in a manifest
+(generated from modules/claude/default.nix), this dispatcher evaluates every
+predicate in one process, and only matching hooks are exec'd.
+
+Manifest format (JSON list, one object per hook):
+    {"name": "kanban-done-reminder-hook",
+     "command": ["/nix/store/.../bin/kanban-done-reminder-hook"],
+     "tool": "Bash",                          # optional: str or list of str
+     "pattern": "^\\\\s*kanban\\\\s+done\\\\s",  # optional: re.search over tool_input.command
+     "timeout": 30}                           # optional: seconds, default 30
+
+A hook with neither "tool" nor "pattern" matches every call. Predicates are a
+cheap pre-filter, not a replacement for the hook's own check: each hook still
+validates the command itself, so a predicate only has to be a superset of what
+the hook acts on.
+
+Output: matched hooks' stdout JSON objects are merged (additionalContext
+strings joined with a blank line, first value wins for other keys); stderr is
+passed through. Exit status is 2 if any hook exited 2 (blocking feedback),
+otherwise the first non-zero status, otherwise 0.
+
+Counters: ~/.claude/metrics/posttool-dispatch-counts.json keeps per-hook
+matched/skipped totals so the pre-filter's hit rate is observable.
+
+Fails open: a missing or corrupt manifest runs nothing and exits 0; a
+predicate whose regex does not compile counts as a match (the hook filters
+for itself).
+"""
+
+import argparse
+import fcntl
+import json
+import os
+import re
+import subprocess
+import sys
+from datetime import datetime, timezone
+from pathlib import Path
+
+
+def show_help() -> None:
+    print("posttool-dispatch-hook - PostToolUse dispatcher that runs only hooks whose trigger matches")
+    print()
+    print("DESCRIPTION:")
+    print("  Internal hook script called automatically by Claude Code.")
+    print("  Should not be invoked manually by users.")
+    print()
+    print("USAGE:")
+    print("  posttool-dispatch-hook --manifest PATH < payload.json")
+    print()
+    print("PURPOSE:")
+    print("  Evaluates every hook's trigger predicate (tool name and/or a regex")
+    print("  over tool_input.command) in one process and execs only the hooks")
+    print("  that match, instead of starting every hook on every Bash call.")
+    print()
+    print("OUTPUT:")
+    print("  Merged hookSpecificOutput of the matched hooks; silent when none match.")
+    print()
+    print("COUNTERS:")
+    print("  ~/.claude/metrics/posttool-dispatch-counts.json — matched/skipped per hook.")
+    print()
+    print("CONFIGURATION:")
+    print("  Configured in modules/claude/default.nix as the PostToolUse(Bash) hook;")
+    print("  the trigger manifest is generated there too (postToolBashTriggers).")
+
+
+# ---------------------------------------------------------------------------
+# Constants
+# ---------------------------------------------------------------------------
+
+_DEFAULT_TIMEOUT = 30  # seconds per matched hook
+_COUNTS_PATH = Path.home() / ".claude" / "metrics" / "posttool-dispatch-counts.json"
+_COUNTS_VERSION = 1
+
+
+# ---------------------------------------------------------------------------
+# Manifest and predicates
+# ---------------------------------------------------------------------------
+
+def load_manifest(path: str) -> list[dict]:
+    """Return the manifest's well-formed entries; [] when it cannot be read.
+
+    An entry needs a name and a non-empty command list. Malformed entries
+    are dropped individually (and reported on stderr) so one typo does not
+    silence every other hook.
+    """
+    try:
+        with open(path, encoding="utf-8") as fh:
+            entries = json.load(fh)
+    except (OSError, ValueError) as exc:
+        print(f"[posttool-dispatch-hook] cannot read manifest {path}: {exc}", file=sys.stderr)
+        return []
+    if not isinstance(entries, list):
+        print(f"[posttool-dispatch-hook] manifest {path} is not a list", file=sys.stderr)
+        return []
+
+    valid = []
+    for entry in entries:
+        if not isinstance(entry, dict):
+            entry = {"entry": entry}
+        command = entry.get("command")
+        if (
+            isinstance(entry.get("name"), str)
+            and isinstance(command, list) and command
+            and all(isinstance(part, str) for part in command)
+        ):
+            valid.append(entry)
+        else:
+            print(f"[posttool-dispatch-hook] skipping malformed manifest entry: {entry!r:.200}", file=sys.stderr)
+    return valid
+
+
+def trigger_matches(entry: dict, tool_name: str, command: str) -> bool:
+    """True when the call satisfies every predicate the entry declares."""
+    tools = entry.get("tool")
+    if isinstance(tools, str):
+        tools = [tools]
+    if tools and tool_name not in tools:
+        return False
+
+    pattern = entry.get("pattern")
+    if not pattern:
+        return True
+    try:
+        return re.search(pattern, command) is not None
+    except (re.error, TypeError):
+        # Fail open: let the hook apply its own filter rather than silently
+        # disabling it because its pre-filter is broken.
+        return True
+
+
+# ---------------------------------------------------------------------------
+# Running matched hooks
+# ---------------------------------------------------------------------------
+
+def run_hook(entry: dict, raw: str) -> "tuple[int, str, str]":
+    """Exec one hook with the original payload on stdin.
+
+    Returns (exit status, stdout, stderr). A hook that cannot be started or
+    times out is reported on stderr and treated as a non-blocking failure.
+    """
+    name = entry["name"]
+    timeout = entry.get("timeout") or _DEFAULT_TIMEOUT
+    try:
+        proc = subprocess.run(
+            entry["command"],
+            input=raw,
+            capture_output=True,
+            text=True,
+            timeout=timeout,
+        )
+    except subprocess.TimeoutExpired:
+        return 1, "", f"[posttool-dispatch-hook] {name} timed out after {timeout}s\n"
+    except OSError as exc:
+        return 1, "", f"[posttool-dispatch-hook] cannot run {name}: {exc}\n"
+    return proc.returncode, proc.stdout, proc.stderr
+
+
+def merge_outputs(outputs: list[str]) -> str:
+    """Combine the stdout of several hooks into what one hook would print.
+
+    Claude Code parses a hook's stdout as a single JSON object, so matched
+    hooks' objects are merged: additionalContext strings are concatenated,
+    any other key keeps the first value seen. A lone output is passed through
+    verbatim; non-JSON output is appended as plain lines after the merged
+    object.
+    """
+    outputs = [out for out in outputs if out.strip()]
+    if len(outputs) <= 1:
+        return outputs[0] if outputs else ""
+
+    merged: dict = {}
+    contexts: list[str] = []
+    plain: list[str] = []
+    for out in outputs:
+        try:
+            obj = json.loads(out)
+        except ValueError:
+            obj = None
+        if not isinstance(obj, dict):
+            plain.append(out.rstrip("\n"))
+            continue
+        for key, value in obj.items():
+            if key == "hookSpecificOutput" and isinstance(value, dict):
+                specific = merged.setdefault("hookSpecificOutput", {})
+                for sub_key, sub_value in value.items():
+                    if sub_key == "additionalContext":
+                        contexts.append(str(sub_value))
+                    else:
+                        specific.setdefault(sub_key, sub_value)
+            else:
+                merged.setdefault(key, value)
+    if contexts:
+        merged.setdefault("hookSpecificOutput", {})["additionalContext"] = "\n\n".join(contexts)
+
+    lines = [json.dumps(merged)] if merged else []
+    return "\n".join(lines + plain) + "\n"
+
+
+# ---------------------------------------------------------------------------
+# Counters
+# ---------------------------------------------------------------------------
+
+def record_counts(entries: list[dict], matched: set[str]) -> None:
+    """Add this invocation to the matched/skipped totals. Never raises.
+
+    Read-modify-write under an exclusive flock on a sibling .lock file (the
+    same scheme orphan-agent-tracker-hook uses); the JSON itself is replaced
+    atomically so a reader never sees a torn file.
+    """
+    counts_path = _COUNTS_PATH
+    try:
+        counts_path.parent.mkdir(parents=True, exist_ok=True)
+        lock_path = counts_path.with_name(counts_path.name + ".lock")
+        with open(lock_path, "a", encoding="utf-8") as lock_fh:
+            fcntl.flock(lock_fh, fcntl.LOCK_EX)
+            try:
+                try:
+                    data = json.loads(counts_path.read_text(encoding="utf-8"))
+                except (OSError, ValueError):
+                    data = None
+                if not isinstance(data, dict) or data.get("version") != _COUNTS_VERSION:
+                    data = {"version": _COUNTS_VERSION, "invocations": 0, "dispatched": 0, "hooks": {}}
+
+                data["invocations"] += 1
+                if matched:
+                    data["dispatched"] += 1
+                for entry in entries:
+                    name = entry["name"]
+                    hook = data["hooks"].setdefault(name, {"matched": 0, "skipped": 0})
+                    hook["matched" if name in matched else "skipped"] += 1
+                data["updated"] = datetime.now(timezone.utc).strftime('%Y-%m-%dT%H:%M:%SZ')
+
+                tmp = counts_path.with_name(f".{counts_path.name}.{os.getpid()}.tmp")
+                tmp.write_text(json.dumps(data, indent=2) + "\n", encoding="utf-8")
+                os.replace(tmp, counts_path)
+            finally:
+                fcntl.flock(lock_fh, fcntl.LOCK_UN)
+    except Exception as exc:
+        print(f"[posttool-dispatch-hook] cannot update counters: {exc}", file=sys.stderr)
+
+
+# ---------------------------------------------------------------------------
+# Main
+# ---------------------------------------------------------------------------
+
+def dispatch(raw: str, entries: list[dict]) -> int:
+    """Run the matching hooks for one payload; return the exit status."""
+    try:
+        payload = json.loads(raw)
+    except ValueError:
+        return 0
+    if not isinstance(payload, dict):
+        return 0
+
+    tool_name = payload.get("tool_name") or ""
+    tool_input = payload.get("tool_input")
+    command = tool_input.get("command", "") if isinstance(tool_input, dict) else ""
+    if not isinstance(command, str):
+        command = ""
+
+    matched = [entry for entry in entries if trigger_matches(entry, tool_name, command)]
+    record_counts(entries, {entry["name"] for entry in matched})
+
+    status = 0
+    outputs = []
+    for entry in matched:
+        code, out, err = run_hook(entry, raw)
+        outputs.append(out)
+        if err:
+            sys.stderr.write(err)
+        if code == 2:
+            status = 2
+        elif code and not status:
+            status = code
+
+    merged = merge_outputs(outputs)
+    if merged:
+        sys.stdout.write(merged)
+    return status
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(add_help=False)
+    parser.add_argument("-h", "--help", action="store_true")
+    parser.add_argument("--manifest")
+    args, _ = parser.parse_known_args()
+    if args.help:
+        show_help()
+        sys.exit(0)
+
+    raw = sys.stdin.read()
+    if not raw.strip() or not args.manifest:
+        sys.exit(0)
+
+    sys.exit(dispatch(raw, load_manifest(args.manifest)))
+
+
+if __name__ == "__main__":
+    try:
+        main()
+    except Exception as exc:
+        print(
+            f"[posttool-dispatch-hook] unhandled exception: {type(exc).__name__}: {exc}",
+            file=sys.stderr,
+        )
+        sys.exit(0)  # Fail open — never break PostToolUse for every Bash call
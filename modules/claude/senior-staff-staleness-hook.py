@@ -1,13 +1,22 @@
 #!/usr/bin/env python3
 """
-senior-staff-staleness-hook: PreToolUse(Bash) hook that polls Senior Staff
-session windows when the last poll is stale.
+senior-staff-staleness-hook: PreToolUse(Bash) hook that surfaces new output
+from Senior Staff session windows.
 
 Triggered by Claude Code's PreToolUse event when tool_name == 'Bash'.
 Reads a roster of active Senior Staff tmux session windows from
-.scratchpad/senior-staff-roster.json and, when the last poll is >60 seconds
-old, captures recent output from each session's Claude pane via `crew read`
-and prints a summary for model visibility.
+.scratchpad/senior-staff-roster.json. The hook itself never talks to tmux:
+polling happens in a detached background refresher (this same script run
+with --refresh) that captures recent output from each session's Claude pane
+via `crew read` and writes a digest with a content hash per session. On
+every Bash call the hook reads that digest and prints only the sessions
+whose content changed since it last printed them.
+
+The old design forked `crew read` serially for every roster session inside
+the hook whenever the last poll was >60s old, each with a 10s timeout — a
+coordinator Bash call could block for N×10 seconds behind a wedged pane.
+Now the hook's cost is two small file reads regardless of roster size, and
+a slow or hung pane only delays the digest, never the coordinator.
 
 Fails open: any error results in silent exit 0.
 
@@ -19,22 +28,36 @@ ROSTER FORMAT:
   ]}
 
 CLAUDE PANE DISCOVERY:
-  For each session, the hook scans the 'panes' map for the first pane whose
-  description contains 'claude' (case-insensitive) and polls that pane via
-  crew read. If no match is found (or no panes field exists), falls back to
-  pane 0.
+  For each session, the refresher scans the 'panes' map for the first pane
+  whose description contains 'claude' (case-insensitive) and polls that
+  pane via crew read. If no match is found (or no panes field exists),
+  falls back to pane 0.
 
 STALENESS GATE:
-  Reads unix epoch from .scratchpad/senior-staff-last-poll.
-  If missing or >60s old: polls all sessions, prints summary, updates timestamp.
-  If <60s old: no-op (silent).
+  Reads unix epoch from .scratchpad/senior-staff-last-poll (the time the
+  last refresher was launched). If missing or >60s old, launches a detached
+  refresher and updates the timestamp; otherwise launches nothing. A
+  refresher that finds another one still running (flock on
+  .scratchpad/senior-staff-poll.lock) exits immediately.
+
+DIGEST:
+  .scratchpad/senior-staff-digest.json (written atomically by the refresher):
+  {"version":1,"refreshed_at":<epoch>,"sessions":[
+    {"pane_ref":"pricing.0","workstream":"...","ok":true,
+     "text":"<crew read output or error note>","hash":"<sha256 of text>"}
+  ]}
+  .scratchpad/senior-staff-digest-seen.json maps pane_ref -> hash of what
+  the hook last printed, so unchanged sessions stay silent.
 
 CONFIGURATION:
   Configured in modules/claude/default.nix as PreToolUse(Bash) hook.
 """
 
 import argparse
+import fcntl
+import hashlib
 import json
+import os
 import subprocess
 import sys
 import time
@@ -43,24 +66,36 @@ from pathlib import Path
 
 ROSTER_FILE = Path(".scratchpad/senior-staff-roster.json")
 TIMESTAMP_FILE = Path(".scratchpad/senior-staff-last-poll")
+DIGEST_FILE = Path(".scratchpad/senior-staff-digest.json")
+SEEN_FILE = Path(".scratchpad/senior-staff-digest-seen.json")
+LOCK_FILE = Path(".scratchpad/senior-staff-poll.lock")
 STALENESS_SECONDS = 60
+CREW_READ_TIMEOUT = 10  # seconds per session, paid only by the refresher
+DIGEST_VERSION = 1
 
 
 def show_help() -> None:
-    print("senior-staff-staleness-hook - PreToolUse hook that polls Senior Staff session windows")
+    print("senior-staff-staleness-hook - PreToolUse hook that surfaces new Senior Staff session output")
     print()
     print("DESCRIPTION:")
     print("  Internal hook script called automatically by Claude Code before Bash tool use.")
     print("  Should not be invoked manually by users.")
     print()
+    print("USAGE:")
+    print("  senior-staff-staleness-hook < payload.json   # hook mode (reads the digest)")
+    print("  senior-staff-staleness-hook --refresh        # refresher (polls sessions, writes the digest)")
+    print()
     print("PURPOSE:")
-    print("  Automatically refreshes Senior Staff session awareness by polling recent")
-    print("  output from each registered session window when the last poll is >60s stale.")
+    print("  Keeps Senior Staff session awareness fresh without blocking Bash calls:")
+    print("  a detached refresher polls each registered session window via crew read")
+    print("  and writes a hashed digest; the hook prints only sessions whose output")
+    print("  changed since it last printed them.")
     print()
     print("TRIGGER:")
     print("  PreToolUse(Bash) — fires before every Bash tool call.")
-    print("  Only actually polls when .scratchpad/senior-staff-roster.json exists AND")
-    print("  .scratchpad/senior-staff-last-poll is missing or >60 seconds old.")
+    print("  Does nothing unless .scratchpad/senior-staff-roster.json exists.")
+    print("  Launches a background refresher when .scratchpad/senior-staff-last-poll")
+    print("  is missing or >60 seconds old.")
     print()
     print("ROSTER FORMAT:")
     print("  .scratchpad/senior-staff-roster.json:")
@@ -70,15 +105,16 @@ def show_help() -> None:
     print('  ]}')
     print()
     print("CLAUDE PANE DISCOVERY:")
-    print("  For each session, the hook scans the 'panes' map for the first pane")
+    print("  For each session, the refresher scans the 'panes' map for the first pane")
     print("  whose description contains 'claude' (case-insensitive) and polls that")
     print("  pane via crew read. If no match is found (or no panes field")
-    print("  exists), the hook falls back to pane 0.")
+    print("  exists), the refresher falls back to pane 0.")
     print()
-    print("STALENESS GATE:")
-    print("  Reads unix epoch from .scratchpad/senior-staff-last-poll.")
-    print("  If missing or >60s old: polls all sessions, prints summary, updates timestamp.")
-    print("  If <60s old: no-op (silent).")
+    print("FILES:")
+    print("  .scratchpad/senior-staff-last-poll        epoch of the last refresher launch")
+    print("  .scratchpad/senior-staff-digest.json      latest per-session output + sha256")
+    print("  .scratchpad/senior-staff-digest-seen.json hashes the hook last printed")
+    print("  .scratchpad/senior-staff-poll.lock        held while a refresher runs")
     print()
     print("CONFIGURATION:")
     print("  Configured in modules/claude/default.nix as PreToolUse(Bash) hook.")
@@ -95,49 +131,152 @@ def find_claude_pane(panes: dict) -> str:
     return "0"
 
 
-def poll_sessions(roster: dict, now: int) -> None:
-    """Poll all sessions in the roster and print a summary."""
-    sessions = roster.get("sessions", [])
-    if not sessions:
-        return
+# ---------------------------------------------------------------------------
+# Refresher (background): crew read every session, write the digest
+# ---------------------------------------------------------------------------
 
-    print("--- Senior Staff Session Update ---")
+def read_session(pane_ref: str) -> tuple[bool, str]:
+    """Capture a pane's recent output. Returns (ok, text).
 
-    for session_entry in sessions:
+    On failure text is the same diagnostic the hook used to print inline,
+    so a pane drifting out of tmux still shows up in the update.
+    """
+    try:
+        result = subprocess.run(
+            ["crew", "read", pane_ref, "--lines", "30", "--format", "human"],
+            text=True,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.STDOUT,
+            timeout=CREW_READ_TIMEOUT,
+        )
+    except (subprocess.TimeoutExpired, FileNotFoundError, OSError) as exc:
+        return False, f"[{pane_ref}: could not run crew read — {type(exc).__name__}: {exc}]"
+    if result.returncode != 0:
+        return False, f"[{pane_ref} unreadable via crew read (exit {result.returncode}) — roster may be drifting from tmux reality]"
+    return True, result.stdout.strip() if result.stdout else ""
+
+
+def build_digest(roster: dict, now: int) -> dict:
+    """Poll every roster session and return the digest document."""
+    sessions = []
+    for session_entry in roster.get("sessions", []):
+        if not isinstance(session_entry, dict):
+            continue
         window = session_entry.get("window", "")
-        workstream = session_entry.get("workstream", "")
-
         if not window:
             continue
+        pane_ref = f"{window}.{find_claude_pane(session_entry.get('panes', {}) or {})}"
+        ok, text = read_session(pane_ref)
+        sessions.append({
+            "pane_ref": pane_ref,
+            "workstream": session_entry.get("workstream", ""),
+            "ok": ok,
+            "text": text,
+            "hash": hashlib.sha256(text.encode("utf-8")).hexdigest(),
+        })
+    return {"version": DIGEST_VERSION, "refreshed_at": now, "sessions": sessions}
+
+
+def write_json_atomic(path: Path, data: dict) -> None:
+    """Write JSON via a temp file and os.replace so readers never see a torn file."""
+    tmp = path.with_name(f".{path.name}.{os.getpid()}.tmp")
+    tmp.write_text(json.dumps(data, indent=2) + "\n")
+    os.replace(tmp, path)
+
+
+def refresh() -> None:
+    """Refresher entry point: one digest rebuild, serialized by LOCK_FILE.
+
+    A second refresher launched while one is still stuck behind a slow pane
+    exits immediately instead of piling up more crew read processes.
+    """
+    try:
+        roster = json.loads(ROSTER_FILE.read_text())
+    except (json.JSONDecodeError, OSError):
+        return
+    if not isinstance(roster, dict):
+        return
 
-        panes = session_entry.get("panes", {})
-        claude_pane = find_claude_pane(panes)
+    try:
+        lock_fh = open(LOCK_FILE, "a")
+    except OSError:
+        return
+    with lock_fh:
+        try:
+            fcntl.flock(lock_fh, fcntl.LOCK_EX | fcntl.LOCK_NB)
+        except OSError:
+            return  # another refresher is running
+        try:
+            write_json_atomic(DIGEST_FILE, build_digest(roster, int(time.time())))
+        except OSError:
+            pass  # Fail open — the next launch tries again
+        finally:
+            fcntl.flock(lock_fh, fcntl.LOCK_UN)
 
-        pane_ref = f"{window}.{claude_pane}"
-        workstream_suffix = f" ({workstream})" if workstream else ""
-        print(f"\nSession: {pane_ref}{workstream_suffix}")
 
-        try:
-            result = subprocess.run(
-                ["crew", "read", pane_ref, "--lines", "30", "--format", "human"],
-                capture_output=False,
-                text=True,
-                stdout=subprocess.PIPE,
-                stderr=subprocess.STDOUT,
-                timeout=10,
-            )
-            window_output = result.stdout.strip() if result.stdout else ""
-            if result.returncode != 0:
-                print(f"  [{pane_ref} unreadable via crew read (exit {result.returncode}) — roster may be drifting from tmux reality]")
-                continue
-        except (subprocess.TimeoutExpired, FileNotFoundError, OSError) as exc:
-            print(f"  [{pane_ref}: could not run crew read — {type(exc).__name__}: {exc}]")
-            continue
+def launch_refresher() -> None:
+    """Start `--refresh` in its own session, detached from this hook's stdio.
+
+    The hook returns without waiting. Telemetry is disabled for the child so
+    a background poll is not recorded as a hook run.
+    """
+    env = dict(os.environ)
+    env["CLAUDE_HOOK_TELEMETRY"] = "0"
+    try:
+        subprocess.Popen(
+            [sys.executable, str(Path(__file__).resolve()), "--refresh"],
+            stdin=subprocess.DEVNULL,
+            stdout=subprocess.DEVNULL,
+            stderr=subprocess.DEVNULL,
+            start_new_session=True,
+            close_fds=True,
+            env=env,
+        )
+    except OSError:
+        pass  # Fail open
+
+
+# ---------------------------------------------------------------------------
+# Hook (foreground): print what changed in the digest
+# ---------------------------------------------------------------------------
+
+def read_json(path: Path) -> dict:
+    """Read a JSON object from disk. Returns {} if missing, invalid, or not an object."""
+    try:
+        data = json.loads(path.read_text())
+    except (json.JSONDecodeError, OSError):
+        return {}
+    return data if isinstance(data, dict) else {}
+
+
+def changed_sessions(digest: dict, seen: dict) -> list[dict]:
+    """Digest sessions whose hash differs from what was last printed."""
+    if digest.get("version") != DIGEST_VERSION:
+        return []
+    return [
+        session for session in digest.get("sessions", [])
+        if isinstance(session, dict)
+        and session.get("pane_ref")
+        and seen.get(session["pane_ref"]) != session.get("hash")
+    ]
+
+
+def print_update(sessions: list[dict]) -> None:
+    """Print the session update block for the given digest sessions."""
+    print("--- Senior Staff Session Update ---")
+
+    for session in sessions:
+        workstream = session.get("workstream", "")
+        workstream_suffix = f" ({workstream})" if workstream else ""
+        print(f"\nSession: {session['pane_ref']}{workstream_suffix}")
 
-        if not window_output:
+        text = session.get("text", "")
+        if not session.get("ok", False):
+            print(f"  {text}")
+        elif not text:
             print("  [no recent output]")
         else:
-            for line in window_output.splitlines():
+            for line in text.splitlines():
                 print(f"  {line}")
 
     print()
@@ -145,7 +284,7 @@ def poll_sessions(roster: dict, now: int) -> None:
 
 
 def read_last_poll() -> int:
-    """Read the last poll timestamp from disk. Returns 0 if missing or invalid."""
+    """Read the last refresher launch timestamp from disk. Returns 0 if missing or invalid."""
     try:
         content = TIMESTAMP_FILE.read_text().strip()
         return int(content)
@@ -164,11 +303,16 @@ def write_timestamp(now: int) -> None:
 def main() -> None:
     parser = argparse.ArgumentParser(add_help=False)
     parser.add_argument("-h", "--help", action="store_true")
+    parser.add_argument("--refresh", action="store_true")
     args, _ = parser.parse_known_args()
     if args.help:
         show_help()
         sys.exit(0)
 
+    if args.refresh:
+        refresh()
+        sys.exit(0)
+
     # Consume stdin (we don't use the hook payload, but must read it)
     sys.stdin.read()
 
@@ -177,32 +321,24 @@ def main() -> None:
         sys.exit(0)
 
     now = int(time.time())
-    last_poll = read_last_poll()
-    age = now - last_poll
-
-    if age < STALENESS_SECONDS:
-        # Not stale yet — no-op
-        sys.exit(0)
-
-    # Load roster
-    try:
-        roster = json.loads(ROSTER_FILE.read_text())
-    except (json.JSONDecodeError, OSError):
-        # Malformed or unreadable roster — update timestamp and exit
+    if now - read_last_poll() >= STALENESS_SECONDS:
+        # Stale (or first run) — kick a background poll; its digest is
+        # picked up by a later Bash call.
         write_timestamp(now)
-        sys.exit(0)
+        launch_refresher()
 
-    sessions = roster.get("sessions", [])
+    sessions = changed_sessions(read_json(DIGEST_FILE), read_json(SEEN_FILE))
     if not sessions:
-        # Empty roster — update timestamp and exit
-        write_timestamp(now)
         sys.exit(0)
 
-    # Poll is stale (or first run) — gather session output
-    poll_sessions(roster, now)
+    print_update(sessions)
 
-    # Update the timestamp
-    write_timestamp(now)
+    seen = read_json(SEEN_FILE)
+    seen.update({session["pane_ref"]: session.get("hash") for session in sessions})
+    try:
+        write_json_atomic(SEEN_FILE, seen)
+    except OSError:
+        pass  # Fail open — worst case the same update prints again
     sys.exit(0)
 
 
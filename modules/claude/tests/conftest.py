@@ -15,6 +15,26 @@ from unittest.mock import MagicMock
 import pytest
 
 
+# ---------------------------------------------------------------------------
+# Hook log sink isolation (_hook_log.py)
+# ---------------------------------------------------------------------------
+
+@pytest.fixture(autouse=True)
+def _isolated_hook_log(tmp_path, monkeypatch):
+    """Keep every log_error/log_info row out of the real ~/.claude/metrics."""
+    monkeypatch.setenv("CLAUDE_HOOK_LOG_DB", str(tmp_path / "hook-log.db"))
+
+
+# ---------------------------------------------------------------------------
+# Kanban board isolation (kanban-pretool-hook's render-cache reads)
+# ---------------------------------------------------------------------------
+
+@pytest.fixture(autouse=True)
+def _isolated_kanban_root(tmp_path, monkeypatch):
+    """Point board lookups at an empty per-test root, never the real .kanban."""
+    monkeypatch.setenv("KANBAN_ROOT", str(tmp_path / "kanban-root"))
+
+
 # ---------------------------------------------------------------------------
 # PreToolUse payload builders (kanban-pretool-hook.py)
 # ---------------------------------------------------------------------------
@@ -2,30 +2,29 @@
 Tests for modules/claude/hook-error-digest-hook.py.
 
 Covered paths:
-- Aggregation correctness against a synthetic fixture with a KNOWN mix of
-  classes (curated + fallback) -- asserts exact counts and exact class keys,
-  not just "it ran without raising".
-- A missing source log file yields zero findings, never an error.
-- The report-shape cap (REPORT_CLASS_CAP) actually truncates when given more
-  than 10 classes, rolling the rest into one summary line.
-- The per-run line-processing cap (PER_RUN_LINE_CAP) skips older lines and
-  still advances the watermark to true EOF.
-- The watermark advances after a run and is not reprocessed on the next run.
-- Log rotation recovery reads the one preserved backup generation.
-- has_watermark=False sources are aggregated without persisting any state
-  (proves the watermark field is genuinely optional per source).
-
-All log/state files used here live under tmp_path -- the real
-~/.claude/metrics/ files and the real state file are never read or written.
+- A known mix of error rows from several hooks produces exact (hook, class)
+  counts; info rows are never counted.
+- A missing database, or one without the table, yields zero findings.
+- The report-shape cap (REPORT_CLASS_CAP) truncates to the top 10 and rolls
+  the rest into one summary line.
+- The last-id watermark advances, so the next run only sees new rows.
+- Rows the ring pruned before a run read them are reported as dropped.
+- A recreated database (ids below the watermark) restarts from zero.
+
+The sink database and state file live under tmp_path (conftest.py points
+CLAUDE_HOOK_LOG_DB there) -- the real ~/.claude/metrics/ is never touched.
 """
 
 import importlib.util
 import json
 import os
+import sqlite3
 from pathlib import Path
 
 import pytest
 
+import _hook_log
+
 _HOOK_PATH = Path(__file__).parent.parent / "hook-error-digest-hook.py"
 
 
@@ -42,138 +41,54 @@ def hook():
     return load_hook()
 
 
-def _write_log(path: Path, lines: list[str]) -> None:
-    path.parent.mkdir(parents=True, exist_ok=True)
-    with open(path, "w", encoding="utf-8") as fh:
-        for line in lines:
-            fh.write(f"[2026-08-05T00:00:00Z] {line}\n")
-
-
-# ---------------------------------------------------------------------------
-# Aggregation correctness (the test that matters)
-# ---------------------------------------------------------------------------
-
-
-class TestAggregationCorrectness:
-    def test_known_mix_of_classes_produces_exact_counts(self, hook, tmp_path):
-        """5 transcript-path-missing + 3 unhandled-exception + 2 fallback-only
-        lines must classify into exactly those three keys with exact counts.
-        """
-        metrics_dir = tmp_path / "metrics"
-        log_path = metrics_dir / "kanban-subagent-stop-hook-errors.log"
+@pytest.fixture
+def db():
+    return Path(os.environ["CLAUDE_HOOK_LOG_DB"])
 
-        lines = (
-            ["Anti-gaming check skipped: non-empty transcript_path that does not exist on disk"] * 5
-            + ["Unhandled exception: boom"] * 3
-            + ["totally unclassifiable line with no colon before a digit 123"] * 2
-        )
-        _write_log(log_path, lines)
 
-        sources = hook.build_sources(metrics_dir)
-        # Isolate to just the one populated source for this assertion.
-        target = [s for s in sources if s.name == "kanban-subagent-stop-hook-errors.log"]
+@pytest.fixture
+def state_path(tmp_path):
+    return tmp_path / "state.json"
 
-        state_path = tmp_path / "state.json"
-        result = hook.run_digest(target, state_path)
 
-        expected_fallback_label = ("other: " + "totally unclassifiable line with no colon before a digit 123")[:60]
-        assert result.class_counts == {
-            "transcript-path-missing": 5,
-            "unhandled-exception": 3,
-            expected_fallback_label: 2,
-        }
-
-    def test_fallback_classifier_takes_prefix_up_to_first_colon(self, hook):
-        message = "detect_criteria_gaming: failed to read transcript"
-        assert hook._fallback_classify(message) == "detect_criteria_gaming:"
-
-    def test_fallback_classifier_other_bucket_when_no_qualifying_colon(self, hook):
-        # No ':' character appears anywhere in the message -> no qualifying
-        # colon -> "other: ..." bucket. (This fixture has no colon at all;
-        # see the next test for the distinct "colon exists but appears
-        # after a digit" branch.)
-        message = "exit 137 with no colon before that number"
-        label = hook._fallback_classify(message)
-        assert label.startswith("other: ")
-        assert len(label) <= 60
-
-    def test_fallback_classifier_other_bucket_when_colon_appears_after_digit(self, hook):
-        # A ':' exists in the message, but a digit ('1' in '#123') appears
-        # before it -> the colon does not qualify as a clean label boundary
-        # -> "other: <first 60 chars>" rather than truncating at the colon.
-        # Mirrors a real log_error() call-site shape (card number ahead of
-        # the first colon), e.g. kanban-subagent-stop-hook.py's
-        # f"kanban show #{card_number} failed (exit {rc}): {stderr}".
-        message = "kanban show #123: failed (exit 1): stderr text"
-        label = hook._fallback_classify(message)
-        assert label == ("other: " + message)[:60]
-
-    def test_curated_classifier_takes_priority_over_fallback(self, hook):
-        classify = hook.make_log_classifier(hook._HOT_LOG_CLASSIFIERS)
-        line = "[2026-08-05T00:00:00Z] kanban done exit 1: card not found"
-        assert classify(line) == "kanban-done-nonzero-exit"
+def _log(hook_name: str, messages: list[str], level: str = "error") -> None:
+    for message in messages:
+        _hook_log.write(hook_name, level, message)
 
 
 # ---------------------------------------------------------------------------
-# Blank/whitespace-only lines are counted, not silently dropped
+# Aggregation correctness
 # ---------------------------------------------------------------------------
 
 
-class TestBlankLinesAreCounted:
-    def test_blank_and_whitespace_only_lines_are_counted_per_source(self, hook, tmp_path):
-        metrics_dir = tmp_path / "metrics"
-        metrics_dir.mkdir(parents=True, exist_ok=True)
-        log_path = metrics_dir / "kanban-subagent-stop-hook-errors.log"
-
-        with open(log_path, "w", encoding="utf-8") as fh:
-            fh.write("[2026-08-05T00:00:00Z] real-class: one\n")
-            fh.write("\n")
-            fh.write("   \n")
-            fh.write("[2026-08-05T00:00:00Z] real-class: two\n")
-
-        sources = hook.build_sources(metrics_dir)
-        target = [s for s in sources if s.name == "kanban-subagent-stop-hook-errors.log"]
-        state_path = tmp_path / "state.json"
-
-        result = hook.run_digest(target, state_path)
-
-        # The two real lines classify normally; the blank and whitespace-only
-        # lines are neither classified nor skipped -- they land in
-        # blank_lines instead, so every raw line is accounted for somewhere.
-        assert result.class_counts == {"real-class:": 2}
-        assert result.blank_lines == {"kanban-subagent-stop-hook-errors.log": 2}
-        assert result.skipped_lines == {}
+class TestAggregation:
+    def test_known_mix_produces_exact_counts(self, hook, db, state_path):
+        _log("kanban-subagent-stop-hook",
+             ["Anti-gaming check skipped: non-empty transcript_path that does not exist on disk"] * 5
+             + ["Unhandled exception: boom"] * 3)
+        _log("kanban-pretool-hook", ["totally unclassifiable line with no colon before a digit 123"] * 2)
+        _log("kanban-pretool-hook", ["Injected card #4 into agent prompt"] * 7, level="info")
 
-        digest_text = hook.format_digest(result)
-        assert "2 blank/whitespace-only lines this run" in digest_text
+        result = hook.run_digest(db, state_path)
 
+        assert result.class_counts == {
+            ("kanban-subagent-stop-hook", "transcript-path-missing"): 5,
+            ("kanban-subagent-stop-hook", "unhandled-exception"): 3,
+            ("kanban-pretool-hook", ("other: totally unclassifiable line with no colon before a digit 123")[:60]): 2,
+        }
+        text = hook.format_digest(result)
+        assert text.splitlines()[1] == "      5  transcript-path-missing  [kanban-subagent-stop-hook]"
 
-# ---------------------------------------------------------------------------
-# Missing source file
-# ---------------------------------------------------------------------------
-
-
-class TestMissingSourceFile:
-    def test_missing_log_file_yields_zero_findings_not_an_error(self, hook, tmp_path):
-        metrics_dir = tmp_path / "metrics"  # never created
-        sources = hook.build_sources(metrics_dir)
-        state_path = tmp_path / "state.json"
-
-        result = hook.run_digest(sources, state_path)
-
+    def test_missing_database_is_zero_findings(self, hook, tmp_path, state_path):
+        result = hook.run_digest(tmp_path / "absent.db", state_path)
         assert result.class_counts == {}
-        assert result.skipped_lines == {}
-
-    def test_all_four_sources_configured_even_when_absent(self, hook, tmp_path):
-        metrics_dir = tmp_path / "metrics"
-        sources = hook.build_sources(metrics_dir)
-        names = {s.name for s in sources}
-        assert names == {
-            "kanban-subagent-stop-hook-errors.log",
-            "kanban-pretool-hook-errors.log",
-            "orphan-agent-tracker-hook-errors.log",
-            "claude-kanban-transition-hook-errors.log",
-        }
+        assert hook.format_digest(result) == ""
+        assert not state_path.exists()
+
+    def test_database_without_table_is_zero_findings(self, hook, tmp_path, state_path):
+        empty = tmp_path / "empty.db"
+        sqlite3.connect(str(empty)).close()
+        assert hook.run_digest(empty, state_path).class_counts == {}
 
 
 # ---------------------------------------------------------------------------
@@ -182,168 +97,55 @@ class TestMissingSourceFile:
 
 
 class TestReportShapeCap:
-    def test_more_than_ten_classes_are_truncated_to_top_ten(self, hook, tmp_path):
-        metrics_dir = tmp_path / "metrics"
-        log_path = metrics_dir / "kanban-pretool-hook-errors.log"
-
-        # 13 distinct fallback classes, each with a distinct, descending count
-        # so ranking is unambiguous. Use distinct first-words so the fallback
-        # classifier produces 13 distinct class keys.
-        lines = []
+    def test_more_than_ten_classes_are_truncated_to_top_ten(self, hook, db, state_path):
+        # 13 distinct fallback classes with descending counts 13..1.
         for i in range(13):
-            count = 13 - i  # 13, 12, 11, ..., 1
-            label_word = f"class{i:02d}"
-            lines.extend([f"{label_word}: some message body"] * count)
-        _write_log(log_path, lines)
+            _log("kanban-pretool-hook", [f"class{i:02d}: some message body"] * (13 - i))
 
-        sources = hook.build_sources(metrics_dir)
-        target = [s for s in sources if s.name == "kanban-pretool-hook-errors.log"]
-        state_path = tmp_path / "state.json"
-
-        result = hook.run_digest(target, state_path)
+        result = hook.run_digest(db, state_path)
 
         assert len(result.class_counts) == 13
         assert len(result.top_classes) == 10
-        assert result.more_classes_count == 3
-        # Rolled-up remainder is the three smallest counts: 3 + 2 + 1 = 6
-        assert result.more_lines_count == 6
-
-        digest_text = hook.format_digest(result)
-        assert "3 more classes, 6 more lines" in digest_text
-
-
-# ---------------------------------------------------------------------------
-# Per-run line cap + watermark advancement
-# ---------------------------------------------------------------------------
-
-
-class TestPerRunLineCapAndWatermark:
-    def test_line_cap_skips_oldest_lines_and_advances_watermark_to_eof(self, hook, tmp_path, monkeypatch):
-        monkeypatch.setattr(hook, "PER_RUN_LINE_CAP", 10)
-
-        metrics_dir = tmp_path / "metrics"
-        log_path = metrics_dir / "kanban-subagent-stop-hook-errors.log"
-        # 15 lines: first 5 are "old-class", last 10 are "new-class". With a
-        # cap of 10, only the most recent 10 ("new-class") should classify.
-        lines = ["old-class: stale"] * 5 + ["new-class: fresh"] * 10
-        _write_log(log_path, lines)
-
-        sources = hook.build_sources(metrics_dir)
-        target = [s for s in sources if s.name == "kanban-subagent-stop-hook-errors.log"]
-        state_path = tmp_path / "state.json"
-
-        result = hook.run_digest(target, state_path)
-
-        assert result.class_counts == {"new-class:": 10}
-        assert result.skipped_lines == {"kanban-subagent-stop-hook-errors.log": 5}
-
-        # Watermark must have advanced to true EOF regardless of the cap --
-        # a second run against the same unchanged file finds nothing new.
-        second_result = hook.run_digest(target, state_path)
-        assert second_result.class_counts == {}
-        assert second_result.skipped_lines == {}
-
-    def test_watermark_persists_inode_and_offset_to_state_file(self, hook, tmp_path):
-        metrics_dir = tmp_path / "metrics"
-        log_path = metrics_dir / "kanban-subagent-stop-hook-errors.log"
-        _write_log(log_path, ["some-class: message"])
-
-        sources = hook.build_sources(metrics_dir)
-        target = [s for s in sources if s.name == "kanban-subagent-stop-hook-errors.log"]
-        state_path = tmp_path / "state.json"
-
-        hook.run_digest(target, state_path)
-
-        assert state_path.exists()
-        state = json.loads(state_path.read_text(encoding="utf-8"))
-        entry = state["kanban-subagent-stop-hook-errors.log"]
-        assert entry["inode"] == os.stat(log_path).st_ino
-        assert entry["offset"] == os.stat(log_path).st_size
-
-    def test_new_lines_appended_since_last_run_are_picked_up(self, hook, tmp_path):
-        metrics_dir = tmp_path / "metrics"
-        log_path = metrics_dir / "kanban-subagent-stop-hook-errors.log"
-        _write_log(log_path, ["first-class: one"])
-
-        sources = hook.build_sources(metrics_dir)
-        target = [s for s in sources if s.name == "kanban-subagent-stop-hook-errors.log"]
-        state_path = tmp_path / "state.json"
-
-        first = hook.run_digest(target, state_path)
-        assert first.class_counts == {"first-class:": 1}
-
-        with open(log_path, "a", encoding="utf-8") as fh:
-            fh.write("[2026-08-05T00:01:00Z] second-class: two\n")
-
-        second = hook.run_digest(target, state_path)
-        assert second.class_counts == {"second-class:": 1}
+        assert (result.more_classes_count, result.more_lines_count) == (3, 6)
+        assert "3 more classes, 6 more errors" in hook.format_digest(result)
 
 
 # ---------------------------------------------------------------------------
-# Rotation recovery
+# Watermark
 # ---------------------------------------------------------------------------
 
 
-class TestRotationRecovery:
-    def test_rotation_reads_backup_tail_once_then_resets_against_new_file(self, hook, tmp_path):
-        metrics_dir = tmp_path / "metrics"
-        metrics_dir.mkdir(parents=True, exist_ok=True)
-        log_path = metrics_dir / "kanban-subagent-stop-hook-errors.log"
-
-        _write_log(log_path, ["before-rotation: one", "before-rotation: two"])
-
-        sources = hook.build_sources(metrics_dir)
-        target = [s for s in sources if s.name == "kanban-subagent-stop-hook-errors.log"]
-        state_path = tmp_path / "state.json"
+class TestWatermark:
+    def test_only_new_rows_are_counted(self, hook, db, state_path):
+        _log("orphan-agent-tracker-hook", ["first-class: one"])
+        assert hook.run_digest(db, state_path).class_counts == {("orphan-agent-tracker-hook", "first-class:"): 1}
+        assert json.loads(state_path.read_text()) == {"last_id": 1}
 
-        first = hook.run_digest(target, state_path)
-        assert first.class_counts == {"before-rotation:": 2}
+        assert hook.run_digest(db, state_path).class_counts == {}
 
-        # Simulate rotation: old file (with the recorded inode) becomes
-        # path.1; a brand-new, empty-then-appended file takes the old name.
-        rotated_path = log_path.with_suffix(log_path.suffix + ".1")
-        # Append one more line to the (soon-to-be-rotated) file before moving
-        # it, to prove the tail-from-stored-offset read picks up entries
-        # written between the last run and the rotation.
-        with open(log_path, "a", encoding="utf-8") as fh:
-            fh.write("[2026-08-05T00:02:00Z] before-rotation: three\n")
-        log_path.rename(rotated_path)
-        _write_log(log_path, ["after-rotation: four"])
+        _log("orphan-agent-tracker-hook", ["second-class: two"])
+        assert hook.run_digest(db, state_path).class_counts == {("orphan-agent-tracker-hook", "second-class:"): 1}
 
-        second = hook.run_digest(target, state_path)
-
-        assert second.class_counts == {
-            "before-rotation:": 1,  # the "three" line written pre-rotation
-            "after-rotation:": 1,
-        }
+    def test_rows_pruned_before_reading_are_reported(self, hook, db, state_path, monkeypatch):
+        _log("h", ["seen: yes"])
+        hook.run_digest(db, state_path)
 
+        monkeypatch.setattr(_hook_log, "RING_CAPACITY", 4)
+        monkeypatch.setattr(_hook_log, "_PRUNE_EVERY", 8)
+        _log("h", [f"burst: {i}" for i in range(7)])  # ids 2..8; id 8 prunes ids <= 4
 
-# ---------------------------------------------------------------------------
-# has_watermark optionality
-# ---------------------------------------------------------------------------
+        result = hook.run_digest(db, state_path)
 
+        assert result.dropped_records == 3
+        assert result.class_counts == {("h", "burst:"): 4}
+        assert "3 older records rotated out of the ring" in hook.format_digest(result)
 
-class TestWatermarkIsOptionalPerSource:
-    def test_source_without_watermark_persists_nothing(self, hook, tmp_path):
-        calls: list[dict] = []
+    def test_recreated_database_restarts_from_zero(self, hook, db, state_path):
+        state_path.write_text(json.dumps({"last_id": 500}))
+        _log("h", ["fresh: row"])
 
-        def fetch(state: dict) -> "tuple[list[str], int]":
-            calls.append(state)
-            return ["[2026-08-05T00:00:00Z] board-class: stranded card #1"], 0
+        result = hook.run_digest(db, state_path)
 
-        watermark_free_source = hook.Source(
-            name="synthetic-board-source",
-            kind="board",
-            fetch=fetch,
-            classify=lambda line: "stranded-card",
-            has_watermark=False,
-        )
-
-        state_path = tmp_path / "state.json"
-        result = hook.run_digest([watermark_free_source], state_path)
-
-        assert result.class_counts == {"stranded-card": 1}
-        # fetch() was handed an empty, throwaway dict -- not the persisted
-        # state -- and no state file was ever written for this run.
-        assert calls == [{}]
-        assert not state_path.exists()
+        assert result.class_counts == {("h", "fresh:"): 1}
+        assert result.dropped_records == 0
+        assert json.loads(state_path.read_text()) == {"last_id": 1}
@@ -0,0 +1,125 @@
+"""
+Tests for modules/claude/_hook_log.py, the shared hook log sink.
+
+Covered paths:
+- write() stores one (ts, hook, level, class, message) row with the class
+  computed at write time: curated labels per hook, else the generic fallback
+- the fallback takes the prefix up to a clean colon, else "other: ..."
+- the ring prunes rows more than RING_CAPACITY ids behind the newest, and ids
+  keep rising across a prune
+- a new database is created 0600
+- write() never raises, even when the database cannot be opened
+- connections run with synchronous=NORMAL, and importing the module does
+  not import sqlite3
+"""
+
+import importlib.util
+import os
+import sqlite3
+import stat
+import subprocess
+import sys
+from pathlib import Path
+
+import pytest
+
+_SINK_PATH = Path(__file__).parent.parent / "_hook_log.py"
+
+
+@pytest.fixture
+def sink():
+    """A fresh _hook_log module per test, so no connection outlives its tmpdir."""
+    spec = importlib.util.spec_from_file_location("_hook_log_under_test", _SINK_PATH)
+    mod = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(mod)
+    return mod
+
+
+def _rows(sink):
+    conn = sqlite3.connect(str(sink.db_path()))
+    try:
+        return conn.execute("SELECT id, hook, level, class, message FROM hook_log ORDER BY id").fetchall()
+    finally:
+        conn.close()
+
+
+# ---------------------------------------------------------------------------
+# Tests: classification
+# ---------------------------------------------------------------------------
+
+class TestClassify:
+    def test_curated_label_for_its_hook_only(self, sink):
+        message = "kanban done exit 1: card not found"
+        assert sink.classify("kanban-subagent-stop-hook", message) == "kanban-done-nonzero-exit"
+        assert sink.classify("kanban-pretool-hook", message) == "other: kanban done exit 1: card not found"
+
+    def test_fallback_takes_prefix_up_to_first_colon(self, sink):
+        assert sink._fallback_classify("detect_criteria_gaming: failed to read transcript") == "detect_criteria_gaming:"
+
+    def test_fallback_other_bucket_when_no_colon(self, sink):
+        label = sink._fallback_classify("exit 137 with no colon before that number")
+        assert label.startswith("other: ") and len(label) <= 60
+
+    def test_fallback_other_bucket_when_colon_follows_digit(self, sink):
+        # Mirrors f"kanban show #{card_number} failed (exit {rc}): {stderr}".
+        message = "kanban show #123: failed (exit 1): stderr text"
+        assert sink._fallback_classify(message) == ("other: " + message)[:60]
+
+
+# ---------------------------------------------------------------------------
+# Tests: writes and the ring
+# ---------------------------------------------------------------------------
+
+class TestWrite:
+    def test_row_shape(self, sink):
+        sink.write("kanban-subagent-stop-hook", "error", "Unhandled exception: boom")
+        ((row_id, hook, level, label, message),) = _rows(sink)
+        assert (row_id, hook, level, label, message) == (
+            1, "kanban-subagent-stop-hook", "error", "unhandled-exception", "Unhandled exception: boom",
+        )
+
+    def test_ring_prunes_and_ids_keep_rising(self, sink, monkeypatch):
+        monkeypatch.setattr(sink, "RING_CAPACITY", 10)
+        monkeypatch.setattr(sink, "_PRUNE_EVERY", 4)
+        for i in range(1, 25):
+            sink.write("h", "info", f"m{i}")
+        ids = [row[0] for row in _rows(sink)]
+        # The last prune ran at id 24 and dropped everything at or below 14.
+        assert ids == list(range(15, 25))
+
+    def test_new_database_is_private(self, sink):
+        sink.write("h", "error", "x: y")
+        assert stat.S_IMODE(os.stat(sink.db_path()).st_mode) == 0o600
+
+    def test_unwritable_path_never_raises(self, sink, tmp_path, monkeypatch):
+        blocker = tmp_path / "not-a-dir"
+        blocker.write_text("")
+        monkeypatch.setenv("CLAUDE_HOOK_LOG_DB", str(blocker / "hook-log.db"))
+        sink.write("h", "error", "lost: but harmless")
+
+    def test_path_change_reopens(self, sink, tmp_path, monkeypatch):
+        sink.write("h", "error", "first: row")
+        monkeypatch.setenv("CLAUDE_HOOK_LOG_DB", str(tmp_path / "other.db"))
+        sink.write("h", "error", "second: row")
+        assert [row[4] for row in _rows(sink)] == ["second: row"]
+
+
+# ---------------------------------------------------------------------------
+# Tests: connection cost
+# ---------------------------------------------------------------------------
+
+class TestConnectionCost:
+    def test_synchronous_normal(self, sink):
+        conn = sink.connect(sink.db_path())
+        try:
+            assert conn.execute("PRAGMA synchronous").fetchone()[0] == 1  # NORMAL
+        finally:
+            conn.close()
+
+    def test_import_does_not_load_sqlite3(self):
+        code = (
+            f"import sys; sys.path.insert(0, {str(_SINK_PATH.parent)!r}); "
+            "import _hook_log; print('sqlite3' in sys.modules)"
+        )
+        proc = subprocess.run([sys.executable, "-c", code], capture_output=True, text=True, check=True)
+        assert proc.stdout.strip() == "False"
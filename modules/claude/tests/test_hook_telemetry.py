@@ -0,0 +1,223 @@
+"""
+Tests for modules/claude/_hook_telemetry.py and `claude-inspect hooks`.
+
+Covered paths:
+- classify_exit maps exit status and printed decisions to skip / allow /
+  ask / deny / error
+- an instrumented hook process appends one record with event, matcher,
+  session and exit path taken from what the hook read and printed, without
+  changing its stdout or exit status
+- duration_ms counts time spent before the shim ran (interpreter startup)
+- a hook exec'd by an instrumented hook records it as parent
+- CLAUDE_HOOK_TELEMETRY=0 disables recording
+- claude-inspect hooks reports per-hook-per-day percentiles and per-session
+  overhead that excludes child hooks
+"""
+
+import importlib.util
+import json
+import os
+import sqlite3
+import subprocess
+import sys
+from pathlib import Path
+
+import pytest
+
+# ---------------------------------------------------------------------------
+# Module loaders
+# ---------------------------------------------------------------------------
+
+_HOOK_DIR = Path(__file__).parent.parent
+_TELEMETRY_PATH = _HOOK_DIR / "_hook_telemetry.py"
+_INSPECT_PATH = _HOOK_DIR / "claude-inspect.py"
+_CLAUDIT_HOOK_PATH = _HOOK_DIR.parent / "claudit" / "claudit-hook.py"
+
+
+def _load(name, path):
+    spec = importlib.util.spec_from_file_location(name, path)
+    mod = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(mod)
+    return mod
+
+
+@pytest.fixture(scope="module")
+def telemetry():
+    return _load("_hook_telemetry_under_test", _TELEMETRY_PATH)
+
+
+@pytest.fixture
+def spool(tmp_path, monkeypatch):
+    path = tmp_path / "hook-timings.jsonl"
+    monkeypatch.setenv("CLAUDE_HOOK_TELEMETRY_PATH", str(path))
+    monkeypatch.delenv("CLAUDE_HOOK_TELEMETRY", raising=False)
+    monkeypatch.delenv("CLAUDE_HOOK_TELEMETRY_PARENT", raising=False)
+    return path
+
+
+# ---------------------------------------------------------------------------
+# Helpers
+# ---------------------------------------------------------------------------
+
+def _hook_script(tmp_path, name, body):
+    """A hook built the way default.nix builds one: telemetry shim + source."""
+    path = tmp_path / f"{name}.py"
+    path.write_text(
+        "import sys as _sys\n"
+        f"_sys.path.insert(0, {str(_HOOK_DIR)!r})\n"
+        "import _hook_telemetry\n"
+        f"_hook_telemetry.start({name!r})\n"
+        "import json, subprocess, sys\n"
+        "payload = json.loads(sys.stdin.read())\n"
+        + body
+    )
+    return path
+
+
+def _run(path, payload):
+    return subprocess.run(
+        [sys.executable, str(path)], input=json.dumps(payload),
+        capture_output=True, text=True, env=dict(os.environ),
+    )
+
+
+def _records(spool):
+    return [json.loads(line) for line in spool.read_text().splitlines()]
+
+
+_PRE_BASH = {"hook_event_name": "PreToolUse", "tool_name": "Bash", "session_id": "s1",
+             "tool_input": {"command": "git push --no-verify"}}
+
+
+# ---------------------------------------------------------------------------
+# Tests: classification
+# ---------------------------------------------------------------------------
+
+class TestClassifyExit:
+    @pytest.mark.parametrize("code, stdout, expected", [
+        (0, "", "skip"),
+        (0, "\n", "skip"),
+        (2, "", "deny"),
+        (1, "", "error"),
+        (0, json.dumps({"hookSpecificOutput": {"permissionDecision": "deny"}}), "deny"),
+        (0, json.dumps({"hookSpecificOutput": {"permissionDecision": "ask"}}), "ask"),
+        (0, json.dumps({"decision": "block", "reason": "x"}), "deny"),
+        (0, json.dumps({"hookSpecificOutput": {"additionalContext": "hi"}}), "allow"),
+        (0, "plain text", "allow"),
+    ])
+    def test_paths(self, telemetry, code, stdout, expected):
+        assert telemetry.classify_exit(code, stdout) == expected
+
+    def test_crash_is_error(self, telemetry):
+        assert telemetry.classify_exit(0, "", crashed=True) == "error"
+
+
+# ---------------------------------------------------------------------------
+# Tests: instrumented processes
+# ---------------------------------------------------------------------------
+
+class TestInstrumentedHook:
+    def test_deny_record_and_behaviour_unchanged(self, tmp_path, spool):
+        deny = {"hookSpecificOutput": {"hookEventName": "PreToolUse", "permissionDecision": "deny"}}
+        hook = _hook_script(tmp_path, "git-no-verify-hook", f"print(json.dumps({deny!r}))\nsys.exit(0)\n")
+
+        proc = _run(hook, _PRE_BASH)
+
+        assert proc.returncode == 0
+        assert json.loads(proc.stdout) == deny
+        (record,) = _records(spool)
+        assert record["hook"] == "git-no-verify-hook"
+        assert (record["event"], record["matcher"], record["session_id"]) == ("PreToolUse", "Bash", "s1")
+        assert (record["exit_path"], record["exit_code"], record["parent"]) == ("deny", 0, None)
+        assert record["duration_ms"] > 0
+
+    @pytest.mark.parametrize("body, path, code", [
+        ("sys.exit(0)\n", "skip", 0),
+        ("sys.exit(2)\n", "deny", 2),
+        ("raise RuntimeError('boom')\n", "error", 1),
+    ])
+    def test_exit_paths(self, tmp_path, spool, body, path, code):
+        proc = _run(_hook_script(tmp_path, "h", body), _PRE_BASH)
+        assert proc.returncode == code
+        (record,) = _records(spool)
+        assert (record["exit_path"], record["exit_code"]) == (path, code)
+
+    @pytest.mark.skipif(sys.platform not in ("linux", "darwin"), reason="process start time not readable")
+    def test_duration_counts_time_before_the_shim(self, tmp_path, spool):
+        hook = _hook_script(tmp_path, "h", "")
+        hook.write_text("import time\ntime.sleep(0.3)\n" + hook.read_text())
+        _run(hook, _PRE_BASH)
+        (record,) = _records(spool)
+        assert record["duration_ms"] >= 300
+
+    def test_child_hook_records_parent(self, tmp_path, spool):
+        child = _hook_script(tmp_path, "kanban-done-reminder-hook", "")
+        parent = _hook_script(
+            tmp_path, "posttool-dispatch-hook",
+            f"subprocess.run([sys.executable, {str(child)!r}], input=json.dumps(payload), text=True)\n",
+        )
+
+        _run(parent, {"hook_event_name": "PostToolUse", "tool_name": "Bash", "session_id": "s1"})
+
+        parents = {r["hook"]: r["parent"] for r in _records(spool)}
+        assert parents == {"kanban-done-reminder-hook": "posttool-dispatch-hook", "posttool-dispatch-hook": None}
+
+    def test_disabled(self, tmp_path, spool, monkeypatch):
+        monkeypatch.setenv("CLAUDE_HOOK_TELEMETRY", "0")
+        _run(_hook_script(tmp_path, "h", ""), _PRE_BASH)
+        assert not spool.exists()
+
+
+# ---------------------------------------------------------------------------
+# Tests: claude-inspect hooks
+# ---------------------------------------------------------------------------
+
+class TestInspectHooks:
+    @pytest.fixture
+    def inspect(self, tmp_path, monkeypatch):
+        claudit = _load("claudit_hook_for_inspect", _CLAUDIT_HOOK_PATH)
+        db_path = tmp_path / "claudit.db"
+        monkeypatch.setattr(claudit, "DB_PATH", db_path)
+        conn = claudit.open_db()
+        rows = [
+            (f"r{i}", "kanban-pretool-hook", "PreToolUse", "Bash", "skip", 0, float(ms),
+             "2099-01-02T10:00:00Z", "s1", None)
+            for i, ms in enumerate(range(1, 101))
+        ] + [
+            ("d1", "posttool-dispatch-hook", "PostToolUse", "Bash", "allow", 0, 50.0, "2099-01-02T11:00:00Z", "s1", None),
+            ("c1", "kanban-done-reminder-hook", "PostToolUse", "Bash", "allow", 0, 30.0, "2099-01-02T11:00:00Z", "s1", "posttool-dispatch-hook"),
+        ]
+        conn.executemany("INSERT INTO hook_timings VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)", rows)
+        conn.commit()
+        conn.close()
+
+        mod = _load("claude_inspect_hooks", _INSPECT_PATH)
+        monkeypatch.setattr(mod, "DB_PATH", str(db_path))
+        return mod
+
+    def test_percentiles_and_session_overhead(self, inspect, capsys):
+        inspect.cmd_hooks(days=36500, session=None, hook=None, fmt="json")
+        result = json.loads(capsys.readouterr().out)
+
+        pretool = next(s for s in result["by_hook_day"] if s["hook"] == "kanban-pretool-hook")
+        assert (pretool["day"], pretool["runs"], pretool["skip"]) == ("2099-01-02", 100, 100)
+        assert (pretool["p50_ms"], pretool["p95_ms"], pretool["p99_ms"]) == (50.5, 95.0, 99.0)
+
+        (session,) = result["sessions"]
+        assert session["session_id"] == "s1"
+        assert session["runs"] == 101  # the dispatched child is inside its parent's time
+        assert session["total_ms"] == 5050.0 + 50.0
+
+    def test_hook_filter_and_human_output(self, inspect, capsys):
+        inspect.cmd_hooks(days=36500, session="s1", hook="posttool-dispatch-hook", fmt="human")
+        out = capsys.readouterr().out
+        assert "posttool-dispatch-hook" in out and "kanban-pretool-hook" not in out
+
+    def test_missing_table_is_not_found(self, tmp_path, monkeypatch, capsys):
+        db_path = tmp_path / "empty.db"
+        sqlite3.connect(str(db_path)).close()
+        mod = _load("claude_inspect_hooks_empty", _INSPECT_PATH)
+        monkeypatch.setattr(mod, "DB_PATH", str(db_path))
+        with pytest.raises(SystemExit):
+            mod.cmd_hooks(days=7, session=None, hook=None, fmt="json")
+        assert json.loads(capsys.readouterr().out)["error_code"] == "NOT_FOUND"
@@ -18,9 +18,11 @@ are created or read during these tests.
 import importlib.util
 import json
 import os
+import sqlite3
 import subprocess
 import sys
 from pathlib import Path
+from types import SimpleNamespace
 from unittest.mock import MagicMock, patch
 
 import pytest
@@ -1922,32 +1924,95 @@ class TestExceptionReprLogging:
         assert "\n" not in logged_message
 
 
-class TestWriteLogLineCap:
-    """_write_log() must cap a single oversized line before writing to disk.
+class TestLogSink:
+    """log_error()/log_info() write capped rows to the shared hook log sink."""
 
-    Without a per-line cap, hook-error-digest-hook.py's PER_RUN_LINE_CAP (a
-    per-run line-count cap, not a byte cap) would re-read one pathologically
-    long line whole on every digest run until the next 10 MB file rotation.
-    """
+    def _rows(self):
+        conn = sqlite3.connect(os.environ["CLAUDE_HOOK_LOG_DB"])
+        try:
+            return conn.execute("SELECT hook, level, message FROM hook_log ORDER BY id").fetchall()
+        finally:
+            conn.close()
 
-    def test_write_log_caps_overlong_line(self, hook, tmp_path):
-        """A message longer than _LOG_MAX_LINE_CHARS is truncated with a marker."""
-        log_path = tmp_path / "test-pretool-errors.log"
+    def test_log_error_caps_overlong_message(self, hook):
+        """A message longer than MAX_MESSAGE_CHARS is truncated with a marker."""
         unique_tail_marker = "UNIQUE_TAIL_MARKER_ZZZ"
-        long_message = ("A" * (hook._LOG_MAX_LINE_CHARS + 1000)) + unique_tail_marker
-        hook._write_log(log_path, long_message)
-        logged = log_path.read_text(encoding="utf-8")
-        assert unique_tail_marker not in logged
-        assert "truncated" in logged
-
-    def test_write_log_leaves_short_line_untouched(self, hook, tmp_path):
-        """A message at or under the cap is written verbatim, with no marker."""
-        log_path = tmp_path / "test-pretool-errors.log"
-        short_message = "short benign message"
-        hook._write_log(log_path, short_message)
-        logged = log_path.read_text(encoding="utf-8")
-        assert short_message in logged
-        assert "truncated" not in logged
+        hook.log_error(("A" * (hook._hook_log.MAX_MESSAGE_CHARS + 1000)) + unique_tail_marker)
+        ((name, level, stored),) = self._rows()
+        assert (name, level) == ("kanban-pretool-hook", "error")
+        assert unique_tail_marker not in stored
+        assert "truncated" in stored
+
+    def test_log_info_leaves_short_message_untouched(self, hook):
+        """A message at or under the cap is stored verbatim, with no marker."""
+        hook.log_info("short benign message")
+        assert self._rows() == [("kanban-pretool-hook", "info", "short benign message")]
+
+
+# ---------------------------------------------------------------------------
+# Tests: kanban render cache reads
+# ---------------------------------------------------------------------------
+
+_KANBAN_PATH = Path(__file__).parent.parent.parent / "kanban" / "kanban.py"
+
+
+@pytest.fixture(scope="module")
+def kanban():
+    """Import the kanban CLI (watchdog stubbed) to build real render-cache entries."""
+    watchdog_stub = MagicMock()
+    watchdog_stub.events.FileSystemEventHandler = object
+    with patch.dict(sys.modules, {"watchdog": watchdog_stub, "watchdog.observers": watchdog_stub,
+                                  "watchdog.events": watchdog_stub}):
+        spec = importlib.util.spec_from_file_location("kanban_for_render_cache", _KANBAN_PATH)
+        mod = importlib.util.module_from_spec(spec)
+        spec.loader.exec_module(mod)
+    return mod
+
+
+class TestCardRenderCache:
+    """fetch_card_xml / _fetch_card_editfiles read kanban's render cache
+    instead of forking `kanban show` while the card is unchanged."""
+
+    @pytest.fixture
+    def board(self, kanban, tmp_path, monkeypatch, capsys):
+        """A board with card #42 in doing, already shown once by the CLI."""
+        root = tmp_path / "board"
+        for col in ("todo", "doing", "done", "canceled"):
+            (root / col).mkdir(parents=True)
+        now = kanban.now_iso()
+        kanban.write_card(root / "doing" / "42.json", {
+            "action": "Cached", "intent": "i", "type": "work", "session": "test-session",
+            "editFiles": ["src/z.py", "src/a.py"], "created": now, "updated": now,
+            "activity": [{"timestamp": now, "message": "created"}],
+        })
+        kanban.cmd_show(SimpleNamespace(root=str(root), card="42", output_style="xml"))
+        shown = capsys.readouterr().out.strip()
+        monkeypatch.setenv("KANBAN_ROOT", str(root))
+        return SimpleNamespace(root=root, card=root / "doing" / "42.json", xml=shown)
+
+    def test_hit_needs_no_subprocess(self, hook, board):
+        with patch("subprocess.run", side_effect=AssertionError("forked kanban")):
+            assert hook.fetch_card_xml("42", "test-session") == board.xml
+            assert hook._fetch_card_editfiles("042", "test-session") == ("042", ["src/a.py", "src/z.py"])
+
+    def test_changed_card_falls_back_to_kanban_show(self, hook, kanban, board):
+        kanban.append_card_activity(board.card, "rechecked")
+        mock_result = KanbanMockResponses.success(stdout="<card/>")
+        with patch("subprocess.run", return_value=mock_result) as run:
+            assert hook.fetch_card_xml("42", "test-session") == "<card/>"
+        run.assert_called_once()
+
+    def test_key_matches_kanban(self, hook, kanban, board):
+        assert hook._card_render_key(board.card) == kanban.card_render_key(board.card)
+        board.card.with_name("42.activity.jsonl").unlink()
+        assert hook._card_render_key(board.card) == kanban.card_render_key(board.card)
+
+    def test_root_is_git_toplevel_kanban(self, hook, tmp_path, monkeypatch):
+        monkeypatch.delenv("KANBAN_ROOT")
+        (tmp_path / "repo" / ".git").mkdir(parents=True)
+        (tmp_path / "repo" / "pkg" / "sub").mkdir(parents=True)
+        monkeypatch.chdir(tmp_path / "repo" / "pkg" / "sub")
+        assert hook._kanban_root() == tmp_path / "repo" / ".kanban"
 
 
 # ---------------------------------------------------------------------------
@@ -169,17 +169,14 @@ def _unmet_ac(text: str, commands: list[tuple[str, int]] | None = None) -> str:
 
 
 def _fake_home_env(home_dir: Path, env: dict) -> dict:
-    """Redirect HOME to an isolated directory so the hook's log writes
-    (ERROR_LOG_PATH / INFO_LOG_PATH, both resolved via Path.home()) land
-    outside the real ~/.claude/metrics/ production log.
+    """Redirect HOME to an isolated directory so anything the hook resolves
+    via Path.home() lands outside the real ~/.claude/.
 
     The hook is launched as a real OS subprocess (see _run_hook), so an
-    in-process monkeypatch of the hook module's ERROR_LOG_PATH/INFO_LOG_PATH
-    constants (as used by the sibling in-process test file) cannot reach it —
-    the child process never sees the parent's monkeypatched module attribute.
-    Overriding the HOME env var the child inherits is the one lever that
-    reaches across the subprocess boundary: Path.home() consults HOME on
-    POSIX, so every log path the hook computes gets rebased under home_dir.
+    in-process monkeypatch cannot reach it. Its log_error()/log_info() rows
+    already go to the per-test CLAUDE_HOOK_LOG_DB that conftest.py sets (the
+    child inherits it through os.environ); HOME is the lever for every other
+    path: Path.home() consults HOME on POSIX.
     """
     home_dir.mkdir(parents=True, exist_ok=True)
     env["HOME"] = str(home_dir)
@@ -677,9 +674,8 @@ def test_missing_kanban_binary_degrades_gracefully(tmp_path):
     env["PATH"] = str(empty_bin_dir)  # No `kanban` binary anywhere on PATH.
     env.pop("PERSONAL_TRAINER_SESSION", None)
     # This is the specific scenario that used to write "kanban CLI not found
-    # in PATH" and "Card #9008 kanban done exit 127" lines into the real
-    # ~/.claude/metrics/kanban-subagent-stop-hook-errors.log on every run —
-    # redirect HOME so those log_error() calls land in an isolated directory.
+    # in PATH" and "Card #9008 kanban done exit 127" errors into the real
+    # ~/.claude/metrics on every run — keep the child's paths isolated.
     env = _fake_home_env(tmp_path / "home", env)
 
     result = _run_hook(_build_stop_payload(transcript_path), env)
@@ -0,0 +1,230 @@
+"""
+Tests for the reverse transcript reader in kanban-subagent-stop-hook.py.
+
+Covered paths:
+- _iter_transcript_entries_reverse yields entries last-first, skips blank
+  and torn lines (a final line still being written), and yields nothing for
+  an empty file
+- extract_card_from_transcript, extract_agent_output and
+  detect_criteria_gaming resolve transcripts larger than
+  _TRANSCRIPT_MAX_BYTES (the old forward scans gave up on them)
+- card resolution keeps the trust-anchor semantics: a later trustworthy
+  tool_use overrides the anchor, later assistant prose does not, and a
+  transcript without an anchor falls back to the latest match anywhere
+- gaming detection only looks at activity after the LAST block feedback
+- each scan stops near EOF instead of reading the whole transcript
+"""
+
+import importlib.util
+from pathlib import Path
+
+import pytest
+
+from .conftest import (
+    make_card_header_entry,
+    make_kanban_criteria_bash_entry,
+    make_substantive_tool_entry,
+    make_transcript_jsonl,
+)
+
+# ---------------------------------------------------------------------------
+# Hook module loader
+# ---------------------------------------------------------------------------
+
+_HOOK_PATH = Path(__file__).parent.parent / "kanban-subagent-stop-hook.py"
+
+
+def load_hook():
+    """Import kanban-subagent-stop-hook.py as a module without executing main()."""
+    spec = importlib.util.spec_from_file_location("kanban_subagent_stop_reverse", _HOOK_PATH)
+    mod = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(mod)
+    return mod
+
+
+@pytest.fixture(scope="module")
+def hook():
+    return load_hook()
+
+
+@pytest.fixture
+def consumed(hook, monkeypatch):
+    """Count how many entries the reverse reader hands to its caller."""
+    counter = {"entries": 0}
+    real = hook._iter_transcript_entries_reverse
+
+    def _counting(path):
+        for entry in real(path):
+            counter["entries"] += 1
+            yield entry
+
+    monkeypatch.setattr(hook, "_iter_transcript_entries_reverse", _counting)
+    return counter
+
+
+# ---------------------------------------------------------------------------
+# Helpers
+# ---------------------------------------------------------------------------
+
+def _write(tmp_path, text):
+    path = tmp_path / "transcript.jsonl"
+    path.write_text(text)
+    return str(path)
+
+
+def _assistant_text(text):
+    return {"role": "assistant", "content": [{"type": "text", "text": text}]}
+
+
+def _feedback(card="42"):
+    return {"role": "user", "content": f"AC review failed for card #{card}. Investigate each failed criterion."}
+
+
+def _filler(n):
+    return [_assistant_text(f"thinking step {i}") for i in range(n)]
+
+
+# ---------------------------------------------------------------------------
+# Tests: the reader
+# ---------------------------------------------------------------------------
+
+class TestReverseReader:
+    def test_yields_last_entry_first(self, hook, tmp_path):
+        path = _write(tmp_path, make_transcript_jsonl([{"n": 1}, {"n": 2}, {"n": 3}]))
+        assert [e["n"] for e in hook._iter_transcript_entries_reverse(path)] == [3, 2, 1]
+
+    def test_skips_blank_and_torn_lines(self, hook, tmp_path):
+        path = _write(tmp_path, '{"n": 1}\n\n  \n{"n": 2}\n{"n": 3, "partial')
+        assert [e["n"] for e in hook._iter_transcript_entries_reverse(path)] == [2, 1]
+
+    def test_no_trailing_newline(self, hook, tmp_path):
+        path = _write(tmp_path, '{"n": 1}\n{"n": 2}')
+        assert [e["n"] for e in hook._iter_transcript_entries_reverse(path)] == [2, 1]
+
+    def test_empty_file(self, hook, tmp_path):
+        assert list(hook._iter_transcript_entries_reverse(_write(tmp_path, ""))) == []
+
+    def test_missing_file_raises_oserror(self, hook, tmp_path):
+        with pytest.raises(OSError):
+            list(hook._iter_transcript_entries_reverse(str(tmp_path / "absent.jsonl")))
+
+
+# ---------------------------------------------------------------------------
+# Tests: transcripts past the old size guard
+# ---------------------------------------------------------------------------
+
+class TestLargeTranscripts:
+    @pytest.fixture
+    def large(self, hook, tmp_path, monkeypatch):
+        """A transcript bigger than _TRANSCRIPT_MAX_BYTES (shrunk for speed)."""
+        monkeypatch.setattr(hook, "_TRANSCRIPT_MAX_BYTES", 1024)
+        entries = _filler(200) + [
+            make_card_header_entry("77", "big-session"),
+            _feedback("77"),
+            make_kanban_criteria_bash_entry("77", "big-session"),
+            _assistant_text("All criteria met."),
+        ]
+        path = _write(tmp_path, make_transcript_jsonl(entries))
+        assert Path(path).stat().st_size > hook._TRANSCRIPT_MAX_BYTES
+        return path
+
+    def test_card_is_resolved(self, hook, large):
+        assert hook.extract_card_from_transcript(large) == ("77", "big-session")
+
+    def test_agent_output_is_read(self, hook, large):
+        assert hook.extract_agent_output(large) == "All criteria met."
+
+    def test_gaming_is_detected(self, hook, large):
+        assert hook.detect_criteria_gaming(large) is True
+
+
+# ---------------------------------------------------------------------------
+# Tests: card resolution
+# ---------------------------------------------------------------------------
+
+class TestCardResolution:
+    def test_trustworthy_tool_use_overrides_anchor(self, hook, tmp_path):
+        path = _write(tmp_path, make_transcript_jsonl([
+            make_card_header_entry("10", "s"),
+            make_kanban_criteria_bash_entry("11", "s"),
+        ]))
+        assert hook.extract_card_from_transcript(path) == ("11", "s")
+
+    def test_later_prose_does_not_override_anchor(self, hook, tmp_path):
+        path = _write(tmp_path, make_transcript_jsonl([
+            make_card_header_entry("10", "s"),
+            _assistant_text("Next you could run kanban criteria check 99 1 --session s"),
+        ]))
+        assert hook.extract_card_from_transcript(path) == ("10", "s")
+
+    def test_last_anchor_wins(self, hook, tmp_path):
+        path = _write(tmp_path, make_transcript_jsonl([
+            make_card_header_entry("10", "s"),
+            make_kanban_criteria_bash_entry("11", "s"),
+            make_card_header_entry("12", "s"),
+        ]))
+        assert hook.extract_card_from_transcript(path) == ("12", "s")
+
+    def test_no_anchor_falls_back_to_latest_match(self, hook, tmp_path):
+        path = _write(tmp_path, make_transcript_jsonl([
+            make_kanban_criteria_bash_entry("5", "s"),
+            _assistant_text("Done with kanban criteria check 6 1 --session s"),
+            _assistant_text("no card here"),
+        ]))
+        assert hook.extract_card_from_transcript(path) == ("6", "s")
+
+    def test_no_reference_at_all(self, hook, tmp_path):
+        assert hook.extract_card_from_transcript(_write(tmp_path, make_transcript_jsonl(_filler(3)))) is None
+
+
+# ---------------------------------------------------------------------------
+# Tests: gaming detection window
+# ---------------------------------------------------------------------------
+
+class TestGamingWindow:
+    def test_only_activity_after_last_feedback_counts(self, hook, tmp_path):
+        path = _write(tmp_path, make_transcript_jsonl([
+            make_card_header_entry("42"),
+            _feedback(),
+            make_substantive_tool_entry("Edit"),
+            _feedback(),
+            make_kanban_criteria_bash_entry("42"),
+        ]))
+        assert hook.detect_criteria_gaming(path) is True
+
+    def test_substantive_work_after_feedback_is_not_gaming(self, hook, tmp_path):
+        path = _write(tmp_path, make_transcript_jsonl([
+            _feedback(),
+            make_substantive_tool_entry("Edit"),
+            make_kanban_criteria_bash_entry("42"),
+        ]))
+        assert hook.detect_criteria_gaming(path) is False
+
+    def test_recheck_without_feedback_is_not_gaming(self, hook, tmp_path):
+        path = _write(tmp_path, make_transcript_jsonl([make_kanban_criteria_bash_entry("42")]))
+        assert hook.detect_criteria_gaming(path) is False
+
+
+# ---------------------------------------------------------------------------
+# Tests: scans stop near EOF
+# ---------------------------------------------------------------------------
+
+class TestEarlyStop:
+    @pytest.fixture
+    def transcript(self, tmp_path):
+        entries = _filler(500) + [
+            make_card_header_entry("42"),
+            _feedback(),
+            make_kanban_criteria_bash_entry("42"),
+            _assistant_text("Rechecked."),
+        ]
+        return _write(tmp_path, make_transcript_jsonl(entries))
+
+    @pytest.mark.parametrize("func, reads", [
+        ("extract_agent_output", 1),
+        ("detect_criteria_gaming", 3),
+        ("extract_card_from_transcript", 4),
+    ])
+    def test_reads_only_the_tail(self, hook, consumed, transcript, func, reads):
+        getattr(hook, func)(transcript)
+        assert consumed["entries"] == reads
@@ -4,8 +4,9 @@ Tests for modules/claude/orphan-agent-tracker-hook.py.
 Covered paths:
 - pretool subcommand: appends entry to tracker file with correct shape
 - pretool: appends without overwriting existing entries (concurrent-safe)
-- subagent-stop: removes matching entry by tool_use_id
+- subagent-stop: removes matching entry by tool_use_id (appends a tombstone)
 - subagent-stop: tolerates missing entry (session restart) — no error
+- subagent-stop: with no tracker file yet, still appends its tombstone
 - user-prompt-submit: emits warning to stdout when tracker is non-empty
 - user-prompt-submit: emits nothing when tracker is empty
 - user-prompt-submit: warning includes count, IDs, descriptions, durations
@@ -20,6 +21,11 @@ Covered paths:
 - user-prompt-submit: stale file from different session not read when KANBAN_SESSION unset
 - user-prompt-submit: warning text leads with 'Wait' before 'TaskStop'
 - user-prompt-submit: warning includes phantom-doing distinguishing line
+- pretool/subagent-stop append one record without rewriting the file
+- a stop tombstone that lands before its start still cancels it
+- legacy records without "op" are read as starts
+- user-prompt-submit compacts once dead records reach the threshold, and
+  leaves the log alone below it
 
 All file I/O uses tmp_path (pytest) — no real scratchpad files are written.
 """
@@ -113,17 +119,24 @@ def _write_tracker(tracker_path: Path, entries: list) -> None:
             fh.write(json.dumps(entry) + "\n")
 
 
-def _read_tracker(tracker_path: Path) -> list:
-    """Read all entries from the tracker JSONL file."""
+def _read_records(tracker_path: Path) -> list:
+    """Read every raw record (starts and stop tombstones) from the tracker file."""
     if not tracker_path.exists():
         return []
-    entries = []
+    records = []
     with open(tracker_path, "r", encoding="utf-8") as fh:
         for line in fh:
             line = line.strip()
             if line:
-                entries.append(json.loads(line))
-    return entries
+                records.append(json.loads(line))
+    return records
+
+
+def _read_tracker(tracker_path: Path) -> list:
+    """Read the live entries: start records with no matching stop tombstone."""
+    records = _read_records(tracker_path)
+    stopped = {r["id"] for r in records if r.get("op") == "stop"}
+    return [r for r in records if r.get("op", "start") == "start" and r["id"] not in stopped]
 
 
 def _run_subcommand(hook_mod, subcommand: str, payload: dict,
@@ -283,16 +296,17 @@ def test_subagent_stop_tolerates_missing_entry(hook, tmp_path):
     assert entries[0]["id"] == "toolu_other"
 
 
-def test_subagent_stop_tolerates_empty_tracker_file(hook, tmp_path):
-    """subagent-stop is a no-op when the tracker file does not exist."""
-    payload = _make_stop_payload(tool_use_id="toolu_nofile")
-    env = {"KANBAN_SESSION": "empty-session"}
+def test_subagent_stop_without_tracker_file_still_tombstones(hook, tmp_path):
+    """A stop that beats the first start creates the file, and the start that
+    lands afterwards is cancelled by it."""
+    env = {"KANBAN_SESSION": "race-session"}
 
-    # Must not raise; no file created
-    _run_subcommand(hook, "subagent-stop", payload, env=env, cwd=tmp_path)
+    _run_subcommand(hook, "subagent-stop", _make_stop_payload(tool_use_id="toolu_fast"), env=env, cwd=tmp_path)
+    _run_subcommand(hook, "pretool", _make_pretool_payload(tool_use_id="toolu_fast"), env=env, cwd=tmp_path)
 
-    tracker = tmp_path / ".scratchpad" / "orphan-tracker-empty-session.jsonl"
-    assert not tracker.exists()
+    tracker = tmp_path / ".scratchpad" / "orphan-tracker-race-session.jsonl"
+    assert [r["op"] for r in _read_records(tracker)] == ["stop", "start"]
+    assert _read_tracker(tracker) == []
 
 
 # ---------------------------------------------------------------------------
@@ -664,3 +678,69 @@ def test_user_prompt_submit_warning_includes_phantom_doing_distinguishing_line(h
     output = _run_subcommand(hook, "user-prompt-submit", payload, env=env, cwd=tmp_path)
 
     assert "phantom-doing" in output
+
+
+# ---------------------------------------------------------------------------
+# New tests: append-only event log and compaction
+# ---------------------------------------------------------------------------
+
+def test_pretool_and_stop_append_without_rewriting(hook, tmp_path):
+    """Each event is one appended line; the file is never replaced."""
+    env = {"KANBAN_SESSION": "log-session"}
+    tracker = tmp_path / ".scratchpad" / "orphan-tracker-log-session.jsonl"
+
+    _run_subcommand(hook, "pretool", _make_pretool_payload(tool_use_id="toolu_a"), env=env, cwd=tmp_path)
+    inode = tracker.stat().st_ino
+    _run_subcommand(hook, "pretool", _make_pretool_payload(tool_use_id="toolu_b"), env=env, cwd=tmp_path)
+    _run_subcommand(hook, "subagent-stop", _make_stop_payload(tool_use_id="toolu_a"), env=env, cwd=tmp_path)
+
+    assert tracker.stat().st_ino == inode
+    assert [(r["op"], r["id"]) for r in _read_records(tracker)] == [
+        ("start", "toolu_a"), ("start", "toolu_b"), ("stop", "toolu_a"),
+    ]
+    assert [e["id"] for e in _read_tracker(tracker)] == ["toolu_b"]
+
+
+def test_fold_records_handles_stop_before_start_and_legacy_lines(hook):
+    """A tombstone cancels its start regardless of order; op-less lines are starts."""
+    records = [
+        {"op": "stop", "id": "toolu_fast"},
+        {"op": "start", "id": "toolu_fast", "started_at": _now_iso()},
+        {"id": "toolu_legacy", "description": "old format", "started_at": _now_iso()},
+    ]
+    live = hook._fold_records(records)
+    assert [(e["op"], e["id"]) for e in live] == [("start", "toolu_legacy")]
+
+
+def test_user_prompt_submit_compacts_at_dead_threshold(hook, tmp_path):
+    """Once dead records reach the threshold the file is rewritten to the live set."""
+    tracker = tmp_path / ".scratchpad" / "orphan-tracker-compact-session.jsonl"
+    pairs = hook._COMPACT_DEAD_THRESHOLD // 2
+    records = [{"op": "start", "id": "toolu_live", "description": "still going",
+                "started_at": _minutes_ago_iso(10)}]
+    for n in range(pairs):
+        records.append({"op": "start", "id": f"toolu_{n}", "started_at": _minutes_ago_iso(10)})
+        records.append({"op": "stop", "id": f"toolu_{n}", "stopped_at": _now_iso()})
+    _write_tracker(tracker, records)
+
+    output = _run_subcommand(hook, "user-prompt-submit", _make_user_prompt_payload(),
+                             env={"KANBAN_SESSION": "compact-session"}, cwd=tmp_path)
+
+    assert "toolu_live" in output
+    assert [(r["op"], r["id"]) for r in _read_records(tracker)] == [("start", "toolu_live")]
+
+
+def test_user_prompt_submit_leaves_log_below_dead_threshold(hook, tmp_path):
+    """A few tombstones are not worth a rewrite."""
+    tracker = tmp_path / ".scratchpad" / "orphan-tracker-small-session.jsonl"
+    records = [
+        {"op": "start", "id": "toolu_done", "started_at": _minutes_ago_iso(10)},
+        {"op": "stop", "id": "toolu_done", "stopped_at": _now_iso()},
+    ]
+    _write_tracker(tracker, records)
+
+    output = _run_subcommand(hook, "user-prompt-submit", _make_user_prompt_payload(),
+                             env={"KANBAN_SESSION": "small-session"}, cwd=tmp_path)
+
+    assert output.strip() == ""
+    assert _read_records(tracker) == records
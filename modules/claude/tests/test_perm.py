@@ -19,6 +19,13 @@ Covered paths:
   tracking file (the janitor-shouldn't-create-what-it-tidies fix).
 - `cmd_hook()` honors a grant written via the non-git cwd fallback,
   instead of silently no-op'ing via its own independent git resolution.
+- allow/cleanup/cleanup-stale are single transactions: cleanup of many
+  claims writes each file once, a failure inside writes nothing, and
+  concurrent `perm` processes (allow, cleanup, cleanup-stale from several
+  sessions at once) never lose or resurrect each other's claims.
+- The compiled allow-list matcher agrees with per-pattern fnmatch, is
+  served from its disk cache without re-resolving the root, and is rebuilt
+  when settings.local.json changes or the cwd's enclosing repo changes.
 
 Isolation: every test redirects $HOME to a per-test tmp_path via
 monkeypatch.setenv("HOME", ...) before touching perm.py, and only ever
@@ -30,6 +37,7 @@ are always separate process invocations and never share the
 module-level `_repo_root` memoization within a single process.
 """
 
+import fnmatch
 import importlib.util
 import io
 import json
@@ -319,3 +327,180 @@ class TestHookHonorsFallbackGrant:
         assert exc_info.value.code == 0
         captured = capsys.readouterr()
         assert captured.out == ""
+
+
+# ---------------------------------------------------------------------------
+# Compiled, cached allow-list matcher
+# ---------------------------------------------------------------------------
+
+_ALLOW = [
+    "Bash(npm test)",
+    "Bash(git log *)",
+    "Bash(ls [ab]*)",
+    "Read(/tmp/*)",
+    "WebFetch",
+    "Edit(src/app.py)",
+]
+
+
+class TestCompiledMatcher:
+    @pytest.mark.parametrize("tool_name, content", [
+        ("Bash", "npm test"),
+        ("Bash", "npm test --watch"),
+        ("Bash", "git log --oneline"),
+        ("Bash", "git log"),
+        ("Bash", "ls alpha"),
+        ("Bash", "ls charlie"),
+        ("Bash", "git log x\nrm -rf /"),
+        ("Read", "/tmp/a/b"),
+        ("Read", "/etc/passwd"),
+        ("WebFetch", "https://example.com"),
+        ("Edit", "src/app.py"),
+        ("Edit", "src/app.pyc"),
+        ("Write", "src/app.py"),
+    ])
+    def test_agrees_with_fnmatch_per_pattern(self, tool_name, content):
+        perm = load_perm()
+        expected = any(
+            tool == tool_name and (glob is None or fnmatch.fnmatch(content, glob))
+            for tool, glob in map(perm._split_allow_pattern, _ALLOW)
+        )
+        tools = perm.compile_allow_patterns(_ALLOW)
+        assert perm.matcher_allows(tools, tool_name, content) is expected
+
+    def test_literals_and_globs_are_separated(self):
+        tools = load_perm().compile_allow_patterns(_ALLOW)
+        assert tools["Bash"]["literals"] == ["npm test"]
+        assert tools["Bash"]["regex"].count("|") == 1
+        assert tools["WebFetch"]["any"] is True
+
+    @pytest.fixture
+    def nongit(self, tmp_path, monkeypatch):
+        home = tmp_path / "home"
+        home.mkdir()
+        monkeypatch.setenv("HOME", str(home))
+        monkeypatch.setenv("PERM_HOOK_CACHE_DIR", str(tmp_path / "cache"))
+        nongit = tmp_path / "nongit"
+        nongit.mkdir()
+        monkeypatch.chdir(nongit)
+        load_perm().cmd_allow("sess", ["Bash(echo *)"], False)
+        return nongit
+
+    def test_cache_hit_skips_root_resolution(self, nongit, monkeypatch):
+        perm = load_perm()
+        assert perm.matcher_allows(perm.load_allow_matcher(str(nongit)), "Bash", "echo hi")
+
+        perm = load_perm()
+        monkeypatch.setattr(perm, "_resolve_root", lambda cwd=None: pytest.fail("resolved root on a cache hit"))
+        assert perm.matcher_allows(perm.load_allow_matcher(str(nongit)), "Bash", "echo hi")
+
+    def test_settings_change_invalidates_cache(self, nongit):
+        perm = load_perm()
+        assert not perm.matcher_allows(perm.load_allow_matcher(str(nongit)), "Bash", "pwd")
+
+        load_perm().cmd_always(["Bash(pwd)"], False)
+
+        perm = load_perm()
+        assert perm.matcher_allows(perm.load_allow_matcher(str(nongit)), "Bash", "pwd")
+
+    def test_new_enclosing_repo_invalidates_cached_root(self, nongit):
+        perm = load_perm()
+        assert perm.load_allow_matcher(str(nongit))
+
+        _init_git_repo(nongit.parent)
+
+        perm = load_perm()
+        # The repo root (nongit's parent) has no settings file of its own.
+        assert perm.load_allow_matcher(str(nongit)) is None
+
+
+# ---------------------------------------------------------------------------
+# Transactional batch updates
+# ---------------------------------------------------------------------------
+
+def _perm_cli(cwd: Path, *args: str) -> subprocess.Popen:
+    return subprocess.Popen(
+        [sys.executable, str(_PERM_PATH), *args],
+        cwd=cwd, env=_subprocess_env(),
+        stdout=subprocess.PIPE, stderr=subprocess.PIPE, text=True,
+    )
+
+
+class TestTransactions:
+    @pytest.fixture
+    def repo(self, tmp_path, monkeypatch):
+        home = tmp_path / "home"
+        home.mkdir()
+        monkeypatch.setenv("HOME", str(home))
+        repo = tmp_path / "repo"
+        repo.mkdir()
+        _init_git_repo(repo)
+        monkeypatch.chdir(repo)
+        return repo
+
+    def test_cleanup_writes_each_file_once(self, repo, monkeypatch):
+        perm = load_perm()
+        perm.cmd_allow("sess-a", [f"Bash(cmd{n} *)" for n in range(50)], False)
+        perm.cmd_allow("sess-b", ["Bash(cmd0 *)"], False)
+
+        perm = load_perm()
+        writes = []
+        real_write = perm._write_json
+        monkeypatch.setattr(perm, "_write_json", lambda path, data: (writes.append(path.name), real_write(path, data)))
+        perm.cmd_cleanup("sess-a", False)
+
+        assert sorted(writes) == [".perm-tracking.json", "settings.local.json"]
+        settings = json.loads((repo / ".claude" / "settings.local.json").read_text())
+        assert settings["permissions"]["allow"] == ["Bash(cmd0 *)"]
+
+    def test_failure_inside_transaction_writes_nothing(self, repo):
+        perm = load_perm()
+        perm.cmd_allow("sess-a", ["Bash(ls)"], False)
+        before = (repo / ".claude" / ".perm-tracking.json").read_text()
+
+        perm = load_perm()
+        with pytest.raises(RuntimeError):
+            with perm._transaction() as (settings, tracking):
+                tracking["temporary"].clear()
+                raise RuntimeError("boom")
+
+        assert (repo / ".claude" / ".perm-tracking.json").read_text() == before
+
+    def test_concurrent_sessions_stress(self, repo):
+        sessions = [f"sess-{n}" for n in range(8)]
+        shared = ["Bash(git status)", "Bash(npm test)"]
+        load_perm().cmd_always(["Bash(make)"], False)
+
+        # Every session grants its own patterns plus the shared ones, all at once.
+        procs = [
+            _perm_cli(repo, "--session", s, "allow", *[f"Bash({s} job{n})" for n in range(15)], *shared)
+            for s in sessions
+        ]
+        assert [p.wait() for p in procs] == [0] * len(procs)
+
+        tracking = json.loads((repo / ".claude" / ".perm-tracking.json").read_text())
+        assert len(tracking["temporary"]) == 15 * len(sessions) + len(shared)
+        assert set(tracking["temporary"]["Bash(npm test)"]) == set(sessions)
+
+        # Plant one stale claim so cleanup-stale has work racing the cleanups.
+        tracking["temporary"]["Bash(old)"] = {"gone-session": 0}
+        (repo / ".claude" / ".perm-tracking.json").write_text(json.dumps(tracking))
+        settings_path = repo / ".claude" / "settings.local.json"
+        settings = json.loads(settings_path.read_text())
+        settings["permissions"]["allow"].append("Bash(old)")
+        settings_path.write_text(json.dumps(settings))
+
+        # Half the sessions clean up concurrently with cleanup-stale runs.
+        leaving, staying = sessions[:4], sessions[4:]
+        procs = [_perm_cli(repo, "--session", s, "cleanup") for s in leaving]
+        procs += [_perm_cli(repo, "cleanup-stale") for _ in range(3)]
+        assert [p.wait() for p in procs] == [0] * len(procs)
+
+        tracking = json.loads((repo / ".claude" / ".perm-tracking.json").read_text())
+        allow = json.loads(settings_path.read_text())["permissions"]["allow"]
+        expected = {f"Bash({s} job{n})" for s in staying for n in range(15)} | set(shared)
+        assert set(tracking["temporary"]) == expected
+        assert set(allow) == expected | {"Bash(make)"}
+        assert len(allow) == len(set(allow))
+        assert set(tracking["temporary"]["Bash(npm test)"]) == set(staying)
+        assert tracking["permanent"] == ["Bash(make)"]
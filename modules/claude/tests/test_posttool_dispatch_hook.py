@@ -0,0 +1,209 @@
+"""
+Tests for modules/claude/posttool-dispatch-hook.py.
+
+Covered paths:
+- trigger_matches: tool-name and regex predicates, entries without either,
+  a broken regex fails open
+- load_manifest drops malformed entries and survives a missing file
+- dispatch execs only matching hooks with the original payload on stdin
+- outputs of several matched hooks merge into one hookSpecificOutput
+- exit status: 2 wins, otherwise the first non-zero status
+- matched/skipped counters accumulate across invocations
+- the shipped predicates are supersets of each hook's own check
+"""
+
+import importlib.util
+import json
+import re
+import sys
+from pathlib import Path
+
+import pytest
+
+# ---------------------------------------------------------------------------
+# Hook module loader
+# ---------------------------------------------------------------------------
+
+_HOOK_DIR = Path(__file__).parent.parent
+_HOOK_PATH = _HOOK_DIR / "posttool-dispatch-hook.py"
+
+
+def load_hook():
+    """Import posttool-dispatch-hook.py as a module without executing main()."""
+    spec = importlib.util.spec_from_file_location("posttool_dispatch_hook", _HOOK_PATH)
+    mod = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(mod)
+    return mod
+
+
+@pytest.fixture(scope="module")
+def hook():
+    """Load the dispatcher module once per test module."""
+    return load_hook()
+
+
+@pytest.fixture
+def counts_path(hook, tmp_path, monkeypatch):
+    path = tmp_path / "metrics" / "posttool-dispatch-counts.json"
+    monkeypatch.setattr(hook, "_COUNTS_PATH", path)
+    return path
+
+
+# ---------------------------------------------------------------------------
+# Helpers
+# ---------------------------------------------------------------------------
+
+def _script(tmp_path, name, body):
+    """Write a tiny Python hook that runs `body` with the payload in `payload`."""
+    path = tmp_path / f"{name}.py"
+    path.write_text("import json, sys\npayload = json.loads(sys.stdin.read())\n" + body)
+    return [sys.executable, str(path)]
+
+
+def _entry(name, command, pattern=None, tool="Bash"):
+    entry = {"name": name, "command": command, "tool": tool}
+    if pattern is not None:
+        entry["pattern"] = pattern
+    return entry
+
+
+def _payload(command, tool_name="Bash"):
+    return json.dumps({"tool_name": tool_name, "tool_input": {"command": command}, "session_id": "s"})
+
+
+def _context(text):
+    return (
+        "print(json.dumps({'hookSpecificOutput': {'hookEventName': 'PostToolUse', "
+        f"'additionalContext': {text!r}}}}}))\n"
+    )
+
+
+# ---------------------------------------------------------------------------
+# Tests: predicates and manifest
+# ---------------------------------------------------------------------------
+
+class TestTriggers:
+    @pytest.mark.parametrize("entry, tool_name, command, expected", [
+        ({"tool": "Bash", "pattern": r"^kanban\s+done\s"}, "Bash", "kanban done 4", True),
+        ({"tool": "Bash", "pattern": r"^kanban\s+done\s"}, "Bash", "ls -la", False),
+        ({"tool": "Bash", "pattern": r"^kanban\s+done\s"}, "Read", "kanban done 4", False),
+        ({"tool": ["Bash", "TaskStop"]}, "TaskStop", "", True),
+        ({}, "Anything", "", True),
+        ({"pattern": "(unclosed"}, "Bash", "ls", True),
+    ])
+    def test_trigger_matches(self, hook, entry, tool_name, command, expected):
+        assert hook.trigger_matches(entry, tool_name, command) is expected
+
+    def test_malformed_entries_are_dropped(self, hook, tmp_path, capsys):
+        manifest = tmp_path / "manifest.json"
+        manifest.write_text(json.dumps([
+            {"name": "ok", "command": ["/bin/true"]},
+            {"name": "no-command"},
+            {"command": ["/bin/true"]},
+            "not an object",
+        ]))
+        assert [e["name"] for e in hook.load_manifest(str(manifest))] == ["ok"]
+        assert capsys.readouterr().err.count("malformed") == 3
+
+    def test_missing_manifest_runs_nothing(self, hook, tmp_path):
+        assert hook.load_manifest(str(tmp_path / "absent.json")) == []
+
+
+# ---------------------------------------------------------------------------
+# Tests: dispatch
+# ---------------------------------------------------------------------------
+
+class TestDispatch:
+    def test_only_matching_hooks_run(self, hook, tmp_path, counts_path, capsys):
+        marker = tmp_path / "ran"
+        entries = [
+            _entry("done", _script(tmp_path, "done", f"open({str(marker)!r}, 'a').write('done ' + payload['tool_input']['command'] + '\\n')\n"), r"^kanban\s+done\s"),
+            _entry("crew", _script(tmp_path, "crew", f"open({str(marker)!r}, 'a').write('crew\\n')\n"), r"^crew\s+create\s"),
+        ]
+
+        assert hook.dispatch(_payload("kanban done 7"), entries) == 0
+
+        assert marker.read_text() == "done kanban done 7\n"
+        assert capsys.readouterr().out == ""
+
+    def test_no_match_spawns_nothing(self, hook, tmp_path, counts_path, monkeypatch):
+        monkeypatch.setattr(hook, "run_hook", lambda *a: pytest.fail("hook was exec'd"))
+        entries = [_entry("done", ["/nonexistent"], r"^kanban\s+done\s")]
+        assert hook.dispatch(_payload("git status"), entries) == 0
+
+    def test_outputs_are_merged(self, hook, tmp_path, counts_path, capsys):
+        entries = [
+            _entry("a", _script(tmp_path, "a", _context("first")), "kanban"),
+            _entry("b", _script(tmp_path, "b", _context("second")), "kanban"),
+        ]
+
+        hook.dispatch(_payload("kanban done 1"), entries)
+
+        out = json.loads(capsys.readouterr().out)
+        assert out == {"hookSpecificOutput": {"hookEventName": "PostToolUse", "additionalContext": "first\n\nsecond"}}
+
+    def test_single_output_passes_through_verbatim(self, hook):
+        assert hook.merge_outputs(["", '{"x": 1}\n']) == '{"x": 1}\n'
+
+    @pytest.mark.parametrize("codes, expected", [((0, 0), 0), ((1, 2), 2), ((3, 1), 3), ((0, 1), 1)])
+    def test_exit_status(self, hook, tmp_path, counts_path, capsys, codes, expected):
+        entries = [
+            _entry(f"h{i}", _script(tmp_path, f"h{i}", f"sys.stderr.write('h{i}\\n'); sys.exit({code})\n"), "x")
+            for i, code in enumerate(codes)
+        ]
+        assert hook.dispatch(_payload("x"), entries) == expected
+        assert capsys.readouterr().err == "h0\nh1\n"
+
+    def test_unstartable_hook_is_non_blocking(self, hook, tmp_path, counts_path, capsys):
+        assert hook.dispatch(_payload("x"), [_entry("gone", [str(tmp_path / "missing")], "x")]) == 1
+        assert "cannot run gone" in capsys.readouterr().err
+
+
+class TestCounts:
+    def test_matched_and_skipped_accumulate(self, hook, tmp_path, counts_path):
+        entries = [
+            _entry("done", _script(tmp_path, "done", ""), r"^kanban\s+done\s"),
+            _entry("crew", _script(tmp_path, "crew", ""), r"^crew\s"),
+        ]
+        for command in ("kanban done 1", "ls", "git status"):
+            hook.dispatch(_payload(command), entries)
+
+        data = json.loads(counts_path.read_text())
+        assert data["invocations"] == 3
+        assert data["dispatched"] == 1
+        assert data["hooks"] == {"done": {"matched": 1, "skipped": 2}, "crew": {"matched": 0, "skipped": 3}}
+
+    def test_corrupt_counts_file_is_reset(self, hook, counts_path):
+        counts_path.parent.mkdir(parents=True)
+        counts_path.write_text("{not json")
+        hook.record_counts([{"name": "a"}], {"a"})
+        assert json.loads(counts_path.read_text())["hooks"] == {"a": {"matched": 1, "skipped": 0}}
+
+
+# ---------------------------------------------------------------------------
+# Tests: shipped manifest predicates
+# ---------------------------------------------------------------------------
+
+def _nix_patterns():
+    """The pattern strings from postToolBashTriggers in default.nix."""
+    nix = (_HOOK_DIR / "default.nix").read_text()
+    block = nix[nix.index("postToolBashTriggers ="):]
+    block = block[:block.index("]);")]
+    return dict(re.findall(r'name = "([^"]+)";.*?pattern = \'\'(.*?)\'\';', block, re.DOTALL))
+
+
+class TestShippedTriggers:
+    @pytest.mark.parametrize("name, command", [
+        ("claude-kanban-transition-hook", "kanban start 4"),
+        ("claude-kanban-transition-hook", "cd /x\nkanban done 3-5 'Shipped'"),
+        ("claude-kanban-transition-hook", "  KANBAN Cancel #9"),
+        ("kanban-done-reminder-hook", "  kanban done 12"),
+        ("crew-lifecycle-hook", "crew create alpha --tell 'hi'"),
+        ("crew-lifecycle-hook", " crew dismiss alpha"),
+    ])
+    def test_pattern_covers_what_the_hook_acts_on(self, name, command):
+        assert re.search(_nix_patterns()[name], command)
+
+    @pytest.mark.parametrize("command", ["ls -la", "git commit -m 'kanban done 4'", "kanban show 4", "crew list"])
+    def test_ordinary_commands_skip_every_hook(self, command):
+        assert not any(re.search(p, command) for p in _nix_patterns().values())
@@ -0,0 +1,192 @@
+"""
+Tests for modules/claude/senior-staff-staleness-hook.py.
+
+Covered paths:
+- the refresher polls each roster session's Claude pane via crew read and
+  writes a digest with a sha256 per session; failures become error notes
+- a refresher that cannot take the poll lock exits without polling
+- hook mode never runs crew read: it launches a detached refresher when the
+  last launch is stale, and not otherwise
+- hook mode prints only sessions whose digest hash changed since it last
+  printed them, then stays silent until they change again
+- no roster → silent no-op
+"""
+
+import fcntl
+import hashlib
+import importlib.util
+import io
+import json
+import subprocess
+import sys
+import time
+from pathlib import Path
+from types import SimpleNamespace
+
+import pytest
+
+# ---------------------------------------------------------------------------
+# Hook module loader
+# ---------------------------------------------------------------------------
+
+_HOOK_PATH = Path(__file__).parent.parent / "senior-staff-staleness-hook.py"
+
+
+def load_hook():
+    """Import senior-staff-staleness-hook.py as a module without executing main()."""
+    spec = importlib.util.spec_from_file_location("senior_staff_staleness_hook", _HOOK_PATH)
+    mod = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(mod)
+    return mod
+
+
+@pytest.fixture(scope="module")
+def hook():
+    """Load the senior-staff-staleness-hook module once per test module."""
+    return load_hook()
+
+
+@pytest.fixture
+def scratchpad(hook, tmp_path, monkeypatch):
+    """Point every .scratchpad path at tmp_path."""
+    for name in ("ROSTER_FILE", "TIMESTAMP_FILE", "DIGEST_FILE", "SEEN_FILE", "LOCK_FILE"):
+        monkeypatch.setattr(hook, name, tmp_path / getattr(hook, name).name)
+    return tmp_path
+
+
+@pytest.fixture
+def popen_calls(hook, monkeypatch):
+    calls = []
+    monkeypatch.setattr(hook.subprocess, "Popen", lambda argv, **kw: calls.append((argv, kw)))
+    return calls
+
+
+# ---------------------------------------------------------------------------
+# Helpers
+# ---------------------------------------------------------------------------
+
+_ROSTER = {"sessions": [
+    {"window": "pricing", "workstream": "Stripe pricing", "panes": {"0": "zsh", "1": "claude (staff)"}},
+    {"window": "infra", "panes": {}},
+    {"workstream": "no window"},
+]}
+
+
+def _fake_crew(outputs):
+    """subprocess.run stand-in: crew read <pane_ref> → outputs[pane_ref]."""
+    def _run(argv, **kwargs):
+        result = outputs[argv[2]]
+        if isinstance(result, Exception):
+            raise result
+        code, out = result
+        return SimpleNamespace(returncode=code, stdout=out)
+    return _run
+
+
+def _run_hook(hook, monkeypatch, capsys, *argv):
+    monkeypatch.setattr(sys, "argv", ["senior-staff-staleness-hook", *argv])
+    monkeypatch.setattr(sys, "stdin", io.StringIO("{}"))
+    with pytest.raises(SystemExit) as exc:
+        hook.main()
+    assert exc.value.code == 0
+    return capsys.readouterr().out
+
+
+def _digest(**texts):
+    return {"version": 1, "refreshed_at": 1, "sessions": [
+        {"pane_ref": ref, "workstream": "", "ok": True, "text": text,
+         "hash": hashlib.sha256(text.encode()).hexdigest()}
+        for ref, text in texts.items()
+    ]}
+
+
+# ---------------------------------------------------------------------------
+# Tests: refresher
+# ---------------------------------------------------------------------------
+
+class TestRefresher:
+    def test_writes_hashed_digest(self, hook, scratchpad, monkeypatch):
+        (scratchpad / hook.ROSTER_FILE.name).write_text(json.dumps(_ROSTER))
+        monkeypatch.setattr(hook.subprocess, "run", _fake_crew({
+            "pricing.1": (0, "  working on tiers\n"),
+            "infra.0": subprocess.TimeoutExpired("crew", 10),
+        }))
+
+        hook.refresh()
+
+        digest = json.loads(hook.DIGEST_FILE.read_text())
+        pricing, infra = digest["sessions"]
+        assert (pricing["pane_ref"], pricing["ok"], pricing["text"]) == ("pricing.1", True, "working on tiers")
+        assert pricing["hash"] == hashlib.sha256(b"working on tiers").hexdigest()
+        assert (infra["pane_ref"], infra["ok"]) == ("infra.0", False)
+        assert "could not run crew read" in infra["text"]
+
+    def test_nonzero_crew_read_is_an_error_note(self, hook, monkeypatch):
+        monkeypatch.setattr(hook.subprocess, "run", _fake_crew({"w.0": (1, "")}))
+        ok, text = hook.read_session("w.0")
+        assert not ok and "unreadable via crew read (exit 1)" in text
+
+    def test_held_lock_skips_poll(self, hook, scratchpad, monkeypatch):
+        hook.ROSTER_FILE.write_text(json.dumps(_ROSTER))
+        monkeypatch.setattr(hook.subprocess, "run", lambda *a, **k: pytest.fail("polled while locked"))
+        with open(hook.LOCK_FILE, "a") as held:
+            fcntl.flock(held, fcntl.LOCK_EX)
+            hook.refresh()
+        assert not hook.DIGEST_FILE.exists()
+
+
+# ---------------------------------------------------------------------------
+# Tests: hook mode
+# ---------------------------------------------------------------------------
+
+class TestHookMode:
+    @pytest.fixture(autouse=True)
+    def _no_inline_polling(self, hook, monkeypatch):
+        monkeypatch.setattr(hook.subprocess, "run", lambda *a, **k: pytest.fail("hook ran crew read inline"))
+
+    def test_no_roster_is_silent(self, hook, scratchpad, popen_calls, monkeypatch, capsys):
+        assert _run_hook(hook, monkeypatch, capsys) == ""
+        assert popen_calls == []
+
+    def test_stale_launch_starts_detached_refresher(self, hook, scratchpad, popen_calls, monkeypatch, capsys):
+        hook.ROSTER_FILE.write_text(json.dumps(_ROSTER))
+
+        _run_hook(hook, monkeypatch, capsys)
+
+        ((argv, kwargs),) = popen_calls
+        assert argv[-1] == "--refresh"
+        assert kwargs["start_new_session"] is True
+        assert kwargs["env"]["CLAUDE_HOOK_TELEMETRY"] == "0"
+        assert int(hook.TIMESTAMP_FILE.read_text()) > 0
+
+    def test_fresh_launch_does_not_refresh(self, hook, scratchpad, popen_calls, monkeypatch, capsys):
+        hook.ROSTER_FILE.write_text(json.dumps(_ROSTER))
+        hook.TIMESTAMP_FILE.write_text(str(int(time.time())))
+        _run_hook(hook, monkeypatch, capsys)
+        assert popen_calls == []
+
+    def test_prints_only_changed_sessions(self, hook, scratchpad, popen_calls, monkeypatch, capsys):
+        hook.ROSTER_FILE.write_text(json.dumps(_ROSTER))
+        hook.DIGEST_FILE.write_text(json.dumps(_digest(**{"pricing.1": "a\nb", "infra.0": ""})))
+
+        first = _run_hook(hook, monkeypatch, capsys)
+        assert "Session: pricing.1\n  a\n  b" in first
+        assert "Session: infra.0\n  [no recent output]" in first
+
+        assert _run_hook(hook, monkeypatch, capsys) == ""
+
+        hook.DIGEST_FILE.write_text(json.dumps(_digest(**{"pricing.1": "a\nb\nc", "infra.0": ""})))
+        third = _run_hook(hook, monkeypatch, capsys)
+        assert "pricing.1" in third and "infra.0" not in third
+
+    def test_error_note_is_printed_verbatim(self, hook, scratchpad, popen_calls, monkeypatch, capsys):
+        hook.ROSTER_FILE.write_text(json.dumps(_ROSTER))
+        digest = _digest(**{"infra.0": "[infra.0 unreadable via crew read (exit 1)]"})
+        digest["sessions"][0]["ok"] = False
+        hook.DIGEST_FILE.write_text(json.dumps(digest))
+        assert "  [infra.0 unreadable via crew read (exit 1)]" in _run_hook(hook, monkeypatch, capsys)
+
+    def test_corrupt_digest_is_silent(self, hook, scratchpad, popen_calls, monkeypatch, capsys):
+        hook.ROSTER_FILE.write_text(json.dumps(_ROSTER))
+        hook.DIGEST_FILE.write_text("{torn")
+        assert _run_hook(hook, monkeypatch, capsys) == ""
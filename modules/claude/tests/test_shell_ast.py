@@ -0,0 +1,123 @@
+"""
+Tests for modules/claude/_shell_ast.py.
+
+Covered paths:
+- control operators split segments whether spaced, fused or quoted
+- backslash-newline continues a line outside single quotes only
+- redirects are recorded per segment; pipelines group `|` segments
+- a line with unbalanced quotes yields fallback segments that guards can opt out of
+- parse_command memoizes in-process only and writes nothing to disk
+- top_level_operators treats $(...) and quotes as opaque
+"""
+
+import importlib.util
+from pathlib import Path
+from unittest.mock import patch
+
+import pytest
+
+# ---------------------------------------------------------------------------
+# Module loader
+# ---------------------------------------------------------------------------
+
+_MODULE_PATH = Path(__file__).parent.parent / "_shell_ast.py"
+
+
+def load_module():
+    """Import _shell_ast.py as a fresh module (empty in-process memo)."""
+    spec = importlib.util.spec_from_file_location("_shell_ast_under_test", _MODULE_PATH)
+    mod = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(mod)
+    return mod
+
+
+@pytest.fixture
+def shell_ast():
+    return load_module()
+
+
+def _words(shell_ast, command):
+    return shell_ast.command_segments(shell_ast.parse_command(command))
+
+
+# ---------------------------------------------------------------------------
+# Tests: segmentation
+# ---------------------------------------------------------------------------
+
+class TestSegments:
+    @pytest.mark.parametrize("command, expected", [
+        ("git add . && git push", [["git", "add", "."], ["git", "push"]]),
+        ("git add .&&git push", [["git", "add", "."], ["git", "push"]]),
+        ("a;b||c", [["a"], ["b"], ["c"]]),
+        ("kanban|cat", [["kanban"], ["cat"]]),
+        ("sleep 1 & echo hi", [["sleep", "1"], ["echo", "hi"]]),
+    ])
+    def test_operators_split_segments(self, shell_ast, command, expected):
+        assert _words(shell_ast, command) == expected
+
+    def test_quoted_operators_stay_inside_words(self, shell_ast):
+        assert _words(shell_ast, 'git commit -m "a && b; c"&&git push') == [
+            ["git", "commit", "-m", "a && b; c"], ["git", "push"],
+        ]
+
+    def test_backslash_newline_continues_the_line(self, shell_ast):
+        assert _words(shell_ast, "git commit \\\n  --no-verify") == [["git", "commit", "--no-verify"]]
+
+    def test_single_quotes_keep_backslash_newline(self, shell_ast):
+        assert _words(shell_ast, "echo 'a\\\nb'") == [["echo", "a\\\nb"]]
+
+    def test_newline_starts_a_new_unit(self, shell_ast):
+        ast = shell_ast.parse_command("cd /tmp\nls")
+        assert [(seg["words"], seg["unit"]) for seg in ast["segments"]] == [(["cd", "/tmp"], 0), (["ls"], 1)]
+
+
+class TestRedirectsAndPipelines:
+    def test_redirects_do_not_split(self, shell_ast):
+        ast = shell_ast.parse_command("make 2>&1 | tee out &> /dev/null")
+        assert [seg["redirects"] for seg in ast["segments"]] == [
+            [["2>&", "1"]], [["&>", "/dev/null"]],
+        ]
+        assert ast["pipelines"] == [[0, 1]]
+
+    def test_pipelines_break_on_other_operators(self, shell_ast):
+        ast = shell_ast.parse_command("a | b && c > out")
+        assert ast["pipelines"] == [[0, 1], [2]]
+        assert ast["segments"][2]["redirects"] == [[">", "out"]]
+
+
+class TestFallback:
+    def test_unbalanced_line_yields_fallback_segments(self, shell_ast):
+        ast = shell_ast.parse_command('echo ok\necho "open && rm -rf x')
+        assert [(seg["words"], seg["fallback"]) for seg in ast["segments"]] == [
+            (["echo", "ok"], False),
+            (["echo", "open"], True),
+            (["rm", "-rf", "x"], True),
+        ]
+        assert shell_ast.command_segments(ast, include_fallback=False) == [["echo", "ok"]]
+
+
+# ---------------------------------------------------------------------------
+# Tests: memoization
+# ---------------------------------------------------------------------------
+
+class TestMemo:
+    def test_repeat_parse_is_served_from_the_memo(self, shell_ast):
+        first = shell_ast.parse_command("git status && git push")
+        with patch.object(shell_ast, "_parse", side_effect=AssertionError("re-parsed")):
+            assert shell_ast.parse_command("git status && git push") is first
+
+    def test_nothing_is_written_to_disk(self, shell_ast, tmp_path, monkeypatch):
+        monkeypatch.setenv("HOME", str(tmp_path))
+        monkeypatch.chdir(tmp_path)
+        shell_ast.parse_command("kanban done 5")
+        assert list(tmp_path.rglob("*")) == []
+
+
+# ---------------------------------------------------------------------------
+# Tests: top_level_operators
+# ---------------------------------------------------------------------------
+
+class TestTopLevelOperators:
+    def test_substitution_and_quotes_are_opaque(self, shell_ast):
+        cmd = 'kanban do "$(cat a && cat b)" \'x || y\' && echo done'
+        assert [op for _, _, op in shell_ast.top_level_operators(cmd)] == ["&&"]
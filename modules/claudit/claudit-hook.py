@@ -21,6 +21,7 @@ import re
 import sqlite3
 import subprocess
 import sys
+import time
 import traceback
 from datetime import datetime
 from pathlib import Path
@@ -32,6 +33,11 @@ from pathlib import Path
 
 DB_PATH = Path.home() / ".claude" / "metrics" / "claudit.db"
 ERROR_LOG_PATH = Path.home() / ".claude" / "metrics" / "claudit-errors.log"
+HOOK_TIMINGS_SPOOL_PATH = Path.home() / ".claude" / "metrics" / "hook-timings.jsonl"
+
+# A rotated spool file is only ingested once it has been quiet this long: a
+# hook that opened the live file just before the rename may still be writing.
+HOOK_TIMINGS_SETTLE_SECONDS = 2.0
 
 # ---------------------------------------------------------------------------
 # Pricing table — per 1M tokens, keyed by normalized model name
@@ -184,6 +190,26 @@ CREATE INDEX IF NOT EXISTS idx_claudit_annotations_recorded_at
 ON claudit_annotations(recorded_at);
 """
 
+# hook_timings is filled from ~/.claude/metrics/hook-timings.jsonl, which every
+# Python hook in modules/claude appends to via _hook_telemetry.py (one row per
+# hook run). id is "<pid>-<perf_counter_ns>" from the writer, so re-ingesting
+# a spool file after a crash is a no-op. parent is set when the hook was
+# exec'd by another hook (posttool-dispatch-hook) and already counted there.
+CREATE_HOOK_TIMINGS_SQL = """
+CREATE TABLE IF NOT EXISTS hook_timings (
+    id TEXT PRIMARY KEY,
+    hook TEXT NOT NULL,
+    event TEXT NOT NULL DEFAULT '',
+    matcher TEXT NOT NULL DEFAULT '',
+    exit_path TEXT NOT NULL,
+    exit_code INTEGER NOT NULL DEFAULT 0,
+    duration_ms REAL NOT NULL,
+    started_at TEXT NOT NULL,
+    session_id TEXT NOT NULL DEFAULT '',
+    parent TEXT
+)
+"""
+
 CREATE_INDEXES_SQL = [
     "CREATE INDEX IF NOT EXISTS idx_am_session_id ON agent_metrics (session_id)",
     "CREATE INDEX IF NOT EXISTS idx_am_kanban_session ON agent_metrics (kanban_session)",
@@ -198,6 +224,8 @@ CREATE_INDEXES_SQL = [
     "CREATE INDEX IF NOT EXISTS idx_kce_kanban_session ON kanban_card_events (kanban_session)",
     "CREATE INDEX IF NOT EXISTS idx_kce_card_number ON kanban_card_events (card_number)",
     "CREATE INDEX IF NOT EXISTS idx_kce_recorded_at ON kanban_card_events (recorded_at)",
+    "CREATE INDEX IF NOT EXISTS idx_ht_hook_started_at ON hook_timings (hook, started_at)",
+    "CREATE INDEX IF NOT EXISTS idx_ht_session_id ON hook_timings (session_id)",
 ]
 
 
@@ -419,35 +447,97 @@ def get_git_repo(cwd: str) -> str:
 # Kanban session lookup
 # ---------------------------------------------------------------------------
 
+# Boards keep the prefix -> name mapping in two files: sessions.json (the
+# compacted snapshot) and sessions.jsonl (an append-only log of
+# {"p": prefix, "name": name} lines, the last line for a prefix winning).
+# See § Session names in kanban.py; keep the two readers in step.
+#
+# Both lookups are memoized for the life of the process. The cwd -> boards
+# walk is cached by directory. The parsed mapping is cached per board, keyed
+# by the files' (inode, mtime_ns, size). A repeat lookup is then a dict hit
+# plus two stat() calls.
+
+_boards_for_cwd: dict[str, list[Path]] = {}
+_sessions_memo: dict[Path, tuple[tuple, dict]] = {}
+
+
+def _stat_key(path: Path) -> tuple | None:
+    try:
+        st = path.stat()
+    except OSError:
+        return None
+    return (st.st_ino, st.st_mtime_ns, st.st_size)
+
+
 def _read_sessions_file(path: Path) -> dict:
     """Read a sessions.json file, returning empty dict on any failure."""
     try:
         with open(path, "r", encoding="utf-8") as fh:
-            return json.load(fh)
+            sessions = json.load(fh)
+        return sessions if isinstance(sessions, dict) else {}
     except Exception:
         return {}
 
 
+def _read_board_sessions(board: Path) -> dict:
+    """A board's prefix -> name mapping: snapshot plus replayed log."""
+    snapshot_path = board / "sessions.json"
+    log_path = board / "sessions.jsonl"
+    key = (_stat_key(snapshot_path), _stat_key(log_path))
+    memo = _sessions_memo.get(board)
+    if memo is not None and memo[0] == key:
+        return memo[1]
+
+    sessions = _read_sessions_file(snapshot_path)
+    try:
+        with open(log_path, "r", encoding="utf-8") as fh:
+            for line in fh:
+                try:
+                    entry = json.loads(line)
+                except ValueError:
+                    continue  # torn trailing line
+                if isinstance(entry, dict) and "p" in entry and "name" in entry:
+                    sessions[entry["p"]] = entry["name"]
+    except OSError:
+        pass
+
+    _sessions_memo[board] = (key, sessions)
+    return sessions
+
+
+def _kanban_boards(working_directory: str) -> list[Path]:
+    """.kanban directories from cwd up to $HOME (or /), nearest first."""
+    cached = _boards_for_cwd.get(working_directory)
+    if cached is not None:
+        return cached
+
+    boards = []
+    home = Path.home()
+    current = Path(working_directory).resolve()
+    while True:
+        candidate = current / ".kanban"
+        if candidate.is_dir():
+            boards.append(candidate)
+        if current == home or current.parent == current:
+            break
+        current = current.parent
+
+    _boards_for_cwd[working_directory] = boards
+    return boards
+
+
 def lookup_kanban_session(working_directory: str, session_id: str) -> str:
     """
     Return the friendly kanban session name for session_id, or 'unknown'.
 
-    Walk up from cwd looking for .kanban/sessions.json. Sessions are keyed
-    by the first 8 characters of the Claude session UUID.
+    Walk up from cwd looking for .kanban boards. Sessions are keyed by the
+    first 8 characters of the Claude session UUID.
     """
     prefix = session_id[:8]
-    home = Path.home()
-    current = Path(working_directory).resolve()
-
-    while True:
-        candidate = current / ".kanban" / "sessions.json"
-        sessions = _read_sessions_file(candidate)
-        result = sessions.get(prefix)
+    for board in _kanban_boards(working_directory):
+        result = _read_board_sessions(board).get(prefix)
         if result is not None:
             return result
-        if current == home or current.parent == current:
-            break
-        current = current.parent
 
     return "unknown"
 
@@ -685,6 +775,7 @@ def open_db() -> sqlite3.Connection:
         conn.execute(CREATE_KANBAN_CARD_EVENTS_SQL)
         conn.execute(CREATE_CLAUDIT_ANNOTATIONS_SQL)
         conn.execute(CREATE_CLAUDIT_ANNOTATIONS_INDEX_SQL)
+        conn.execute(CREATE_HOOK_TIMINGS_SQL)
 
         # Idempotent migrations: add V6/V8 columns if not already present.
         # SQLite raises OperationalError "duplicate column name" when a column
@@ -854,6 +945,76 @@ def write_permission_denials(
         )
 
 
+# ---------------------------------------------------------------------------
+# Hook timings ingestion
+#
+# Hooks append to the spool with O_APPEND and no lock (see
+# modules/claude/_hook_telemetry.py). Draining renames the live file to
+# hook-timings.<ns>.ingest, so new records start a fresh spool, then loads
+# every settled .ingest file in one transaction and deletes it after commit.
+# ---------------------------------------------------------------------------
+
+_HOOK_TIMING_COLUMNS = (
+    "id", "hook", "event", "matcher", "exit_path", "exit_code",
+    "duration_ms", "started_at", "session_id", "parent",
+)
+
+
+def _hook_timing_row(line: str) -> tuple | None:
+    """Parse one spool line into an INSERT row; None for junk lines."""
+    try:
+        record = json.loads(line)
+        if not isinstance(record, dict) or not record.get("id") or not record.get("hook"):
+            return None
+        return (
+            str(record["id"]),
+            str(record["hook"]),
+            str(record.get("event") or ""),
+            str(record.get("matcher") or ""),
+            str(record.get("exit_path") or "skip"),
+            int(record.get("exit_code") or 0),
+            float(record["duration_ms"]),
+            str(record["started_at"]),
+            str(record.get("session_id") or ""),
+            record.get("parent") or None,
+        )
+    except (ValueError, TypeError, KeyError):
+        return None
+
+
+def ingest_hook_timings(conn: sqlite3.Connection, spool_path: Path = HOOK_TIMINGS_SPOOL_PATH) -> int:
+    """Move spooled hook timing records into hook_timings. Returns rows inserted."""
+    try:
+        if spool_path.stat().st_size > 0:
+            os.rename(spool_path, spool_path.with_name(f"{spool_path.stem}.{time.time_ns()}.ingest"))
+    except FileNotFoundError:
+        pass
+
+    cutoff = time.time() - HOOK_TIMINGS_SETTLE_SECONDS
+    settled = sorted(
+        path for path in spool_path.parent.glob(f"{spool_path.stem}.*.ingest")
+        if path.stat().st_mtime <= cutoff
+    )
+    if not settled:
+        return 0
+
+    rows = []
+    for path in settled:
+        with open(path, encoding="utf-8", errors="replace") as fh:
+            rows.extend(row for row in map(_hook_timing_row, fh) if row is not None)
+
+    placeholders = ", ".join("?" for _ in _HOOK_TIMING_COLUMNS)
+    before = conn.total_changes
+    conn.executemany(
+        f"INSERT OR IGNORE INTO hook_timings ({', '.join(_HOOK_TIMING_COLUMNS)}) VALUES ({placeholders})",
+        rows,
+    )
+    conn.commit()
+    for path in settled:
+        path.unlink(missing_ok=True)
+    return conn.total_changes - before
+
+
 # ---------------------------------------------------------------------------
 # Error logging
 # ---------------------------------------------------------------------------
@@ -964,4 +1125,14 @@ if __name__ == "__main__":
         main()
     except Exception as exc:
         log_error(f"hook error: {exc}\n{traceback.format_exc()}")
+    # Independent of main(): a Stop with no assistant turns still drains the
+    # hook timing spool.
+    try:
+        conn = open_db()
+        try:
+            ingest_hook_timings(conn)
+        finally:
+            conn.close()
+    except Exception as exc:
+        log_error(f"hook timings ingest error: {exc}\n{traceback.format_exc()}")
     sys.exit(0)
@@ -129,6 +129,26 @@ CREATE TABLE IF NOT EXISTS claudit_annotations (
 )
 """
 
+# hook_timings is filled from ~/.claude/metrics/hook-timings.jsonl, which every
+# Python hook in modules/claude appends to via _hook_telemetry.py (one row per
+# hook run). id is "<pid>-<perf_counter_ns>" from the writer, so re-ingesting
+# a spool file after a crash is a no-op. parent is set when the hook was
+# exec'd by another hook (posttool-dispatch-hook) and already counted there.
+CREATE_HOOK_TIMINGS_SQL = """
+CREATE TABLE IF NOT EXISTS hook_timings (
+    id TEXT PRIMARY KEY,
+    hook TEXT NOT NULL,
+    event TEXT NOT NULL DEFAULT '',
+    matcher TEXT NOT NULL DEFAULT '',
+    exit_path TEXT NOT NULL,
+    exit_code INTEGER NOT NULL DEFAULT 0,
+    duration_ms REAL NOT NULL,
+    started_at TEXT NOT NULL,
+    session_id TEXT NOT NULL DEFAULT '',
+    parent TEXT
+)
+"""
+
 CREATE_INDEXES_SQL = [
     "CREATE INDEX IF NOT EXISTS idx_am_session_id ON agent_metrics (session_id)",
     "CREATE INDEX IF NOT EXISTS idx_am_kanban_session ON agent_metrics (kanban_session)",
@@ -144,6 +164,8 @@ CREATE_INDEXES_SQL = [
     "CREATE INDEX IF NOT EXISTS idx_kce_card_number ON kanban_card_events (card_number)",
     "CREATE INDEX IF NOT EXISTS idx_kce_recorded_at ON kanban_card_events (recorded_at)",
     "CREATE INDEX IF NOT EXISTS idx_claudit_annotations_recorded_at ON claudit_annotations (recorded_at)",
+    "CREATE INDEX IF NOT EXISTS idx_ht_hook_started_at ON hook_timings (hook, started_at)",
+    "CREATE INDEX IF NOT EXISTS idx_ht_session_id ON hook_timings (session_id)",
 ]
 
 
@@ -160,6 +182,7 @@ def ensure_schema(conn: sqlite3.Connection) -> None:
     conn.execute(CREATE_PERMISSION_DENIALS_SQL)
     conn.execute(CREATE_KANBAN_CARD_EVENTS_SQL)
     conn.execute(CREATE_CLAUDIT_ANNOTATIONS_SQL)
+    conn.execute(CREATE_HOOK_TIMINGS_SQL)
     for idx_sql in CREATE_INDEXES_SQL:
         conn.execute(idx_sql)
     conn.commit()
@@ -0,0 +1,116 @@
+"""
+Tests for claudit-hook.py hook timing ingestion.
+
+Covers:
+- settled spool records land in hook_timings and the spool is consumed
+- re-ingesting a record (crash between commit and unlink) inserts nothing
+- junk lines are skipped without losing the rest of the file
+- a spool file written to within the settle window waits for the next run
+"""
+
+import importlib.util
+import json
+import os
+import time
+from pathlib import Path
+
+import pytest
+
+
+# ---------------------------------------------------------------------------
+# Module loader
+# ---------------------------------------------------------------------------
+
+_CLAUDIT_HOOK_PATH = Path(__file__).parent / "claudit-hook.py"
+
+
+def load_claudit_hook():
+    """Import claudit-hook.py as a module (hyphenated filename needs importlib)."""
+    spec = importlib.util.spec_from_file_location("claudit_hook_timings", _CLAUDIT_HOOK_PATH)
+    mod = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(mod)
+    return mod
+
+
+@pytest.fixture(scope="module")
+def claudit_hook():
+    return load_claudit_hook()
+
+
+# ---------------------------------------------------------------------------
+# Helpers
+# ---------------------------------------------------------------------------
+
+@pytest.fixture
+def conn(claudit_hook, tmp_path, monkeypatch):
+    monkeypatch.setattr(claudit_hook, "DB_PATH", tmp_path / "claudit.db")
+    conn = claudit_hook.open_db()
+    yield conn
+    conn.close()
+
+
+def _record(n, hook="kanban-pretool-hook", **extra):
+    record = {
+        "id": f"100-{n}", "hook": hook, "event": "PreToolUse", "matcher": "Bash",
+        "exit_path": "skip", "exit_code": 0, "duration_ms": 40.0 + n,
+        "started_at": "2026-10-19T10:00:00.000000Z", "session_id": "s1", "parent": None,
+    }
+    record.update(extra)
+    return json.dumps(record)
+
+
+def _write_spool(path, lines, age=10.0):
+    path.write_text("".join(line + "\n" for line in lines))
+    stamp = time.time() - age
+    os.utime(path, (stamp, stamp))
+
+
+def _rows(conn):
+    return conn.execute("SELECT id, hook, duration_ms, parent FROM hook_timings ORDER BY id").fetchall()
+
+
+# ---------------------------------------------------------------------------
+# Tests
+# ---------------------------------------------------------------------------
+
+class TestIngestHookTimings:
+    def test_settled_spool_is_loaded_and_consumed(self, claudit_hook, conn, tmp_path):
+        spool = tmp_path / "hook-timings.jsonl"
+        _write_spool(spool, [_record(1), _record(2, hook="posttool-dispatch-hook", parent=None),
+                             _record(3, hook="kanban-done-reminder-hook", parent="posttool-dispatch-hook")])
+
+        assert claudit_hook.ingest_hook_timings(conn, spool) == 3
+
+        assert _rows(conn) == [
+            ("100-1", "kanban-pretool-hook", 41.0, None),
+            ("100-2", "posttool-dispatch-hook", 42.0, None),
+            ("100-3", "kanban-done-reminder-hook", 43.0, "posttool-dispatch-hook"),
+        ]
+        assert list(tmp_path.glob("hook-timings*")) == []
+
+    def test_reingest_is_a_no_op(self, claudit_hook, conn, tmp_path):
+        spool = tmp_path / "hook-timings.jsonl"
+        _write_spool(spool, [_record(1)])
+        claudit_hook.ingest_hook_timings(conn, spool)
+        _write_spool(tmp_path / "hook-timings.1.ingest", [_record(1)])
+
+        assert claudit_hook.ingest_hook_timings(conn, spool) == 0
+        assert len(_rows(conn)) == 1
+
+    def test_junk_lines_are_skipped(self, claudit_hook, conn, tmp_path):
+        spool = tmp_path / "hook-timings.jsonl"
+        _write_spool(spool, ["{torn", _record(1), '{"id": "x"}', _record(2, duration_ms="slow")])
+
+        assert claudit_hook.ingest_hook_timings(conn, spool) == 1
+        assert [row[0] for row in _rows(conn)] == ["100-1"]
+
+    def test_fresh_spool_waits_for_next_run(self, claudit_hook, conn, tmp_path):
+        spool = tmp_path / "hook-timings.jsonl"
+        _write_spool(spool, [_record(1)], age=0)
+
+        assert claudit_hook.ingest_hook_timings(conn, spool) == 0
+        assert not spool.exists()
+        assert len(list(tmp_path.glob("hook-timings.*.ingest"))) == 1
+
+    def test_missing_spool(self, claudit_hook, conn, tmp_path):
+        assert claudit_hook.ingest_hook_timings(conn, tmp_path / "hook-timings.jsonl") == 0
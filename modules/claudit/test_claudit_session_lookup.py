@@ -0,0 +1,78 @@
+"""
+Tests for claudit-hook.py kanban session lookup.
+
+Covers:
+- names are found in the sessions.jsonl log as well as the sessions.json
+  snapshot, the log winning
+- the nearest board that knows the prefix wins while walking up from cwd
+- unknown prefixes resolve to 'unknown'
+- repeat lookups are served from the in-process memo until a file changes
+"""
+
+import importlib.util
+import json
+from pathlib import Path
+from unittest.mock import patch
+
+import pytest
+
+
+# ---------------------------------------------------------------------------
+# Module loader
+# ---------------------------------------------------------------------------
+
+_CLAUDIT_HOOK_PATH = Path(__file__).parent / "claudit-hook.py"
+
+
+def load_claudit_hook():
+    """Import claudit-hook.py as a module (hyphenated filename needs importlib)."""
+    spec = importlib.util.spec_from_file_location("claudit_hook_session_lookup", _CLAUDIT_HOOK_PATH)
+    mod = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(mod)
+    return mod
+
+
+@pytest.fixture
+def claudit_hook():
+    # Fresh module per test: the memos are process-wide.
+    return load_claudit_hook()
+
+
+# ---------------------------------------------------------------------------
+# Tests
+# ---------------------------------------------------------------------------
+
+class TestLookupKanbanSession:
+    def test_log_overrides_snapshot(self, claudit_hook, tmp_path):
+        board = tmp_path / ".kanban"
+        board.mkdir()
+        (board / "sessions.json").write_text(json.dumps({"abcdef01": "old-name", "12345678": "other"}))
+        (board / "sessions.jsonl").write_text(json.dumps({"p": "abcdef01", "name": "new-name"}) + "\n{\"p\": ")
+
+        assert claudit_hook.lookup_kanban_session(str(tmp_path), "abcdef01-rest") == "new-name"
+        assert claudit_hook.lookup_kanban_session(str(tmp_path), "12345678-rest") == "other"
+        assert claudit_hook.lookup_kanban_session(str(tmp_path), "ffffffff-rest") == "unknown"
+
+    def test_walks_up_to_a_board_that_knows_the_session(self, claudit_hook, tmp_path):
+        outer = tmp_path / ".kanban"
+        outer.mkdir()
+        (outer / "sessions.jsonl").write_text(json.dumps({"p": "abcdef01", "name": "outer"}) + "\n")
+        nested = tmp_path / "pkg" / "src"
+        (tmp_path / "pkg" / ".kanban").mkdir(parents=True)
+        nested.mkdir()
+
+        assert claudit_hook.lookup_kanban_session(str(nested), "abcdef01") == "outer"
+
+    def test_repeat_lookup_is_memoized(self, claudit_hook, tmp_path):
+        board = tmp_path / ".kanban"
+        board.mkdir()
+        (board / "sessions.jsonl").write_text(json.dumps({"p": "abcdef01", "name": "first"}) + "\n")
+        assert claudit_hook.lookup_kanban_session(str(tmp_path), "abcdef01") == "first"
+
+        with patch.object(claudit_hook.json, "loads", side_effect=AssertionError("re-parsed")), \
+                patch.object(claudit_hook.Path, "is_dir", side_effect=AssertionError("re-walked")):
+            assert claudit_hook.lookup_kanban_session(str(tmp_path), "abcdef01") == "first"
+
+        with open(board / "sessions.jsonl", "a") as fh:
+            fh.write(json.dumps({"p": "abcdef01", "name": "renamed"}) + "\n")
+        assert claudit_hook.lookup_kanban_session(str(tmp_path), "abcdef01") == "renamed"
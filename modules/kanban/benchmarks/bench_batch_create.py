@@ -0,0 +1,115 @@
+#!/usr/bin/env python3
+"""
+Benchmark: create N cards with one `kanban do` array vs N single-card calls.
+
+Usage:
+    python3 modules/kanban/benchmarks/bench_batch_create.py [--cards 50] [--repeat 3]
+
+Each run gets a fresh temporary board seeded with in-flight cards, so the
+board-loading, identifier-search and conflict-check costs are realistic. Both
+modes run the full validation pipeline (identifier search via rg, MoV
+pre-pass, scope isolation, editFiles conflict check) against the current git
+checkout. The metrics DB is redirected into the temporary directory so the
+real ~/.claude/metrics/claudit.db is never touched.
+
+Reports the best wall-clock time of --repeat runs for each mode.
+"""
+
+import argparse
+import contextlib
+import importlib.util
+import io
+import json
+import sys
+import tempfile
+import time
+from pathlib import Path
+from types import SimpleNamespace
+
+_KANBAN_PATH = Path(__file__).parent.parent / "kanban.py"
+
+
+def load_kanban():
+    """Import kanban.py as a module (watchdog must be importable)."""
+    spec = importlib.util.spec_from_file_location("kanban_bench", _KANBAN_PATH)
+    mod = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(mod)
+    return mod
+
+
+def make_cards(count: int) -> list[dict]:
+    """Cards with disjoint editFiles, a backtick identifier each, and one
+    shared MoV chain — the shape of a typical planning wave."""
+    return [
+        {
+            "action": f"Update `load_kanban` call site {i}",
+            "intent": "Benchmark card",
+            "type": "work",
+            "editFiles": [f"bench/pkg{i}/module.py"],
+            "criteria": [{
+                "text": "module exists",
+                "mov_type": "programmatic",
+                "mov_commands": [{"cmd": "test -d /", "timeout": 5}],
+            }],
+        }
+        for i in range(count)
+    ]
+
+
+def seed_board(kanban, root: Path, inflight: int) -> None:
+    for col in kanban.COLUMNS:
+        (root / col).mkdir(parents=True, exist_ok=True)
+    for i in range(inflight):
+        card = kanban.make_card(
+            action=f"In-flight {i}", intent="Seed", edit_files=[f"seed/{i}.py"], session="seed",
+        )
+        kanban.write_card(root / ("doing" if i % 2 else "todo") / f"{i + 1}.json", card)
+
+
+def run_batch(kanban, root: Path, cards: list[dict]) -> None:
+    kanban.cmd_do(SimpleNamespace(
+        root=str(root), json_data=json.dumps(cards), json_file=None, session="bench", force=False,
+    ))
+
+
+def run_single(kanban, root: Path, cards: list[dict]) -> None:
+    for card in cards:
+        kanban.cmd_do(SimpleNamespace(
+            root=str(root), json_data=json.dumps(card), json_file=None, session="bench", force=False,
+        ))
+
+
+def time_mode(kanban, runner, count: int, inflight: int, repeat: int) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        with tempfile.TemporaryDirectory() as tmp:
+            root = Path(tmp) / ".kanban"
+            seed_board(kanban, root, inflight)
+            kanban._METRICS_DB_PATH = Path(tmp) / "claudit.db"
+            cards = make_cards(count)
+            with contextlib.redirect_stdout(io.StringIO()), contextlib.redirect_stderr(io.StringIO()):
+                start = time.perf_counter()
+                runner(kanban, root, cards)
+                best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--cards", type=int, default=50, help="cards to create (default: 50)")
+    parser.add_argument("--inflight", type=int, default=40, help="seeded todo/doing cards (default: 40)")
+    parser.add_argument("--repeat", type=int, default=3, help="runs per mode; best is reported (default: 3)")
+    args = parser.parse_args()
+
+    kanban = load_kanban()
+    single = time_mode(kanban, run_single, args.cards, args.inflight, args.repeat)
+    batch = time_mode(kanban, run_batch, args.cards, args.inflight, args.repeat)
+
+    print(f"cards: {args.cards}  in-flight: {args.inflight}  repeat: {args.repeat}")
+    print(f"  {args.cards} single-card calls: {single * 1000:8.1f} ms")
+    print(f"  one {args.cards}-card array:     {batch * 1000:8.1f} ms")
+    print(f"  speedup:                 {single / batch:8.1f}x")
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,436 @@
+#!/usr/bin/env python3
+"""
+Benchmark suite: time the main kanban commands on synthetic boards.
+
+Usage:
+    python3 modules/kanban/benchmarks/bench_suite.py [--sizes 100,1000,10000] [--repeat 5]
+        [--output results.json] [--compare baseline.json] [--threshold 0.25]
+        [--only list_xml,show] [--kanban path/to/kanban.py] [--allow-failures]
+
+For each board size a fresh temporary board is generated with realistic card
+shapes: 3-6 criteria with mov_commands, 2-4 editFiles, an activity log of
+5-40 entries, and a spread of cards across todo / doing / done / canceled and
+twelve archive months. Cards are written with the write_card() of the
+kanban.py under test, and every command's arguments come from that
+revision's own argparse tree, so an older revision is benchmarked against a
+board in its own on-disk format. Each benchmark then calls the command
+in-process (stdout discarded) and records the best and median wall-clock
+time of --repeat runs:
+
+    list_xml_cold   kanban list (xml), card index deleted before each run
+    list_xml        kanban list (xml), warm card index
+    list_simple     kanban list --output-style=simple
+    list_detail     kanban list --output-style=detail
+    show            kanban show <doing card> (xml)
+    do              kanban do <one card> — full validation pipeline
+    criteria_check  kanban criteria check <card> 1 (mov_commands: `true`)
+    done            kanban done <card with all criteria met>
+    report          kanban report
+    auto_archive    auto_archive_old_cards with size/10 stale done cards
+    auto_archive_noop  the same pass with nothing to archive — the cost
+                       get_root() adds to every command
+
+The run is hermetic: the working directory is the temporary directory (so
+identifier checks find no git repo), and the metrics DB is redirected there
+so the real ~/.claude/metrics/claudit.db is never touched.
+
+A command that exits non-zero or raises -- or whose untimed setup does, e.g.
+arguments an older revision's parser rejects -- is recorded as a failure
+(with the last line it wrote to stderr) instead of a timing, and fails the run unless
+--allow-failures is given -- CI passes it for the base revision only, so a
+benchmark the base cannot run is skipped rather than blocking the PR.
+
+--output writes the results as JSON. --compare diffs them against an earlier
+JSON file and exits 1 if any benchmark's best time regressed by more than
+--threshold (a fraction; default 0.25) AND by more than --min-delta-ms
+(default 2ms, so sub-millisecond noise never fails a run); benchmarks that
+failed on either side are left out of the comparison. CI runs the suite
+against the base and head revisions on the same machine with --kanban and
+compares the two files (see .github/workflows/kanban-bench.yml).
+"""
+
+import argparse
+import contextlib
+import importlib.util
+import io
+import json
+import os
+import platform
+import random
+import statistics
+import sys
+import tempfile
+import time
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+
+_KANBAN_PATH = Path(__file__).parent.parent / "kanban.py"
+
+RESULTS_VERSION = 1
+
+BENCHMARKS = (
+    "list_xml_cold", "list_xml", "list_simple", "list_detail", "show", "do",
+    "criteria_check", "done", "report", "auto_archive", "auto_archive_noop",
+)
+
+
+def load_kanban(path: Path = _KANBAN_PATH):
+    """Import kanban.py as a module (watchdog must be importable for older revisions)."""
+    spec = importlib.util.spec_from_file_location("kanban_bench_suite", path)
+    mod = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(mod)
+    return mod
+
+
+# ---------------------------------------------------------------------------
+# Synthetic boards
+# ---------------------------------------------------------------------------
+
+def _iso(moment: datetime) -> str:
+    return moment.strftime("%Y-%m-%dT%H:%M:%SZ")
+
+
+def _synthetic_card(rng: random.Random, num: int, updated: datetime, all_met: bool = False) -> tuple[dict, list]:
+    created = updated - timedelta(hours=rng.randint(1, 72))
+    card = {
+        "action": f"Refactor the `module_{num}` loader and update its call sites " * rng.randint(1, 6),
+        "intent": f"Synthetic card {num}: keep loaders consistent across packages",
+        "type": "work",
+        "agent": rng.choice(["swe-backend", "swe-frontend", "swe-devex", "researcher"]),
+        "model": "sonnet",
+        "session": f"session-{num % 7}",
+        "editFiles": [f"pkg{num % 50}/mod{num}_{i}.py" for i in range(rng.randint(2, 4))],
+        "readFiles": [f"docs/ref{num % 13}.md"],
+        "criteria": [
+            {
+                "text": f"criterion {i} of card {num}",
+                "mov_commands": [{"cmd": f"rg -q 'module_{num}' pkg{num % 50}/", "timeout": 10}],
+                "met": all_met or rng.random() < 0.4,
+            }
+            for i in range(rng.randint(3, 6))
+        ],
+        "cycles": 0,
+        "agent_launch_pending": False,
+        "created": _iso(created),
+        "updated": _iso(updated),
+    }
+    activity = [
+        {"timestamp": _iso(created + timedelta(minutes=i)), "message": f"Progress note {i} on card {num}"}
+        for i in range(rng.randint(5, 40))
+    ]
+    return card, activity
+
+
+def _write_synthetic(kanban, path: Path, card: dict, activity: list) -> None:
+    # Through the revision's own write_card: every revision accepts an inline
+    # "activity" list and lays it out in whatever format it reads back.
+    path.parent.mkdir(parents=True, exist_ok=True)
+    kanban.write_card(path, dict(card, activity=activity))
+
+
+def generate_board(kanban, root: Path, size: int, seed: int = 0) -> dict[str, list[int]]:
+    """Populate root with `size` cards; return card numbers per location."""
+    rng = random.Random(seed)
+    now = datetime.now(timezone.utc)
+    for col in ("todo", "doing", "done", "canceled", "archive", "scratchpad"):
+        (root / col).mkdir(parents=True, exist_ok=True)
+
+    placed: dict[str, list[int]] = {"todo": [], "doing": [], "done": [], "canceled": [], "archive": []}
+    for num in range(1, size + 1):
+        roll = rng.random()
+        if roll < 0.10:
+            location, updated = "todo", now - timedelta(hours=rng.randint(0, 48))
+        elif roll < 0.20:
+            location, updated = "doing", now - timedelta(minutes=rng.randint(0, 600))
+        elif roll < 0.55:
+            # Recent enough that get_root()'s auto-archive leaves them in done/.
+            location, updated = "done", now - timedelta(days=rng.randint(0, 20))
+        elif roll < 0.60:
+            location, updated = "canceled", now - timedelta(days=rng.randint(0, 20))
+        else:
+            location, updated = "archive", now - timedelta(days=rng.randint(35, 365))
+        card, activity = _synthetic_card(rng, num, updated)
+        if location == "archive":
+            path = root / "archive" / updated.strftime("%Y-%m") / f"{num}.json"
+        else:
+            path = root / location / f"{num}.json"
+        _write_synthetic(kanban, path, card, activity)
+        placed[location].append(num)
+    return placed
+
+
+# ---------------------------------------------------------------------------
+# Benchmarks
+# ---------------------------------------------------------------------------
+
+class _Board:
+    """A generated board plus a supply of fresh card numbers for mutating benchmarks."""
+
+    def __init__(self, kanban, root: Path, size: int):
+        self.kanban = kanban
+        self.root = root
+        self.size = size
+        self.placed = generate_board(kanban, root, size)
+        self._rng = random.Random(size)
+
+    def fresh_cards(self, column: str, count: int = 1, all_met: bool = False, stale: bool = False) -> list[str]:
+        # One board scan for the whole batch: next_number() globs every card.
+        first = self.kanban.next_number(self.root)
+        now = datetime.now(timezone.utc)
+        updated = now - timedelta(days=90) if stale else now
+        for num in range(first, first + count):
+            card, activity = _synthetic_card(self._rng, num, updated, all_met=all_met)
+            if column == "doing":
+                card["criteria"] = [dict(c, mov_commands=[{"cmd": "true", "timeout": 5}]) for c in card["criteria"]]
+            _write_synthetic(self.kanban, self.root / column / f"{num}.json", card, activity)
+        return [str(num) for num in range(first, first + count)]
+
+    def fresh_card(self, column: str, all_met: bool = False) -> str:
+        return self.fresh_cards(column, all_met=all_met)[0]
+
+
+class _Parsed(Exception):
+    """Raised by a stubbed command to hand main()'s Namespace back to _cli."""
+
+    def __init__(self, namespace):
+        super().__init__()
+        self.namespace = namespace
+
+
+def _cli(kanban, root: Path, *argv: str):
+    """Parse argv with the revision's own argparse tree, so the Namespace has
+    exactly the destinations (and defaults) that revision's commands read.
+
+    Revisions without _build_parser build the tree inside main(), so main()
+    is run with every cmd_* replaced by a stub that returns the Namespace it
+    was dispatched with.
+    """
+    argv = ["--root", str(root), *argv]
+    if hasattr(kanban, "_build_parser"):
+        return kanban._build_parser().parse_args(argv)
+
+    def capture(args):
+        raise _Parsed(args)
+
+    commands = {name: getattr(kanban, name) for name in dir(kanban) if name.startswith("cmd_")}
+    saved_argv = sys.argv
+    try:
+        for name in commands:
+            setattr(kanban, name, capture)
+        sys.argv = ["kanban", *argv]
+        kanban.main()
+    except _Parsed as parsed:
+        return parsed.namespace
+    finally:
+        sys.argv = saved_argv
+        for name, func in commands.items():
+            setattr(kanban, name, func)
+    raise RuntimeError(f"main() dispatched no command for {argv[2:]}")
+
+
+def _benchmark_steps(kanban, board: _Board):
+    """name -> (setup, run). setup() runs untimed before each timed run() and
+    returns run's argument -- for commands, the parsed Namespace, so argparse
+    itself is never on the clock."""
+    root = board.root
+    doing_card = str(board.placed["doing"][0]) if board.placed["doing"] else board.fresh_card("doing")
+
+    def cli(*argv):
+        return lambda: _cli(kanban, root, *argv)
+
+    def drop_index():
+        with contextlib.suppress(FileNotFoundError):
+            (root / ".card-index").unlink()
+        return _cli(kanban, root, "list", "--output-style", "xml")
+
+    def new_card():
+        num = kanban.next_number(root)
+        data = json.dumps({
+            "action": f"Benchmark card {num}",
+            "intent": "Measure kanban do",
+            "type": "work",
+            "editFiles": [f"bench/new_{num}.py"],
+            "criteria": [{"text": "exists", "mov_commands": [{"cmd": "test -d /", "timeout": 5}]}],
+        })
+        return _cli(kanban, root, "do", data, "--session", "bench")
+
+    def stale_done_cards():
+        board.fresh_cards("done", max(board.size // 10, 1), stale=True)
+
+    return {
+        "list_xml_cold": (drop_index, kanban.cmd_list),
+        "list_xml": (cli("list", "--output-style", "xml"), kanban.cmd_list),
+        "list_simple": (cli("list", "--output-style", "simple"), kanban.cmd_list),
+        "list_detail": (cli("list", "--output-style", "detail"), kanban.cmd_list),
+        "show": (cli("show", doing_card), kanban.cmd_show),
+        "do": (new_card, kanban.cmd_do),
+        "criteria_check": (lambda: _cli(kanban, root, "criteria", "check", board.fresh_card("doing"), "1",
+                                        "--session", "bench"), kanban.cmd_criteria_dispatch),
+        "done": (lambda: _cli(kanban, root, "done", board.fresh_card("doing", all_met=True), "Benchmarked"),
+                 kanban.cmd_done),
+        "report": (cli("report"), kanban.cmd_report),
+        "auto_archive": (stale_done_cards, lambda _: kanban.auto_archive_old_cards(root)),
+        "auto_archive_noop": (lambda: None, lambda _: kanban.auto_archive_old_cards(root)),
+    }
+
+
+def _run_once(run, arg) -> "str | None":
+    """Run one call; return why it failed, or None on success."""
+    try:
+        run(arg)
+    except SystemExit as exc:
+        if exc.code not in (None, 0):
+            return f"exit {exc.code}"
+    except Exception as exc:
+        return f"{type(exc).__name__}: {exc}"
+    return None
+
+
+def failed_benchmarks(data: dict) -> list[str]:
+    """The "<size>/<name>" of every benchmark recorded as a failure."""
+    return [
+        f"{size}/{name}"
+        for size, benches in data.get("results", {}).items()
+        for name, timing in benches.items()
+        if "failed" in timing
+    ]
+
+
+def run_suite(kanban, sizes: list[int], repeat: int, only: set[str] | None = None) -> dict:
+    results: dict[str, dict[str, dict]] = {}
+    previous_cwd = os.getcwd()
+    for size in sizes:
+        with tempfile.TemporaryDirectory() as tmp:
+            os.chdir(tmp)
+            try:
+                kanban._METRICS_DB_PATH = Path(tmp) / "claudit.db"
+                board = _Board(kanban, Path(tmp) / ".kanban", size)
+                steps = _benchmark_steps(kanban, board)
+                size_results = {}
+                for name in BENCHMARKS:
+                    if only and name not in only:
+                        continue
+                    setup, run = steps[name]
+                    timings = []
+                    failure = None
+                    for _ in range(repeat):
+                        prepared = []
+                        stderr = io.StringIO()
+                        with contextlib.redirect_stdout(io.StringIO()), contextlib.redirect_stderr(stderr):
+                            failure = _run_once(lambda _: prepared.append(setup()), None)
+                            if failure:
+                                failure = f"setup: {failure}"
+                            else:
+                                start = time.perf_counter()
+                                failure = _run_once(run, prepared[0])
+                                elapsed = (time.perf_counter() - start) * 1000
+                        if failure:
+                            last_line = stderr.getvalue().strip().splitlines()[-1:]
+                            if last_line:
+                                failure = f"{failure}: {last_line[0]}"
+                            break
+                        timings.append(elapsed)
+                    if failure:
+                        size_results[name] = {"failed": failure}
+                    else:
+                        size_results[name] = {
+                            "best_ms": round(min(timings), 3),
+                            "median_ms": round(statistics.median(timings), 3),
+                        }
+                results[str(size)] = size_results
+            finally:
+                os.chdir(previous_cwd)
+    return {
+        "version": RESULTS_VERSION,
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "repeat": repeat,
+        "results": results,
+    }
+
+
+# ---------------------------------------------------------------------------
+# Baseline comparison
+# ---------------------------------------------------------------------------
+
+def compare_results(baseline: dict, current: dict, threshold: float, min_delta_ms: float) -> list[dict]:
+    """One row per benchmark present in both runs; "regressed" marks failures."""
+    rows = []
+    for size, benches in current.get("results", {}).items():
+        for name, timing in benches.items():
+            base = baseline.get("results", {}).get(size, {}).get(name)
+            if base is None or "best_ms" not in base or "best_ms" not in timing:
+                continue
+            before, after = base["best_ms"], timing["best_ms"]
+            change = (after - before) / before if before else 0.0
+            rows.append({
+                "size": size,
+                "name": name,
+                "baseline_ms": before,
+                "current_ms": after,
+                "change": change,
+                "regressed": change > threshold and after - before > min_delta_ms,
+            })
+    return rows
+
+
+def _print_results(data: dict) -> None:
+    for size, benches in data["results"].items():
+        print(f"cards: {size}")
+        for name, timing in benches.items():
+            if "failed" in timing:
+                print(f"  {name:<18} FAILED ({timing['failed']})")
+            else:
+                print(f"  {name:<18} best {timing['best_ms']:9.2f} ms   median {timing['median_ms']:9.2f} ms")
+
+
+def _print_comparison(rows: list[dict], threshold: float) -> None:
+    print(f"\ncomparison (regression threshold: +{threshold:.0%})")
+    for row in rows:
+        flag = "  REGRESSION" if row["regressed"] else ""
+        print(
+            f"  {row['size']:>6} {row['name']:<18} {row['baseline_ms']:9.2f} -> "
+            f"{row['current_ms']:9.2f} ms ({row['change']:+.0%}){flag}"
+        )
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--sizes", default="100,1000,10000", help="comma-separated board sizes (default: 100,1000,10000)")
+    parser.add_argument("--repeat", type=int, default=5, help="runs per benchmark (default: 5)")
+    parser.add_argument("--only", default=None, help=f"comma-separated subset of: {','.join(BENCHMARKS)}")
+    parser.add_argument("--kanban", type=Path, default=_KANBAN_PATH, help="kanban.py to benchmark (default: this checkout's)")
+    parser.add_argument("--output", type=Path, help="write results JSON here")
+    parser.add_argument("--compare", type=Path, help="baseline results JSON to diff against")
+    parser.add_argument("--threshold", type=float, default=0.25, help="allowed slowdown as a fraction (default: 0.25)")
+    parser.add_argument("--min-delta-ms", type=float, default=2.0, help="ignore slowdowns smaller than this (default: 2)")
+    parser.add_argument("--allow-failures", action="store_true", help="record failing benchmarks without failing the run")
+    args = parser.parse_args()
+
+    only = set(args.only.split(",")) if args.only else None
+    if only and only - set(BENCHMARKS):
+        print(f"Error: unknown benchmark(s): {', '.join(sorted(only - set(BENCHMARKS)))}", file=sys.stderr)
+        return 1
+
+    kanban = load_kanban(args.kanban)
+    data = run_suite(kanban, [int(s) for s in args.sizes.split(",")], args.repeat, only)
+    _print_results(data)
+    if args.output:
+        args.output.write_text(json.dumps(data, indent=2) + "\n")
+
+    status = 0
+    failed = failed_benchmarks(data)
+    if failed and not args.allow_failures:
+        print(f"Error: benchmark(s) failed: {', '.join(failed)}", file=sys.stderr)
+        status = 1
+
+    if args.compare:
+        rows = compare_results(json.loads(args.compare.read_text()), data, args.threshold, args.min_delta_ms)
+        _print_comparison(rows, args.threshold)
+        if any(row["regressed"] for row in rows):
+            status = 1
+    return status
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -12,44 +12,63 @@ ENVIRONMENT VARIABLES:
   KANBAN_ARCHIVE_DAYS  - Days before auto-archiving done cards (default: 30)
   KANBAN_SESSION       - Override session detection
   KANBAN_ROOT          - Override board location
+  KANBAN_NO_SERVE      - Never route commands through a running `kanban serve`
 """
 
-import argparse
-import difflib
-import fnmatch
-import html
+# Startup cost matters: sub-agents run `kanban criteria check` constantly,
+# and every invocation pays for the module-level imports below. Only modules
+# that nearly every command needs are imported here. The rest are imported
+# inside the functions that use them:
+#
+#   argparse                  main() — hot commands dispatch without it
+#                             (see _fast_dispatch)
+#   watchdog, termios, tty,   watch mode only
+#   select
+#   sqlite3                   write_kanban_event (metrics)
+#   tempfile                  _write_file_atomic
+#   html                      XML rendering
+#   difflib, unicodedata      unknown-field suggestions, terminal widths
+#   socket, signal            kanban serve and its client (only when a
+#                             board server socket exists)
+#
+# test_kanban_import_budget.py enforces this with `python -X importtime`.
+import contextlib
+import fcntl
+import io
 import json
 import os
 import re
 import shlex
-import select
 import shutil
-import sqlite3
 import subprocess
 import sys
-import termios
 import textwrap
 import threading
 import time
-import tty
-import unicodedata
 from collections import defaultdict
-from dataclasses import dataclass
+from contextlib import contextmanager, suppress
 from datetime import datetime, timezone, timedelta
 from pathlib import Path
 from threading import Event
 
-# Filesystem watching (bundled via Nix Python wrapper)
-from watchdog.observers import Observer
-from watchdog.events import FileSystemEventHandler
 
-@dataclass
 class WatchState:
-    output_style: str = "simple"  # "simple" | "xml" | "detail"
-    session_filter: str = ""
-    card_filter: str = ""
-    input_mode: str = ""       # "" | "session" | "card"
-    input_buffer: str = ""
+    """Interactive watch-mode view state (a plain class: dataclasses costs
+    an `inspect` import at startup)."""
+
+    def __init__(
+        self,
+        output_style: str = "simple",  # "simple" | "xml" | "detail"
+        session_filter: str = "",
+        card_filter: str = "",
+        input_mode: str = "",          # "" | "session" | "card"
+        input_buffer: str = "",
+    ):
+        self.output_style = output_style
+        self.session_filter = session_filter
+        self.card_filter = card_filter
+        self.input_mode = input_mode
+        self.input_buffer = input_buffer
 
 COLUMNS = ["todo", "doing", "done", "canceled"]
 ARCHIVE_DAYS_THRESHOLD = int(os.environ.get("KANBAN_ARCHIVE_DAYS", "30"))
@@ -180,37 +199,121 @@ def get_current_session_id() -> str | None:
         return None
 
 
-def resolve_session_name(uuid_prefix: str, root: Path) -> str:
-    """Map UUID prefix to a friendly adjective-noun name, creating if needed."""
-    sessions_file = root / "sessions.json"
+# ---------------------------------------------------------------------------
+# Session names
+#
+# Session UUID prefixes map to friendly names. Two files hold the mapping:
+#
+#   root/sessions.json    compacted snapshot, {prefix: name}
+#   root/sessions.jsonl   append-only log, one {"p": prefix, "name": name}
+#                         line per new session or rename; the last line for
+#                         a prefix wins
+#
+# The mapping is the snapshot with the log replayed over it. Readers take no
+# lock: the snapshot is replaced atomically, and a torn trailing log line is
+# skipped. Writers (a new session, `kanban rename`) hold root/.sessions.lock,
+# a leaf lock. They re-read the mapping under it, so two sessions starting at
+# once cannot drop each other's entry or claim the same name, and then append
+# a single line. When the log passes _SESSIONS_LOG_COMPACT_BYTES, the writer
+# folds it into the snapshot and truncates it, still under the lock.
+#
+# _read_sessions memoizes the parsed mapping per board, keyed by both files'
+# (inode, mtime_ns, size). So a long-lived process like `kanban serve`
+# resolves a known session with two stat() calls and a dict hit.
+#
+# claudit-hook.py reads the same two files (lookup_kanban_session). Keep the
+# formats in step.
+# ---------------------------------------------------------------------------
+
+_SESSIONS_SNAPSHOT_FILENAME = "sessions.json"
+_SESSIONS_LOG_FILENAME = "sessions.jsonl"
+_SESSIONS_LOCK_FILENAME = ".sessions.lock"
+_SESSIONS_LOG_COMPACT_BYTES = 16 * 1024
+
+_sessions_memo: dict[str, tuple[tuple, dict[str, str]]] = {}
+
+
+def _stat_key(path: Path) -> tuple | None:
+    try:
+        st = path.stat()
+    except OSError:
+        return None
+    return (st.st_ino, st.st_mtime_ns, st.st_size)
+
+
+def _read_sessions(root: Path) -> dict[str, str]:
+    """The prefix -> name mapping: snapshot plus replayed log (memoized)."""
+    snapshot_path = root / _SESSIONS_SNAPSHOT_FILENAME
+    log_path = root / _SESSIONS_LOG_FILENAME
+    key = (_stat_key(snapshot_path), _stat_key(log_path))
+    memo = _sessions_memo.get(str(root))
+    if memo is not None and memo[0] == key:
+        return memo[1]
 
-    # Load existing mappings
     sessions: dict[str, str] = {}
-    if sessions_file.exists():
+    try:
+        loaded = json.loads(snapshot_path.read_text())
+        if isinstance(loaded, dict):
+            sessions.update(loaded)
+    except (json.JSONDecodeError, OSError):
+        pass
+    try:
+        log_text = log_path.read_text(encoding="utf-8")
+    except OSError:
+        log_text = ""
+    for line in log_text.splitlines():
         try:
-            sessions = json.loads(sessions_file.read_text())
-        except (json.JSONDecodeError, OSError):
-            sessions = {}
+            entry = json.loads(line)
+        except json.JSONDecodeError:
+            continue  # torn trailing line
+        if isinstance(entry, dict) and isinstance(entry.get("p"), str) and isinstance(entry.get("name"), str):
+            sessions[entry["p"]] = entry["name"]
+
+    _sessions_memo[str(root)] = (key, sessions)
+    return sessions
+
+
+def _append_session(root: Path, uuid_prefix: str, name: str) -> None:
+    """Record prefix -> name in the log (sessions lock held), compacting if due."""
+    log_path = root / _SESSIONS_LOG_FILENAME
+    with open(log_path, "a", encoding="utf-8") as fh:
+        fh.write(json.dumps({"p": uuid_prefix, "name": name}) + "\n")
+        fh.flush()
+        os.fsync(fh.fileno())
+        size = fh.tell()
+    if size > _SESSIONS_LOG_COMPACT_BYTES:
+        sessions = _read_sessions(root)
+        _write_file_atomic(root / _SESSIONS_SNAPSHOT_FILENAME, json.dumps(sessions, indent=2) + "\n")
+        log_path.write_text("")
+
 
+def resolve_session_name(uuid_prefix: str, root: Path) -> str:
+    """Map UUID prefix to a friendly adjective-noun name, creating if needed."""
     # Return existing mapping
-    if uuid_prefix in sessions:
-        return sessions[uuid_prefix]
-
-    # Generate new name — deterministic from UUID, with collision fallback
-    used_names = set(sessions.values())
-    seed = int(uuid_prefix, 16)
-    adj_idx = seed % len(_ADJECTIVES)
-    noun_idx = (seed // len(_ADJECTIVES)) % len(_NOUNS)
-    name = f"{_ADJECTIVES[adj_idx]}-{_NOUNS[noun_idx]}"
-
-    # Handle unlikely collisions by incrementing
-    while name in used_names:
-        noun_idx = (noun_idx + 1) % len(_NOUNS)
-        name = f"{_ADJECTIVES[adj_idx]}-{_NOUNS[noun_idx]}"
+    name = _read_sessions(root).get(uuid_prefix)
+    if name is not None:
+        return name
 
-    sessions[uuid_prefix] = name
     root.mkdir(parents=True, exist_ok=True)
-    sessions_file.write_text(json.dumps(sessions, indent=2) + "\n")
+    with _flock_exclusive(root / _SESSIONS_LOCK_FILENAME):
+        # Another process may have mapped it while we waited.
+        sessions = _read_sessions(root)
+        if uuid_prefix in sessions:
+            return sessions[uuid_prefix]
+
+        # Generate new name — deterministic from UUID, with collision fallback
+        used_names = set(sessions.values())
+        seed = int(uuid_prefix, 16)
+        adj_idx = seed % len(_ADJECTIVES)
+        noun_idx = (seed // len(_ADJECTIVES)) % len(_NOUNS)
+        name = f"{_ADJECTIVES[adj_idx]}-{_NOUNS[noun_idx]}"
+
+        # Handle unlikely collisions by incrementing
+        while name in used_names:
+            noun_idx = (noun_idx + 1) % len(_NOUNS)
+            name = f"{_ADJECTIVES[adj_idx]}-{_NOUNS[noun_idx]}"
+
+        _append_session(root, uuid_prefix, name)
     return name
 
 
@@ -219,7 +322,12 @@ def resolve_session_name(uuid_prefix: str, root: Path) -> str:
 # =============================================================================
 
 def auto_archive_old_cards(root: Path, days_threshold: int = ARCHIVE_DAYS_THRESHOLD) -> None:
-    """Archive done cards older than threshold days."""
+    """Archive done cards older than threshold days.
+
+    Cards are moved month by month under that month's summary lock, and the
+    month's summary is updated with just the moved cards (see § Archive month
+    summaries).
+    """
     done_dir = root / "done"
     archive_base = root / "archive"
     if not done_dir.exists():
@@ -228,6 +336,7 @@ def auto_archive_old_cards(root: Path, days_threshold: int = ARCHIVE_DAYS_THRESH
     cutoff_date = datetime.now(timezone.utc) - timedelta(days=days_threshold)
     archived_count = 0
 
+    stale_by_month: dict[str, list[Path]] = defaultdict(list)
     for card_file in done_dir.glob("*.json"):
         try:
             card = json.loads(card_file.read_text())
@@ -236,18 +345,239 @@ def auto_archive_old_cards(root: Path, days_threshold: int = ARCHIVE_DAYS_THRESH
                 continue
             updated = parse_iso(updated_str)
             if updated < cutoff_date:
-                archive_month = updated.strftime("%Y-%m")
-                archive_dir = archive_base / archive_month
-                archive_dir.mkdir(parents=True, exist_ok=True)
-                card_file.rename(archive_dir / card_file.name)
-                archived_count += 1
-        except (ValueError, KeyError, json.JSONDecodeError):
+                stale_by_month[updated.strftime("%Y-%m")].append(card_file)
+        except (ValueError, KeyError, json.JSONDecodeError, FileNotFoundError):
             continue
 
+    for archive_month, card_files in sorted(stale_by_month.items()):
+        archive_dir = archive_base / archive_month
+        archive_dir.mkdir(parents=True, exist_ok=True)
+        with _archive_month_lock(root, archive_month):
+            before_ns = archive_dir.stat().st_mtime_ns
+            moved = []
+            for card_file in card_files:
+                with card_lock(root, card_number(card_file)):
+                    # Another process may have reopened or archived it while
+                    # we waited for the lock — only move it if still in done/.
+                    if not card_file.exists():
+                        continue
+                    moved.append(move_card(card_file, archive_dir / card_file.name))
+                    discard_card_lock(root, card_number(card_file))
+            if moved:
+                _add_to_archive_summary(root, archive_month, moved, before_ns)
+            archived_count += len(moved)
+
     if archived_count > 0:
         print(f"Auto-archived {archived_count} old card(s) to {archive_base}/", file=sys.stderr)
 
 
+# ---------------------------------------------------------------------------
+# Archive month summaries
+#
+# Reports and throughput cover archived cards too. Without help, a 12-month
+# report would read every card in every month. Instead, each archive month
+# has a summary manifest, root/archive/YYYY-MM.summary (JSON lines):
+#
+#   line 1   header: month, card count, first/last completion time, lead
+#            time sum/count, and the month directory's st_mtime_ns when the
+#            summary was built
+#   line 2+  one entry per card: number, completion time, created, intent,
+#            action, completion comment
+#
+# A report first reads only each month's header line. Months whose
+# first..last range misses the --from/--to window are skipped. Throughput
+# needs only the header counts and lead-time sums.
+#
+# The summary sits beside the month directory, not inside it. That way the
+# directory's mtime changes only when cards do. write_card's atomic replace,
+# a move in or out, and a deletion all rename inside the directory. So a
+# single stat() tells whether the summary is current. A stale, missing or
+# unreadable summary is rebuilt from the month's cards, which covers months
+# archived before summaries existed. If it cannot be saved it is still used
+# in memory (fail open).
+#
+# auto_archive_old_cards updates a summary incrementally. It holds the
+# month's lock around its moves and appends just the moved cards, provided
+# the summary was current before the moves.
+#
+# Lock order: board_lock -> month lock -> card_lock. Readers rebuilding a
+# summary take only the month lock and never write a card.
+# ---------------------------------------------------------------------------
+
+_ARCHIVE_SUMMARY_VERSION = 1
+_ARCHIVE_SUMMARY_SUFFIX = ".summary"
+
+
+def _archive_month_lock(root: Path, month: str):
+    return _flock_exclusive(root / ".locks" / f"archive-{month}.lock")
+
+
+def _archive_summary_path(root: Path, month: str) -> Path:
+    return root / "archive" / f"{month}{_ARCHIVE_SUMMARY_SUFFIX}"
+
+
+def card_completed_at(card: dict, card_path: Path) -> datetime | None:
+    """A done card's completion time: updated, else the last activity
+    timestamp, else created; None if none of them parses."""
+    updated_str = card.get("updated")
+    if updated_str:
+        try:
+            return parse_iso(updated_str)
+        except ValueError:
+            pass
+    # The log is only read when this fallback is actually needed.
+    activity = read_card_activity(card_path)
+    if isinstance(activity, list) and activity:
+        last_ts = activity[-1].get("timestamp") if isinstance(activity[-1], dict) else None
+        if last_ts:
+            try:
+                return parse_iso(last_ts)
+            except ValueError:
+                pass
+    created_str = card.get("created")
+    if created_str:
+        try:
+            return parse_iso(created_str)
+        except ValueError:
+            pass
+    return None
+
+
+def completion_comment(activity: list) -> str | None:
+    """The completion message: the last activity entry, unless "Created" is
+    the only one."""
+    if isinstance(activity, list) and len(activity) > 1 and isinstance(activity[-1], dict):
+        return activity[-1].get("message")
+    return None
+
+
+def _archive_summary_entry(card_path: Path) -> dict | None:
+    try:
+        card = read_card_fields(card_path, ("action", "intent", "created", "updated"))
+    except (json.JSONDecodeError, OSError):
+        return None
+    completed = card_completed_at(card, card_path)
+    return {
+        "n": card_number(card_path),
+        "completed": completed.astimezone(timezone.utc).strftime("%Y-%m-%dT%H:%M:%SZ") if completed else None,
+        "created": card.get("created"),
+        "intent": card.get("intent", ""),
+        "action": card.get("action", ""),
+        "comment": completion_comment(read_card_activity(card_path)),
+    }
+
+
+def _archive_summary_header(month: str, dir_mtime_ns: int, entries: list[dict]) -> dict:
+    completed = sorted(e["completed"] for e in entries if e.get("completed"))
+    lead_times = [
+        lead for lead in (
+            calculate_lead_time({"created": e.get("created"), "updated": e.get("completed")}) for e in entries
+        )
+        if lead is not None
+    ]
+    return {
+        "version": _ARCHIVE_SUMMARY_VERSION,
+        "month": month,
+        "dir_mtime_ns": dir_mtime_ns,
+        "count": len(entries),
+        "first": completed[0] if completed else None,
+        "last": completed[-1] if completed else None,
+        "lead_time_sum": sum(lead_times),
+        "lead_time_count": len(lead_times),
+    }
+
+
+def _write_archive_summary(root: Path, month: str, header: dict, entries: list[dict]) -> None:
+    lines = [json.dumps(header)] + [json.dumps(e) for e in sorted(entries, key=lambda e: int(e["n"]))]
+    try:
+        _write_file_atomic(_archive_summary_path(root, month), "\n".join(lines) + "\n")
+    except OSError:
+        pass
+
+
+def _read_archive_summary_file(root: Path, month: str, header_only: bool) -> tuple[dict | None, list[dict] | None]:
+    try:
+        with open(_archive_summary_path(root, month), encoding="utf-8") as fh:
+            header = json.loads(fh.readline())
+            if not isinstance(header, dict) or header.get("version") != _ARCHIVE_SUMMARY_VERSION:
+                return None, None
+            if header_only:
+                return header, None
+            entries = [json.loads(line) for line in fh if line.strip()]
+    except (OSError, json.JSONDecodeError):
+        return None, None
+    if len(entries) != header.get("count"):
+        return None, None  # torn or hand-edited
+    return header, entries
+
+
+def _rebuild_archive_summary(root: Path, month: str) -> tuple[dict, list[dict]]:
+    month_dir = root / "archive" / month
+    # Stat BEFORE reading the cards: a change landing mid-build leaves the
+    # stored mtime stale, so the next reader rebuilds again.
+    dir_mtime_ns = month_dir.stat().st_mtime_ns
+    entries = [e for e in (_archive_summary_entry(p) for p in month_dir.glob("*.json")) if e is not None]
+    header = _archive_summary_header(month, dir_mtime_ns, entries)
+    _write_archive_summary(root, month, header, entries)
+    return header, entries
+
+
+def read_archive_summary(root: Path, month: str, header_only: bool = False) -> tuple[dict, list[dict] | None]:
+    """A current summary for archive month `month` (rebuilt if stale).
+
+    With header_only=True the entries are not parsed (returned as None)
+    unless the summary had to be rebuilt.
+    """
+    month_dir = root / "archive" / month
+    header, entries = _read_archive_summary_file(root, month, header_only)
+    try:
+        current_ns = month_dir.stat().st_mtime_ns
+    except OSError:
+        return _archive_summary_header(month, 0, []), []
+    if header is not None and header.get("dir_mtime_ns") == current_ns:
+        return header, entries
+    with _archive_month_lock(root, month):
+        header, entries = _read_archive_summary_file(root, month, header_only)
+        if header is not None and header.get("dir_mtime_ns") == month_dir.stat().st_mtime_ns:
+            return header, entries
+        return _rebuild_archive_summary(root, month)
+
+
+def _add_to_archive_summary(root: Path, month: str, moved: list[Path], before_ns: int) -> None:
+    """Fold newly archived cards into the month summary (month lock held)."""
+    header, entries = _read_archive_summary_file(root, month, header_only=False)
+    if header is None or header.get("dir_mtime_ns") != before_ns:
+        _rebuild_archive_summary(root, month)
+        return
+    moved_nums = {card_number(p) for p in moved}
+    entries = [e for e in entries if e.get("n") not in moved_nums]
+    entries += [e for e in (_archive_summary_entry(p) for p in moved) if e is not None]
+    header = _archive_summary_header(month, (root / "archive" / month).stat().st_mtime_ns, entries)
+    _write_archive_summary(root, month, header, entries)
+
+
+def archive_months(root: Path) -> list[str]:
+    """Archive month directory names (YYYY-MM), oldest first."""
+    archive_base = root / "archive"
+    if not archive_base.exists():
+        return []
+    return sorted(p.name for p in archive_base.iterdir() if p.is_dir() and re.fullmatch(r"\d{4}-\d{2}", p.name))
+
+
+def _summary_overlaps(header: dict, since: datetime | None, until: datetime | None) -> bool:
+    """Whether a month's completion range can intersect [since, until]."""
+    if not header.get("count"):
+        return False
+    try:
+        if since and header.get("last") and parse_iso(header["last"]) < since:
+            return False
+        if until and header.get("first") and parse_iso(header["first"]) > until:
+            return False
+    except ValueError:
+        pass
+    return True
+
+
 def get_root(args_root: str | None, auto_init: bool = True) -> Path:
     """Get kanban root directory with auto-init."""
     if args_root:
@@ -285,54 +615,817 @@ def migrate_criteria(card: dict) -> bool:
     Old dual-column field names are constructed at runtime to avoid literals.
     Card-level: old cycle counter field renamed to cycles.
 
-    Returns True if migration was performed and the card should be persisted.
-    """
-    criteria = card.get("criteria")
-    if not criteria:
-        return False
+    Returns True if migration was performed and the card should be persisted.
+    """
+    criteria = card.get("criteria")
+    if not criteria:
+        return False
+
+    # Old dual-column field names (split to avoid literal presence in source)
+    _old_primary = "agent" + "_met"
+    _old_reviewer = "reviewer" + "_met"
+    _old_reason = "reviewer" + "_fail_reason"
+
+    migrated = False
+    for criterion in criteria:
+        # V3 -> V4: collapse dual-column back to single met field
+        if _old_primary in criterion:
+            criterion["met"] = criterion.pop(_old_primary)
+            criterion.pop(_old_reviewer, None)
+            criterion.pop(_old_reason, None)
+            migrated = True
+        # V1 -> V2 (legacy path, now collapsed into V4 directly)
+        elif "met" not in criterion:
+            criterion["met"] = False
+            migrated = True
+
+    # Card-level: rename old cycle counter to cycles (old name was "<col>_cycles")
+    _old_cycles = "rev" + "iew_cycles"
+    if _old_cycles in card:
+        card["cycles"] = card.pop(_old_cycles)
+        migrated = True
+
+    return migrated
+
+
+# ---------------------------------------------------------------------------
+# Card storage: mutable header + append-only activity log
+#
+# A card is two files side by side in its column directory:
+#
+#   NNN.json            the header — every card field EXCEPT activity; small,
+#                       rewritten (atomically) on each mutation
+#   NNN.activity.jsonl  the activity log — one JSON object per line, only
+#                       ever appended to
+#
+# Activity grows for the whole life of a card while everything else stays
+# roughly constant, so keeping it inline made every `criteria check` and
+# `done` re-serialize an ever-longer list, and made every list/report view
+# parse it just to discard it. Split, an activity entry costs one appended
+# line (append_card_activity), and only views that actually render activity
+# (`kanban show`, the status report's completion comment) read the log.
+#
+# The sidecar name ends in ".jsonl", so the "*.json" globs that discover cards
+# never see it; move_card carries it along whenever the header moves.
+#
+# Legacy single-file cards (activity inline in NNN.json) are migrated on first
+# read, under the card lock, exactly like the criteria schema migration: the
+# log is written first and the header second, so a crash between the two is
+# repaired by simply migrating again.
+# ---------------------------------------------------------------------------
+
+def _activity_path(card_path: Path) -> Path:
+    """Sidecar activity log path for a card header path (N.json -> N.activity.jsonl)."""
+    return card_path.with_name(f"{card_number(card_path)}.activity.jsonl")
+
+
+def read_card(path: Path, include_activity: bool = False, persist_migrations: bool = True) -> dict:
+    """Read a card header, transparently migrating old schemas if needed.
+
+    include_activity=True also loads the activity log into card["activity"]
+    (the full view `kanban show` renders). Without it the returned dict has
+    no "activity" key at all — list, report and mutation paths never parse
+    the log.
+
+    persist_migrations=False migrates in memory only. Read-only commands
+    (show, list, report) pass it so that viewing a board never takes card
+    locks or rewrites files; the next mutation of the card persists the
+    migrated form anyway.
+
+    Safe against concurrent writers: write_card replaces files atomically, so
+    the read always sees a complete card. The migration write-back is a
+    read-modify-write, so it runs under the card's lock and re-reads the file
+    first — persisting the migrated copy of what was read before the lock
+    would silently undo any update another process landed in between.
+    """
+    card = json.loads(path.read_text())
+    needs_write = migrate_criteria(card) or ("criteria" in card and "summary" not in card)
+    if (needs_write or "activity" in card) and persist_migrations:
+        with card_lock(_board_root_for_card_path(path), card_number(path)):
+            try:
+                card = json.loads(path.read_text())
+            except FileNotFoundError:
+                # Moved to another column while we waited for the lock; the
+                # copy already in hand is migrated in memory, and the next
+                # read at the new location persists the migration.
+                pass
+            else:
+                needs_write = migrate_criteria(card) or ("criteria" in card and "summary" not in card)
+                if needs_write or "activity" in card:
+                    # Legacy inline activity: write_card moves it to the log,
+                    # and adds the summary block (see § Card summary block).
+                    write_card(path, card)
+    if include_activity:
+        if "activity" not in card:
+            card["activity"] = read_card_activity(path)
+    else:
+        card.pop("activity", None)
+    # Backward compat: cards created before Phase 1 lack agent_launch_pending.
+    # Default to False so callers can use card["agent_launch_pending"] safely
+    # without KeyError on legacy cards.
+    card.setdefault("agent_launch_pending", False)
+    return card
+
+
+def read_card_activity(card_path: Path) -> list[dict]:
+    """Return a card's activity log entries, oldest first.
+
+    A line that fails to parse (the torn tail of an append interrupted by a
+    crash) is skipped rather than failing the whole read.
+    """
+    log_path = _activity_path(card_path)
+    try:
+        text = log_path.read_text()
+    except FileNotFoundError:
+        stray = _find_stray_activity_log(card_path)
+        if stray is None:
+            return []
+        text = stray.read_text()
+    entries = []
+    for line in text.splitlines():
+        if not line.strip():
+            continue
+        try:
+            entries.append(json.loads(line))
+        except json.JSONDecodeError:
+            continue
+    return entries
+
+
+def _find_stray_activity_log(card_path: Path) -> Path | None:
+    """Find, and move back beside its header, an activity log left behind in
+    another column by a move interrupted between its two renames.
+
+    Runs under the card's lock, so it cannot mistake a move still in progress
+    for an interrupted one and pull the log back to a column the header is
+    just leaving.
+    """
+    root = _board_root_for_card_path(card_path)
+    log_path = _activity_path(card_path)
+    with card_lock(root, card_number(card_path)):
+        if log_path.exists():
+            return log_path  # the move finished, or another reader recovered it
+        for candidate in list(root.glob(f"*/{log_path.name}")) + list(root.glob(f"archive/*/{log_path.name}")):
+            if not card_path.exists():
+                return candidate  # the header moved on too; read the log where it is
+            try:
+                candidate.rename(log_path)
+                return log_path
+            except OSError:
+                return candidate
+    return None
+
+
+def append_card_activity(card_path: Path, message: str) -> None:
+    """Append one timestamped entry to a card's activity log.
+
+    O(1) in the length of the log: one line appended and fsynced, the header
+    is not touched. Callers mutating the card hold its card_lock.
+    """
+    entry = {"timestamp": now_iso(), "message": message}
+    with open(_activity_path(card_path), "a", encoding="utf-8") as fh:
+        fh.write(json.dumps(entry) + "\n")
+        fh.flush()
+        os.fsync(fh.fileno())
+
+
+def move_card(card_path: Path, target: Path) -> Path:
+    """Move a card (header and activity log) to target; returns target.
+
+    The header is renamed first — it is the card's identity — then the log.
+    If interrupted in between, read_card_activity finds the stray log and
+    moves it back beside the header.
+    """
+    target.parent.mkdir(parents=True, exist_ok=True)
+    card_path.rename(target)
+    log_path = _activity_path(card_path)
+    if log_path.exists():
+        log_path.rename(_activity_path(target))
+    record_card_change(target)
+    return target
+
+
+def write_card(path: Path, card: dict) -> None:
+    """Write a card header atomically and durably.
+
+    If card carries an "activity" list (a new card, a legacy migration, or a
+    full view read with include_activity=True) the activity log is REPLACED
+    with it, before the header is written. Without an "activity" key the log
+    is left untouched; new entries go through append_card_activity.
+
+    Each file is written to a temp file in the same directory, fsynced, then
+    os.replace()d over the target and the directory entry fsynced. Readers
+    therefore see either the previous card or the new one, never a torn,
+    half-written file — even if this process is killed mid-write or the
+    machine loses power. Temp names (".<name>.<random>.tmp") never match the
+    "*.json" globs used to discover cards.
+
+    Atomic replacement does not prevent lost updates between two
+    read-modify-write cycles; callers mutating an existing card hold its
+    card_lock (see locked_card / update_card).
+    """
+    if "criteria" in card:
+        card["summary"] = _compute_card_summary(card, card.get("summary"))
+    if "activity" in card:
+        header = {k: v for k, v in card.items() if k != "activity"}
+        log_text = "".join(json.dumps(entry) + "\n" for entry in card["activity"] or [])
+        _write_file_atomic(_activity_path(path), log_text)
+    else:
+        header = card
+    _write_file_atomic(path, json.dumps(header, indent=2) + "\n")
+    record_card_change(path)
+
+
+# ---------------------------------------------------------------------------
+# Card summary block
+#
+# Every `kanban list` runs the stranded and abandoned detectors over the
+# doing cards, and the detail views show met/total criteria counts. Rather
+# than recount criteria and re-derive timestamps per card per render,
+# write_card keeps a denormalized block in the card header:
+#
+#   "summary": {
+#     "criteria_total": 3,
+#     "criteria_met": 2,
+#     "last_activity_at": "<the card's updated timestamp>",
+#     "last_met_at": "<when criteria_met last went up, or null>"
+#   }
+#
+# Since every criteria change goes through write_card, the block is always
+# current for cards written by kanban. card_summary() returns the stored
+# block, or computes one in memory for a card that has no block yet or whose
+# criteria count no longer matches (a hand edit). Read-only views therefore
+# never write. Existing cards are backfilled by read_card's migration
+# write-back, the same path that persists criteria schema upgrades, the first
+# time a mutating command reads them.
+#
+# Malformed criteria (not a list, or non-dict entries) yield None. The
+# detectors treat None as "not stranded / not abandoned" (fail closed).
+# ---------------------------------------------------------------------------
+
+_SUMMARY_KEYS = frozenset({"criteria_total", "criteria_met", "last_activity_at", "last_met_at"})
+
+
+def _compute_card_summary(card: dict, previous: dict | None = None) -> dict | None:
+    criteria = card.get("criteria")
+    if not isinstance(criteria, list) or not all(isinstance(c, dict) for c in criteria):
+        return None
+    met = sum(1 for c in criteria if c.get("met"))
+    previous = previous if isinstance(previous, dict) else {}
+    if "criteria_met" not in previous:
+        # Backfill: the best available estimate of when a criterion was met.
+        last_met_at = card.get("updated") if met else None
+    elif met > previous.get("criteria_met", 0):
+        last_met_at = card.get("updated") or now_iso()
+    else:
+        last_met_at = previous.get("last_met_at")
+    return {
+        "criteria_total": len(criteria),
+        "criteria_met": met,
+        "last_activity_at": card.get("updated"),
+        "last_met_at": last_met_at,
+    }
+
+
+def card_summary(card: dict) -> dict | None:
+    """The card's summary block (see § Card summary block), computed if absent or stale."""
+    summary = card.get("summary")
+    criteria = card.get("criteria")
+    if (
+        isinstance(summary, dict)
+        and _SUMMARY_KEYS <= summary.keys()
+        and isinstance(criteria, list)
+        and summary["criteria_total"] == len(criteria)
+    ):
+        return summary
+    return _compute_card_summary(card, summary)
+
+
+def _write_file_atomic(path: Path, text: str) -> None:
+    """Replace path with text via temp file + fsync + os.replace (see write_card)."""
+    try:
+        mode = path.stat().st_mode & 0o777
+    except FileNotFoundError:
+        mode = 0o644
+    import tempfile
+    fd, tmp_name = tempfile.mkstemp(dir=path.parent, prefix=f".{path.name}.", suffix=".tmp")
+    try:
+        os.fchmod(fd, mode)  # mkstemp creates 0600; keep the card's usual mode
+        with os.fdopen(fd, "w", encoding="utf-8") as fh:
+            fh.write(text)
+            fh.flush()
+            os.fsync(fh.fileno())
+        os.replace(tmp_name, path)
+    except BaseException:
+        with suppress(FileNotFoundError):
+            os.unlink(tmp_name)
+        raise
+    _fsync_dir(path.parent)
+
+
+def _fsync_dir(directory: Path) -> None:
+    """fsync a directory so a rename/replace inside it survives a crash.
+
+    Best-effort: some filesystems refuse to open or fsync directories, and a
+    missed directory fsync only weakens durability, never consistency.
+    """
+    try:
+        dir_fd = os.open(directory, os.O_RDONLY)
+    except OSError:
+        return
+    try:
+        os.fsync(dir_fd)
+    except OSError:
+        pass
+    finally:
+        os.close(dir_fd)
+
+
+# ---------------------------------------------------------------------------
+# Advisory locking
+#
+# Many sub-agents run `kanban criteria check` against the same card while the
+# coordinator moves it between columns. Without coordination two
+# read-modify-write cycles interleave and the later write silently drops the
+# earlier one's change (a criterion that passed shows as unmet again), and a
+# reader racing a plain write_text() could parse half a file.
+#
+# Two lock levels, both fcntl.flock on files under the board root (released by
+# the kernel if the holder dies, so a crashed agent can never wedge the board):
+#
+#   board_lock(root)      root/.lock — card-number allocation and bulk
+#                         operations that must see a stable board across
+#                         several cards.
+#   card_lock(root, num)  root/.locks/<num>.lock — one card's read-modify-
+#                         write. Keyed by card NUMBER, not path, because a
+#                         move changes the path: a writer in doing/ and a
+#                         mover renaming to done/ must contend for the same
+#                         lock.
+#
+# Ordering: board_lock before card_lock, never the reverse. Both are
+# re-entrant within a thread (read_card's migration write-back takes the card
+# lock its caller may already hold); flock itself is per open file
+# description, so a naive second acquisition in the same process would
+# deadlock against itself.
+#
+# A card's lock file goes away with the card: archiving or trashing it calls
+# discard_card_lock while still holding the lock, so .locks/ does not grow by
+# one file per card ever created. A waiter that opened the file before the
+# unlink wakes up holding a lock on an orphaned inode, which nobody else can
+# contend for — so _flock_exclusive checks, once it has the flock, that the
+# path still names the inode it locked, and starts over if not.
+# ---------------------------------------------------------------------------
+
+_held_locks = threading.local()
+
+
+@contextmanager
+def _flock_exclusive(lock_path: Path):
+    """Hold an exclusive, thread-reentrant flock on lock_path."""
+    held: dict[str, list] = _held_locks.__dict__.setdefault("locks", {})
+    key = str(lock_path)
+    if key in held:
+        held[key][1] += 1
+        try:
+            yield
+        finally:
+            held[key][1] -= 1
+        return
+
+    while True:
+        lock_path.parent.mkdir(parents=True, exist_ok=True)
+        lock_fh = open(lock_path, "a", encoding="utf-8")
+        fcntl.flock(lock_fh, fcntl.LOCK_EX)
+        try:
+            if os.stat(lock_path).st_ino == os.fstat(lock_fh.fileno()).st_ino:
+                break
+        except FileNotFoundError:
+            pass
+        # Unlinked (and perhaps recreated) while we waited; see above.
+        lock_fh.close()
+
+    with lock_fh:
+        held[key] = [lock_fh, 1]
+        try:
+            yield
+        finally:
+            del held[key]
+            fcntl.flock(lock_fh, fcntl.LOCK_UN)
+
+
+@contextmanager
+def board_lock(root: Path):
+    """Hold an exclusive advisory lock over the whole board for the duration.
+
+    Serializes operations that must see a stable board across several writes
+    — above all card-number allocation: next_number() scans the board, so two
+    concurrent `kanban do` invocations could otherwise both pick the same
+    number and the second write would silently clobber the first card. Bulk
+    transitions (`kanban cancel 1 2 3`, `kanban start 4 5`) also run under it
+    so the whole group lands as one unit relative to other bulk writers.
+    """
+    root.mkdir(parents=True, exist_ok=True)
+    with _flock_exclusive(root / ".lock"):
+        yield
+
+
+@contextmanager
+def card_lock(root: Path, num: str | int):
+    """Hold the advisory lock for card #num (see § Advisory locking)."""
+    with _flock_exclusive(root / ".locks" / f"{num}.lock"):
+        yield
+
+
+def discard_card_lock(root: Path, num: str | int) -> None:
+    """Remove card #num's lock file once the card has left the live board.
+
+    The caller holds card_lock(root, num); waiters notice the unlink and
+    retry on a fresh file (see § Advisory locking).
+    """
+    with suppress(FileNotFoundError):
+        (root / ".locks" / f"{num}.lock").unlink()
+
+
+def _board_root_for_card_path(path: Path) -> Path:
+    """Board root for a card file: root/<col>/N.json or root/archive/YYYY-MM/N.json."""
+    if path.parent.parent.name == "archive":
+        return path.parent.parent.parent
+    return path.parent.parent
+
+
+def _normalize_card_ref(pattern: str) -> str:
+    """Card number as find_card matches it ("042" -> "42")."""
+    return str(int(pattern)) if str(pattern).isdigit() else str(pattern)
+
+
+@contextmanager
+def locked_card(root: Path, pattern: str):
+    """Lock card `pattern`, then yield its CURRENT path.
+
+    The path is resolved after the lock is acquired, so a card moved by the
+    previous lock holder is found in its new column. Use for read-modify-write
+    cycles that also move the card or exit early; plain field updates can use
+    update_card.
+    """
+    with card_lock(root, _normalize_card_ref(pattern)):
+        yield find_card(root, pattern)
+
+
+def update_card(root: Path, pattern: str, mutate) -> tuple[Path, dict]:
+    """Apply mutate(card) to card `pattern` under its lock and write it back.
+
+    mutate may raise SystemExit to abort without writing. Stamps "updated"
+    and returns (path, card).
+    """
+    with locked_card(root, pattern) as card_path:
+        card = read_card(card_path)
+        mutate(card)
+        card["updated"] = now_iso()
+        write_card(card_path, card)
+        return card_path, card
+
+
+# ---------------------------------------------------------------------------
+# Board generation
+#
+# Coordinators run `kanban list --output-style=xml` every turn (the PostCompact
+# hook twice), and each run pushed the whole board into model context even when
+# nothing had changed. The board generation is a monotonic counter bumped by
+# every card write, move and creation — all of which funnel through write_card
+# or move_card — so a poller can ask for just the difference:
+#
+#   kanban list --changed-since <gen>
+#
+# emits only the cards added, moved or modified after <gen>, names the cards
+# that left the listed columns, and reports the new generation to pass next
+# time.
+#
+# root/.generation.log is an append-only journal, one {"g": gen, "n": num}
+# line per change; the current generation is the last line's "g". Once it
+# grows past _GENERATION_LOG_COMPACT_BYTES it is rewritten keeping only each
+# live card's latest entry. Entries for cards that have left the board
+# (archived or trashed) are dropped then, and the highest dropped generation
+# becomes the log's floor: a cursor older than the floor can no longer be
+# answered exactly, so the caller gets the full board instead — as it does for
+# a cursor AHEAD of the log (the journal was deleted), or a malformed one.
+#
+# Appends are serialized by root/.generation.lock, a leaf lock: it is taken
+# while a card or board lock may already be held and never takes another
+# lock itself, so it adds no ordering constraint. The journal is advisory —
+# failure to record a change is tolerated (fail open), the card write itself
+# has already landed.
+# ---------------------------------------------------------------------------
+
+_GENERATION_LOG_FILENAME = ".generation.log"
+_GENERATION_LOCK_FILENAME = ".generation.lock"
+_GENERATION_LOG_COMPACT_BYTES = 64 * 1024
+
+
+def _board_root_for_change(path: Path) -> Path | None:
+    """Board root for a card path that belongs in the journal, else None.
+
+    Only numbered cards in a column or an archive month count; scratchpad
+    files and cards written outside a board (tests, tooling) do not.
+    """
+    if not path.stem.isdigit():
+        return None
+    if path.parent.name in COLUMNS:
+        return path.parent.parent
+    if path.parent.parent.name == "archive":
+        return path.parent.parent.parent
+    return None
+
+
+def _parse_generation_log(text: str) -> list[dict]:
+    """Journal entries in order, skipping torn or malformed lines."""
+    entries = []
+    for line in text.splitlines():
+        try:
+            entry = json.loads(line)
+        except json.JSONDecodeError:
+            continue
+        if isinstance(entry, dict) and isinstance(entry.get("g"), int):
+            entries.append(entry)
+    return entries
+
+
+def board_generation(root: Path) -> int:
+    """Current board generation (0 for a board with no recorded changes).
+
+    Reads only the journal's tail, and decodes it from the end: every card
+    move pays for this, so it stops at the last intact line instead of
+    parsing the whole tail.
+    """
+    try:
+        with open(root / _GENERATION_LOG_FILENAME, "rb") as fh:
+            fh.seek(0, os.SEEK_END)
+            fh.seek(max(fh.tell() - 4096, 0))
+            tail = fh.read().decode("utf-8", errors="replace")
+    except OSError:
+        return 0
+    for line in reversed(tail.splitlines()):
+        entries = _parse_generation_log(line)
+        if entries:
+            return entries[0]["g"]
+    return 0
+
+
+def record_card_change(path: Path) -> None:
+    """Bump the board generation for the card at path (see § Board generation)."""
+    root = _board_root_for_change(path)
+    if root is None:
+        return
+    log_path = root / _GENERATION_LOG_FILENAME
+    try:
+        with _flock_exclusive(root / _GENERATION_LOCK_FILENAME):
+            generation = board_generation(root) + 1
+            with open(log_path, "a", encoding="utf-8") as fh:
+                fh.write(json.dumps({"g": generation, "n": path.stem}) + "\n")
+                fh.flush()
+                os.fsync(fh.fileno())
+                size = fh.tell()
+            if size > _GENERATION_LOG_COMPACT_BYTES:
+                _compact_generation_log(root)
+    except OSError:
+        pass
+
+
+def _compact_generation_log(root: Path) -> None:
+    """Rewrite the journal as one entry per live card plus a floor line.
+
+    Called with the generation lock held.
+    """
+    log_path = root / _GENERATION_LOG_FILENAME
+    entries = _parse_generation_log(log_path.read_text(encoding="utf-8"))
+    if not entries:
+        return
+    live = {p.stem for col in COLUMNS for p in (root / col).glob("*.json")}
+    latest: dict[str, int] = {}
+    floor = 0
+    for entry in entries:
+        if entry.get("floor"):
+            floor = max(floor, entry["g"])
+        elif "n" in entry:
+            latest[str(entry["n"])] = entry["g"]
+    for num in [num for num in latest if num not in live]:
+        floor = max(floor, latest.pop(num))
+    # Written in generation order, so the last line still carries the current
+    # generation (a dropped card's, if it was the latest) and the counter
+    # never moves backwards.
+    kept = [{"g": floor, "floor": True}] + [{"g": g, "n": num} for num, g in latest.items()]
+    kept.sort(key=lambda entry: entry["g"])
+    _write_file_atomic(log_path, "".join(json.dumps(entry) + "\n" for entry in kept))
+
+
+def cards_changed_since(root: Path, since: int) -> tuple[int, set[str] | None]:
+    """(current generation, card numbers changed after `since`).
+
+    The set is None when `since` cannot be answered exactly — older than the
+    journal's floor, or ahead of the current generation — and the caller
+    should fall back to the full board.
+    """
+    try:
+        entries = _parse_generation_log((root / _GENERATION_LOG_FILENAME).read_text(encoding="utf-8"))
+    except OSError:
+        entries = []
+    generation = entries[-1]["g"] if entries else 0
+    floor = max((e["g"] for e in entries if e.get("floor")), default=0)
+    if since < floor or since > generation:
+        return generation, None
+    return generation, {str(e["n"]) for e in entries if "n" in e and e["g"] > since}
+
+
+# ---------------------------------------------------------------------------
+# Projection reads for list and report views
+#
+# `kanban list` runs on every coordinator turn and re-reads every card on the
+# board; the report and throughput views read every done card. None of them
+# need more than a handful of top-level fields, and none of them may change a
+# card — yet going through read_card meant a full decode per card plus a
+# possible locked migration write-back per legacy card.
+#
+# read_card_fields() decodes one header and keeps only the requested fields,
+# migrating in memory only. CardIndex goes further: it persists each card's
+# projection in root/.card-index keyed by the file's (inode, mtime_ns, size).
+# write_card always replaces a card with a NEW inode (temp file + rename), so
+# any write invalidates the entry; a card moved between columns is a new
+# path and simply decoded once more. A list of an unchanged 500-card board
+# is then 500 stat() calls and one decode of the index instead of 500 card
+# decodes — and legacy cards still carrying inline activity are decoded once,
+# not on every list.
+#
+# The index is a pure cache: unreadable or stale content is ignored and
+# rebuilt, and failure to save it is silently tolerated (fail open — a
+# read-only checkout must still list). Its name deliberately does not end in
+# ".json", so neither card discovery globs nor watch mode's refresh trigger
+# ever see it.
+# ---------------------------------------------------------------------------
+
+CARD_INDEX_FIELDS = (
+    "action", "intent", "type", "agent", "model", "session",
+    "editFiles", "writeFiles", "readFiles", "criteria", "cycles",
+    "created", "updated", "agent_launch_pending", "summary",
+)
+
+_CARD_INDEX_FILENAME = ".card-index"
+_CARD_INDEX_VERSION = 2
+
+
+def read_card_fields(path: Path, fields=CARD_INDEX_FIELDS) -> dict:
+    """Read only `fields` of a card header. Never writes anything back.
+
+    Old criteria schemas are migrated in memory so callers see the current
+    shape; agent_launch_pending gets the same default read_card applies.
+    """
+    card = json.loads(path.read_text())
+    migrate_criteria(card)
+    card.setdefault("agent_launch_pending", False)
+    return {field: card[field] for field in fields if field in card}
+
+
+class CardIndex:
+    """Stat-validated cache of card projections (see § Projection reads).
+
+    Usage: index = CardIndex(root); index.read(path) per card; index.save()
+    once at the end. Returned dicts share nested lists with the cache —
+    treat them as read-only.
+    """
+
+    def __init__(self, root: Path):
+        self.root = root
+        self.path = root / _CARD_INDEX_FILENAME
+        self._entries: dict[str, dict] = {}
+        self._seen: set[str] = set()
+        self._dirty = False
+        try:
+            data = json.loads(self.path.read_text())
+            if data.get("version") == _CARD_INDEX_VERSION and isinstance(data.get("cards"), dict):
+                self._entries = data["cards"]
+        except (OSError, ValueError, AttributeError):
+            pass
+
+    def read(self, path: Path, fields=CARD_INDEX_FIELDS) -> dict:
+        """Projection of `fields` for the card at path, from cache when fresh."""
+        if not set(fields) <= set(CARD_INDEX_FIELDS):
+            return read_card_fields(path, fields)
+        rel = path.relative_to(self.root).as_posix()
+        # stat BEFORE reading: if the card is replaced in between, the entry
+        # carries the old key and is simply re-decoded next time.
+        st = path.stat()
+        key = [st.st_ino, st.st_mtime_ns, st.st_size]
+        self._seen.add(rel)
+        entry = self._entries.get(rel)
+        if not isinstance(entry, dict) or entry.get("key") != key or not isinstance(entry.get("fields"), dict):
+            entry = {"key": key, "fields": read_card_fields(path)}
+            self._entries[rel] = entry
+            self._dirty = True
+        cached = entry["fields"]
+        return {field: cached[field] for field in fields if field in cached}
+
+    def save(self) -> None:
+        """Persist the index if anything changed, dropping deleted cards."""
+        if not self._dirty:
+            return
+        for rel in [r for r in self._entries if r not in self._seen]:
+            if not (self.root / rel).exists():
+                del self._entries[rel]
+        try:
+            _write_file_atomic(
+                self.path,
+                json.dumps({"version": _CARD_INDEX_VERSION, "cards": self._entries}, separators=(",", ":")),
+            )
+        except OSError:
+            return
+        self._dirty = False
+
+
+# ---------------------------------------------------------------------------
+# Card render cache
+#
+# kanban-pretool-hook forks `kanban show N --output-style=xml` on every Agent
+# launch (prompt injection) and, through its isolation and editFiles guards,
+# on Bash calls too; a parallel fan-out launches many agents against the same
+# few cards. Each fork pays interpreter start-up, get_root's git call, a card
+# decode, the activity log and the XML render — for output that only changes
+# when the card does.
+#
+# cmd_show therefore stores each XML render in root/.render-cache/N.render:
+#
+#   {"version": 1, "path": "<col>/N.json", "key": [...],
+#    "xml": "<card ...>...</card>", "editFiles": ["sorted", "paths"]}
+#
+# key is card_render_key(): the header's (inode, mtime_ns, size) exactly as
+# CardIndex keys it — write_card always replaces the header with a new inode
+# — plus the activity log's (mtime_ns, size), because activity is appended in
+# place and is part of the render. A card moved to another column changes
+# "path" (and its status attribute), so that invalidates the entry too.
+# editFiles is the list a reader would get back by parsing <edit-files> out
+# of the XML, so a guard lookup needs no XML parse.
+#
+# The same file is read by kanban-pretool-hook directly (its
+# _cached_card_render), which is why this layout is a contract between the
+# two: any change bumps _RENDER_CACHE_VERSION, and the hook's key function is
+# tested against card_render_key. A miss there falls back to forking
+# `kanban show`, which refills the entry — so the first launch against a card
+# pays for the render and the rest of the fan-out reads it.
+#
+# Like the card index it is a pure cache: stale or unreadable entries are
+# ignored and rewritten, and a failed save is tolerated. No name in it ends
+# in ".json", so card discovery globs and the watchers never see it.
+# ---------------------------------------------------------------------------
+
+_RENDER_CACHE_DIRNAME = ".render-cache"
+_RENDER_CACHE_VERSION = 1
 
-    # Old dual-column field names (split to avoid literal presence in source)
-    _old_primary = "agent" + "_met"
-    _old_reviewer = "reviewer" + "_met"
-    _old_reason = "reviewer" + "_fail_reason"
 
-    migrated = False
-    for criterion in criteria:
-        # V3 -> V4: collapse dual-column back to single met field
-        if _old_primary in criterion:
-            criterion["met"] = criterion.pop(_old_primary)
-            criterion.pop(_old_reviewer, None)
-            criterion.pop(_old_reason, None)
-            migrated = True
-        # V1 -> V2 (legacy path, now collapsed into V4 directly)
-        elif "met" not in criterion:
-            criterion["met"] = False
-            migrated = True
+def card_render_key(card_path: Path) -> list[int]:
+    """Validation key for a card's rendered view (see § Card render cache)."""
+    st = card_path.stat()
+    try:
+        act = _activity_path(card_path).stat()
+        activity = [act.st_mtime_ns, act.st_size]
+    except FileNotFoundError:
+        activity = [0, 0]
+    return [st.st_ino, st.st_mtime_ns, st.st_size, *activity]
 
-    # Card-level: rename old cycle counter to cycles (old name was "<col>_cycles")
-    _old_cycles = "rev" + "iew_cycles"
-    if _old_cycles in card:
-        card["cycles"] = card.pop(_old_cycles)
-        migrated = True
 
-    return migrated
+def _render_cache_path(root: Path, num: str) -> Path:
+    return root / _RENDER_CACHE_DIRNAME / f"{num}.render"
 
 
-def read_card(path: Path) -> dict:
-    """Read a JSON card file, transparently migrating old criteria schema if needed."""
-    card = json.loads(path.read_text())
-    if migrate_criteria(card):
-        write_card(path, card)
-    # Backward compat: cards created before Phase 1 lack agent_launch_pending.
-    # Default to False so callers can use card["agent_launch_pending"] safely
-    # without KeyError on legacy cards.
-    card.setdefault("agent_launch_pending", False)
-    return card
+def read_render_cache(root: Path, card_path: Path, key: list[int]) -> dict | None:
+    """The cached render of card_path if it was made from `key`, else None."""
+    try:
+        entry = json.loads(_render_cache_path(root, card_number(card_path)).read_text())
+    except (OSError, ValueError):
+        return None
+    if (
+        not isinstance(entry, dict)
+        or entry.get("version") != _RENDER_CACHE_VERSION
+        or entry.get("path") != card_path.relative_to(root).as_posix()
+        or entry.get("key") != key
+        or not isinstance(entry.get("xml"), str)
+    ):
+        return None
+    return entry
 
 
-def write_card(path: Path, card: dict) -> None:
-    """Write a JSON card file."""
-    path.write_text(json.dumps(card, indent=2) + "\n")
+def write_render_cache(root: Path, card_path: Path, key: list[int], xml: str, card: dict) -> None:
+    """Store a card's XML render under the key it was rendered from. Fail open."""
+    edit_files = card.get("editFiles") or card.get("writeFiles", [])
+    entry = {
+        "version": _RENDER_CACHE_VERSION,
+        "path": card_path.relative_to(root).as_posix(),
+        "key": key,
+        "xml": xml,
+        "editFiles": [f.strip() for f in sorted(edit_files) if f.strip()],
+    }
+    try:
+        cache_path = _render_cache_path(root, card_number(card_path))
+        cache_path.parent.mkdir(exist_ok=True)
+        _write_file_atomic(cache_path, json.dumps(entry, separators=(",", ":")))
+    except (OSError, ValueError):
+        pass
 
 
 def find_all_cards(root: Path, include_archived: bool = True) -> list[Path]:
@@ -418,7 +1511,7 @@ def get_session_from_card(card: dict) -> str | None:
 def get_session_from_path(path: Path) -> str | None:
     """Get session from card file."""
     try:
-        return read_card(path).get("session")
+        return read_card_fields(path, ("session",)).get("session")
     except (json.JSONDecodeError, OSError):
         return None
 
@@ -486,14 +1579,13 @@ def is_card_stranded(
     attached to is worse than one that occasionally misses a stranding.
     """
     try:
-        criteria = card.get("criteria") or []
-        if not criteria:
+        summary = card_summary(card)
+        if not summary or not summary["criteria_total"]:
+            return False
+        if summary["criteria_met"] != summary["criteria_total"]:
             return False
-        for criterion in criteria:
-            if not isinstance(criterion, dict) or not criterion.get("met"):
-                return False
 
-        updated_str = card.get("updated")
+        updated_str = summary["last_activity_at"]
         if not updated_str:
             return False
         updated = parse_iso(updated_str)
@@ -531,16 +1623,13 @@ def is_card_abandoned(
     a card is corrupt.
     """
     try:
-        criteria = card.get("criteria") or []
-        if not criteria:
+        summary = card_summary(card)
+        if not summary or not summary["criteria_total"]:
+            return False
+        if summary["criteria_met"]:
             return False
-        for criterion in criteria:
-            if not isinstance(criterion, dict):
-                return False
-            if criterion.get("met"):
-                return False
 
-        updated_str = card.get("updated")
+        updated_str = summary["last_activity_at"]
         if not updated_str:
             return False
         updated = parse_iso(updated_str)
@@ -613,7 +1702,8 @@ def _ses_attr(card: dict) -> str:
     """
     card_session = card.get("session")
     if card_session and isinstance(card_session, str):
-        return f' ses="{html.escape(card_session)}"'
+        from html import escape
+        return f' ses="{escape(card_session)}"'
     return ""
 
 
@@ -678,6 +1768,33 @@ _V8_KANBAN_MIGRATION_SQL = [
     "ALTER TABLE kanban_card_events ADD COLUMN persona TEXT",
 ]
 
+def _kanban_event_row(
+    card: dict,
+    card_num: str,
+    event_type: str,
+    card_completed_at: str | None = None,
+    from_column: str | None = None,
+    to_column: str | None = None,
+    git_project: str | None = None,
+) -> tuple:
+    """One kanban_card_events row (see write_kanban_event for the arguments)."""
+    return (
+        card_num,
+        event_type,
+        card.get("agent"),
+        card.get("model"),
+        card.get("session"),
+        card.get("created"),
+        card_completed_at,
+        card.get("type"),
+        len(card.get("criteria", [])),
+        git_project,
+        from_column,
+        to_column,
+        card.get("agent") if card.get("agent") != "unassigned" else None,
+    )
+
+
 def write_kanban_event(
     card: dict,
     card_num: str,
@@ -706,6 +1823,23 @@ def write_kanban_event(
         if git_project is None:
             git_root = get_git_root()
             git_project = os.path.basename(git_root) if git_root else None
+        write_kanban_events([_kanban_event_row(
+            card, card_num, event_type, card_completed_at, from_column, to_column, git_project,
+        )])
+    except Exception:
+        pass  # Never disrupt kanban CLI — metrics are best-effort
+
+
+def write_kanban_events(rows: list[tuple]) -> None:
+    """Insert _kanban_event_row() rows in one connection and one transaction.
+
+    Bulk transitions record a whole group with this instead of paying the
+    connect/DDL/commit cost per card. Best-effort like write_kanban_event.
+    """
+    if not rows:
+        return
+    try:
+        import sqlite3
         _METRICS_DB_PATH.parent.mkdir(parents=True, exist_ok=True)
         conn = sqlite3.connect(str(_METRICS_DB_PATH))
         try:
@@ -726,7 +1860,7 @@ def write_kanban_event(
                     conn.execute(alter_sql)
                 except sqlite3.OperationalError:
                     pass
-            conn.execute(
+            conn.executemany(
                 """
                 INSERT INTO kanban_card_events (
                     card_number, event_type, agent, model, kanban_session,
@@ -735,21 +1869,7 @@ def write_kanban_event(
                 )
                 VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
                 """,
-                (
-                    card_num,
-                    event_type,
-                    card.get("agent"),
-                    card.get("model"),
-                    card.get("session"),
-                    card.get("created"),
-                    card_completed_at,
-                    card.get("type"),
-                    len(card.get("criteria", [])),
-                    git_project,
-                    from_column,
-                    to_column,
-                    card.get("agent") if card.get("agent") != "unassigned" else None,
-                ),
+                rows,
             )
             conn.commit()
         finally:
@@ -869,9 +1989,16 @@ def substitute_card_id_placeholders(card: dict, card_number: int | str) -> None:
                 entry["cmd"] = entry["cmd"].replace("__CARD_ID__", num_str)
 
 
-def create_card_in_column(root: Path, column: str, card: dict) -> int:
-    """Write a card to a column, return its number."""
-    num = next_number(root)
+def create_card_in_column(root: Path, column: str, card: dict, num: int | None = None) -> int:
+    """Write a card to a column, return its number.
+
+    num, when given, is a number the caller already allocated under
+    board_lock (batch creation allocates a contiguous run with one board
+    scan instead of one scan per card); otherwise the next free number is
+    computed here.
+    """
+    if num is None:
+        num = next_number(root)
     substitute_card_id_placeholders(card, num)
     filepath = root / column / f"{num}.json"
     filepath.parent.mkdir(parents=True, exist_ok=True)
@@ -1788,6 +2915,55 @@ def _identifier_exists_in_repo(identifier: str) -> bool:
     return False
 
 
+def _identifiers_existing_in_repo(identifiers: list[str]) -> set[str]:
+    """Return the subset of identifiers that _identifier_exists_in_repo would
+    report as existing, resolved with ONE repo search for the whole batch.
+
+    A bulk `kanban do` used to fork `rg` once per identifier variant per card,
+    re-scanning the repo each time. Here every variant of every identifier is
+    handed to a single `rg -oF -e ... -e ...` pass, and the matched strings it
+    prints tell us which variants occur. Any identifier that pass did NOT
+    confirm (rare: a genuinely unmatched name, one of the test-fixture
+    literals that needs its own exclusion glob, or a variant shadowed by an
+    overlapping longer match on the same line) falls back to the exact
+    per-identifier check, so the answer is identical to calling
+    _identifier_exists_in_repo on each — only cheaper.
+
+    Fails open like _identifier_exists_in_repo: if the batch pass errors or
+    times out, every identifier is treated as found.
+    """
+    if not identifiers:
+        return set()
+    variants_by_identifier = {ident: _mov_identifier_case_variants(ident) for ident in identifiers}
+    batchable = [i for i in identifiers if i not in _MOV_IDENTIFIER_TEST_FIXTURE_LITERALS]
+    all_variants = sorted({v for ident in batchable for v in variants_by_identifier[ident]})
+
+    found_variants: set[str] = set()
+    if all_variants:
+        search_root = get_git_root() or Path.cwd()
+        cmd = ["rg", "-oF", "--no-filename", "--no-line-number"]
+        for glob in _MOV_IDENTIFIER_SEARCH_EXCLUDE_GLOBS:
+            cmd += ["-g", glob]
+        for variant in all_variants:
+            cmd += ["-e", variant]
+        cmd += ["--", str(search_root)]
+        try:
+            result = subprocess.run(cmd, capture_output=True, text=True, timeout=10)
+        except (subprocess.TimeoutExpired, FileNotFoundError, OSError):
+            return set(identifiers)
+        if result.returncode not in (0, 1):
+            return set(identifiers)
+        found_variants = set(result.stdout.splitlines())
+
+    existing: set[str] = set()
+    for ident in identifiers:
+        if ident in batchable and any(v in found_variants for v in variants_by_identifier[ident]):
+            existing.add(ident)
+        elif _identifier_exists_in_repo(ident):
+            existing.add(ident)
+    return existing
+
+
 def warn_unmatched_card_identifiers(card_json) -> None:
     """Print a non-blocking warning for backtick-quoted identifiers in `action`
     that don't appear anywhere in the repo (outside `.kanban/`).
@@ -1804,12 +2980,17 @@ def warn_unmatched_card_identifiers(card_json) -> None:
     else:
         return  # Not a card — nothing to check
 
+    # Resolve every distinct candidate across the whole batch in one search
+    # (see _identifiers_existing_in_repo), then report per card.
+    candidates_by_card = [extract_identifier_candidates(card.get("action", "")) for card in cards]
+    distinct = list(dict.fromkeys(tok for candidates in candidates_by_card for tok in candidates))
+    existing = _identifiers_existing_in_repo(distinct)
+
     is_bulk = len(cards) > 1
-    for idx, card in enumerate(cards):
-        candidates = extract_identifier_candidates(card.get("action", ""))
+    for idx, candidates in enumerate(candidates_by_card):
         if not candidates:
             continue
-        unmatched = [tok for tok in candidates if not _identifier_exists_in_repo(tok)]
+        unmatched = [tok for tok in candidates if tok not in existing]
         if not unmatched:
             continue
         card_label = f"card[{idx}] " if is_bulk else ""
@@ -2349,7 +3530,27 @@ def _mov_prepass_run_criterion(criterion: dict, working_dir: str) -> bool | None
     return True  # Every command in the array already exits 0.
 
 
-def _mov_prepass_precompute_results(card_json) -> dict[int, bool | None]:
+def _mov_prepass_criterion_key(criterion: dict) -> tuple | None:
+    """Return a hashable key identifying criterion's mov_commands chain, or None.
+
+    Two criteria with the same ordered cmd strings run the same commands in
+    the same working directory, so they share one pre-pass verdict.
+    """
+    mov_commands = criterion.get("mov_commands")
+    if not isinstance(mov_commands, list) or not mov_commands:
+        return None
+    cmds = []
+    for entry in mov_commands:
+        if not isinstance(entry, dict) or not isinstance(entry.get("cmd"), str):
+            return None
+        cmds.append(entry["cmd"])
+    return tuple(cmds)
+
+
+def _mov_prepass_precompute_results(
+    card_json,
+    shared: dict[tuple, bool | None] | None = None,
+) -> dict[int, bool | None]:
     """Run each acceptance criterion's MoV pre-pass EXACTLY ONCE, keyed by the
     criterion's index in the card's criteria list, so that
     warn_nondiscriminating_movs and warn_survival_guard_failing_movs can
@@ -2361,7 +3562,8 @@ def _mov_prepass_precompute_results(card_json) -> dict[int, bool | None]:
     warn_nondiscriminating_movs consumes those).
 
     Only supports the single-card shape (`card_json` is a dict) — the only
-    shape validate_and_build_card's call site ever passes. Returns {} for
+    shape run_card_creation_warnings ever passes (it loops over a batch one
+    card at a time). Returns {} for
     anything else (a bulk list, a non-dict, a non-list `criteria` field),
     which is safe: both consumers treat a missing key exactly like an
     inconclusive `None` result (see each function's `precomputed` parameter)
@@ -2378,6 +3580,12 @@ def _mov_prepass_precompute_results(card_json) -> dict[int, bool | None]:
     validation, resolving the criteria list, computing working_dir) is
     guarded by its own outer try/except so that an unexpected failure
     there ALSO yields {} instead of propagating — see GitHub issue #61.
+
+    `shared` (optional): a verdict cache keyed by _mov_prepass_criterion_key,
+    passed by batch creation (see run_card_creation_warnings) so a
+    mov_commands chain repeated across cards in one `kanban do` array — the
+    same survival guard or test-runner MoV on every card of a wave — runs
+    once per batch instead of once per card.
     """
     try:
         if not isinstance(card_json, dict):
@@ -2394,7 +3602,13 @@ def _mov_prepass_precompute_results(card_json) -> dict[int, bool | None]:
         if not isinstance(criterion, dict):
             continue
         try:
+            key = _mov_prepass_criterion_key(criterion) if shared is not None else None
+            if key is not None and key in shared:
+                results[ac_idx] = shared[key]
+                continue
             results[ac_idx] = _mov_prepass_run_criterion(criterion, working_dir)
+            if key is not None:
+                shared[key] = results[ac_idx]
         except Exception:
             # An unexpected exception while evaluating THIS criterion costs
             # only that criterion — record it as inconclusive (None) and
@@ -2698,7 +3912,7 @@ def _mov_collect_emptiness_assertions(card: dict) -> list[tuple[int, int, str]]:
 
 def check_mov_scope_isolation(
     cards: list[dict],
-    board_cards: list[dict],
+    board_cards: "list[dict] | EditFilesIndex",
 ) -> list[tuple[int, int, int, str, str, str]]:
     """Check each card's path-emptiness MoV assertions for cross-card overlap.
 
@@ -2707,7 +3921,8 @@ def check_mov_scope_isolation(
                card is normalized to a 1-element list by the caller).
         board_cards: cards currently in todo/doing (any session), each carrying
                      an 'id' key (card number string) — see
-                     _load_scope_isolation_board_cards.
+                     _load_scope_isolation_board_cards — or an EditFilesIndex
+                     already built over them.
 
     Returns a list of (card_idx, ac_idx, cmd_idx, conflict_label, asserted_path,
     overlapping_file) tuples, one per detected conflict:
@@ -2718,29 +3933,33 @@ def check_mov_scope_isolation(
     """
     violations: list[tuple[int, int, int, str, str, str]] = []
 
-    for idx, card in enumerate(cards):
-        assertions = _mov_collect_emptiness_assertions(card)
-        if not assertions:
-            continue
+    per_card_assertions = [_mov_collect_emptiness_assertions(card) for card in cards]
+    if not any(per_card_assertions):
+        return violations
+
+    # Both populations are indexed once (see EditFilesIndex) and queried per
+    # asserted path, instead of pairwise-matching every path against every
+    # editFiles entry on the board.
+    board_index = board_cards if isinstance(board_cards, EditFilesIndex) else EditFilesIndex(board_cards)
+    sibling_index = EditFilesIndex(cards)
+    sibling_pos = {id(card): pos for pos, card in enumerate(cards)}
 
+    for idx, assertions in enumerate(per_card_assertions):
         for ac_idx, cmd_idx, asserted_path in assertions:
             # 1. Board cards (todo/doing, ALL sessions) — pre-existing in-flight work.
-            for other in board_cards:
-                for ef in other.get("editFiles") or []:
-                    if _mov_path_overlaps_editfile(asserted_path, ef):
-                        conflict_label = f"card #{other.get('id', 'unknown')}"
-                        violations.append((idx, ac_idx, cmd_idx, conflict_label, asserted_path, ef))
+            for ef, other in board_index.scope_overlaps(asserted_path):
+                conflict_label = f"card #{other.get('id', 'unknown')}"
+                violations.append((idx, ac_idx, cmd_idx, conflict_label, asserted_path, ef))
 
             # 2. Same-batch siblings — cards being created alongside this one in
             #    the same `kanban do`/`kanban todo` array. These do not exist on
             #    the board yet, so a board-only scan would miss them entirely.
-            for sib_idx, sibling in enumerate(cards):
+            for ef, sibling in sibling_index.scope_overlaps(asserted_path):
+                sib_idx = sibling_pos[id(sibling)]
                 if sib_idx == idx:
                     continue
-                for ef in sibling.get("editFiles") or []:
-                    if _mov_path_overlaps_editfile(asserted_path, ef):
-                        conflict_label = f"batch sibling [{sib_idx}]"
-                        violations.append((idx, ac_idx, cmd_idx, conflict_label, asserted_path, ef))
+                conflict_label = f"batch sibling [{sib_idx}]"
+                violations.append((idx, ac_idx, cmd_idx, conflict_label, asserted_path, ef))
 
     return violations
 
@@ -2753,8 +3972,20 @@ def _load_scope_isolation_board_cards(root: Path) -> list[dict]:
     that path in editFiles — a card in todo will eventually move to doing and
     modify the path just as surely as a card already doing.
     """
-    cards = []
-    for col in ("todo", "doing"):
+    todo_cards, doing_cards = _load_inflight_cards(root)
+    return todo_cards + doing_cards
+
+
+def _load_inflight_cards(root: Path) -> tuple[list[dict], list[dict]]:
+    """Load todo and doing cards (all sessions, with IDs) in a single pass.
+
+    `kanban do`/`kanban todo` need both populations — todo+doing for MoV
+    scope isolation, doing alone for the editFiles conflict check — and used
+    to read every doing card from disk twice to get them. Callers load once
+    here and hand the lists to both checks.
+    """
+    loaded: dict[str, list[dict]] = {"todo": [], "doing": []}
+    for col, cards in loaded.items():
         for card_path in find_cards_in_column(root, col):
             try:
                 card = read_card(card_path)
@@ -2762,10 +3993,14 @@ def _load_scope_isolation_board_cards(root: Path) -> list[dict]:
                 cards.append(card)
             except (json.JSONDecodeError, OSError):
                 continue
-    return cards
+    return loaded["todo"], loaded["doing"]
 
 
-def validate_mov_scope_isolation(card_json, root: Path) -> None:
+def validate_mov_scope_isolation(
+    card_json,
+    root: Path,
+    board_cards: "list[dict] | EditFilesIndex | None" = None,
+) -> None:
     """Reject card creation when a MoV path-emptiness assertion overlaps
     another card's declared editFiles.
 
@@ -2777,6 +4012,9 @@ def validate_mov_scope_isolation(card_json, root: Path) -> None:
     Exits with code 1 if any violations are found, printing an actionable error
     report to stderr. Returns normally when no path-emptiness assertions overlap
     another card's scope.
+
+    board_cards, when given, is the caller's already-loaded todo+doing set
+    (see _load_inflight_cards); otherwise it is loaded from root.
     """
     if isinstance(card_json, dict):
         cards = [card_json]
@@ -2785,7 +4023,8 @@ def validate_mov_scope_isolation(card_json, root: Path) -> None:
     else:
         return  # Not a card — nothing to validate
 
-    board_cards = _load_scope_isolation_board_cards(root)
+    if board_cards is None:
+        board_cards = _load_scope_isolation_board_cards(root)
     violations = check_mov_scope_isolation(cards, board_cards)
     if not violations:
         return
@@ -2885,6 +4124,7 @@ _KNOWN_MOV_ENTRY_FIELDS = frozenset({
 
 def _suggest_field(unknown: str, known: frozenset) -> str | None:
     """Return a close-match suggestion for unknown against known fields, or None."""
+    import difflib
     matches = difflib.get_close_matches(unknown, known, n=1, cutoff=0.6)
     return matches[0] if matches else None
 
@@ -2970,10 +4210,14 @@ def validate_card_column(data: dict) -> None:
         sys.exit(1)
 
 
-def validate_and_build_card(data: dict, session: str | None) -> dict:
+def validate_and_build_card(data: dict, session: str | None, run_warnings: bool = True) -> dict:
     """Validate card data and build card dict.
 
     Raises SystemExit on validation failure.
+
+    run_warnings=False skips the non-blocking creation warnings (identifier
+    existence, MoV pre-pass) so batch creation can run them once across every
+    card of the batch — see run_card_creation_warnings.
     """
     validate_no_unknown_fields(data)
     validate_card_column(data)
@@ -3092,33 +4336,49 @@ def validate_and_build_card(data: dict, session: str | None) -> dict:
     if edit_files and read_files:
         card["readFiles"] = [f for f in read_files if f not in edit_files]
 
+    if run_warnings:
+        run_card_creation_warnings([card])
+    return card
+
+
+def run_card_creation_warnings(cards: list[dict]) -> None:
+    """Run the non-blocking creation-time warnings over one or more built cards.
+
+    Batch-aware: the identifier-existence search covers every card in a single
+    repo scan, and the MoV pre-pass verdict for any mov_commands chain repeated
+    across cards is computed once and shared. A single-card call behaves
+    exactly as the per-card warnings always have.
+    """
+    if not cards:
+        return
+
     # Non-blocking identifier-existence warning: flag backtick-quoted,
     # identifier-shaped tokens in the action text that don't appear anywhere
     # in the repo. Warn-only — see § Identifier-existence warning above for
     # why this never raises SystemExit.
-    warn_unmatched_card_identifiers(card)
-
-    # Run each criterion's MoV pre-pass ONCE, shared by both warnings below
-    # instead of each independently calling _mov_prepass_run_criterion on
-    # the same criterion — see GitHub issue #60. Without this, any
-    # criterion labelled '(survival guard)' had its MoV executed twice per
-    # card creation (once per warning); ordinary criteria were unaffected.
-    mov_prepass_results = _mov_prepass_precompute_results(card)
-
-    # Non-blocking non-discriminating-MoV warning: flag acceptance criteria
-    # whose mov_commands already exit 0 against the current tree, before any
-    # work has been done. Warn-only — see § Non-discriminating MoV warning
-    # above for why this never raises SystemExit.
-    warn_nondiscriminating_movs(card, precomputed=mov_prepass_results)
-
-    # Non-blocking survival-guard-failing-MoV warning: flag acceptance
-    # criteria labelled '(survival guard)' whose mov_commands do NOT already
-    # exit 0 against the current tree — the inverse of the check above. See
-    # § Survival-guard-failing MoV warning above for why this never raises
-    # SystemExit.
-    warn_survival_guard_failing_movs(card, precomputed=mov_prepass_results)
-
-    return card
+    warn_unmatched_card_identifiers(cards[0] if len(cards) == 1 else cards)
+
+    shared_prepass: dict[tuple, bool | None] = {}
+    for card in cards:
+        # Run each criterion's MoV pre-pass ONCE, shared by both warnings below
+        # instead of each independently calling _mov_prepass_run_criterion on
+        # the same criterion — see GitHub issue #60. Without this, any
+        # criterion labelled '(survival guard)' had its MoV executed twice per
+        # card creation (once per warning); ordinary criteria were unaffected.
+        mov_prepass_results = _mov_prepass_precompute_results(card, shared=shared_prepass)
+
+        # Non-blocking non-discriminating-MoV warning: flag acceptance criteria
+        # whose mov_commands already exit 0 against the current tree, before any
+        # work has been done. Warn-only — see § Non-discriminating MoV warning
+        # above for why this never raises SystemExit.
+        warn_nondiscriminating_movs(card, precomputed=mov_prepass_results)
+
+        # Non-blocking survival-guard-failing-MoV warning: flag acceptance
+        # criteria labelled '(survival guard)' whose mov_commands do NOT already
+        # exit 0 against the current tree — the inverse of the check above. See
+        # § Survival-guard-failing MoV warning above for why this never raises
+        # SystemExit.
+        warn_survival_guard_failing_movs(card, precomputed=mov_prepass_results)
 
 
 def _mov_fail_closed_scan(raw_input_text: str, source: str) -> None:
@@ -3186,6 +4446,252 @@ def resolve_json_input(args) -> object:
         sys.exit(1)
 
 
+# ---------------------------------------------------------------------------
+# Compiled editFiles path-pattern index
+#
+# Every file-conflict question the scheduler asks has the same shape: "does
+# this new path (or glob) overlap ANY editFiles entry of ANY in-flight card?"
+# Answering it pairwise — every new entry against every in-flight entry, one
+# fnmatch call each — is O(cards × files²) per `kanban do`, and a busy board
+# pays that on every creation. EditFilesIndex is built ONCE from the in-flight
+# cards and then queried per new path:
+#
+#   - Every entry is stored in a trie keyed by its '/'-split path segments, so
+#     literal equality and directory containment (either direction) are a
+#     single walk down the new path's segments.
+#   - Glob entries are additionally pre-compiled to a regex (once, at build
+#     time) and hung off the trie node of their literal directory prefix — the
+#     segments before the first wildcard. A glob can only match a path that
+#     starts with that prefix, so a query only tests the handful of globs that
+#     sit on its own walk, never the whole board.
+#   - A glob QUERY tests its own compiled regex against the entries in the
+#     subtree under its literal prefix only.
+#
+# Matching semantics are a strict superset of the old fnmatch behavior: '*',
+# '?' and '[...]' behave exactly as fnmatch does (including '*' crossing '/'),
+# and '**' finally gets real recursive meaning — see _compile_path_glob.
+# ---------------------------------------------------------------------------
+
+_PATH_GLOB_CHARS = frozenset("*?[")
+
+
+def _is_path_glob(pattern: str) -> bool:
+    """True if pattern contains any fnmatch wildcard character."""
+    return any(ch in _PATH_GLOB_CHARS for ch in pattern)
+
+
+def _path_segments(path: str) -> list[str]:
+    """Split a path on '/', dropping empty segments (same rule as _path_is_prefix_of)."""
+    return [p for p in path.split("/") if p]
+
+
+def _glob_static_segments(pattern: str) -> list[str]:
+    """Return the leading segments of pattern that contain no wildcard."""
+    static = []
+    for segment in pattern.split("/"):
+        if _is_path_glob(segment):
+            break
+        if segment:
+            static.append(segment)
+    return static
+
+
+def _compile_path_glob(pattern: str) -> "re.Pattern[str]":
+    """Compile an editFiles glob into an anchored regex.
+
+    '*', '?' and '[...]' mirror fnmatch exactly — '*' still crosses '/', as the
+    fnmatch-based scheduler always has — so nothing that used to conflict
+    stops conflicting. '**' gains real recursive semantics on top:
+
+      - a '**/' segment matches zero or more leading directories, so
+        '**/*.ts' matches 'foo.ts' as well as 'src/a/foo.ts', and
+        'src/**/x.py' matches 'src/x.py';
+      - a trailing '/**' matches the directory itself and everything
+        beneath it, so 'src/**' matches 'src' and 'src/a/b.py'.
+    """
+    i, n = 0, len(pattern)
+    out: list[str] = []
+    while i < n:
+        if pattern.startswith("**/", i) and (i == 0 or pattern[i - 1] == "/"):
+            out.append("(?:.*/)?")
+            i += 3
+            continue
+        if pattern.startswith("/**", i) and i + 3 == n:
+            out.append("(?:/.*)?")
+            i += 3
+            continue
+        ch = pattern[i]
+        if ch == "*":
+            while i < n and pattern[i] == "*":
+                i += 1
+            out.append(".*")
+            continue
+        if ch == "?":
+            out.append(".")
+            i += 1
+            continue
+        if ch == "[":
+            j = i + 1
+            if j < n and pattern[j] == "!":
+                j += 1
+            if j < n and pattern[j] == "]":
+                j += 1
+            while j < n and pattern[j] != "]":
+                j += 1
+            if j >= n:
+                # Unterminated bracket: fnmatch treats '[' as a literal.
+                out.append(re.escape(ch))
+                i += 1
+                continue
+            body = pattern[i + 1:j].replace("\\", "\\\\")
+            if body.startswith("!"):
+                body = "^" + body[1:]
+            elif body.startswith("^"):
+                body = "\\" + body
+            out.append(f"[{body}]")
+            i = j + 1
+            continue
+        out.append(re.escape(ch))
+        i += 1
+    return re.compile("(?s:" + "".join(out) + r")\Z")
+
+
+class _PathTrieNode:
+    """One '/'-segment of the EditFilesIndex trie."""
+
+    __slots__ = ("children", "entries", "globs")
+
+    def __init__(self) -> None:
+        self.children: dict[str, "_PathTrieNode"] = {}
+        # (seq, entry, owner) for every entry whose full segment path ends here.
+        self.entries: list[tuple[int, str, object]] = []
+        # (seq, entry, owner, regex) for glob entries whose literal prefix ends here.
+        self.globs: list[tuple[int, str, object, "re.Pattern[str]"]] = []
+
+
+class EditFilesIndex:
+    """Compiled, queryable index over in-flight cards' editFiles entries.
+
+    Build once per command from the in-flight cards (see the section comment
+    above), then ask `overlaps(path)` for scheduler conflicts or
+    `scope_overlaps(path)` for MoV scope-isolation conflicts. Both return
+    (entry, owner) pairs in insertion order — i.e. card order, then each
+    card's editFiles order — so callers report conflicts in the same order the
+    old pairwise loops did.
+    """
+
+    def __init__(self, cards: "list[dict] | None" = None) -> None:
+        self._root = _PathTrieNode()
+        self._seq = 0
+        # Cards indexed via add_card, in insertion order.
+        self.cards: list[dict] = []
+        for card in cards or []:
+            self.add_card(card)
+
+    def add_card(self, card: dict) -> None:
+        """Index every string editFiles entry of card, owned by card."""
+        self.cards.append(card)
+        edit_files = card.get("editFiles") or []
+        if not isinstance(edit_files, list):
+            return
+        for entry in edit_files:
+            if isinstance(entry, str) and entry:
+                self.add(entry, card)
+
+    def add(self, entry: str, owner: object) -> None:
+        """Index a single path or glob entry on behalf of owner."""
+        seq = self._seq
+        self._seq += 1
+        self._node_for(_path_segments(entry), create=True).entries.append((seq, entry, owner))
+        if _is_path_glob(entry):
+            node = self._node_for(_glob_static_segments(entry), create=True)
+            node.globs.append((seq, entry, owner, _compile_path_glob(entry)))
+
+    def _node_for(self, segments: list[str], create: bool = False) -> "_PathTrieNode | None":
+        node = self._root
+        for segment in segments:
+            child = node.children.get(segment)
+            if child is None:
+                if not create:
+                    return None
+                child = node.children[segment] = _PathTrieNode()
+            node = child
+        return node
+
+    def _walk(self, segments: list[str]):
+        """Yield the root, then each existing node along segments."""
+        node = self._root
+        yield node
+        for segment in segments:
+            node = node.children.get(segment)
+            if node is None:
+                return
+            yield node
+
+    @staticmethod
+    def _subtree_entries(node: "_PathTrieNode"):
+        stack = [node]
+        while stack:
+            current = stack.pop()
+            yield from current.entries
+            stack.extend(current.children.values())
+
+    def _collect_overlaps(self, path: str, found: dict) -> None:
+        segments = _path_segments(path)
+        # Indexed globs that match `path` (or equal it), found along its walk.
+        for node in self._walk(segments):
+            for seq, entry, owner, regex in node.globs:
+                if entry == path or regex.match(path):
+                    found[seq] = (entry, owner)
+        # Exact literal equality.
+        node = self._node_for(segments)
+        if node is not None:
+            for seq, entry, owner in node.entries:
+                if entry == path:
+                    found[seq] = (entry, owner)
+        # A glob query additionally matches indexed entries under its literal prefix.
+        if _is_path_glob(path):
+            start = self._node_for(_glob_static_segments(path))
+            if start is not None:
+                regex = _compile_path_glob(path)
+                for seq, entry, owner in self._subtree_entries(start):
+                    if seq not in found and regex.match(entry):
+                        found[seq] = (entry, owner)
+
+    def overlaps(self, path: str) -> list[tuple[str, object]]:
+        """Return (entry, owner) for every indexed entry that glob-overlaps path.
+
+        Overlap means: equal, the entry (as a glob) matches path, or path (as
+        a glob) matches the entry — the same predicate _globs_overlap applies.
+        """
+        found: dict[int, tuple[str, object]] = {}
+        self._collect_overlaps(path, found)
+        return [found[seq] for seq in sorted(found)]
+
+    def scope_overlaps(self, path: str) -> list[tuple[str, object]]:
+        """Like overlaps(), plus directory containment in either direction.
+
+        This is _mov_path_overlaps_editfile's predicate: an asserted path
+        'modules/' overlaps an entry 'modules/claude/foo.py' and vice versa.
+        """
+        found: dict[int, tuple[str, object]] = {}
+        self._collect_overlaps(path, found)
+        segments = _path_segments(path)
+        if segments:
+            # Indexed entries that are a directory prefix of path.
+            for depth, node in enumerate(self._walk(segments)):
+                if depth == 0:
+                    continue
+                for seq, entry, owner in node.entries:
+                    found[seq] = (entry, owner)
+            # Indexed entries nested under path.
+            node = self._node_for(segments)
+            if node is not None:
+                for seq, entry, owner in self._subtree_entries(node):
+                    found[seq] = (entry, owner)
+        return [found[seq] for seq in sorted(found)]
+
+
 def _files_conflict(path_a: str, edit_a: bool, path_b: str, edit_b: bool) -> bool:
     """Return True if two file entries conflict based on conflict rules.
 
@@ -3194,16 +4700,16 @@ def _files_conflict(path_a: str, edit_a: bool, path_b: str, edit_b: bool) -> boo
     - editFiles vs readFiles  → NO CONFLICT (reader + writer is allowed)
     - readFiles vs readFiles  → NO CONFLICT (two readers are fine)
 
-    Uses fnmatch for glob matching. Python's fnmatch treats '*' as matching
-    any character including '/' on non-Windows, so 'src/*.py' will match
-    'src/foo.py' — crossing path separators as specified.
+    Glob matching follows _compile_path_glob: '*' matches any character
+    including '/', so 'src/*.py' will match 'src/foo.py' — crossing path
+    separators as specified — and '**' is recursive.
     """
     # Only conflict when both are edits (two writers)
     if not (edit_a and edit_b):
         return False
 
     # Check if the two patterns overlap: either a matches b's pattern or b matches a's
-    return fnmatch.fnmatch(path_a, path_b) or fnmatch.fnmatch(path_b, path_a)
+    return bool(_globs_overlap([path_a], [path_b]))
 
 
 def check_file_conflicts(
@@ -3216,76 +4722,91 @@ def check_file_conflicts(
     Returns the first conflict found as (inflight_card_num, inflight_session, conflicting_path),
     or None if no conflicts exist.
 
-    In-flight means: doing column.
+    In-flight means: doing column. The doing cards are indexed once (see
+    EditFilesIndex) and each new editFiles entry is a single index query;
+    only edit-vs-edit is a conflict, so new_read_files never match.
     """
     if not new_edit_files and not new_read_files:
         return None
 
-    in_flight_columns = ["doing"]
-
-    for col in in_flight_columns:
-        for card_path in find_cards_in_column(root, col):
-            try:
-                inflight = read_card(card_path)
-            except (json.JSONDecodeError, OSError):
-                continue
-
-            inflight_edit = inflight.get("editFiles") or []
-            inflight_read = inflight.get("readFiles") or []
-            inflight_num = card_number(card_path)
-            inflight_session = inflight.get("session") or "unknown"
-
-            # Check new card's editFiles against inflight editFiles only
-            # (only edit-vs-edit is a conflict)
-            for new_path in new_edit_files:
-                for existing_path in inflight_edit:
-                    if _files_conflict(new_path, True, existing_path, True):
-                        return (inflight_num, inflight_session, new_path)
+    doing_cards = _load_all_doing_cards(root)
+    index = EditFilesIndex(doing_cards)
+    board_pos = {id(card): pos for pos, card in enumerate(doing_cards)}
+
+    # Report the earliest in-flight card (board order), and for that card the
+    # earliest conflicting new path — the same answer the old nested scan gave.
+    best: tuple[int, int] | None = None
+    for new_idx, new_path in enumerate(new_edit_files):
+        hits = index.overlaps(new_path)
+        if not hits:
+            continue
+        pos = min(board_pos[id(owner)] for _entry, owner in hits)
+        if best is None or pos < best[0]:
+            best = (pos, new_idx)
 
-    return None
+    if best is None:
+        return None
+    inflight = doing_cards[best[0]]
+    return (inflight["id"], inflight.get("session") or "unknown", new_edit_files[best[1]])
 
 
 def _globs_overlap(globs_a: list[str], globs_b: list[str]) -> list[str]:
     """Return list of overlapping glob entries (concrete-vs-glob OR concrete-vs-concrete).
 
-    Uses fnmatch for glob matching: a entry from globs_a overlaps with an entry
-    from globs_b if they are equal, or one matches the other as a glob pattern.
+    An entry from globs_a overlaps with an entry from globs_b if they are
+    equal, or one matches the other as a glob pattern. globs_b is compiled into
+    an EditFilesIndex once, so each globs_a entry is one index query.
 
-    Limitation: fnmatch does NOT treat '/' as a directory separator. The '**'
-    recursive-directory glob (e.g. '**/*.ts') is NOT reliably supported — it may
-    match on some platforms but should not be relied upon. If recursive glob
-    matching is needed, consider switching to pathlib.PurePath.match(), which
-    provides proper '**' support. For now, avoid '**' patterns in editFiles; use
-    explicit directory prefixes (e.g. 'src/*.ts') instead.
+    '*' matches across '/' (fnmatch-compatible), and '**' is recursive: a
+    '**/' segment matches zero or more directories, so '**/*.ts' overlaps both
+    'foo.ts' and 'src/foo.ts' — see _compile_path_glob.
     """
-    overlap = []
-    for ga in globs_a:
-        for gb in globs_b:
-            if ga == gb or fnmatch.fnmatch(gb, ga) or fnmatch.fnmatch(ga, gb):
-                overlap.append(ga)
-                break
-    return overlap
+    if not globs_a or not globs_b:
+        return []
+    index = EditFilesIndex()
+    for gb in globs_b:
+        if isinstance(gb, str) and gb:
+            index.add(gb, None)
+    return [ga for ga in globs_a if isinstance(ga, str) and index.overlaps(ga)]
 
 
 def check_editfiles_overlap(
     card_id: str,
     card_edit_files: list[str],
-    all_doing_cards: list[dict],
+    all_doing_cards: "list[dict] | EditFilesIndex",
 ) -> list[tuple[str, str, list[str]]]:
     """Returns list of (card_id, session, overlapping_files) tuples.
 
     Scans all_doing_cards for editFiles overlap with card_edit_files.
     Cards with empty editFiles produce no conflicts.
     The card with card_id is excluded from the scan (skip self-comparison).
+
+    all_doing_cards may be a prebuilt EditFilesIndex — callers that check
+    several cards against the same in-flight set (bulk `kanban do`, `kanban
+    start N M ...`) build it once instead of once per card.
     """
     if not card_edit_files:
         return []
+    if isinstance(all_doing_cards, EditFilesIndex):
+        index = all_doing_cards
+    else:
+        index = EditFilesIndex(all_doing_cards)
+
+    overlapping_by_card: dict[int, list[str]] = {}
+    for path in card_edit_files:
+        if not isinstance(path, str):
+            continue
+        matched: set[int] = set()
+        for _entry, owner in index.overlaps(path):
+            if id(owner) not in matched:
+                matched.add(id(owner))
+                overlapping_by_card.setdefault(id(owner), []).append(path)
+
     conflicts = []
-    for other in all_doing_cards:
+    for other in index.cards:
         if str(other.get("id", "")) == str(card_id):
             continue
-        other_files = other.get("editFiles") or []
-        overlapping = _globs_overlap(card_edit_files, other_files)
+        overlapping = overlapping_by_card.get(id(other))
         if overlapping:
             conflicts.append((
                 str(other.get("id", "unknown")),
@@ -3313,9 +4834,10 @@ def _route_card_to_column(
     card: dict,
     requested_column: str | None,
     default_column: str,
-    doing_cards: list[dict],
+    doing_cards: "list[dict] | EditFilesIndex",
     force: bool,
     git_project: str | None,
+    num: int | None = None,
 ) -> tuple[int, bool]:
     """Create one card in the column implied by its verb, or its own explicit override.
 
@@ -3347,11 +4869,17 @@ def _route_card_to_column(
     "doing"-bound card was deferred to "todo" because of an editFiles
     conflict — callers use it to decide whether to exit non-zero, matching
     `kanban do`'s pre-existing conflict-signal behavior.
+
+    num is the card number pre-allocated by the batch pipeline (see
+    _create_cards_from_json); None allocates one here. When doing_cards is an
+    EditFilesIndex, a card placed in doing is added to it, so later cards of
+    the same batch are conflict-checked against it exactly as if it had
+    already been on the board.
     """
     target = requested_column or default_column
 
     if target == "todo":
-        num = create_card_in_column(root, "todo", card)
+        num = create_card_in_column(root, "todo", card, num=num)
         write_kanban_event(card, str(num), "create", to_column="todo", git_project=git_project)
         print(num)
         return num, False
@@ -3363,7 +4891,7 @@ def _route_card_to_column(
     if overlap_conflicts and not force:
         inflight_num, inflight_session, conflict_files = overlap_conflicts[0]
         conflict_path = conflict_files[0] if conflict_files else "(unknown)"
-        num = create_card_in_column(root, "todo", card)
+        num = create_card_in_column(root, "todo", card, num=num)
         write_kanban_event(card, str(num), "create", to_column="todo", git_project=git_project)
         print(num)
         print(
@@ -3375,18 +4903,32 @@ def _route_card_to_column(
     if overlap_conflicts and force:
         card["forced"] = True
     card["agent_launch_pending"] = True
-    num = create_card_in_column(root, "doing", card)
+    num = create_card_in_column(root, "doing", card, num=num)
     write_kanban_event(card, str(num), "create", to_column="doing", git_project=git_project)
+    if isinstance(doing_cards, EditFilesIndex):
+        doing_cards.add_card({**card, "id": str(num)})
     print(num)
     return num, False
 
 
-def cmd_do(args) -> None:
-    """Create card(s) directly in the doing column from JSON input.
+def _create_cards_from_json(args, default_column: str) -> None:
+    """Shared batch-creation pipeline behind `kanban do` and `kanban todo`.
 
-    Accepts either a single JSON object or an array of objects for bulk creation.
-    Sets agent_launch_pending=True on cards placed in doing (conflict-deferred
-    cards go to todo and do NOT get agent_launch_pending=True).
+    Accepts either a single JSON object or an array of objects. Whatever the
+    batch size, board state and the expensive validation steps are paid once
+    per invocation rather than once per card:
+
+      - the in-flight board (todo + doing) is read from disk once and shared
+        by MoV scope isolation and the editFiles conflict check;
+      - the identifier-existence search and the MoV pre-pass run across all
+        cards together (see run_card_creation_warnings);
+      - new cards are conflict-checked against in-flight cards AND against
+        earlier cards of the same batch that were placed in doing;
+      - every card is written under a single board_lock, with card numbers
+        allocated from one board scan.
+
+    Validation is all-or-nothing: no card is written unless every card in
+    the batch validates.
     """
     root = get_root(args.root)
 
@@ -3404,7 +4946,13 @@ def cmd_do(args) -> None:
     # editFiles — either an in-flight board card (todo/doing, any session) or
     # a sibling in this same creation batch. See § Cross-card MoV scope-isolation
     # validation above validate_mov_scope_isolation's definition.
-    validate_mov_scope_isolation(data, root)
+    #
+    # The in-flight board is read ONCE here and shared with the editFiles
+    # conflict check below; the doing cards are compiled into an
+    # EditFilesIndex a single time for every card in this invocation.
+    todo_cards, doing_list = _load_inflight_cards(root)
+    validate_mov_scope_isolation(data, root, board_cards=todo_cards + doing_list)
+    doing_cards = EditFilesIndex(doing_list)
 
     session = args.session if hasattr(args, "session") and args.session else get_current_session_id()
 
@@ -3413,7 +4961,8 @@ def cmd_do(args) -> None:
     git_project = os.path.basename(git_root) if git_root else None
 
     # Detect array vs object
-    if isinstance(data, list):
+    is_bulk = isinstance(data, list)
+    if is_bulk:
         # Bulk creation: validate all cards first (fail fast)
         # Pre-pass: collect && violations across ALL cards before proceeding.
         # This lets us report every violation in one shot rather than stopping
@@ -3434,161 +4983,301 @@ def cmd_do(args) -> None:
                 print("", file=sys.stderr)
             sys.exit(1)
 
-        cards = []
         for i, card_data in enumerate(data):
             if not isinstance(card_data, dict):
                 print(f"Error: Array element {i} must be a JSON object, got {type(card_data).__name__}", file=sys.stderr)
                 sys.exit(1)
-            card = validate_and_build_card(card_data, session)
-            # Carry the entry's own "column" override alongside its built card —
-            # validate_and_build_card's returned dict never contains "column"
-            # (make_card doesn't accept it), so it must be read from the raw
-            # input here, one entry at a time.
-            cards.append((card, card_data.get("column")))
-
-        # All validation passed — create cards, routing each to its own column
-        # (explicit per-entry override, falling back to "doing" when absent —
-        # see _route_card_to_column), checking conflicts per card landing in doing.
-        force = getattr(args, "force", False)
-        doing_cards = _load_all_doing_cards(root)
-        had_conflict = False
-        for card, requested_column in cards:
-            _, conflicted = _route_card_to_column(
-                root, card, requested_column, "doing", doing_cards, force, git_project,
-            )
-            had_conflict = had_conflict or conflicted
-        if had_conflict:
-            sys.exit(1)
+        entries = data
     elif isinstance(data, dict):
-        # Single card creation with conflict detection. The optional "column"
-        # field is honored here too, for consistency with the array path —
-        # see card #3349: a single-object `kanban do --file` call with
-        # "column": "todo" queues the card instead of starting it, exactly as
-        # that same object would inside an array.
-        force = getattr(args, "force", False)
-        card = validate_and_build_card(data, session)
-        doing_cards = _load_all_doing_cards(root)
-        requested_column = data.get("column")
-        _, conflicted = _route_card_to_column(
-            root, card, requested_column, "doing", doing_cards, force, git_project,
-        )
-        if conflicted:
-            # Clean up --file before exiting so it never pre-exists on next use
-            json_file = getattr(args, "json_file", None)
-            if json_file:
-                os.remove(json_file)
-            sys.exit(1)
+        # Single card creation. The optional "column" field is honored here
+        # too, for consistency with the array path — see card #3349: a
+        # single-object `kanban do --file` call with "column": "todo" queues
+        # the card instead of starting it, exactly as that same object would
+        # inside an array.
+        entries = [data]
     else:
         print(f"Error: JSON must be an object or array, got {type(data).__name__}", file=sys.stderr)
         sys.exit(1)
 
-    # Delete the --file input after successful card creation so it never pre-exists on next use
+    # Structural validation for every card before anything is written. Carry
+    # each entry's own "column" override alongside its built card —
+    # validate_and_build_card's returned dict never contains "column"
+    # (make_card doesn't accept it), so it must be read from the raw input
+    # here, one entry at a time.
+    cards = [
+        (validate_and_build_card(card_data, session, run_warnings=False), card_data.get("column"))
+        for card_data in entries
+    ]
+
+    # Non-blocking warnings, once across the whole batch.
+    run_card_creation_warnings([card for card, _ in cards])
+
+    # All validation passed — create cards, routing each to its own column
+    # (explicit per-entry override, falling back to default_column when
+    # absent — see _route_card_to_column), checking conflicts per card
+    # landing in doing.
+    force = getattr(args, "force", False)
+    had_conflict = False
+    with board_lock(root):
+        next_num = next_number(root)
+        for card, requested_column in cards:
+            num, conflicted = _route_card_to_column(
+                root, card, requested_column, default_column, doing_cards, force, git_project,
+                num=next_num,
+            )
+            next_num = num + 1
+            had_conflict = had_conflict or conflicted
+
     json_file = getattr(args, "json_file", None)
+    if had_conflict:
+        # Clean up a single-card --file before exiting so it never pre-exists on next use
+        if json_file and not is_bulk:
+            os.remove(json_file)
+        sys.exit(1)
+
+    # Delete the --file input after successful card creation so it never pre-exists on next use
     if json_file:
         os.remove(json_file)
 
 
+def cmd_do(args) -> None:
+    """Create card(s) directly in the doing column from JSON input.
 
-def cmd_defer(args) -> None:
-    """Move card(s) from doing back to todo."""
-    root = get_root(args.root)
-    card_numbers = args.card if isinstance(args.card, list) else [args.card]
+    Accepts either a single JSON object or an array of objects for bulk creation.
+    Sets agent_launch_pending=True on cards placed in doing (conflict-deferred
+    cards go to todo and do NOT get agent_launch_pending=True).
+    """
+    _create_cards_from_json(args, "doing")
 
-    # Pre-compute git_project once to avoid N redundant git subprocesses in bulk loops
-    git_root = get_git_root()
-    git_project = os.path.basename(git_root) if git_root else None
 
-    for card_num in card_numbers:
-        card_path = find_card(root, card_num)
-        col = card_path.parent.name
-        num = card_number(card_path)
+# ---------------------------------------------------------------------------
+# Bulk transitions
+#
+# `kanban done`, `cancel`, `defer` and `start` accept any mix of card numbers,
+# `#N` references, inclusive ranges (`4-9` or `4..9`) and comma lists
+# (`3,5,8-10`). A coordinator closing out a wave of finished cards used to pay
+# one process start, one board scan per card and one SQLite connection per
+# event; now the whole group is one invocation that:
+#
+#   - applies every move under a single board lock (each card additionally
+#     under its own lock while it is read and moved — see § Advisory locking),
+#   - keeps going past a card that fails, reporting each card on its own line,
+#   - records every lifecycle event with one batched metrics insert, and
+#   - exits with a status that says how the group as a whole went:
+#
+#       0  every card transitioned
+#       1  no card transitioned (or the only card failed — unchanged for
+#          single-card calls, so `kanban done N` keeps its old contract)
+#       2  at least one card hit MAX_CYCLES in `done` — escalation beats
+#          partial success because a human has to look either way
+#       3  partial: some cards transitioned, others failed
+# ---------------------------------------------------------------------------
 
-        if col != "doing":
-            print(f"Error: Card #{num} is in '{col}', not 'doing'. Defer only works on cards in doing.", file=sys.stderr)
-            sys.exit(1)
+BULK_EXIT_PARTIAL = 3
 
-        card = read_card(card_path)
-        card["agent_launch_pending"] = False
-        card["updated"] = now_iso()
-        write_card(card_path, card)
-        write_kanban_event(card, num, "defer", from_column=col, to_column="todo", git_project=git_project)
+# A typo like `1-9999` should fail loudly rather than lock the board while it
+# reports ten thousand missing cards.
+_CARD_RANGE_MAX = 500
+
+_CARD_REF_PART = re.compile(r"#?(\d+)(?:(?:-|\.\.)#?(\d+))?")
+
+
+def is_card_ref(token: str) -> bool:
+    """True if token is a card number, range or comma list of them."""
+    parts = token.split(",")
+    return all(_CARD_REF_PART.fullmatch(part) for part in parts)
+
+
+def parse_card_refs(tokens: list[str]) -> list[str]:
+    """Expand card references to a de-duplicated list of card numbers.
+
+    "7", "#7", "4-9", "4..9" and "3,5,8-10" all expand; order of first
+    appearance is kept. Tokens that are not references pass through untouched
+    so find_card reports them the way it always has. A reversed or oversized
+    range is an error (exit 1) before any card is touched.
+    """
+    refs: list[str] = []
+    seen: set[str] = set()
+
+    def add(ref: str) -> None:
+        if ref not in seen:
+            seen.add(ref)
+            refs.append(ref)
+
+    for token in tokens:
+        if not is_card_ref(token):
+            add(token)
+            continue
+        for part in token.split(","):
+            match = _CARD_REF_PART.fullmatch(part)
+            start = int(match.group(1))
+            end = int(match.group(2)) if match.group(2) is not None else start
+            if end < start:
+                print(f"Error: Invalid card range '{part}' (end before start)", file=sys.stderr)
+                sys.exit(1)
+            if end - start >= _CARD_RANGE_MAX:
+                print(f"Error: Card range '{part}' spans more than {_CARD_RANGE_MAX} cards", file=sys.stderr)
+                sys.exit(1)
+            for num in range(start, end + 1):
+                add(str(num))
+    return refs
+
+
+def _bulk_card_args(args) -> list[str]:
+    """Card tokens from args.card, which may be a list (CLI) or a single str."""
+    return list(args.card) if isinstance(args.card, list) else [args.card]
+
+
+def _finish_bulk(verb: str, total: int, failed: list[str], max_cycles: bool = False) -> None:
+    """Print the group summary and exit with the bulk status (see above)."""
+    if not failed:
+        return
+    transitioned = total - len(failed)
+    if total > 1:
+        print(
+            f"{verb}: {transitioned} of {total} cards transitioned; "
+            f"failed: {' '.join('#' + ref.lstrip('#') for ref in failed)}",
+            file=sys.stderr,
+        )
+    if max_cycles:
+        sys.exit(2)
+    sys.exit(BULK_EXIT_PARTIAL if transitioned else 1)
+
+
+def cmd_defer(args) -> None:
+    """Move card(s) from doing back to todo (see § Bulk transitions)."""
+    root = get_root(args.root)
+    card_numbers = parse_card_refs(_bulk_card_args(args))
+
+    # Pre-compute git_project once to avoid N redundant git subprocesses in bulk loops
+    git_root = get_git_root()
+    git_project = os.path.basename(git_root) if git_root else None
+    events: list[tuple] = []
+    failed: list[str] = []
 
-        target = root / "todo" / card_path.name
-        target.parent.mkdir(parents=True, exist_ok=True)
-        card_path.rename(target)
-        print(f"Deferred: #{num} — moved to todo")
+    with board_lock(root):
+        try:
+            for card_num in card_numbers:
+                try:
+                    with locked_card(root, card_num) as card_path:
+                        col = card_path.parent.name
+                        num = card_number(card_path)
+
+                        if col != "doing":
+                            print(f"Error: Card #{num} is in '{col}', not 'doing'. Defer only works on cards in doing.", file=sys.stderr)
+                            failed.append(card_num)
+                            continue
+
+                        card = read_card(card_path)
+                        card["agent_launch_pending"] = False
+                        card["updated"] = now_iso()
+                        write_card(card_path, card)
+                        events.append(_kanban_event_row(card, num, "defer", from_column=col, to_column="todo", git_project=git_project))
+
+                        target = root / "todo" / card_path.name
+                        target.parent.mkdir(parents=True, exist_ok=True)
+                        move_card(card_path, target)
+                        print(f"Deferred: #{num} — moved to todo")
+                except SystemExit:
+                    failed.append(card_num)
+        finally:
+            write_kanban_events(events)
+    _finish_bulk("Defer", len(card_numbers), failed)
 
 
 def cmd_start(args) -> None:
-    """Move card(s) from todo to doing (pick up queued work)."""
+    """Move card(s) from todo to doing (see § Bulk transitions)."""
     root = get_root(args.root)
-    card_numbers = args.card if isinstance(args.card, list) else [args.card]
+    card_numbers = parse_card_refs(_bulk_card_args(args))
     git_root = get_git_root()
     git_project = os.path.basename(git_root) if git_root else None
     force = getattr(args, "force", False)
-    failed = False
-    # Snapshot doing cards once before the loop to avoid N redundant directory scans.
-    doing_cards = _load_all_doing_cards(root)
-    for card_num in card_numbers:
+    events: list[tuple] = []
+    failed: list[str] = []
+    # The whole group runs under the board lock (see § Advisory locking), with
+    # each card additionally under its own lock while it is read and moved.
+    with board_lock(root):
+        # Snapshot doing cards once before the loop to avoid N redundant directory
+        # scans, and compile their editFiles once for every card being started.
+        doing_cards = EditFilesIndex(_load_all_doing_cards(root))
         try:
-            card_path = find_card(root, card_num)
-            col = card_path.parent.name
-            num = card_number(card_path)
-            if col != "todo":
-                print(f"Error: Card #{num} is in '{col}', not 'todo'. Start only works on cards in todo.", file=sys.stderr)
-                failed = True
-                continue
-            card = read_card(card_path)
-            edit_files = card.get("editFiles") or []
-            overlap_conflicts = check_editfiles_overlap(num, edit_files, doing_cards)
-            if overlap_conflicts and not force:
-                inflight_num, inflight_session, conflict_files = overlap_conflicts[0]
-                conflict_path = conflict_files[0] if conflict_files else "(unknown)"
-                print(
-                    f"Error: Cannot start card #{num} — file conflict with active card.\n"
-                    f"  Conflicting card: #{inflight_num} (session '{inflight_session}', status doing)\n"
-                    f"  Overlapping files: {conflict_path}\n"
-                    f"Use `kanban todo --file <card>` instead to queue this card. Run `kanban start {num}`\n"
-                    f"once the conflicting card reaches `done` (changes committed).\n"
-                    f"Override with --force if you genuinely need parallel writes (audit-logged).",
-                    file=sys.stderr,
-                )
-                failed = True
-                continue
-            # Rename before write: flag never lands in todo/ on crash (atomic, matches cmd_do).
-            target = root / "doing" / card_path.name
-            target.parent.mkdir(parents=True, exist_ok=True)
-            card_path.rename(target)
-            card["agent_launch_pending"], card["updated"] = True, now_iso()
-            if overlap_conflicts and force:
-                card["forced"] = True
-            write_card(target, card)
-            write_kanban_event(card, num, "start", from_column="todo", to_column="doing", git_project=git_project)
-            print(f"Started: #{num} — moved to doing")
-        except SystemExit:
-            failed = True
-            continue
-        except (json.JSONDecodeError, OSError) as e:
-            print(f"Error: Failed to process card {card_num}: {e}", file=sys.stderr)
-            failed = True
-            continue
-    if failed:
-        sys.exit(1)
+            for card_num in card_numbers:
+                try:
+                    with locked_card(root, card_num) as card_path:
+                        col = card_path.parent.name
+                        num = card_number(card_path)
+                        if col != "todo":
+                            print(f"Error: Card #{num} is in '{col}', not 'todo'. Start only works on cards in todo.", file=sys.stderr)
+                            failed.append(card_num)
+                            continue
+                        card = read_card(card_path)
+                        edit_files = card.get("editFiles") or []
+                        overlap_conflicts = check_editfiles_overlap(num, edit_files, doing_cards)
+                        if overlap_conflicts and not force:
+                            inflight_num, inflight_session, conflict_files = overlap_conflicts[0]
+                            conflict_path = conflict_files[0] if conflict_files else "(unknown)"
+                            print(
+                                f"Error: Cannot start card #{num} — file conflict with active card.\n"
+                                f"  Conflicting card: #{inflight_num} (session '{inflight_session}', status doing)\n"
+                                f"  Overlapping files: {conflict_path}\n"
+                                f"Use `kanban todo --file <card>` instead to queue this card. Run `kanban start {num}`\n"
+                                f"once the conflicting card reaches `done` (changes committed).\n"
+                                f"Override with --force if you genuinely need parallel writes (audit-logged).",
+                                file=sys.stderr,
+                            )
+                            failed.append(card_num)
+                            continue
+                        # Rename before write: flag never lands in todo/ on crash (atomic, matches cmd_do).
+                        target = root / "doing" / card_path.name
+                        target.parent.mkdir(parents=True, exist_ok=True)
+                        move_card(card_path, target)
+                        card["agent_launch_pending"], card["updated"] = True, now_iso()
+                        if overlap_conflicts and force:
+                            card["forced"] = True
+                        write_card(target, card)
+                        events.append(_kanban_event_row(card, num, "start", from_column="todo", to_column="doing", git_project=git_project))
+                        print(f"Started: #{num} — moved to doing")
+                except SystemExit:
+                    failed.append(card_num)
+                    continue
+                except (json.JSONDecodeError, OSError) as e:
+                    print(f"Error: Failed to process card {card_num}: {e}", file=sys.stderr)
+                    failed.append(card_num)
+                    continue
+        finally:
+            write_kanban_events(events)
+    _finish_bulk("Start", len(card_numbers), failed)
 
 
 def cmd_show(args) -> None:
     """Display card contents."""
     root = get_root(args.root)
     card_path = find_card(root, args.card)
-    card = read_card(card_path)
-    col = card_path.parent.name
-    num = card_number(card_path)
 
-    # Claude XML output style
+    # Claude XML output style, served from the render cache when the card is
+    # unchanged (see § Card render cache). The key is taken BEFORE reading:
+    # a card replaced in between is stored under its old key and simply
+    # re-rendered next time.
     if getattr(args, "output_style", None) == "xml":
-        print(format_card_xml(card, num, col, include_details=True))
+        try:
+            key = card_render_key(card_path)
+        except OSError:
+            key = None
+        cached = read_render_cache(root, card_path, key) if key else None
+        if cached:
+            print(cached["xml"])
+            return
+        card = read_card(card_path, include_activity=True, persist_migrations=False)
+        xml = format_card_xml(card, card_number(card_path), card_path.parent.name, include_details=True)
+        if key:
+            write_render_cache(root, card_path, key, xml, card)
+        print(xml)
         return
 
+    card = read_card(card_path, include_activity=True, persist_migrations=False)
+    col = card_path.parent.name
+    num = card_number(card_path)
+
     # Build human-friendly terminal output (simple or detail)
     bold = "\033[1m"
     dim_bold = "\033[2;1m"
@@ -3719,7 +5408,7 @@ def cmd_rejections(args) -> None:
     """Display rejection history for a card, formatted for readability."""
     root = get_root(args.root)
     card_path = find_card(root, args.card)
-    card = read_card(card_path)
+    card = read_card(card_path, persist_migrations=False)
     num = card_number(card_path)
 
     rejection_history = card.get("rejection_history", [])
@@ -3790,89 +5479,91 @@ def cmd_rename(args) -> None:
         print(f"Error: Session name must contain only lowercase letters, numbers, and hyphens (got '{new_name}')", file=sys.stderr)
         sys.exit(1)
 
-    # Load sessions mapping
-    sessions_file = root / "sessions.json"
-    sessions: dict[str, str] = {}
-    if sessions_file.exists():
-        try:
-            sessions = json.loads(sessions_file.read_text())
-        except (json.JSONDecodeError, OSError):
-            sessions = {}
+    # Check and update the mapping under the sessions lock (see § Session names)
+    with _flock_exclusive(root / _SESSIONS_LOCK_FILENAME):
+        sessions = _read_sessions(root)
 
-    # Check if new name is already in use (by a different UUID prefix)
-    used_by_other = None
-    for uuid_prefix, name in sessions.items():
-        if name == new_name and uuid_prefix != session_id:
-            used_by_other = uuid_prefix
-            break
+        # Check if new name is already in use (by a different UUID prefix)
+        used_by_other = None
+        for uuid_prefix, name in sessions.items():
+            if name == new_name and uuid_prefix != session_id:
+                used_by_other = uuid_prefix
+                break
 
-    if used_by_other:
-        print(f"Error: Session name '{new_name}' is already in use by session {used_by_other}", file=sys.stderr)
-        sys.exit(1)
+        if used_by_other:
+            print(f"Error: Session name '{new_name}' is already in use by session {used_by_other}", file=sys.stderr)
+            sys.exit(1)
 
-    # Get the old name for reporting
-    old_name = sessions.get(session_id, "<unknown>")
+        # Get the old name for reporting
+        old_name = sessions.get(session_id, "<unknown>")
 
-    # Update the mapping
-    sessions[session_id] = new_name
-    sessions_file.write_text(json.dumps(sessions, indent=2) + "\n")
+        # Update the mapping
+        _append_session(root, session_id, new_name)
 
     print(f"Renamed session {session_id} from '{old_name}' to '{new_name}'")
 
 
 def cmd_cancel(args) -> None:
-    """Move card(s) to canceled column."""
+    """Move card(s) to canceled column (see § Bulk transitions)."""
     root = get_root(args.root)
-    card_numbers = args.card if isinstance(args.card, list) else [args.card]
+    card_numbers = _bulk_card_args(args)
 
     # Support positional reason: if the last element of card_numbers is not a
-    # digit-only string it was provided as a bare positional reason argument
+    # card reference it was provided as a bare positional reason argument
     # (e.g. `kanban cancel 1011 "some reason"`).  Extract it before looping.
     reason = args.reason if hasattr(args, "reason") and args.reason else None
-    if not reason and len(card_numbers) > 1 and not card_numbers[-1].isdigit():
+    if not reason and len(card_numbers) > 1 and not is_card_ref(card_numbers[-1]):
         reason = card_numbers[-1]
         card_numbers = card_numbers[:-1]
+    card_numbers = parse_card_refs(card_numbers)
 
     # Pre-compute git_project once to avoid N redundant git subprocesses in bulk loops
     git_root = get_git_root()
     git_project = os.path.basename(git_root) if git_root else None
+    events: list[tuple] = []
+    failed: list[str] = []
 
-    for card_num in card_numbers:
-        card_path = find_card(root, card_num)
-        col = card_path.parent.name
-        card = read_card(card_path)
-        num = card_number(card_path)
+    with board_lock(root):
+        try:
+            for card_num in card_numbers:
+                try:
+                    with locked_card(root, card_num) as card_path:
+                        col = card_path.parent.name
+                        card = read_card(card_path)
+                        num = card_number(card_path)
 
-        if reason:
-            card["cancelReason"] = reason
+                        if reason:
+                            card["cancelReason"] = reason
 
-        card["updated"] = now_iso()
-        write_card(card_path, card)
+                        card["updated"] = now_iso()
+                        write_card(card_path, card)
 
-        write_kanban_event(card, num, "canceled", from_column=col, to_column="canceled", git_project=git_project)
+                        events.append(_kanban_event_row(card, num, "canceled", from_column=col, to_column="canceled", git_project=git_project))
 
-        target_path = root / "canceled" / card_path.name
-        target_path.parent.mkdir(parents=True, exist_ok=True)
-        card_path.rename(target_path)
+                        target_path = root / "canceled" / card_path.name
+                        target_path.parent.mkdir(parents=True, exist_ok=True)
+                        move_card(card_path, target_path)
+                except SystemExit:
+                    failed.append(card_num)
+                    continue
 
-        # Output with reason if provided
-        if reason:
-            print(f"Canceled: #{num} — {reason}")
-        else:
-            print(f"Canceled: #{num}")
+                # Output with reason if provided
+                if reason:
+                    print(f"Canceled: #{num} — {reason}")
+                else:
+                    print(f"Canceled: #{num}")
+        finally:
+            write_kanban_events(events)
+    _finish_bulk("Cancel", len(card_numbers), failed)
 
 
 def cmd_agent(args) -> None:
     """Set the agent field on a card."""
     root = get_root(args.root)
-    card_path = find_card(root, args.card)
-    card = read_card(card_path)
 
     # Normalize to lowercase-kebab-case (same as make_card)
     agent_type = args.agent_type.lower().replace(" ", "-")
-    card["agent"] = agent_type
-    card["updated"] = now_iso()
-    write_card(card_path, card)
+    card_path, _ = update_card(root, args.card, lambda card: card.__setitem__("agent", agent_type))
     print(f"Card #{card_number(card_path)} agent set to: {agent_type}")
 
 
@@ -3895,17 +5586,17 @@ def cmd_clear_agent_launch_pending(args) -> None:
     guard before write.
     """
     root = get_root(args.root)
-    card_path = find_card(root, args.card)
-    col = card_path.parent.name
-    if col != "doing":
-        num = card_number(card_path)
-        print(f"Error: Card #{num} is in '{col}', not 'doing'. clear-agent-launch-pending only works on cards in doing.", file=sys.stderr)
-        sys.exit(1)
-    card = read_card(card_path)
-    card["agent_launch_pending"] = False
-    card["updated"] = now_iso()
-    write_card(card_path, card)
-    print(f"Card #{card_number(card_path)} agent_launch_pending cleared")
+    with locked_card(root, args.card) as card_path:
+        col = card_path.parent.name
+        if col != "doing":
+            num = card_number(card_path)
+            print(f"Error: Card #{num} is in '{col}', not 'doing'. clear-agent-launch-pending only works on cards in doing.", file=sys.stderr)
+            sys.exit(1)
+        card = read_card(card_path)
+        card["agent_launch_pending"] = False
+        card["updated"] = now_iso()
+        write_card(card_path, card)
+        print(f"Card #{card_number(card_path)} agent_launch_pending cleared")
 
 
 def cmd_criteria_add(args) -> None:
@@ -3939,123 +5630,120 @@ def cmd_criteria_add(args) -> None:
                 print(msg, file=sys.stderr)
             sys.exit(1)
 
-    card_path = find_card(root, args.card)
-    card = read_card(card_path)
-    num = card_number(card_path)
-
-    # Guard: canceled cards are intentionally closed; criteria add is not allowed.
-    if card_path.parent.name == "canceled":
-        print(
-            f"Error: cannot add criteria to a canceled card #{num}. Canceled cards are intentionally closed.",
-            file=sys.stderr,
-        )
-        sys.exit(1)
+    with locked_card(root, args.card) as card_path:
+        card = read_card(card_path)
+        num = card_number(card_path)
 
-    # Track whether this is an auto-reopen (done -> doing) so we can rename AFTER write.
-    auto_reopen = card_path.parent.name == "done"
-    auto_reopen_target: "Path | None" = None
-    if auto_reopen:
-        doing_dir = root / "doing"
-        doing_dir.mkdir(parents=True, exist_ok=True)
-        auto_reopen_target = doing_dir / card_path.name
+        # Guard: canceled cards are intentionally closed; criteria add is not allowed.
+        if card_path.parent.name == "canceled":
+            print(
+                f"Error: cannot add criteria to a canceled card #{num}. Canceled cards are intentionally closed.",
+                file=sys.stderr,
+            )
+            sys.exit(1)
 
-        # F5: Scrub stale 'Completed' activity entry left by cmd_done.
-        if "activity" in card:
+        # Track whether this is an auto-reopen (done -> doing) so we can rename AFTER write.
+        auto_reopen = card_path.parent.name == "done"
+        auto_reopen_target: "Path | None" = None
+        if auto_reopen:
+            doing_dir = root / "doing"
+            doing_dir.mkdir(parents=True, exist_ok=True)
+            auto_reopen_target = doing_dir / card_path.name
+
+            # F5: Scrub stale 'Completed' activity entry left by cmd_done.
+            # The one place activity is edited rather than appended: setting
+            # card["activity"] makes write_card below replace the log.
+            activity = read_card_activity(card_path)
             # Remove the most-recent 'Completed' entry to avoid misleading activity on a doing card.
-            for i in range(len(card["activity"]) - 1, -1, -1):
-                if card["activity"][i].get("message") == "Completed":
-                    card["activity"].pop(i)
+            for i in range(len(activity) - 1, -1, -1):
+                if activity[i].get("message") == "Completed":
+                    activity.pop(i)
+                    card["activity"] = activity
                     break  # scrub at most one entry
 
-    # Initialize criteria list if it doesn't exist
-    if "criteria" not in card:
-        card["criteria"] = []
-
-    # Build mov_commands from paired --mov-cmd / --mov-timeout arguments
-    mov_commands = []
-    if args.mov_cmd:
-        timeouts = list(args.mov_timeout) if args.mov_timeout else []
-        for i, cmd in enumerate(args.mov_cmd):
-            timeout = timeouts[i] if i < len(timeouts) else 30
-            mov_commands.append({"cmd": cmd, "timeout": timeout})
-
-    new_criterion: dict = {
-        "text": args.text,
-        "mov_commands": mov_commands,
-        "met": False,
-    }
+        # Initialize criteria list if it doesn't exist
+        if "criteria" not in card:
+            card["criteria"] = []
+
+        # Build mov_commands from paired --mov-cmd / --mov-timeout arguments
+        mov_commands = []
+        if args.mov_cmd:
+            timeouts = list(args.mov_timeout) if args.mov_timeout else []
+            for i, cmd in enumerate(args.mov_cmd):
+                timeout = timeouts[i] if i < len(timeouts) else 30
+                mov_commands.append({"cmd": cmd, "timeout": timeout})
+
+        new_criterion: dict = {
+            "text": args.text,
+            "mov_commands": mov_commands,
+            "met": False,
+        }
 
-    # Apply __CARD_ID__ substitution in criterion text and mov_commands
-    if isinstance(new_criterion.get("text"), str):
-        new_criterion["text"] = new_criterion["text"].replace("__CARD_ID__", str(num))
-    for entry in new_criterion.get("mov_commands", []):
-        if isinstance(entry.get("cmd"), str):
-            entry["cmd"] = entry["cmd"].replace("__CARD_ID__", str(num))
+        # Apply __CARD_ID__ substitution in criterion text and mov_commands
+        if isinstance(new_criterion.get("text"), str):
+            new_criterion["text"] = new_criterion["text"].replace("__CARD_ID__", str(num))
+        for entry in new_criterion.get("mov_commands", []):
+            if isinstance(entry.get("cmd"), str):
+                entry["cmd"] = entry["cmd"].replace("__CARD_ID__", str(num))
 
-    card["criteria"].append(new_criterion)
-    card["updated"] = now_iso()
-    validate_criteria_schema(card["criteria"])
+        card["criteria"].append(new_criterion)
+        card["updated"] = now_iso()
+        validate_criteria_schema(card["criteria"])
 
-    # F2: write before rename — write_card to source path first (still in done/ for auto-reopen),
-    # then rename. This matches cmd_done's pattern and reduces the partial-state window on crash.
-    write_card(card_path, card)
+        # F2: write before rename — write_card to source path first (still in done/ for auto-reopen),
+        # then rename. This matches cmd_done's pattern and reduces the partial-state window on crash.
+        write_card(card_path, card)
 
-    if auto_reopen:
-        card_path.rename(auto_reopen_target)
+        if auto_reopen:
+            move_card(card_path, auto_reopen_target)
 
-        # F1: Record the done->doing transition in the metrics DB (audit trail / analytics dashboard).
-        write_kanban_event(card, num, "start", from_column="done", to_column="doing")
+            # F1: Record the done->doing transition in the metrics DB (audit trail / analytics dashboard).
+            write_kanban_event(card, num, "start", from_column="done", to_column="doing")
 
-        print(
-            f"Warning: card #{num} was auto-reopened from 'done' to 'doing' because a new acceptance criterion was added after the card was already marked done.\n"
-            f"         Re-launch the agent to verify the new criterion (the SubagentStop hook will catch it).",
-            file=sys.stderr,
-        )
+            print(
+                f"Warning: card #{num} was auto-reopened from 'done' to 'doing' because a new acceptance criterion was added after the card was already marked done.\n"
+                f"         Re-launch the agent to verify the new criterion (the SubagentStop hook will catch it).",
+                file=sys.stderr,
+            )
 
-    print(f"Added criterion to #{num}: {new_criterion['text']}")
+        print(f"Added criterion to #{num}: {new_criterion['text']}")
 
 
 def cmd_criteria_remove(args) -> None:
     """Remove acceptance criterion from card."""
     root = get_root(args.root)
-    card_path = find_card(root, args.card)
-    card = read_card(card_path)
-
-    criteria = card.get("criteria", [])
-    if not criteria:
-        print("Error: Card has no acceptance criteria to remove", file=sys.stderr)
-        sys.exit(1)
+    with locked_card(root, args.card) as card_path:
+        card = read_card(card_path)
 
-    # Validate criterion number
-    criterion_idx = args.n - 1  # Convert to 0-based
-    if criterion_idx < 0 or criterion_idx >= len(criteria):
-        print(f"Error: Invalid criterion number {args.n}. Valid range: 1-{len(criteria)}", file=sys.stderr)
-        sys.exit(1)
+        criteria = card.get("criteria", [])
+        if not criteria:
+            print("Error: Card has no acceptance criteria to remove", file=sys.stderr)
+            sys.exit(1)
 
-    # Check if removal would leave zero criteria
-    if len(criteria) <= 1:
-        print("Error: Cannot remove last acceptance criterion. Cards must have at least one.", file=sys.stderr)
-        sys.exit(1)
+        # Validate criterion number
+        criterion_idx = args.n - 1  # Convert to 0-based
+        if criterion_idx < 0 or criterion_idx >= len(criteria):
+            print(f"Error: Invalid criterion number {args.n}. Valid range: 1-{len(criteria)}", file=sys.stderr)
+            sys.exit(1)
 
-    # Remove criterion and log to activity
-    removed_criterion = criteria[criterion_idx]
-    removed_text = removed_criterion.get("text", "")
+        # Check if removal would leave zero criteria
+        if len(criteria) <= 1:
+            print("Error: Cannot remove last acceptance criterion. Cards must have at least one.", file=sys.stderr)
+            sys.exit(1)
 
-    if "activity" not in card:
-        card["activity"] = []
+        # Remove criterion and log to activity
+        removed_criterion = criteria[criterion_idx]
+        removed_text = removed_criterion.get("text", "")
 
-    card["activity"].append({
-        "timestamp": now_iso(),
-        "message": f"Removed AC {args.n}: '{removed_text}' — Reason: {args.reason}"
-    })
+        append_card_activity(card_path, f"Removed AC {args.n}: '{removed_text}' — Reason: {args.reason}")
 
-    criteria.pop(criterion_idx)
-    card["updated"] = now_iso()
-    validate_criteria_schema(card["criteria"])
-    write_card(card_path, card)
-    num = card_number(card_path)
-    print(f"Removed criterion from #{num}: {removed_text}")
-    print(f"Reason: {args.reason}")
+        criteria.pop(criterion_idx)
+        card["updated"] = now_iso()
+        validate_criteria_schema(card["criteria"])
+        write_card(card_path, card)
+        num = card_number(card_path)
+        print(f"Removed criterion from #{num}: {removed_text}")
+        print(f"Reason: {args.reason}")
 
 
 def _find_criterion_idx(criteria: list, criterion_arg: str) -> int | None:
@@ -4100,6 +5788,12 @@ def cmd_criteria_check(args) -> None:
     # Use process cwd (where agent invoked kanban)
     working_dir = os.getcwd()
 
+    # MoV commands run WITHOUT the card lock — they can take minutes, and
+    # sibling agents checking other criteria of this card must not queue
+    # behind them. Verdicts are collected here and committed below under the
+    # lock, against a fresh read of the card.
+    passed: list[tuple[int, str]] = []
+
     for criterion_arg in args.n:
         criterion_idx = _find_criterion_idx(criteria, criterion_arg)
         if criterion_idx is None:
@@ -4183,37 +5877,55 @@ def cmd_criteria_check(args) -> None:
                 sys.exit(11)
 
         # All commands in the array passed
-        criteria[criterion_idx]["met"] = True
+        passed.append((criterion_idx, text))
         print(f"Criterion {display_n} passed: {text}")
 
-    card["updated"] = now_iso()
-    validate_criteria_schema(card["criteria"])
-    write_card(card_path, card)
+    # Commit under the card lock. Re-reading is what prevents lost updates:
+    # another agent may have checked a different criterion (or the
+    # coordinator moved the card) while our commands ran, and writing back
+    # the copy read above would erase that. A criterion is located by index
+    # when its text still matches, otherwise by text, so a concurrent
+    # `criteria remove` that shifted indices cannot misattribute a verdict.
+    with locked_card(root, args.card) as card_path:
+        card = read_card(card_path)
+        fresh_criteria = card.get("criteria", [])
+        for criterion_idx, text in passed:
+            if not (criterion_idx < len(fresh_criteria) and fresh_criteria[criterion_idx].get("text", "") == text):
+                criterion_idx = next(
+                    (i for i, c in enumerate(fresh_criteria) if c.get("text", "") == text), None,
+                )
+            if criterion_idx is None:
+                print(f"Warning: criterion '{text}' was removed from card #{num} while it was being checked", file=sys.stderr)
+                continue
+            fresh_criteria[criterion_idx]["met"] = True
+        card["updated"] = now_iso()
+        validate_criteria_schema(card["criteria"])
+        write_card(card_path, card)
 
 
 def cmd_criteria_uncheck(args) -> None:
     """Mark acceptance criterion(s) as unmet (clears met)."""
     root = get_root(args.root)
-    card_path = find_card(root, args.card)
-    card = read_card(card_path)
-
-    criteria = card.get("criteria", [])
-    if not criteria:
-        print(f"Error: Card #{card_number(card_path)} has no acceptance criteria", file=sys.stderr)
-        sys.exit(1)
+    with locked_card(root, args.card) as card_path:
+        card = read_card(card_path)
 
-    for criterion_arg in args.n:
-        criterion_idx = _find_criterion_idx(criteria, criterion_arg)
-        if criterion_idx is None:
-            print(f"Error: No criterion found matching '{criterion_arg}'", file=sys.stderr)
+        criteria = card.get("criteria", [])
+        if not criteria:
+            print(f"Error: Card #{card_number(card_path)} has no acceptance criteria", file=sys.stderr)
             sys.exit(1)
 
-        criteria[criterion_idx]["met"] = False
-        print(f"⬜ Unchecked: {criteria[criterion_idx]['text']}")
+        for criterion_arg in args.n:
+            criterion_idx = _find_criterion_idx(criteria, criterion_arg)
+            if criterion_idx is None:
+                print(f"Error: No criterion found matching '{criterion_arg}'", file=sys.stderr)
+                sys.exit(1)
+
+            criteria[criterion_idx]["met"] = False
+            print(f"⬜ Unchecked: {criteria[criterion_idx]['text']}")
 
-    card["updated"] = now_iso()
-    validate_criteria_schema(card["criteria"])
-    write_card(card_path, card)
+        card["updated"] = now_iso()
+        validate_criteria_schema(card["criteria"])
+        write_card(card_path, card)
 
 
 
@@ -4246,7 +5958,7 @@ def format_card_xml(card: dict, num: str, col: str, include_details: bool = Fals
         col: Column/status name
         include_details: Include intent, AC, and activity (for show command)
     """
-    esc = html.escape
+    from html import escape as esc
     session = card.get("session", "")
     action = card.get("action", "")
     card_type = card.get("type", "work")
@@ -4277,7 +5989,11 @@ def format_card_xml(card: dict, num: str, col: str, include_details: bool = Fals
     if include_details:
         criteria = card.get("criteria", [])
         if criteria:
-            xml_parts.append("  <acceptance-criteria>")
+            summary = card_summary(card)
+            if summary:
+                xml_parts.append(f'  <acceptance-criteria met-count="{summary["criteria_met"]}" total="{summary["criteria_total"]}">')
+            else:
+                xml_parts.append("  <acceptance-criteria>")
             for criterion in criteria:
                 met = "true" if criterion.get("met", False) else "false"
                 text = esc(criterion.get("text", ""))
@@ -4389,9 +6105,11 @@ def _display_width(s: str) -> int:
     All other Unicode characters (Narrow, Neutral, Halfwidth, Ambiguous)
     are treated as 1 column, matching typical Western terminal behavior.
     """
+    from unicodedata import east_asian_width
+
     width = 0
     for c in s:
-        eaw = unicodedata.east_asian_width(c)
+        eaw = east_asian_width(c)
         width += 2 if eaw in ('W', 'F') else 1
     return width
 
@@ -4586,7 +6304,9 @@ def format_card_line(card: dict, num: str, show_session: bool = False, output_st
         criteria = card.get("criteria", [])
         if criteria:
             table_lines = format_criteria_table(criteria, indent="    ")
-            criteria_section = f"{dim}    Acceptance Criteria\n"
+            summary = card_summary(card)
+            progress = f" ({summary['criteria_met']}/{summary['criteria_total']} met)" if summary else ""
+            criteria_section = f"{dim}    Acceptance Criteria{progress}\n"
             criteria_section += "\n".join(table_lines)
             criteria_section += reset
             sections.append(criteria_section)
@@ -4634,16 +6354,21 @@ def format_card_line(card: dict, num: str, show_session: bool = False, output_st
 
 
 def calculate_throughput_metrics(root: Path) -> dict:
-    """Calculate throughput metrics for done cards.
+    """Calculate throughput metrics for done and archived cards.
+
+    Archive months contribute through their summaries (see § Archive month
+    summaries); only a month completed as recently as today has its entries
+    read.
 
     Returns dict with:
         - cards_per_hour: Hourly throughput rate based on today's cards (float)
         - cards_today: Cards completed since midnight today
-        - cards_all_time: Total cards in done column
+        - cards_all_time: Total cards in the done column and the archive
         - avg_lead_time_seconds: Average lead time in seconds (or None)
     """
     done_dir = root / "done"
-    if not done_dir.exists():
+    months = archive_months(root)
+    if not done_dir.exists() and not months:
         return {
             "cards_per_hour": 0.0,
             "cards_today": 0,
@@ -4657,11 +6382,13 @@ def calculate_throughput_metrics(root: Path) -> dict:
 
     cards_today = 0
     cards_all_time = 0
-    lead_times = []
+    lead_time_sum = 0.0
+    lead_time_count = 0
 
+    card_index = CardIndex(root)
     for card_file in done_dir.glob("*.json"):
         try:
-            card = read_card(card_file)
+            card = card_index.read(card_file, ("created", "updated"))
             cards_all_time += 1
 
             # Get completion timestamp
@@ -4674,16 +6401,32 @@ def calculate_throughput_metrics(root: Path) -> dict:
             # Calculate lead time
             lead_time = calculate_lead_time(card)
             if lead_time is not None:
-                lead_times.append(lead_time)
+                lead_time_sum += lead_time
+                lead_time_count += 1
 
         except (json.JSONDecodeError, OSError, ValueError):
             continue
+    card_index.save()
+
+    for month in months:
+        header, _ = read_archive_summary(root, month, header_only=True)
+        cards_all_time += header.get("count", 0)
+        lead_time_sum += header.get("lead_time_sum", 0)
+        lead_time_count += header.get("lead_time_count", 0)
+        if _summary_overlaps(header, today_midnight, None):
+            _, entries = read_archive_summary(root, month)
+            for entry in entries:
+                try:
+                    if parse_iso(entry["completed"]) >= today_midnight:
+                        cards_today += 1
+                except (KeyError, TypeError, ValueError):
+                    continue
 
     # Calculate hourly throughput rate based on today's progress
     # Avoid division by zero for very early morning (use minimum 1 hour)
     cards_per_hour = cards_today / max(hours_elapsed_today, 1.0)
 
-    avg_lead_time = sum(lead_times) / len(lead_times) if lead_times else None
+    avg_lead_time = lead_time_sum / lead_time_count if lead_time_count else None
 
     return {
         "cards_per_hour": cards_per_hour,
@@ -4695,7 +6438,10 @@ def calculate_throughput_metrics(root: Path) -> dict:
 
 def cmd_list(args) -> None:
     """Show board overview with compact format."""
-    root = get_root(args.root)
+    board_model = getattr(args, "_board_model", None)
+    # get_root() also runs the done-column auto-archive scan; a watch refresh
+    # rendering from its BoardModel skips that per-frame disk pass.
+    root = board_model.root if board_model is not None else get_root(args.root)
 
     # Check for watch state or args
     watch_state = getattr(args, '_watch_state', None)
@@ -4743,21 +6489,50 @@ def cmd_list(args) -> None:
     # Session filters
     current_session, hide_own, show_only_mine = resolve_session_filters(args)
 
+    # Delta mode (--changed-since, see § Board generation). The generation is
+    # read BEFORE the cards, so a write racing this listing is reported again
+    # on the next poll rather than lost. changed_nums stays None for a full
+    # listing, including when the cursor cannot be answered exactly.
+    changed_since = getattr(args, "changed_since", None)
+    if changed_since is not None:
+        generation, changed_nums = cards_changed_since(root, changed_since)
+    else:
+        generation, changed_nums = board_generation(root), None
+    present_nums: set[str] = set()
+
     # Gather cards grouped by column (flat, no session grouping for XML)
     all_cards_by_column: dict[str, list[tuple[str, dict]]] = {col: [] for col in columns_to_show}
     # Also track by session for non-XML rendering
     my_cards: dict[str, list[tuple[str, dict]]] = {col: [] for col in columns_to_show}
     other_cards: dict[str, list[tuple[str, dict]]] = {col: [] for col in columns_to_show}
+    # Every filtered "doing" card, changed or not: the stranded/abandoned
+    # detectors below judge the whole column even when --changed-since
+    # trims the <c> rows to the delta.
+    doing_cards: list[tuple[str, dict]] = []
+
+    # Card source: watch mode hands in its in-memory BoardModel (patched from
+    # filesystem events, see watch_and_run) so a refresh re-reads nothing;
+    # otherwise projection reads through the card index — see § Projection
+    # reads.
+    board_model = getattr(args, "_board_model", None)
+    card_index = None
+    if board_model is not None:
+        column_cards = board_model.column
+    else:
+        card_index = CardIndex(root)
+
+        def column_cards(col: str):
+            for card_path in find_cards_in_column(root, col):
+                try:
+                    yield card_number(card_path), card_index.read(card_path)
+                except (json.JSONDecodeError, OSError):
+                    continue
 
     for col in columns_to_show:
-        for card_path in find_cards_in_column(root, col):
-            try:
-                card = read_card(card_path)
-            except (json.JSONDecodeError, OSError):
-                continue
+        for num, card in column_cards(col):
+            present_nums.add(num)
             if not card_in_date_range(card, since, until):
                 continue
-            num = card_number(card_path)
 
             # Apply watch filters
             if card_filter and not num.startswith(card_filter):
@@ -4767,6 +6542,11 @@ def cmd_list(args) -> None:
                 if not card_session.lower().startswith(session_filter.lower()):
                     continue
 
+            if col == "doing":
+                doing_cards.append((num, card))
+            if changed_nums is not None and num not in changed_nums:
+                continue
+
             # Add to flat list for XML
             all_cards_by_column[col].append((num, card))
 
@@ -4775,6 +6555,11 @@ def cmd_list(args) -> None:
                 my_cards[col].append((num, card))
             else:
                 other_cards[col].append((num, card))
+    if card_index is not None:
+        card_index.save()
+    # Changed cards no longer in any listed column: moved out (e.g. to done
+    # without --show-done), archived or trashed.
+    gone_nums = sorted(changed_nums - present_nums, key=int) if changed_nums is not None else []
 
     # Stranded-card detection (SURFACE ONLY — never mutates a card, never
     # calls `kanban done`). See STRANDED_CARD_THRESHOLD_MINUTES for why this
@@ -4783,9 +6568,11 @@ def cmd_list(args) -> None:
     # new hook, so the warning reaches a coordinator with zero new wiring.
     #
     # Scoped to whatever "doing" cards this invocation already fetched
-    # (respecting --column/--session/--since/--until filters); if the
-    # caller excluded "doing" from columns_to_show, detection simply does
-    # not run rather than performing a second, unfiltered scan.
+    # (respecting --column/--session/--since/--until filters, but NOT
+    # --changed-since: a card goes stranded by sitting unchanged, so a delta
+    # listing still judges every doing card); if the caller excluded "doing"
+    # from columns_to_show, detection simply does not run rather than
+    # performing a second, unfiltered scan.
     #
     # Wrapped in try/except so a malformed card or clock error can never
     # break `kanban list` itself — this command is load-bearing for every
@@ -4794,7 +6581,7 @@ def cmd_list(args) -> None:
     stranded_cards: list[tuple[str, dict]] = []
     try:
         _now = datetime.now(timezone.utc)
-        for _num, _card in all_cards_by_column.get("doing", []):
+        for _num, _card in doing_cards:
             if is_card_stranded(_card, now=_now):
                 stranded_cards.append((_num, _card))
     except Exception:
@@ -4817,7 +6604,7 @@ def cmd_list(args) -> None:
     try:
         _stranded_nums = {_num for _num, _ in stranded_cards}
         _now_abandoned = datetime.now(timezone.utc)
-        for _num, _card in all_cards_by_column.get("doing", []):
+        for _num, _card in doing_cards:
             if _num in _stranded_nums:
                 continue
             if is_card_abandoned(_card, now=_now_abandoned):
@@ -4853,14 +6640,17 @@ def cmd_list(args) -> None:
     # coordinator to identify what a card is about without blowing up
     # token budgets on a 30-card board list.
     if output_style == "xml":
-        esc = html.escape
+        from html import escape as esc
 
         # Get session for delineation
         session_arg = getattr(args, "session", None)
 
-        # Build session attribute for board tag
+        # Build session attribute for board tag. generation is the cursor for
+        # the next --changed-since; since="..." marks a delta listing (absent
+        # means a full board, even when --changed-since was passed).
         session_attr = f' session="{esc(session_arg)}"' if session_arg else ""
-        print(f"<board{session_attr}>")
+        delta_attr = f' since="{changed_since}"' if changed_nums is not None else ""
+        print(f'<board{session_attr} generation="{generation}"{delta_attr}>')
 
         _INTENT_MAX = 200  # chars; keep in sync with test_kanban_list_xml_schema.py
 
@@ -5000,11 +6790,23 @@ def cmd_list(args) -> None:
             for _line in _abandoned_lines:
                 print(_line)
 
+        # Delta listings name cards that left the listed columns. Same <card>
+        # tag rationale as <stranded>: never mistakable for a board <c>.
+        if gone_nums:
+            print("<gone>")
+            for num in gone_nums:
+                print(f'<card n="{esc(num)}"/>')
+            print("</gone>")
+
         print("</board>")
         return
 
     # Non-XML output: session-grouped display
     print(f"KANBAN BOARD: {root}")
+    if changed_nums is not None:
+        print(f"Generation {generation} — changes since {changed_since}")
+        if gone_nums:
+            print(f"Left this view: {', '.join('#' + n for n in gone_nums)}")
     print()
 
     if not hide_own:
@@ -5107,164 +6909,105 @@ def cmd_todo(args) -> None:
 
     Accepts either a single JSON object or an array of objects for bulk creation.
     """
-    root = get_root(args.root)
-
-    # resolve_json_input performs a fail-closed raw-text scan for hook-skip literals
-    # when JSON is malformed (see _mov_fail_closed_scan), then returns parsed data.
-    data = resolve_json_input(args)
-
-    # Run banned-pattern validation (validate_mov_commands_content) here, before
-    # per-card structural validation. validate_no_unknown_fields runs later, inside
-    # validate_and_build_card, at the start of each card's structural validation pass.
-    validate_mov_commands_content(data)
+    _create_cards_from_json(args, "todo")
 
-    # Cross-card MoV scope-isolation: reject path-emptiness assertions (e.g.
-    # `test -z "$(git diff ... -- <path>)"`) that overlap another card's
-    # editFiles — either an in-flight board card (todo/doing, any session) or
-    # a sibling in this same creation batch. See § Cross-card MoV scope-isolation
-    # validation above validate_mov_scope_isolation's definition.
-    validate_mov_scope_isolation(data, root)
 
-    session = args.session if hasattr(args, "session") and args.session else get_current_session_id()
+def _done_one(root: Path, card_ref: str, message: str, git_project: str | None, events: list[tuple]) -> int:
+    """Complete one card for cmd_done; returns 0 (done), 1 (blocked) or 2 (max cycles).
 
-    # Pre-compute git_project once to avoid N redundant git subprocesses in bulk loops
-    git_root = get_git_root()
-    git_project = os.path.basename(git_root) if git_root else None
+    A card that cannot be found still exits via find_card — cmd_done catches it.
+    """
+    with locked_card(root, card_ref) as card_path:
+        col = card_path.parent.name
+        card = read_card(card_path)
+        num = card_number(card_path)
 
-    # Detect array vs object
-    if isinstance(data, list):
-        # Bulk creation: validate all cards first (fail fast)
-        # Pre-pass: collect && violations across ALL cards before proceeding.
-        # This lets us report every violation in one shot rather than stopping
-        # at the first offending card.
-        all_ampersand_errors = []
-        for idx, card_data in enumerate(data):
-            if not isinstance(card_data, dict):
-                continue
-            raw_criteria = card_data.get("criteria") or card_data.get("ac", [])
-            object_criteria = [c for c in raw_criteria if isinstance(c, dict)]
-            violations = _collect_ampersand_errors(object_criteria)
-            if violations:
-                card_label = f"card[{idx}]: {str(card_data.get('action', ''))[:50]!r}"
-                all_ampersand_errors.append((card_label, violations))
-        if all_ampersand_errors:
-            for card_label, violations in all_ampersand_errors:
-                _print_ampersand_chain_errors(violations, card_label=card_label)
-                print("", file=sys.stderr)
-            sys.exit(1)
+        if col != "doing":
+            print(f"Error: Card #{num} is in '{col}', not 'doing'. Done only works on cards in doing.", file=sys.stderr)
+            return 1
 
-        cards = []
-        for i, card_data in enumerate(data):
-            if not isinstance(card_data, dict):
-                print(f"Error: Array element {i} must be a JSON object, got {type(card_data).__name__}", file=sys.stderr)
-                sys.exit(1)
-            card = validate_and_build_card(card_data, session)
-            # Carry the entry's own "column" override alongside its built card —
-            # see the matching comment in cmd_do's bulk branch.
-            cards.append((card, card_data.get("column")))
-
-        # All validation passed — create all cards, routing each to its own
-        # column (explicit per-entry override, falling back to "todo" when
-        # absent — see _route_card_to_column). A "doing"-bound entry runs the
-        # same editFiles conflict check `kanban do` runs.
-        force = getattr(args, "force", False)
-        doing_cards = _load_all_doing_cards(root)
-        had_conflict = False
-        for card, requested_column in cards:
-            _, conflicted = _route_card_to_column(
-                root, card, requested_column, "todo", doing_cards, force, git_project,
-            )
-            had_conflict = had_conflict or conflicted
-        if had_conflict:
-            sys.exit(1)
-    elif isinstance(data, dict):
-        # Single card creation (existing behavior). The optional "column"
-        # field is honored here too, for consistency with the array path —
-        # see the matching comment in cmd_do's single-object branch.
-        force = getattr(args, "force", False)
-        card = validate_and_build_card(data, session)
-        doing_cards = _load_all_doing_cards(root)
-        requested_column = data.get("column")
-        _, conflicted = _route_card_to_column(
-            root, card, requested_column, "todo", doing_cards, force, git_project,
-        )
-        if conflicted:
-            # Clean up --file before exiting so it never pre-exists on next use
-            json_file = getattr(args, "json_file", None)
-            if json_file:
-                os.remove(json_file)
-            sys.exit(1)
-    else:
-        print(f"Error: JSON must be an object or array, got {type(data).__name__}", file=sys.stderr)
-        sys.exit(1)
+        # Gate: all criteria must have met == True
+        criteria = card.get("criteria", [])
+        if criteria:
+            unchecked = [
+                (i, c) for i, c in enumerate(criteria, start=1)
+                if not c.get("met", False)
+            ]
+            if unchecked:
+                # Increment cycles counter
+                card["cycles"] = card.get("cycles", 0) + 1
+                cycles = card["cycles"]
+                append_card_activity(card_path, f"Done blocked — unchecked criteria (cycle {cycles})")
+                card["updated"] = now_iso()
+                write_card(card_path, card)
+
+                print(f"Cannot complete card #{num} — {len(unchecked)} of {len(criteria)} acceptance criteria not met:", file=sys.stderr)
+                for i, criterion in unchecked:
+                    text = criterion.get("text", "")
+                    print(f"  {i}. ⬜ {text}", file=sys.stderr)
+                print(f"\nRun `kanban criteria check {num} <n>` to mark criteria as met.", file=sys.stderr)
+                print(f"Cycle: {cycles}/{MAX_CYCLES}", file=sys.stderr)
+
+                if cycles >= MAX_CYCLES:
+                    print(f"Max cycles ({MAX_CYCLES}) reached — escalate to staff engineer.", file=sys.stderr)
+                    return 2
+                return 1
+
+        # Append completion message to activity
+        append_card_activity(card_path, message)
+        card["updated"] = now_iso()
+        write_card(card_path, card)
 
-    # Delete the --file input after successful card creation so it never pre-exists on next use
-    json_file = getattr(args, "json_file", None)
-    if json_file:
-        os.remove(json_file)
+        events.append(_kanban_event_row(card, num, "done", card_completed_at=card["updated"], from_column=col, to_column="done", git_project=git_project))
+        target = root / "done" / card_path.name
+        target.parent.mkdir(parents=True, exist_ok=True)
+        move_card(card_path, target)
+        print(f"Done: #{num} — {message}")
+        return 0
 
 
 def cmd_done(args) -> None:
-    """Move card to done column (pure verb - no view mode).
+    """Move card(s) to done column (pure verb - no view mode).
 
     Gate: all criteria must have met == True.
     If unchecked criteria remain, increments cycles and exits 1 (retryable)
-    until cycles >= MAX_CYCLES, then exits 2 (max cycles reached).
+    until cycles >= MAX_CYCLES, then exits 2 (max cycles reached). Several
+    cards complete as one group — see § Bulk transitions for the exit statuses.
     """
     root = get_root(args.root)
-    card_path = find_card(root, args.card)
-    col = card_path.parent.name
-    card = read_card(card_path)
-    num = card_number(card_path)
-
-    if col != "doing":
-        print(f"Error: Card #{num} is in '{col}', not 'doing'. Done only works on cards in doing.", file=sys.stderr)
-        sys.exit(1)
-
-    # Gate: all criteria must have met == True
-    criteria = card.get("criteria", [])
-    if criteria:
-        unchecked = [
-            (i, c) for i, c in enumerate(criteria, start=1)
-            if not c.get("met", False)
-        ]
-        if unchecked:
-            # Increment cycles counter
-            card["cycles"] = card.get("cycles", 0) + 1
-            cycles = card["cycles"]
-            card["activity"].append({
-                "timestamp": now_iso(),
-                "message": f"Done blocked — unchecked criteria (cycle {cycles})",
-            })
-            card["updated"] = now_iso()
-            write_card(card_path, card)
-
-            print(f"Cannot complete card #{num} — {len(unchecked)} of {len(criteria)} acceptance criteria not met:", file=sys.stderr)
-            for i, criterion in unchecked:
-                text = criterion.get("text", "")
-                print(f"  {i}. ⬜ {text}", file=sys.stderr)
-            print(f"\nRun `kanban criteria check {num} <n>` to mark criteria as met.", file=sys.stderr)
-            print(f"Cycle: {cycles}/{MAX_CYCLES}", file=sys.stderr)
+    card_refs = _bulk_card_args(args)
+    message = args.message if hasattr(args, "message") and args.message else None
+    # `kanban done N <message>` predates bulk done, so with exactly two
+    # positionals the second is the message even when it looks like a card
+    # (`kanban done 2 7`). With more, the cancel convention applies: a
+    # trailing token that is not a card reference is the message
+    # (`kanban done 3 5 "Shipped"`); a numeric one needs -m.
+    if message is None and len(card_refs) == 2:
+        message = card_refs.pop()
+    elif message is None and len(card_refs) > 2 and not is_card_ref(card_refs[-1]):
+        message = card_refs.pop()
+    message = message or "Completed"
+    card_refs = parse_card_refs(card_refs)
 
-            if cycles >= MAX_CYCLES:
-                print(f"Max cycles ({MAX_CYCLES}) reached — escalate to staff engineer.", file=sys.stderr)
-                sys.exit(2)
-            sys.exit(1)
+    git_root = get_git_root()
+    git_project = os.path.basename(git_root) if git_root else None
+    events: list[tuple] = []
+    failed: list[str] = []
+    max_cycles = False
 
-    # Append completion message to activity
-    message = args.message if hasattr(args, "message") and args.message else "Completed"
-    card["activity"].append({
-        "timestamp": now_iso(),
-        "message": message,
-    })
-    card["updated"] = now_iso()
-    write_card(card_path, card)
-
-    write_kanban_event(card, num, "done", card_completed_at=card["updated"], from_column=col, to_column="done")
-    target = root / "done" / card_path.name
-    target.parent.mkdir(parents=True, exist_ok=True)
-    card_path.rename(target)
-    print(f"Done: #{num} — {message}")
+    with board_lock(root):
+        try:
+            for card_ref in card_refs:
+                try:
+                    status = _done_one(root, card_ref, message, git_project, events)
+                except SystemExit:
+                    status = 1
+                if status:
+                    failed.append(card_ref)
+                    max_cycles = max_cycles or status == 2
+        finally:
+            write_kanban_events(events)
+    _finish_bulk("Done", len(card_refs), failed, max_cycles)
 
 
 def trash_path(path: Path) -> None:
@@ -5362,7 +7105,14 @@ def cmd_clean(args) -> None:
         col_path = root / col
         if col_path.exists():
             for card_file in col_path.glob("*.json"):
-                trash_path(card_file)
+                with card_lock(root, card_number(card_file)):
+                    if not card_file.exists():
+                        continue  # moved to another column while we waited
+                    trash_path(card_file)
+                    if _activity_path(card_file).exists():
+                        trash_path(_activity_path(card_file))
+                    record_card_change(card_file)
+                    discard_card_lock(root, card_number(card_file))
                 trashed_count += 1
 
     # Trash scratchpad if expunge
@@ -5386,7 +7136,7 @@ def cmd_clean(args) -> None:
 def cmd_report(args) -> None:
     """Generate status report from completed cards.
 
-    Shows intent, action, and completion comment from done cards, with optional date filtering.
+    Shows intent, action, and completion comment from done and archived cards, with optional date filtering.
     Includes all sessions by default, sorted newest first.
     """
     root = get_root(args.root)
@@ -5411,57 +7161,29 @@ def cmd_report(args) -> None:
             print(f"Error: Invalid --to date format '{args.to_date}'. Use YYYY-MM-DD.", file=sys.stderr)
             sys.exit(1)
 
-    # Gather completed cards from done column
+    # Gather completed cards from the done column and the archive months
     done_cards = []
     done_dir = root / "done"
 
-    if not done_dir.exists():
+    if not done_dir.exists() and not (root / "archive").exists():
         # No completed cards - output empty result
         if getattr(args, "output_style", None) == "xml":
             print("<status-report>")
             print("</status-report>")
-        else:
-            print("No completed cards found.")
-        return
-
-    for card_path in done_dir.glob("*.json"):
-        try:
-            card = read_card(card_path)
-
-            # Resolve completion timestamp robustly — try in order:
-            #   (1) card['updated']
-            #   (2) fall back to activity — last entry's timestamp in activity[]
-            #   (3) card['created']
-            # Only skip the card if ALL three are missing or unparseable.
-            updated = None
-
-            # (1) Try 'updated' field first
-            updated_str = card.get("updated")
-            if updated_str:
-                try:
-                    updated = parse_iso(updated_str)
-                except ValueError:
-                    pass
+        else:
+            print("No completed cards found.")
+        return
 
-            # (2) Fall back to activity — last entry's timestamp in activity[]
-            if updated is None:
-                activity = card.get("activity", [])
-                if isinstance(activity, list) and activity:
-                    last_ts = activity[-1].get("timestamp") if isinstance(activity[-1], dict) else None
-                    if last_ts:
-                        try:
-                            updated = parse_iso(last_ts)
-                        except ValueError:
-                            pass
-
-            # (3) Fall back to 'created' field
-            if updated is None:
-                created_str = card.get("created")
-                if created_str:
-                    try:
-                        updated = parse_iso(created_str)
-                    except ValueError:
-                        pass
+    seen = set()
+    card_index = CardIndex(root)
+    for card_path in done_dir.glob("*.json"):
+        try:
+            card = card_index.read(card_path, ("action", "intent", "created", "updated"))
+
+            # Resolve completion timestamp robustly: updated, else the last
+            # activity entry's timestamp, else created. Only skip the card if
+            # all three are missing or unparseable.
+            updated = card_completed_at(card, card_path)
 
             # If all timestamp sources failed, warn loudly and skip
             if updated is None:
@@ -5472,44 +7194,68 @@ def cmd_report(args) -> None:
                 )
                 continue
 
+            seen.add(card_number(card_path))
+
             # Apply date filters
             if from_date and updated < from_date:
                 continue
             if to_date and updated > to_date:
                 continue
 
-            done_cards.append((updated, card_number(card_path), card))
+            # Only cards that made it through the filters render a completion
+            # comment, so only their activity logs are read.
+            comment = completion_comment(read_card_activity(card_path))
+            done_cards.append((updated, card_number(card_path), card, comment))
 
         except (json.JSONDecodeError, OSError):
             # Skip malformed cards
             continue
+    card_index.save()
+
+    # Archived cards come from the month summaries. A month whose completion
+    # range misses the window is skipped on its header line alone.
+    for month in archive_months(root):
+        header, entries = read_archive_summary(root, month, header_only=True)
+        if not _summary_overlaps(header, from_date, to_date):
+            continue
+        if entries is None:
+            header, entries = read_archive_summary(root, month)
+        for entry in entries:
+            num = str(entry.get("n"))
+            try:
+                updated = parse_iso(entry["completed"])
+            except (KeyError, TypeError, ValueError):
+                print(
+                    f"kanban report: skipping {root / 'archive' / month / f'{num}.json'} — no parseable "
+                    "timestamp in updated, activity[-1].timestamp, or created",
+                    file=sys.stderr,
+                )
+                continue
+            # A card reopened out of the archive while a stale copy lingered
+            # is reported once, from done/.
+            if num in seen:
+                continue
+            seen.add(num)
+            if from_date and updated < from_date:
+                continue
+            if to_date and updated > to_date:
+                continue
+            card = {"action": entry.get("action", ""), "intent": entry.get("intent", "")}
+            done_cards.append((updated, num, card, entry.get("comment")))
 
     # Sort newest first (reverse chronological)
     done_cards.sort(key=lambda x: x[0], reverse=True)
 
-    # Helper function to extract completion comment from activity
-    def get_completion_comment(card: dict) -> str | None:
-        """Extract completion comment from activity array.
-
-        Returns the last activity message that isn't 'Created', or None if not found.
-        """
-        activity = card.get("activity", [])
-        if len(activity) > 1:
-            # Return the last activity message (which is the completion message)
-            return activity[-1].get("message")
-        return None
-
     # Output based on style
     output_style = getattr(args, "output_style", "human")
 
     if output_style == "xml":
         # XML format for Claude Code consumption
-        esc = html.escape
+        from html import escape as esc
         print("<status-report>")
-        for updated, num, card in done_cards:
+        for updated, num, card, comment in done_cards:
             action = card.get("action", "")
             intent = card.get("intent", "")
-            comment = get_completion_comment(card)
             completion_date = updated.strftime("%Y-%m-%d")
 
             print(f'  <card num="{esc(num)}" completed="{esc(completion_date)}">')
@@ -5547,10 +7293,9 @@ def cmd_report(args) -> None:
         output_lines.append("")
 
         # Print cards
-        for updated, num, card in done_cards:
+        for updated, num, card, comment in done_cards:
             action = card.get("action", "[NO ACTION]")
             intent = card.get("intent", "")
-            comment = get_completion_comment(card)
             completion_date = updated.strftime("%Y-%m-%d")
 
             # Card header with date
@@ -5611,6 +7356,240 @@ def cmd_report(args) -> None:
         use_pager("\n".join(output_lines))
 
 
+# =============================================================================
+# Full-text search
+# =============================================================================
+#
+# `kanban search <query>` finds cards across every column AND every archive
+# month — before this, finding which past card touched a file or mentioned an
+# error meant grepping thousands of JSON files by hand.
+#
+# The index is an SQLite FTS5 table in root/.search.db over each card's
+# action, intent, criteria text, comments, activity messages and files
+# (editFiles / readFiles), plus a plain table of the fields the filters need
+# (column, session, type, updated). It is a cache of the card files, never a
+# source of truth: delete it and the next search rebuilds it.
+#
+# Updates are incremental and ride on the board generation journal (see
+# § Board generation): write_card and move_card record every change there, so
+# each search re-indexes only the cards changed since the generation it last
+# indexed. Keeping sqlite out of write_card itself keeps the write path — and
+# the hot `criteria check` — free of an sqlite import and a second database
+# write. A cursor the journal can no longer answer (compacted past it, or a
+# deleted journal) falls back to a full rebuild, as does --rebuild.
+# =============================================================================
+
+_SEARCH_DB_FILENAME = ".search.db"
+_SEARCH_DB_VERSION = 1
+SEARCH_COLUMNS = COLUMNS + ["archive"]
+
+
+def _open_search_index(root: Path):
+    """Open (creating if needed) the search index; exits 1 without FTS5."""
+    import sqlite3
+
+    conn = sqlite3.connect(str(root / _SEARCH_DB_FILENAME))
+    conn.execute("PRAGMA busy_timeout=5000")
+    try:
+        version = conn.execute("PRAGMA user_version").fetchone()[0]
+        if version != _SEARCH_DB_VERSION:
+            conn.executescript(
+                """
+                DROP TABLE IF EXISTS search_meta;
+                DROP TABLE IF EXISTS search_cards;
+                DROP TABLE IF EXISTS search_fts;
+                CREATE TABLE search_meta (key TEXT PRIMARY KEY, value INTEGER);
+                CREATE TABLE search_cards (
+                    num INTEGER PRIMARY KEY,
+                    location TEXT NOT NULL,
+                    month TEXT,
+                    session TEXT,
+                    type TEXT,
+                    intent TEXT,
+                    created TEXT,
+                    updated TEXT
+                );
+                CREATE VIRTUAL TABLE search_fts USING fts5(
+                    action, intent, criteria, comments, activity, files,
+                    tokenize = 'unicode61'
+                );
+                """
+            )
+            conn.execute(f"PRAGMA user_version = {_SEARCH_DB_VERSION}")
+            conn.commit()
+    except sqlite3.OperationalError as e:
+        conn.close()
+        print(f"Error: search index unavailable ({e}). kanban search needs SQLite with FTS5.", file=sys.stderr)
+        sys.exit(1)
+    return conn
+
+
+def _search_card_location(card_path: Path) -> tuple[str, str | None]:
+    """(location, archive month) for a card path."""
+    if card_path.parent.parent.name == "archive":
+        return "archive", card_path.parent.name
+    return card_path.parent.name, None
+
+
+def _locate_card_file(root: Path, num: str) -> Path | None:
+    """Current path of card #num, or None if it no longer exists."""
+    for col in COLUMNS:
+        path = root / col / f"{num}.json"
+        if path.exists():
+            return path
+    return next(iter(sorted((root / "archive").glob(f"*/{num}.json"))), None)
+
+
+def _index_card(conn, card_path: Path) -> None:
+    num = int(card_number(card_path))
+    conn.execute("DELETE FROM search_cards WHERE num = ?", (num,))
+    conn.execute("DELETE FROM search_fts WHERE rowid = ?", (num,))
+    try:
+        card = read_card(card_path, include_activity=True, persist_migrations=False)
+    except (json.JSONDecodeError, OSError):
+        return
+    location, month = _search_card_location(card_path)
+    files = [*(card.get("editFiles") or card.get("writeFiles") or []), *(card.get("readFiles") or [])]
+    conn.execute(
+        "INSERT INTO search_cards VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+        (num, location, month, card.get("session"), card.get("type"), card.get("intent", ""),
+         card.get("created"), card.get("updated")),
+    )
+    conn.execute(
+        "INSERT INTO search_fts (rowid, action, intent, criteria, comments, activity, files)"
+        " VALUES (?, ?, ?, ?, ?, ?, ?)",
+        (
+            num,
+            card.get("action", ""),
+            card.get("intent", ""),
+            "\n".join(c.get("text", "") for c in card.get("criteria", []) if isinstance(c, dict)),
+            "\n".join(c.get("text", "") for c in card.get("comments", []) if isinstance(c, dict)),
+            "\n".join(e.get("message", "") for e in card.get("activity", []) if isinstance(e, dict)),
+            " ".join(files),
+        ),
+    )
+
+
+def sync_search_index(root: Path, conn, rebuild: bool = False) -> None:
+    """Bring the search index up to date with the board (see § Full-text search)."""
+    row = conn.execute("SELECT value FROM search_meta WHERE key = 'generation'").fetchone()
+    if row is None or rebuild:
+        generation, changed = board_generation(root), None
+    else:
+        generation, changed = cards_changed_since(root, row[0])
+
+    with conn:
+        if changed is None:
+            conn.execute("DELETE FROM search_cards")
+            conn.execute("DELETE FROM search_fts")
+            for card_path in find_all_cards(root, include_archived=True):
+                if card_path.stem.isdigit():
+                    _index_card(conn, card_path)
+        else:
+            for num in changed:
+                card_path = _locate_card_file(root, num)
+                if card_path is None:
+                    conn.execute("DELETE FROM search_cards WHERE num = ?", (int(num),))
+                    conn.execute("DELETE FROM search_fts WHERE rowid = ?", (int(num),))
+                else:
+                    _index_card(conn, card_path)
+        conn.execute(
+            "INSERT OR REPLACE INTO search_meta (key, value) VALUES ('generation', ?)", (generation,)
+        )
+
+
+def _fts_query(text: str) -> str:
+    """Free text -> FTS5 MATCH expression: every term must match.
+
+    Terms are quoted so punctuation in paths and identifiers ("src/app.py",
+    "card-42") cannot trip FTS5 query syntax; a trailing * keeps its prefix
+    meaning.
+    """
+    terms = []
+    for term in text.split():
+        prefix = term.endswith("*") and len(term) > 1
+        term = term.rstrip("*") if prefix else term
+        terms.append('"' + term.replace('"', '""') + '"' + ("*" if prefix else ""))
+    return " ".join(terms)
+
+
+def cmd_search(args) -> None:
+    """Full-text search across all columns and archive months."""
+    root = get_root(args.root)
+    query = _fts_query(" ".join(args.query))
+    if not query:
+        print("Error: search query is empty", file=sys.stderr)
+        sys.exit(1)
+
+    columns = []
+    for col_arg in getattr(args, "column", None) or []:
+        for col in col_arg.split(","):
+            col = col.strip()
+            if col not in SEARCH_COLUMNS:
+                print(f"Error: Invalid column '{col}'. Valid columns: {', '.join(SEARCH_COLUMNS)}", file=sys.stderr)
+                sys.exit(1)
+            columns.append(col)
+    since = parse_date_filter(args.since) if getattr(args, "since", None) else None
+    until = parse_date_filter(args.until) if getattr(args, "until", None) else None
+
+    conn = _open_search_index(root)
+    try:
+        sync_search_index(root, conn, rebuild=getattr(args, "rebuild", False))
+
+        sql = (
+            "SELECT c.num, c.location, c.month, c.session, c.intent, c.updated,"
+            " snippet(search_fts, -1, '[', ']', '…', 12)"
+            " FROM search_fts JOIN search_cards c ON c.num = search_fts.rowid"
+            " WHERE search_fts MATCH ?"
+        )
+        params: list = [query]
+        if columns:
+            sql += f" AND c.location IN ({','.join('?' * len(columns))})"
+            params += columns
+        if getattr(args, "session", None):
+            sql += " AND c.session = ?"
+            params.append(args.session)
+        if getattr(args, "type", None):
+            sql += " AND c.type = ?"
+            params.append(args.type)
+        sql += " ORDER BY rank"
+        try:
+            rows = conn.execute(sql, params).fetchall()
+        except Exception as e:  # sqlite3.OperationalError — sqlite3 is imported lazily
+            print(f"Error: invalid search query: {e}", file=sys.stderr)
+            sys.exit(1)
+    finally:
+        conn.close()
+
+    results = [
+        row for row in rows
+        if card_in_date_range({"updated": row[5] or ""}, since, until)
+    ][: args.limit]
+
+    if getattr(args, "output_style", "xml") == "xml":
+        from html import escape as esc
+
+        print(f'<search query="{esc(" ".join(args.query))}" results="{len(results)}">')
+        for num, location, month, session, intent, _updated, snippet in results:
+            month_attr = f' month="{esc(month)}"' if month else ""
+            ses_attr = f' ses="{esc(session)}"' if isinstance(session, str) and session else ""
+            print(
+                f'<c n="{num}"{ses_attr} s="{esc(location)}"{month_attr}>'
+                f"<i>{esc(intent or '')}</i><m>{esc(' '.join((snippet or '').split()))}</m></c>"
+            )
+        print("</search>")
+        return
+
+    if not results:
+        print("No matching cards.")
+        return
+    for num, location, month, session, intent, _updated, snippet in results:
+        where = f"archive/{month}" if month else location
+        print(f"#{num} [{where}] {intent or ''}")
+        if snippet:
+            print(f"    {' '.join(snippet.split())}")
+
+
 # =============================================================================
 # Watch mode (reused from v1)
 # =============================================================================
@@ -5672,6 +7651,10 @@ def _handle_input_mode(state: WatchState, ch: str, refresh_event: Event) -> None
 
 def _input_thread(state: WatchState, refresh_event: Event, stop_event: Event) -> None:
     """Background thread for reading keyboard input."""
+    import select
+    import termios
+    import tty
+
     fd = sys.stdin.fileno()
     old_settings = termios.tcgetattr(fd)
     try:
@@ -5727,29 +7710,192 @@ def _render_watch(args, command_func, state: WatchState, is_interactive: bool) -
         _print_status_bar(state)
 
 
+# ---------------------------------------------------------------------------
+# Incremental watch mode
+#
+# On a busy board agents check criteria every few seconds, and each write
+# used to cost a full refresh: a board-wide glob, a decode of every card, and
+# a clear-screen repaint. Three pieces make a refresh proportional to what
+# actually changed:
+#
+#   _WatchChanges  the observer thread records every changed card path;
+#                  the main loop coalesces a burst of events (an atomic card
+#                  write alone is create + modify + move) until the board
+#                  has been quiet for a debounce window, then drains the
+#                  whole set at once.
+#   BoardModel     `kanban list`'s in-memory board, patched from those paths
+#                  — only the named cards are re-read.
+#   _paint_frame   repaints only the terminal rows whose text changed, and
+#                  nothing at all when the frame is identical.
+#
+# The debounce window defaults to 100ms; override with --debounce <ms> or
+# KANBAN_WATCH_DEBOUNCE_MS. A continuously busy board still refreshes at least
+# every _WATCH_MAX_COALESCE_WINDOWS windows.
+# ---------------------------------------------------------------------------
+
+_WATCH_DEFAULT_DEBOUNCE_MS = 100
+_WATCH_MAX_COALESCE_WINDOWS = 10
+_ANSI_ESCAPE_RE = re.compile(r"\x1b\[[0-9;?]*[A-Za-z]")
+
+
+def _watch_debounce_seconds(args) -> float:
+    """Debounce window from --debounce, then KANBAN_WATCH_DEBOUNCE_MS, then the default."""
+    debounce_ms = getattr(args, "debounce", None)
+    if debounce_ms is None:
+        try:
+            debounce_ms = int(os.environ.get("KANBAN_WATCH_DEBOUNCE_MS", _WATCH_DEFAULT_DEBOUNCE_MS))
+        except ValueError:
+            debounce_ms = _WATCH_DEFAULT_DEBOUNCE_MS
+    return max(debounce_ms, 0) / 1000.0
+
+
+class _WatchChanges:
+    """Thread-safe set of changed paths, filled by the observer thread."""
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._paths: set[str] = set()
+
+    def add(self, path: str) -> None:
+        with self._lock:
+            self._paths.add(path)
+
+    def drain(self) -> set[str]:
+        with self._lock:
+            paths, self._paths = self._paths, set()
+        return paths
+
+
+class BoardModel:
+    """In-memory copy of the board's column cards for watch-mode `kanban list`.
+
+    Loaded once through the card index, then kept current by apply(), which
+    re-reads only the paths named by filesystem events: a card that exists is
+    (re)loaded into its column, a card that no longer exists is dropped —
+    together that covers create, modify, move and delete.
+    """
+
+    def __init__(self, root: Path):
+        self.root = root
+        self._cards: dict[str, dict[str, dict]] = {col: {} for col in COLUMNS}
+        self._index = CardIndex(root)
+        for col in COLUMNS:
+            for card_path in find_cards_in_column(root, col):
+                self._load(col, card_path)
+        self._index.save()
+
+    def _load(self, col: str, card_path: Path) -> None:
+        num = card_number(card_path)
+        try:
+            self._cards[col][num] = self._index.read(card_path)
+        except (json.JSONDecodeError, OSError):
+            # Missing (moved again already) or mid-write: drop it; the event
+            # for its next state brings it back.
+            self._cards[col].pop(num, None)
+
+    def apply(self, paths) -> bool:
+        """Patch the model from changed paths. Returns True if any card path
+        was among them (False: nothing the list renders changed)."""
+        touched = False
+        for raw in paths:
+            path = Path(raw)
+            col = path.parent.name
+            if col not in self._cards or path.parent.parent != self.root:
+                continue
+            if not re.fullmatch(r"\d+\.json", path.name):
+                continue
+            touched = True
+            if path.exists():
+                self._load(col, path)
+            else:
+                self._cards[col].pop(card_number(path), None)
+        if touched:
+            self._index.save()
+        return touched
+
+    def column(self, col: str) -> list[tuple[str, dict]]:
+        """(num, card) pairs for a column in card-number order."""
+        return sorted(self._cards.get(col, {}).items(), key=lambda item: int(item[0]))
+
+
+def _coalesce_events(refresh_event: Event, debounce: float) -> None:
+    """Absorb further events until a full debounce window passes with none.
+
+    Bounded at _WATCH_MAX_COALESCE_WINDOWS windows so a board that never goes
+    quiet still refreshes. Leaves refresh_event cleared.
+    """
+    deadline = time.monotonic() + debounce * _WATCH_MAX_COALESCE_WINDOWS
+    while True:
+        refresh_event.clear()
+        remaining = deadline - time.monotonic()
+        if remaining <= 0 or not refresh_event.wait(timeout=min(debounce, remaining)):
+            return
+
+
+def _paint_frame(previous: list[str] | None, frame: list[str]) -> None:
+    """Draw frame, rewriting only rows that differ from previous.
+
+    Falls back to a full clear-and-repaint for the first frame, and whenever
+    a line could wrap or the frame outgrows the terminal — row addressing is
+    only correct when one frame line is exactly one screen row.
+    """
+    if frame == previous:
+        return
+    size = shutil.get_terminal_size()
+    full = (
+        previous is None
+        or max(len(frame), len(previous)) >= size.lines
+        or any(len(_ANSI_ESCAPE_RE.sub("", line)) >= size.columns for line in frame)
+    )
+    if full:
+        out = "\033[2J\033[H" + "\n".join(frame) + "\n"
+    else:
+        parts = [
+            f"\033[{row + 1};1H\033[2K{line}"
+            for row, line in enumerate(frame)
+            if row >= len(previous) or previous[row] != line
+        ]
+        if len(frame) < len(previous):
+            parts.append(f"\033[{len(frame) + 1};1H\033[J")
+        parts.append(f"\033[{len(frame) + 1};1H")
+        out = "".join(parts)
+    sys.stdout.write(out)
+    sys.stdout.flush()
+
+
 def watch_and_run(args, command_func) -> None:
     """Watch .kanban/ directory and re-run command on changes.
 
     --watch always forces simple output style regardless of --output-style value
     or the default. XML streamed live is unreadable noise for interactive monitoring;
     simple is the only sensible format for watch mode.
+
+    `kanban list --watch` renders from a BoardModel patched per event (see
+    § Incremental watch mode); other commands are re-run in full on each
+    coalesced refresh.
     """
     root = get_root(args.root)
     refresh_event = Event()
     stop_event = Event()
+    changes = _WatchChanges()
+    debounce = _watch_debounce_seconds(args)
     # Watch mode always starts in simple style — XML is not useful for live
     # interactive monitoring. This overrides any --output-style flag or default.
     state = WatchState(output_style="simple")
     is_interactive = sys.stdin.isatty()
+    board_model = BoardModel(root) if command_func is cmd_list else None
+    args._board_model = board_model
+
+    # Filesystem watching (bundled via Nix Python wrapper)
+    from watchdog.events import FileSystemEventHandler
+    from watchdog.observers import Observer
 
     class DebounceHandler(FileSystemEventHandler):
         def on_any_event(self, event):
-            if event.is_directory:
-                return
-            is_json_event = event.src_path.endswith(".json")
-            if hasattr(event, "dest_path"):
-                is_json_event = is_json_event or event.dest_path.endswith(".json")
-            if is_json_event:
+            json_paths = _event_json_paths(event)
+            if json_paths:
+                for path in json_paths:
+                    changes.add(path)
                 refresh_event.set()
 
     observer = Observer()
@@ -5767,27 +7913,37 @@ def watch_and_run(args, command_func) -> None:
         input_thread.start()
 
     if is_interactive:
-        print(f"Watching {root} for changes... (Press ? for help)")
-        print()
+        banner = f"Watching {root} for changes... (Press ? for help)"
     else:
-        print(f"Watching {root} for changes... (Ctrl+C to exit)")
-        print()
+        banner = f"Watching {root} for changes... (Ctrl+C to exit)"
+
+    def render_frame() -> list[str]:
+        buffer = io.StringIO()
+        with contextlib.redirect_stdout(buffer):
+            print(banner)
+            print()
+            try:
+                _render_watch(args, command_func, state, is_interactive)
+            except Exception as e:
+                print(f"Error: {e}")
+                if is_interactive:
+                    print()
+                    _print_status_bar(state)
+        return buffer.getvalue().rstrip("\n").split("\n")
 
     try:
-        _render_watch(args, command_func, state, is_interactive)
+        frame = render_frame()
+        _paint_frame(None, frame)
         while not stop_event.is_set():
-            if refresh_event.wait(timeout=0.5):
-                refresh_event.clear()
-                time.sleep(0.1)  # Small debounce
-                refresh_event.clear()
-                print("\033[2J\033[H", end="", flush=True)
-                try:
-                    _render_watch(args, command_func, state, is_interactive)
-                except Exception as e:
-                    print(f"Error: {e}", file=sys.stderr)
-                    if is_interactive:
-                        print()
-                        _print_status_bar(state)
+            if not refresh_event.wait(timeout=0.5):
+                continue
+            _coalesce_events(refresh_event, debounce)
+            changed = changes.drain()
+            if board_model is not None and changed:
+                board_model.apply(changed)
+            next_frame = render_frame()
+            _paint_frame(frame, next_frame)
+            frame = next_frame
     except KeyboardInterrupt:
         print("\nStopping watch mode...")
     finally:
@@ -5800,27 +7956,494 @@ def watch_and_run(args, command_func) -> None:
         os.system('stty sane 2>/dev/null')
 
 
+# =============================================================================
+# Board server (kanban serve)
+# =============================================================================
+# ---------------------------------------------------------------------------
+# The coordinator, every sub-agent, several hooks and the PostCompact script
+# each run kanban as a fresh process. Each run finds the git root again and
+# reads the board from disk again. `kanban serve` is an optional per-board
+# daemon that pays those costs once:
+#
+#   - It holds the board in a BoardModel (see § Incremental watch mode).
+#   - It answers requests on root/.serve.sock, a Unix socket.
+#
+# The protocol is JSON-RPC 2.0, one JSON object per line. The method is a
+# kanban command and params carry the rest of the command line plus the
+# caller's cwd and environment:
+#
+#   {"jsonrpc": "2.0", "id": 1, "method": "criteria",
+#    "params": {"args": ["check", "12", "2"], "cwd": "/repo", "env": {...}}}
+#   -> {"jsonrpc": "2.0", "id": 1,
+#       "result": {"stdout": "...", "stderr": "...", "exit_code": 0}}
+#
+# The daemon runs the same cmd_* functions as the CLI, under the caller's
+# cwd and environment. So session detection, metrics events and MoV commands
+# behave exactly as they would in the caller's process. `ping` reports the
+# served root, pid and board generation.
+#
+# The model is kept current from two sources:
+#   - the generation journal (§ Board generation), which names every card
+#     written through kanban. This includes the daemon's own writes, so a
+#     `done` followed by a `list` is never stale.
+#   - a watchdog observer, for edits made outside kanban.
+#
+# Requests are served one at a time. Commands print to a redirected stdout
+# and run under a swapped cwd and environment, which are process-wide, so
+# two requests must never overlap. The file locks still serialize the daemon
+# against direct CLI writers.
+#
+# Because the queue is serial, only commands that finish in milliseconds are
+# served. `criteria check` runs the criterion's MoV commands, which can take
+# as long as their timeouts allow; served, it would stall every other
+# agent's list/show/status behind it. It always runs in the caller's own
+# process (_serve_direct), and the server refuses it if asked.
+#
+# Client side (_serve_client): main() hands _SERVE_COMMANDS to the daemon
+# when root/.serve.sock accepts a connection. If there is no socket, a stale
+# socket, or KANBAN_NO_SERVE is set, the command runs directly, as before.
+# Interactive terminals always run directly, because the pager and the
+# terminal width belong to the caller's tty. The client waits at most
+# _SERVE_REPLY_TIMEOUT for the answer. A read-only command (_SERVE_READ_ONLY)
+# that times out simply runs directly instead. For anything else the
+# daemon's answer is final once the request has been sent: a transition is
+# never retried locally, so it cannot run twice, and a timeout is reported
+# as "may or may not have run".
+# ---------------------------------------------------------------------------
+
+_SERVE_SOCKET_FILENAME = ".serve.sock"
+_SERVE_COMMANDS = frozenset({"list", "ls", "show", "status", "criteria", "ac", "start", "done", "cancel", "defer"})
+_SERVE_READ_ONLY = frozenset({"list", "ls", "show", "status"})
+_SERVE_CONNECT_TIMEOUT = 0.2
+_SERVE_REPLY_TIMEOUT = 10.0
+_SERVE_READ_TIMEOUT = 5.0
+_SERVE_ARCHIVE_INTERVAL = 60.0
+
+
+def _event_json_paths(event) -> list[str]:
+    """The .json paths a watchdog event names (source and, for moves, destination)."""
+    if event.is_directory:
+        return []
+    paths = [event.src_path] if event.src_path.endswith(".json") else []
+    dest_path = getattr(event, "dest_path", "")
+    if dest_path and dest_path.endswith(".json"):
+        paths.append(dest_path)
+    return paths
+
+
+def _jsonrpc_error(request_id, code: int, message: str) -> dict:
+    return {"jsonrpc": "2.0", "id": request_id, "error": {"code": code, "message": message}}
+
+
+def _serve_direct(method: str, args: list[str]) -> bool:
+    """True for a served command that must still run in the caller: `criteria
+    check`, whose MoV commands would hold up the daemon's serial queue.
+
+    Any "check" word counts, wherever flags put the subcommand; at worst a
+    criterion whose text is "check" is added directly instead of served.
+    """
+    return method in ("criteria", "ac") and "check" in args
+
+
+class BoardServer:
+    """Serves kanban commands for one board from an in-memory BoardModel."""
+
+    def __init__(self, root: Path):
+        self.root = root
+        self.socket_path = root / _SERVE_SOCKET_FILENAME
+        self.changes = _WatchChanges()
+        self.generation = board_generation(root)
+        self.model = BoardModel(root)
+        self._parser = _build_parser()
+        self._commands = _command_table()
+        self._last_archive = time.monotonic()
+        self._stop = Event()
+
+    def stop(self) -> None:
+        self._stop.set()
+
+    def refresh(self) -> None:
+        """Bring the model up to date with the journal and watched events."""
+        if time.monotonic() - self._last_archive >= _SERVE_ARCHIVE_INTERVAL:
+            # Direct invocations archive on every get_root(); once a minute
+            # is plenty for a threshold measured in days.
+            auto_archive_old_cards(self.root)
+            self._last_archive = time.monotonic()
+        changed = self.changes.drain()
+        generation, nums = cards_changed_since(self.root, self.generation)
+        if nums is None:
+            self.model = BoardModel(self.root)
+        else:
+            changed.update(str(self.root / col / f"{num}.json") for num in nums for col in COLUMNS)
+        self.generation = generation
+        if changed:
+            self.model.apply(changed)
+
+    def handle(self, request) -> dict:
+        """Answer one JSON-RPC request object."""
+        if not isinstance(request, dict) or request.get("jsonrpc") != "2.0" or "method" not in request:
+            return _jsonrpc_error(request.get("id") if isinstance(request, dict) else None, -32600, "Invalid Request")
+        request_id = request.get("id")
+        method = request["method"]
+        params = request.get("params") or {}
+        if method == "ping":
+            return {"jsonrpc": "2.0", "id": request_id, "result": {
+                "root": str(self.root), "pid": os.getpid(), "generation": board_generation(self.root),
+            }}
+        if method not in _SERVE_COMMANDS:
+            return _jsonrpc_error(request_id, -32601, f"Method not found: {method}")
+        args = params.get("args", [])
+        if not isinstance(args, list) or not all(isinstance(a, str) for a in args) or "--watch" in args:
+            return _jsonrpc_error(request_id, -32602, "Invalid params: args must be a list of strings (no --watch)")
+        if _serve_direct(method, args):
+            return _jsonrpc_error(request_id, -32601, f"Method not served: {method} check runs MoV commands")
+        env = params.get("env")
+        cwd = params.get("cwd")
+        return {"jsonrpc": "2.0", "id": request_id, "result": self._run([method] + args, cwd, env)}
+
+    def _run(self, argv: list[str], cwd: str | None, env: dict | None) -> dict:
+        stdout, stderr = io.StringIO(), io.StringIO()
+        exit_code = 0
+        saved_cwd = os.getcwd()
+        saved_env = dict(os.environ)
+        try:
+            if isinstance(env, dict):
+                os.environ.clear()
+                os.environ.update({str(k): str(v) for k, v in env.items()})
+            # A MoV command that itself runs kanban must not queue behind the
+            # request that spawned it.
+            os.environ["KANBAN_NO_SERVE"] = "1"
+            if cwd:
+                os.chdir(cwd)
+            with contextlib.redirect_stdout(stdout), contextlib.redirect_stderr(stderr):
+                try:
+                    args = self._parser.parse_args(argv)
+                    args.root = str(self.root)
+                    if args.command in ("list", "ls"):
+                        self.refresh()
+                        args._board_model = self.model
+                    self._commands[args.command](args)
+                except SystemExit as e:
+                    if e.code is None or isinstance(e.code, int):
+                        exit_code = e.code or 0
+                    else:
+                        print(e.code, file=sys.stderr)
+                        exit_code = 1
+                except Exception:
+                    import traceback
+                    traceback.print_exc()
+                    exit_code = 1
+        except OSError as e:
+            # The caller's cwd is gone, or similar: nothing ran.
+            stderr.write(f"Error: {e}\n")
+            exit_code = 1
+        finally:
+            os.chdir(saved_cwd)
+            os.environ.clear()
+            os.environ.update(saved_env)
+        return {"stdout": stdout.getvalue(), "stderr": stderr.getvalue(), "exit_code": exit_code}
+
+    def _handle_connection(self, conn) -> None:
+        conn.settimeout(_SERVE_READ_TIMEOUT)
+        with conn.makefile("rwb") as stream:
+            while True:
+                try:
+                    line = stream.readline()
+                except OSError:
+                    return
+                if not line:
+                    return
+                try:
+                    request = json.loads(line)
+                except (json.JSONDecodeError, UnicodeDecodeError):
+                    response = _jsonrpc_error(None, -32700, "Parse error")
+                else:
+                    response = self.handle(request)
+                try:
+                    stream.write(json.dumps(response).encode() + b"\n")
+                    stream.flush()
+                except OSError:
+                    return
+
+    def serve_forever(self) -> None:
+        """Listen on root/.serve.sock until stop() is called."""
+        import socket
+
+        from watchdog.events import FileSystemEventHandler
+        from watchdog.observers import Observer
+
+        changes = self.changes
+
+        class ChangeHandler(FileSystemEventHandler):
+            def on_any_event(self, event):
+                for path in _event_json_paths(event):
+                    changes.add(path)
+
+        listener = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        old_umask = os.umask(0o077)
+        try:
+            listener.bind(str(self.socket_path))
+        finally:
+            os.umask(old_umask)
+        bound_inode = self.socket_path.stat().st_ino
+        listener.listen(16)
+        listener.settimeout(0.5)
+
+        observer = Observer()
+        observer.schedule(ChangeHandler(), str(self.root), recursive=True)
+        observer.start()
+        try:
+            while not self._stop.is_set():
+                try:
+                    conn, _ = listener.accept()
+                except socket.timeout:
+                    continue
+                with conn:
+                    self._handle_connection(conn)
+        finally:
+            observer.stop()
+            observer.join()
+            listener.close()
+            # Only remove the socket if it is still ours.
+            with suppress(OSError):
+                if self.socket_path.stat().st_ino == bound_inode:
+                    self.socket_path.unlink()
+
+
+class _ServeConnectionLost(Exception):
+    """The board server went away after a request may have reached it."""
+
+
+class _ServeTimeout(_ServeConnectionLost):
+    """The board server did not answer within _SERVE_REPLY_TIMEOUT."""
+
+
+def _serve_call(socket_path: Path, method: str, params: dict | None = None) -> dict:
+    """Send one JSON-RPC request to a board server and return its response.
+
+    Raises OSError if the server cannot be reached (nothing was sent),
+    _ServeTimeout if no answer arrives within _SERVE_REPLY_TIMEOUT, and
+    _ServeConnectionLost if the connection fails once sending has begun.
+    """
+    import socket
+
+    request = {"jsonrpc": "2.0", "id": 1, "method": method, "params": params or {}}
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as sock:
+        sock.settimeout(_SERVE_CONNECT_TIMEOUT)
+        sock.connect(str(socket_path))
+        sock.settimeout(_SERVE_REPLY_TIMEOUT)
+        try:
+            with sock.makefile("rwb") as stream:
+                stream.write(json.dumps(request).encode() + b"\n")
+                stream.flush()
+                line = stream.readline()
+        except TimeoutError as e:
+            raise _ServeTimeout(str(e)) from e
+        except OSError as e:
+            raise _ServeConnectionLost(str(e)) from e
+    if not line:
+        raise _ServeConnectionLost("board server closed the connection")
+    return json.loads(line)
+
+
+def _serve_socket_for(root_arg: str | None) -> Path | None:
+    """root/.serve.sock for the board this invocation would use, if it exists.
+
+    Resolves the root the way get_root does, but finds the git root by
+    walking up for .git instead of running git. A GIT_DIR/GIT_WORK_TREE
+    override is left to git itself: no daemon.
+    """
+    if root_arg:
+        root = Path(root_arg)
+    elif root_env := os.environ.get("KANBAN_ROOT"):
+        root = Path(root_env)
+    elif os.environ.get("GIT_DIR") or os.environ.get("GIT_WORK_TREE"):
+        return None
+    else:
+        cwd = Path.cwd()
+        base_dir = next((d for d in (cwd, *cwd.parents) if (d / ".git").exists()), cwd)
+        root = base_dir / ".kanban"
+    socket_path = root / _SERVE_SOCKET_FILENAME
+    return socket_path if socket_path.exists() else None
+
+
+def _serve_client(argv: list[str]) -> int | None:
+    """Run argv on the board server. Returns the exit code, or None to run it directly."""
+    if os.environ.get("KANBAN_NO_SERVE") or sys.stdout.isatty():
+        return None
+    root_arg = None
+    if argv[:1] == ["--root"] and len(argv) > 1:
+        root_arg, argv = argv[1], argv[2:]
+    elif argv[:1] and argv[0].startswith("--root="):
+        root_arg, argv = argv[0][len("--root="):], argv[1:]
+    if not argv or argv[0] not in _SERVE_COMMANDS or "--watch" in argv or _serve_direct(argv[0], argv[1:]):
+        return None
+    socket_path = _serve_socket_for(root_arg)
+    if socket_path is None:
+        return None
+    params = {"args": argv[1:], "cwd": os.getcwd(), "env": dict(os.environ)}
+    try:
+        response = _serve_call(socket_path, argv[0], params)
+    except _ServeTimeout:
+        if argv[0] in _SERVE_READ_ONLY:
+            return None  # a read is safe to repeat: run it directly
+        print(
+            f"Error: kanban board server did not answer within {_SERVE_REPLY_TIMEOUT:g}s; "
+            "the command may or may not have run.",
+            file=sys.stderr,
+        )
+        return 1
+    except _ServeConnectionLost:
+        print("Error: kanban board server connection lost; the command may or may not have run.", file=sys.stderr)
+        return 1
+    except (OSError, json.JSONDecodeError):
+        # Unreachable (stale socket, server gone): nothing was sent.
+        return None
+    if "result" not in response:
+        # The server refused the request without running anything.
+        return None
+    result = response["result"]
+    sys.stdout.write(result.get("stdout", ""))
+    sys.stderr.write(result.get("stderr", ""))
+    return int(result.get("exit_code", 1))
+
+
+def cmd_serve(args) -> None:
+    """Run the board server for this board until interrupted."""
+    import signal
+
+    root = get_root(args.root)
+    socket_path = root / _SERVE_SOCKET_FILENAME
+    if len(os.fsencode(str(socket_path))) >= 104:
+        print(f"Error: socket path too long for a Unix socket: {socket_path}", file=sys.stderr)
+        sys.exit(1)
+    if socket_path.exists():
+        try:
+            _serve_call(socket_path, "ping")
+        except (OSError, _ServeConnectionLost, json.JSONDecodeError):
+            socket_path.unlink()  # stale: left behind by a server that died
+        else:
+            print(f"Error: a board server is already running on {socket_path}", file=sys.stderr)
+            sys.exit(1)
+
+    server = BoardServer(root)
+    signal.signal(signal.SIGTERM, lambda *_: server.stop())
+    print(f"Serving {root} on {socket_path} (pid {os.getpid()})", file=sys.stderr)
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+
+
 # =============================================================================
 # Argparse setup
 # =============================================================================
 
-def add_session_flags(parser: argparse.ArgumentParser) -> None:
-    """Add common session filtering flags to a parser."""
+def add_session_flags(parser) -> None:
+    """Add common session filtering flags to an argparse parser."""
     parser.add_argument("--session", help="Filter by session ID")
     parser.add_argument("--only-mine", action="store_true", dest="only_mine", help="Show only current session's cards")
     parser.add_argument("--show-mine", action="store_true", dest="show_mine", help="Show mine (override KANBAN_HIDE_MINE)")
     parser.add_argument("--hide-mine", action="store_true", dest="hide_mine", help="Hide current session's cards")
 
 
-def add_date_flags(parser: argparse.ArgumentParser) -> None:
-    """Add common date filtering flags."""
+def add_date_flags(parser) -> None:
+    """Add common date filtering flags to an argparse parser."""
     parser.add_argument("--since", help="Filter by date (today, yesterday, week, month, or ISO)")
     parser.add_argument("--until", help="Filter until date (ISO format)")
 
 
-def main() -> None:
+# ---------------------------------------------------------------------------
+# Fast-path dispatch
+#
+# Building the full argparse tree (and importing argparse) costs more than
+# most hot commands themselves. The commands sub-agents and hooks run
+# constantly have a grammar small enough to parse by hand: positionals, the
+# session flags, and a leading --root. _fast_parse() recognizes exactly that
+# grammar and returns the same Namespace attributes argparse would; anything
+# else — help, --watch, an abbreviated or unknown flag, a wrong argument
+# count, a value starting with "-" — returns None and goes through the full
+# parser, so errors and help text are unchanged.
+# ---------------------------------------------------------------------------
+
+# command -> (min positionals, max positionals, positional names, extra defaults)
+_FAST_PATH_COMMANDS = {
+    "status": (1, 1, ("card",), {}),
+    "show": (1, 1, ("card",), {"output_style": "xml"}),
+    "done": (1, None, ("card",), {"message": None}),
+    "check": (2, None, ("card", "n"), {}),
+    "uncheck": (2, None, ("card", "n"), {}),
+}
+_FAST_PATH_SESSION_SWITCHES = {"--only-mine": "only_mine", "--show-mine": "show_mine", "--hide-mine": "hide_mine"}
+_FAST_PATH_SHOW_STYLES = ("simple", "xml", "detail")
+
+
+def _fast_parse(argv: list[str]):
+    """Parse argv for a hot command without argparse, or return None."""
+    from types import SimpleNamespace
+
+    root = None
+    if argv[:1] == ["--root"] and len(argv) > 1 and not argv[1].startswith("-"):
+        root, argv = argv[1], argv[2:]
+    elif argv[:1] and argv[0].startswith("--root="):
+        root, argv = argv[0][len("--root="):], argv[1:]
+    if not argv:
+        return None
+
+    command, rest = argv[0], argv[1:]
+    ns = {"root": root, "command": command}
+    if command in ("criteria", "ac"):
+        if not rest or rest[0] not in ("check", "uncheck"):
+            return None
+        ns["criteria_command"], rest = rest[0], rest[1:]
+        spec = _FAST_PATH_COMMANDS[ns["criteria_command"]]
+    elif command in ("status", "show", "done"):
+        spec = _FAST_PATH_COMMANDS[command]
+    else:
+        return None
+    min_pos, max_pos, names, defaults = spec
+
+    ns.update(watch=False, debounce=None, session=None, only_mine=False, show_mine=False, hide_mine=False)
+    ns.update(defaults)
+    positionals = []
+    tokens = iter(rest)
+    for token in tokens:
+        if not token.startswith("-") or token == "-":
+            positionals.append(token)
+            continue
+        flag, has_value, value = token.partition("=")
+        if flag in _FAST_PATH_SESSION_SWITCHES and not has_value:
+            ns[_FAST_PATH_SESSION_SWITCHES[flag]] = True
+            continue
+        if flag == "--session" or (flag == "--output-style" and command == "show"):
+            if not has_value:
+                value = next(tokens, None)
+                if value is None or value.startswith("-"):
+                    return None
+            if flag == "--output-style" and value not in _FAST_PATH_SHOW_STYLES:
+                return None
+            ns[flag[2:].replace("-", "_")] = value
+            continue
+        return None
+
+    if len(positionals) < min_pos or (max_pos is not None and len(positionals) > max_pos):
+        return None
+    if max_pos is None and len(names) == 1:
+        ns[names[0]] = positionals
+    elif max_pos is None:
+        ns[names[0]], ns[names[1]] = positionals[0], positionals[1:]
+    else:
+        ns.update(zip(names, positionals))
+    return SimpleNamespace(**ns)
+
+
+def _build_parser():
+    """The full argparse command tree."""
+    import argparse
+
     parent_parser = argparse.ArgumentParser(add_help=False)
     parent_parser.add_argument("--watch", action="store_true", help="Auto-refresh on .kanban/ changes")
+    parent_parser.add_argument("--debounce", type=int, default=None, metavar="MS", help=f"With --watch: coalesce changes for MS milliseconds before refreshing (default: $KANBAN_WATCH_DEBOUNCE_MS or {_WATCH_DEFAULT_DEBOUNCE_MS})")
 
     parser = argparse.ArgumentParser(
         description="Kanban CLI — JSON-based kanban board for agent coordination",
@@ -5867,18 +8490,18 @@ def main() -> None:
 
     # --- cancel ---
     p_cancel = subparsers.add_parser("cancel", parents=[parent_parser], help="Move card(s) to canceled column")
-    p_cancel.add_argument("card", nargs="+", help="Card number(s)")
+    p_cancel.add_argument("card", nargs="+", help="Card number(s), ranges (4-9) or lists (3,5), then an optional reason")
     p_cancel.add_argument("--reason", default=None, help="Optional cancellation reason (applies to all cards)")
     add_session_flags(p_cancel)
 
     # --- defer ---
     p_defer = subparsers.add_parser("defer", parents=[parent_parser], help="Move card(s) from doing back to todo")
-    p_defer.add_argument("card", nargs="+", help="Card number(s)")
+    p_defer.add_argument("card", nargs="+", help="Card number(s), ranges (4-9) or lists (3,5)")
     add_session_flags(p_defer)
 
     # --- start ---
     p_start = subparsers.add_parser("start", parents=[parent_parser], help="Move card(s) from todo to doing")
-    p_start.add_argument("card", nargs="+", help="Card number(s)")
+    p_start.add_argument("card", nargs="+", help="Card number(s), ranges (4-9) or lists (3,5)")
     p_start.add_argument("--force", action="store_true", default=False, help="Bypass editFiles overlap check; sets forced=true on card for audit trail")
     add_session_flags(p_start)
 
@@ -5933,6 +8556,7 @@ def main() -> None:
         p_list.add_argument("--show-canceled", action="store_true", help="Include canceled")
         p_list.add_argument("--show-all", action="store_true", help="Include done + canceled")
         p_list.add_argument("--output-style", choices=["simple", "xml", "detail"], default="xml", help="Output style: xml (structured XML, default), simple (title only), detail (everything). Note: --watch always forces simple regardless of this flag.")
+        p_list.add_argument("--changed-since", dest="changed_since", type=int, metavar="GEN", help="Only cards added, moved or modified after board generation GEN (from <board generation=...>)")
         add_session_flags(p_list)
         add_date_flags(p_list)
 
@@ -5942,9 +8566,9 @@ def main() -> None:
     p_todo.add_argument("--file", dest="json_file", metavar="PATH", help="Read card JSON from file instead of inline argument")
     add_session_flags(p_todo)
 
-    p_done = subparsers.add_parser("done", parents=[parent_parser], help="Move card to done")
-    p_done.add_argument("card", help="Card number")
-    p_done.add_argument("message", nargs="?", default=None, help="Completion message")
+    p_done = subparsers.add_parser("done", parents=[parent_parser], help="Move card(s) to done")
+    p_done.add_argument("card", nargs="+", help="Card number(s), ranges (4-9) or lists (3,5), then an optional completion message")
+    p_done.add_argument("-m", "--message", default=None, help="Completion message (applies to all cards)")
     add_session_flags(p_done)
 
     # --- report ---
@@ -5953,18 +8577,31 @@ def main() -> None:
     p_report.add_argument("--to", dest="to_date", help="End date (YYYY-MM-DD, inclusive)")
     p_report.add_argument("--output-style", choices=["human", "xml"], default="human", help="Output format: human (default, readable), xml (structured for parsing)")
 
+    # --- search ---
+    p_search = subparsers.add_parser("search", parents=[parent_parser], help="Full-text search across all cards, including archive")
+    p_search.add_argument("query", nargs="+", help="Search terms (all must match; trailing * for prefix)")
+    p_search.add_argument("--column", action="append", help=f"Filter location(s): {', '.join(SEARCH_COLUMNS)}")
+    p_search.add_argument("--session", help="Filter by session")
+    p_search.add_argument("--type", help="Filter by card type (work, review, research)")
+    add_date_flags(p_search)
+    p_search.add_argument("--limit", type=int, default=20, help="Maximum results (default: 20)")
+    p_search.add_argument("--rebuild", action="store_true", help="Rebuild the search index from the card files")
+    p_search.add_argument("--output-style", choices=["simple", "xml"], default="xml", help="Output style: xml (default), simple")
+
+    # --- serve ---
+    subparsers.add_parser("serve", parents=[parent_parser], help="Run a board server: list/show/criteria/transitions over a Unix socket")
+
     # --- clean ---
     p_clean = subparsers.add_parser("clean", parents=[parent_parser], help="Delete cards with user confirmation")
     p_clean.add_argument("column", nargs="?", default=None, help="Column to clean (doing, todo, done, canceled)")
     p_clean.add_argument("--expunge", action="store_true", help="Also delete scratchpad contents (only with full clean)")
 
-    args = parser.parse_args()
+    return parser
 
-    if not args.command:
-        parser.print_help()
-        sys.exit(0)
 
-    commands = {
+def _command_table() -> dict:
+    """Command name -> handler, shared by main() and the board server."""
+    return {
         "init": cmd_init,
         "session-hook": cmd_session_hook,
         "do": cmd_do,
@@ -5982,12 +8619,29 @@ def main() -> None:
         "rejections": cmd_rejections,
         "rename": cmd_rename,
         "report": cmd_report,
+        "search": cmd_search,
         "clean": cmd_clean,
         "criteria": cmd_criteria_dispatch,
         "ac": cmd_criteria_dispatch,
+        "serve": cmd_serve,
     }
 
-    command_func = commands[args.command]
+
+def main() -> None:
+    served = _serve_client(sys.argv[1:])
+    if served is not None:
+        sys.exit(served)
+
+    args = _fast_parse(sys.argv[1:])
+    if args is None:
+        parser = _build_parser()
+        args = parser.parse_args()
+
+        if not args.command:
+            parser.print_help()
+            sys.exit(0)
+
+    command_func = _command_table()[args.command]
 
     if getattr(args, "watch", False):
         watch_and_run(args, command_func)
@@ -0,0 +1,200 @@
+"""
+Tests for `kanban report` and throughput metrics over archive months.
+
+Covers:
+- auto_archive_old_cards writes a per-month summary beside the month dir
+- report includes archived cards, with their completion comments
+- months outside --from/--to are pruned on their summary header alone
+- a summary gone stale (month dir changed since) is rebuilt
+- months archived before summaries existed get one on first read
+- throughput counts archived cards and their lead times
+"""
+
+import importlib.util
+import json
+import sys
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+from types import SimpleNamespace
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+
+# ---------------------------------------------------------------------------
+# Module loader
+# ---------------------------------------------------------------------------
+
+_KANBAN_PATH = Path(__file__).parent.parent / "kanban.py"
+
+
+def load_kanban():
+    """Import kanban.py as a module with watchdog stubbed out."""
+    watchdog_stub = MagicMock()
+    sys.modules.setdefault("watchdog", watchdog_stub)
+    sys.modules.setdefault("watchdog.observers", watchdog_stub)
+    sys.modules.setdefault("watchdog.events", watchdog_stub)
+    watchdog_stub.events.FileSystemEventHandler = object
+
+    spec = importlib.util.spec_from_file_location("kanban_archive_report", _KANBAN_PATH)
+    mod = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(mod)
+    return mod
+
+
+@pytest.fixture(scope="module")
+def kanban():
+    return load_kanban()
+
+
+# ---------------------------------------------------------------------------
+# Helpers
+# ---------------------------------------------------------------------------
+
+def _setup_board(tmp_path):
+    """Create minimal kanban board directory structure."""
+    for col in ("todo", "doing", "done", "canceled", "archive"):
+        (tmp_path / col).mkdir(parents=True, exist_ok=True)
+    return tmp_path
+
+
+def _iso(dt):
+    return dt.strftime("%Y-%m-%dT%H:%M:%SZ")
+
+
+def _done_card(kanban, path, action, completed, comment="Shipped"):
+    created = completed - timedelta(hours=2)
+    kanban.write_card(path, {
+        "action": action, "intent": f"Why {action}", "type": "work", "session": "s",
+        "criteria": [], "created": _iso(created), "updated": _iso(completed),
+        "activity": [
+            {"timestamp": _iso(created), "message": "Created"},
+            {"timestamp": _iso(completed), "message": comment},
+        ],
+    })
+
+
+def _report(kanban, board, from_date=None, to_date=None):
+    kanban.cmd_report(SimpleNamespace(
+        root=str(board), output_style="xml", from_date=from_date, to_date=to_date,
+    ))
+
+
+# ---------------------------------------------------------------------------
+# Tests: summaries written at archive time
+# ---------------------------------------------------------------------------
+
+class TestArchiveSummary:
+    def test_auto_archive_writes_month_summary(self, kanban, tmp_path):
+        board = _setup_board(tmp_path)
+        completed = datetime(2025, 3, 10, 12, tzinfo=timezone.utc)
+        _done_card(kanban, board / "done" / "1.json", "Old work", completed)
+        _done_card(kanban, board / "done" / "2.json", "Older work", completed - timedelta(days=5))
+
+        kanban.auto_archive_old_cards(board)
+
+        lines = (board / "archive" / "2025-03.summary").read_text().splitlines()
+        header = json.loads(lines[0])
+        assert header["count"] == 2
+        assert header["first"] == "2025-03-05T12:00:00Z"
+        assert header["last"] == "2025-03-10T12:00:00Z"
+        assert header["lead_time_count"] == 2 and header["lead_time_sum"] == 2 * 7200
+        assert header["dir_mtime_ns"] == (board / "archive" / "2025-03").stat().st_mtime_ns
+        assert [json.loads(l)["n"] for l in lines[1:]] == ["1", "2"]
+
+    def test_later_archive_run_extends_summary(self, kanban, tmp_path):
+        board = _setup_board(tmp_path)
+        completed = datetime(2025, 3, 10, 12, tzinfo=timezone.utc)
+        _done_card(kanban, board / "done" / "1.json", "First", completed)
+        kanban.auto_archive_old_cards(board)
+        _done_card(kanban, board / "done" / "2.json", "Second", completed + timedelta(days=1))
+
+        with patch.object(kanban, "_rebuild_archive_summary", side_effect=AssertionError("rebuilt")):
+            kanban.auto_archive_old_cards(board)
+
+        header, entries = kanban.read_archive_summary(board, "2025-03")
+        assert header["count"] == 2
+        assert [e["action"] for e in entries] == ["First", "Second"]
+
+    def test_stale_summary_is_rebuilt(self, kanban, tmp_path):
+        board = _setup_board(tmp_path)
+        completed = datetime(2025, 3, 10, 12, tzinfo=timezone.utc)
+        _done_card(kanban, board / "done" / "1.json", "Archived", completed)
+        kanban.auto_archive_old_cards(board)
+
+        # Rewriting an archived card renames inside the month dir.
+        card = kanban.read_card(board / "archive" / "2025-03" / "1.json")
+        card["action"] = "Renamed after archiving"
+        kanban.write_card(board / "archive" / "2025-03" / "1.json", card)
+
+        _, entries = kanban.read_archive_summary(board, "2025-03")
+        assert entries[0]["action"] == "Renamed after archiving"
+
+    def test_pre_summary_month_gets_one_on_first_read(self, kanban, tmp_path):
+        board = _setup_board(tmp_path)
+        (board / "archive" / "2024-11").mkdir()
+        _done_card(kanban, board / "archive" / "2024-11" / "7.json", "Legacy",
+                   datetime(2024, 11, 2, tzinfo=timezone.utc))
+
+        header, _ = kanban.read_archive_summary(board, "2024-11", header_only=True)
+
+        assert header["count"] == 1
+        assert (board / "archive" / "2024-11.summary").exists()
+        assert kanban.find_card(board, "7") == board / "archive" / "2024-11" / "7.json"
+
+
+# ---------------------------------------------------------------------------
+# Tests: report and throughput
+# ---------------------------------------------------------------------------
+
+class TestReportOverArchive:
+    def test_report_includes_archived_cards(self, kanban, tmp_path, capsys):
+        board = _setup_board(tmp_path)
+        _done_card(kanban, board / "done" / "1.json", "Recent work", datetime.now(timezone.utc))
+        _done_card(kanban, board / "done" / "2.json", "Archived work",
+                   datetime(2025, 3, 10, tzinfo=timezone.utc), comment="Merged upstream")
+        kanban.auto_archive_old_cards(board)
+
+        _report(kanban, board)
+
+        out = capsys.readouterr().out
+        assert "Recent work" in out and "Archived work" in out
+        assert '<card num="2" completed="2025-03-10">' in out
+        assert "<comment>Merged upstream</comment>" in out
+
+    def test_months_outside_window_are_pruned(self, kanban, tmp_path, capsys):
+        board = _setup_board(tmp_path)
+        for num, month in enumerate((1, 2, 3, 4), start=1):
+            _done_card(kanban, board / "done" / f"{num}.json", f"Month {month}",
+                       datetime(2025, month, 15, tzinfo=timezone.utc))
+        kanban.auto_archive_old_cards(board)
+
+        real = kanban._read_archive_summary_file
+        full_reads = []
+
+        def spy(root, month, header_only):
+            if not header_only:
+                full_reads.append(month)
+            return real(root, month, header_only)
+
+        with patch.object(kanban, "read_card_fields", side_effect=AssertionError("card read")), \
+                patch.object(kanban, "_read_archive_summary_file", side_effect=spy):
+            _report(kanban, board, from_date="2025-03-01", to_date="2025-03-31")
+
+        out = capsys.readouterr().out
+        assert "Month 3" in out
+        assert "Month 1" not in out and "Month 2" not in out and "Month 4" not in out
+        assert full_reads == ["2025-03"]
+
+    def test_throughput_counts_archive(self, kanban, tmp_path):
+        board = _setup_board(tmp_path)
+        _done_card(kanban, board / "done" / "1.json", "Today", datetime.now(timezone.utc))
+        _done_card(kanban, board / "done" / "2.json", "Archived",
+                   datetime(2025, 3, 10, tzinfo=timezone.utc))
+        kanban.auto_archive_old_cards(board)
+
+        metrics = kanban.calculate_throughput_metrics(board)
+
+        assert metrics["cards_all_time"] == 2
+        assert metrics["cards_today"] == 1
+        assert metrics["avg_lead_time_seconds"] == 7200
@@ -0,0 +1,196 @@
+"""
+Tests for the batch card-creation pipeline shared by `kanban do` / `kanban todo`
+(_create_cards_from_json in kanban.py).
+
+Covers:
+- Identifier-existence search runs ONE rg pass for every card in an array
+- A mov_commands chain repeated across cards is pre-passed once per batch
+- New cards conflict-check against earlier cards of the same batch
+- Card numbers are allocated contiguously under the board lock
+- Validation is all-or-nothing: an invalid card means no card is written
+- _identifiers_existing_in_repo agrees with the per-identifier check
+"""
+
+import importlib.util
+import json
+import subprocess
+import sys
+from pathlib import Path
+from types import SimpleNamespace
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+
+# ---------------------------------------------------------------------------
+# Module loader
+# ---------------------------------------------------------------------------
+
+_KANBAN_PATH = Path(__file__).parent.parent / "kanban.py"
+
+
+def load_kanban():
+    """Import kanban.py as a module with watchdog stubbed out."""
+    watchdog_stub = MagicMock()
+    sys.modules.setdefault("watchdog", watchdog_stub)
+    sys.modules.setdefault("watchdog.observers", watchdog_stub)
+    sys.modules.setdefault("watchdog.events", watchdog_stub)
+    watchdog_stub.events.FileSystemEventHandler = object
+
+    spec = importlib.util.spec_from_file_location("kanban_batch_create", _KANBAN_PATH)
+    mod = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(mod)
+    return mod
+
+
+@pytest.fixture(scope="module")
+def kanban():
+    return load_kanban()
+
+
+# ---------------------------------------------------------------------------
+# Helpers
+# ---------------------------------------------------------------------------
+
+def _setup_board(tmp_path):
+    """Create minimal kanban board directory structure."""
+    for col in ("todo", "doing", "done", "canceled"):
+        (tmp_path / col).mkdir(parents=True, exist_ok=True)
+    return tmp_path
+
+
+def _card(action, edit_files, cmd="true", column=None):
+    card = {
+        "action": action,
+        "intent": "Because",
+        "type": "work",
+        "editFiles": edit_files,
+        "criteria": [{
+            "text": "check",
+            "mov_type": "programmatic",
+            "mov_commands": [{"cmd": cmd, "timeout": 5}],
+        }],
+    }
+    if column is not None:
+        card["column"] = column
+    return card
+
+
+def _args(board, cards):
+    return SimpleNamespace(
+        root=str(board), json_data=json.dumps(cards), json_file=None, session="s", force=False,
+    )
+
+
+def _cards_in(board, column):
+    return sorted(int(p.stem) for p in (board / column).glob("*.json"))
+
+
+# ---------------------------------------------------------------------------
+# Tests
+# ---------------------------------------------------------------------------
+
+class TestBatchValidation:
+    def test_identifier_search_is_one_rg_pass(self, kanban, tmp_path):
+        board = _setup_board(tmp_path)
+        cards = [_card(f"Touch `helper_{i}`", [f"lib/{i}.py"]) for i in range(5)]
+        rg_calls = []
+
+        def fake_run(cmd, *a, **kw):
+            if cmd and cmd[0] == "rg":
+                rg_calls.append(cmd)
+                patterns = [cmd[i + 1] for i, tok in enumerate(cmd) if tok == "-e"]
+                return subprocess.CompletedProcess(cmd, 0, stdout="\n".join(patterns), stderr="")
+            return subprocess.CompletedProcess(cmd, 1, stdout="", stderr="")
+
+        with patch.object(kanban, "write_kanban_event"), \
+                patch.object(kanban, "get_git_root", return_value=None), \
+                patch.object(kanban, "_mov_prepass_run_criterion", return_value=False), \
+                patch.object(kanban.subprocess, "run", side_effect=fake_run):
+            kanban.cmd_todo(_args(board, cards))
+
+        assert len(rg_calls) == 1
+        assert _cards_in(board, "todo") == [1, 2, 3, 4, 5]
+
+    def test_repeated_mov_chain_is_prepassed_once(self, kanban, tmp_path):
+        board = _setup_board(tmp_path)
+        cards = [_card(f"Card {i}", [f"lib/{i}.py"], cmd="pytest -q") for i in range(4)]
+
+        with patch.object(kanban, "write_kanban_event"), \
+                patch.object(kanban, "warn_unmatched_card_identifiers"), \
+                patch.object(kanban, "_mov_prepass_run_criterion", return_value=False) as prepass:
+            kanban.cmd_todo(_args(board, cards))
+
+        assert prepass.call_count == 1
+
+    def test_invalid_card_means_nothing_is_written(self, kanban, tmp_path):
+        board = _setup_board(tmp_path)
+        bad = _card("Bad", ["lib/b.py"])
+        del bad["intent"]
+        cards = [_card("Good", ["lib/a.py"]), bad]
+
+        with patch.object(kanban, "write_kanban_event"), \
+                patch.object(kanban, "warn_unmatched_card_identifiers"), \
+                patch.object(kanban, "_mov_prepass_run_criterion", return_value=False), \
+                pytest.raises(SystemExit):
+            kanban.cmd_do(_args(board, cards))
+
+        assert _cards_in(board, "todo") == []
+        assert _cards_in(board, "doing") == []
+
+
+class TestBatchPlacement:
+    def test_sibling_edit_files_conflict_defers_later_card(self, kanban, tmp_path, capsys):
+        board = _setup_board(tmp_path)
+        cards = [
+            _card("First", ["src/*.ts"]),
+            _card("Second", ["src/foo.ts"]),
+            _card("Third", ["docs/readme.md"]),
+        ]
+
+        with patch.object(kanban, "write_kanban_event"), \
+                patch.object(kanban, "warn_unmatched_card_identifiers"), \
+                patch.object(kanban, "_mov_prepass_run_criterion", return_value=False), \
+                pytest.raises(SystemExit) as exc:
+            kanban.cmd_do(_args(board, cards))
+
+        assert exc.value.code == 1
+        assert _cards_in(board, "doing") == [1, 3]
+        assert _cards_in(board, "todo") == [2]
+        assert "src/foo.ts" in capsys.readouterr().err
+
+    def test_numbers_are_contiguous_after_existing_cards(self, kanban, tmp_path, capsys):
+        board = _setup_board(tmp_path)
+        (board / "done" / "41.json").write_text(json.dumps({"action": "old"}))
+        cards = [
+            _card("A", ["lib/a.py"]),
+            _card("B", ["lib/b.py"], column="todo"),
+            _card("C", ["lib/c.py"]),
+        ]
+
+        with patch.object(kanban, "write_kanban_event"), \
+                patch.object(kanban, "warn_unmatched_card_identifiers"), \
+                patch.object(kanban, "_mov_prepass_run_criterion", return_value=False):
+            kanban.cmd_do(_args(board, cards))
+
+        assert _cards_in(board, "doing") == [42, 44]
+        assert _cards_in(board, "todo") == [43]
+        assert capsys.readouterr().out.split() == ["42", "43", "44"]
+        assert (board / ".lock").exists()
+
+
+class TestIdentifiersExistingInRepo:
+    def test_matches_per_identifier_check(self, kanban, tmp_path, monkeypatch):
+        (tmp_path / "mod.py").write_text("def alpha_helper():\n    return beta_thing\n")
+        monkeypatch.chdir(tmp_path)
+        idents = ["alpha_helper", "betaThing", "missing_gamma"]
+
+        with patch.object(kanban, "get_git_root", return_value=tmp_path):
+            batch = kanban._identifiers_existing_in_repo(idents)
+            single = {i for i in idents if kanban._identifier_exists_in_repo(i)}
+
+        assert batch == single == {"alpha_helper", "betaThing"}
+
+    def test_fails_open_when_rg_is_missing(self, kanban):
+        with patch.object(kanban.subprocess, "run", side_effect=FileNotFoundError):
+            assert kanban._identifiers_existing_in_repo(["x_y"]) == {"x_y"}
@@ -0,0 +1,177 @@
+"""
+Tests for the benchmark harness (benchmarks/bench_suite.py).
+
+Covers:
+- A tiny end-to-end run produces timings for every benchmark, and each
+  mutating benchmark actually performed its command (no silent SystemExit)
+- A command that exits non-zero or raises is recorded as a failure, not a
+  timing, and the fixture board is written by the revision under test
+- A revision without _build_parser has its arguments parsed through its own
+  main(), and a setup that fails is recorded rather than crashing the run
+- compare_results flags only slowdowns above both the relative threshold and
+  the absolute minimum delta, skipping benchmarks that failed on either side
+"""
+
+import importlib.util
+import sys
+import textwrap
+from pathlib import Path
+from unittest.mock import MagicMock
+
+import pytest
+
+
+# ---------------------------------------------------------------------------
+# Module loader
+# ---------------------------------------------------------------------------
+
+_KANBAN_PATH = Path(__file__).parent.parent / "kanban.py"
+_BENCH_PATH = Path(__file__).parent.parent / "benchmarks" / "bench_suite.py"
+
+
+def load_kanban():
+    """Import kanban.py as a module with watchdog stubbed out."""
+    watchdog_stub = MagicMock()
+    sys.modules.setdefault("watchdog", watchdog_stub)
+    sys.modules.setdefault("watchdog.observers", watchdog_stub)
+    sys.modules.setdefault("watchdog.events", watchdog_stub)
+    watchdog_stub.events.FileSystemEventHandler = object
+
+    spec = importlib.util.spec_from_file_location("kanban_bench_suite_test", _KANBAN_PATH)
+    mod = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(mod)
+    return mod
+
+
+def load_bench():
+    spec = importlib.util.spec_from_file_location("bench_suite", _BENCH_PATH)
+    mod = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(mod)
+    return mod
+
+
+@pytest.fixture(scope="module")
+def kanban():
+    return load_kanban()
+
+
+@pytest.fixture(scope="module")
+def bench():
+    return load_bench()
+
+
+# ---------------------------------------------------------------------------
+# Tests
+# ---------------------------------------------------------------------------
+
+class TestRunSuite:
+    def test_small_board_times_every_benchmark(self, kanban, bench):
+        data = bench.run_suite(kanban, [30], repeat=1)
+        timings = data["results"]["30"]
+        assert set(timings) == set(bench.BENCHMARKS)
+        assert all(t["best_ms"] > 0 for t in timings.values())
+
+    def test_mutating_benchmarks_do_their_work(self, kanban, bench, tmp_path, monkeypatch):
+        monkeypatch.chdir(tmp_path)
+        monkeypatch.setattr(kanban, "_METRICS_DB_PATH", tmp_path / "claudit.db")
+        board = bench._Board(kanban, tmp_path / ".kanban", 30)
+        steps = bench._benchmark_steps(kanban, board)
+        root = board.root
+
+        before = {col: len(list((root / col).glob("*.json"))) for col in ("doing", "done")}
+        archived = len(list((root / "archive").rglob("*.json")))
+        for name in ("do", "done", "criteria_check"):
+            setup, run = steps[name]
+            run(setup())
+        setup, run = steps["auto_archive"]
+        run(setup())
+
+        assert len(list((root / "doing").glob("*.json"))) == before["doing"] + 2  # do + checked card
+        assert len(list((root / "done").glob("*.json"))) == before["done"] + 1
+        assert len(list((root / "archive").rglob("*.json"))) == archived + 3  # size // 10 stale cards
+
+
+class TestFailures:
+    def test_failing_command_is_recorded_not_timed(self, kanban, bench, monkeypatch):
+        def refuse(args):
+            print("Error: refused", file=sys.stderr)
+            sys.exit(1)
+
+        monkeypatch.setattr(kanban, "cmd_show", refuse)
+        monkeypatch.setattr(kanban, "cmd_report", lambda args: sys.exit(0))
+        data = bench.run_suite(kanban, [10], repeat=2, only={"show", "report"})
+
+        assert data["results"]["10"]["show"] == {"failed": "exit 1: Error: refused"}
+        assert "best_ms" in data["results"]["10"]["report"]
+        assert bench.failed_benchmarks(data) == ["10/show"]
+
+    def test_fixture_cards_go_through_the_revision_write_card(self, kanban, bench, tmp_path, monkeypatch):
+        written = []
+        monkeypatch.setattr(kanban, "write_card", lambda path, card: written.append((path, card)))
+        bench.generate_board(kanban, tmp_path, 5)
+        assert len(written) == 5
+        assert all("activity" in card for _, card in written)
+
+
+class TestCompare:
+    def _data(self, **timings):
+        return {"results": {"100": {name: {"best_ms": ms, "median_ms": ms} for name, ms in timings.items()}}}
+
+    def test_flags_only_real_regressions(self, bench):
+        baseline = self._data(list_xml=10.0, show=1.0, report=50.0)
+        current = self._data(list_xml=14.0, show=1.9, report=52.0, done=3.0)
+        rows = {r["name"]: r for r in bench.compare_results(baseline, current, 0.25, 2.0)}
+        assert rows["list_xml"]["regressed"]          # +40%, +4ms
+        assert not rows["show"]["regressed"]          # +90% but under 2ms
+        assert not rows["report"]["regressed"]        # +4%
+        assert "done" not in rows                     # no baseline
+
+    def test_failed_benchmarks_are_not_compared(self, bench):
+        baseline = {"results": {"100": {"show": {"failed": "exit 1"}, "report": {"best_ms": 5.0, "median_ms": 5.0}}}}
+        current = {"results": {"100": {"show": {"best_ms": 1.0, "median_ms": 1.0}, "report": {"failed": "exit 1"}}}}
+        assert bench.compare_results(baseline, current, 0.25, 2.0) == []
+
+
+# A revision from before _build_parser: the argparse tree lives in main(),
+# which dispatches through a dict of cmd_* functions.
+_OLD_STYLE_KANBAN = textwrap.dedent("""
+    import argparse
+
+    def cmd_show(args):
+        raise AssertionError("really ran the command")
+
+    def main():
+        parser = argparse.ArgumentParser()
+        parser.add_argument("--root")
+        sub = parser.add_subparsers(dest="command")
+        p_show = sub.add_parser("show")
+        p_show.add_argument("card")
+        p_show.add_argument("--output-style", default="xml")
+        args = parser.parse_args()
+        {"show": cmd_show}[args.command](args)
+""")
+
+
+class TestOlderRevisions:
+    def test_arguments_are_parsed_through_main(self, bench, tmp_path):
+        path = tmp_path / "kanban_old.py"
+        path.write_text(_OLD_STYLE_KANBAN)
+        old = bench.load_kanban(path)
+        original = old.cmd_show
+
+        args = bench._cli(old, tmp_path, "show", "7")
+
+        assert (args.command, args.card, args.output_style, args.root) == ("show", "7", "xml", str(tmp_path))
+        assert old.cmd_show is original
+
+    def test_setup_failure_is_recorded(self, kanban, bench, monkeypatch):
+        def reject():
+            print("kanban: error: unrecognized arguments", file=sys.stderr)
+            sys.exit(2)
+
+        monkeypatch.delattr(kanban, "_build_parser")
+        monkeypatch.setattr(kanban, "main", reject)
+        data = bench.run_suite(kanban, [10], repeat=2, only={"show", "auto_archive_noop"})
+
+        assert data["results"]["10"]["show"] == {"failed": "setup: exit 2: kanban: error: unrecognized arguments"}
+        assert "best_ms" in data["results"]["10"]["auto_archive_noop"]
@@ -0,0 +1,257 @@
+"""
+Tests for bulk transitions: `kanban done/cancel/defer/start` over card lists
+and ranges.
+
+Covers:
+- parse_card_refs expands numbers, #refs, ranges and comma lists, keeps
+  order, de-duplicates, and rejects reversed or oversized ranges
+- the fast path and argparse agree on the new `done` argument shape
+- done / cancel / defer move every card and take a trailing message/reason;
+  `done N <message>` keeps its single-card meaning even for a numeric message
+- a failing card does not stop the group; exit statuses 0 / 1 / 2 / 3
+- one batched metrics write per invocation, under one board lock
+"""
+
+import importlib.util
+import sqlite3
+import sys
+from contextlib import contextmanager
+from pathlib import Path
+from types import SimpleNamespace
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+
+# ---------------------------------------------------------------------------
+# Module loader
+# ---------------------------------------------------------------------------
+
+_KANBAN_PATH = Path(__file__).parent.parent / "kanban.py"
+
+
+def load_kanban():
+    """Import kanban.py as a module with watchdog stubbed out."""
+    watchdog_stub = MagicMock()
+    sys.modules.setdefault("watchdog", watchdog_stub)
+    sys.modules.setdefault("watchdog.observers", watchdog_stub)
+    sys.modules.setdefault("watchdog.events", watchdog_stub)
+    watchdog_stub.events.FileSystemEventHandler = object
+
+    spec = importlib.util.spec_from_file_location("kanban_bulk_transitions", _KANBAN_PATH)
+    mod = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(mod)
+    return mod
+
+
+@pytest.fixture(scope="module")
+def kanban():
+    return load_kanban()
+
+
+# ---------------------------------------------------------------------------
+# Helpers
+# ---------------------------------------------------------------------------
+
+@pytest.fixture
+def board(kanban, tmp_path, monkeypatch):
+    monkeypatch.setattr(kanban, "_METRICS_DB_PATH", tmp_path / "claudit.db")
+    monkeypatch.setattr(kanban, "get_git_root", lambda: None)
+    root = tmp_path / ".kanban"
+    for col in ("todo", "doing", "done", "canceled"):
+        (root / col).mkdir(parents=True)
+    return root
+
+
+def _add_card(kanban, root, col, num, criteria_met=None, cycles=0):
+    card = kanban.make_card(action=f"Card {num}", intent="Because", edit_files=[f"src/{num}.py"], session="s")
+    if criteria_met is not None:
+        card["criteria"] = [{"text": "works", "met": criteria_met}]
+    if cycles:
+        card["cycles"] = cycles
+    kanban.write_card(root / col / f"{num}.json", card)
+
+
+def _columns(root):
+    return {col: sorted(p.stem for p in (root / col).glob("*.json"))
+            for col in ("todo", "doing", "done", "canceled")}
+
+
+def _events(tmp_path):
+    conn = sqlite3.connect(str(tmp_path / "claudit.db"))
+    try:
+        return conn.execute(
+            "SELECT card_number, event_type FROM kanban_card_events ORDER BY id"
+        ).fetchall()
+    finally:
+        conn.close()
+
+
+def _exit_code(fn, args):
+    try:
+        fn(args)
+    except SystemExit as exc:
+        return exc.code
+    return 0
+
+
+# ---------------------------------------------------------------------------
+# Tests: card reference parsing
+# ---------------------------------------------------------------------------
+
+class TestParseCardRefs:
+    @pytest.mark.parametrize("tokens, expected", [
+        (["7"], ["7"]),
+        (["#7", "3"], ["7", "3"]),
+        (["4-6"], ["4", "5", "6"]),
+        (["4..6", "5"], ["4", "5", "6"]),
+        (["3,5,8-9"], ["3", "5", "8", "9"]),
+        (["007"], ["7"]),
+        (["abc"], ["abc"]),
+    ])
+    def test_expansion(self, kanban, tokens, expected):
+        assert kanban.parse_card_refs(tokens) == expected
+
+    @pytest.mark.parametrize("token", ["9-4", "1-5000"])
+    def test_bad_ranges_exit_before_any_card(self, kanban, token, capsys):
+        with pytest.raises(SystemExit) as exc:
+            kanban.parse_card_refs([token])
+        assert exc.value.code == 1
+        assert token in capsys.readouterr().err
+
+    @pytest.mark.parametrize("argv", [
+        ["done", "3", "5", "Shipped"],
+        ["done", "2", "7"],
+        ["done", "3-5"],
+    ])
+    def test_fast_path_matches_argparse(self, kanban, argv):
+        assert vars(kanban._fast_parse(argv)) == vars(kanban._build_parser().parse_args(argv))
+
+
+# ---------------------------------------------------------------------------
+# Tests: bulk commands
+# ---------------------------------------------------------------------------
+
+class TestBulkDone:
+    def test_range_with_trailing_message(self, kanban, board, tmp_path, capsys):
+        for num in (3, 4, 5):
+            _add_card(kanban, board, "doing", num, criteria_met=True)
+
+        code = _exit_code(kanban.cmd_done, SimpleNamespace(root=str(board), card=["3-5", "Shipped"], message=None))
+
+        assert code == 0
+        assert _columns(board)["done"] == ["3", "4", "5"]
+        assert capsys.readouterr().out.count("— Shipped") == 3
+        assert _events(tmp_path) == [("3", "done"), ("4", "done"), ("5", "done")]
+
+    def test_partial_success_exits_3(self, kanban, board, capsys):
+        _add_card(kanban, board, "doing", 1, criteria_met=True)
+        _add_card(kanban, board, "doing", 2, criteria_met=False)
+        _add_card(kanban, board, "todo", 3)
+
+        code = _exit_code(kanban.cmd_done, SimpleNamespace(root=str(board), card=["1", "2", "3", "99"], message=None))
+
+        assert code == kanban.BULK_EXIT_PARTIAL
+        assert _columns(board)["done"] == ["1"]
+        err = capsys.readouterr().err
+        assert "1 of 4 cards transitioned; failed: #2 #3 #99" in err
+        assert kanban.read_card(board / "doing" / "2.json")["cycles"] == 1
+
+    def test_max_cycles_outranks_partial(self, kanban, board):
+        _add_card(kanban, board, "doing", 1, criteria_met=True)
+        _add_card(kanban, board, "doing", 2, criteria_met=False, cycles=kanban.MAX_CYCLES - 1)
+
+        code = _exit_code(kanban.cmd_done, SimpleNamespace(root=str(board), card=["1,2"], message=None))
+
+        assert code == 2
+
+    def test_nothing_transitioned_exits_1(self, kanban, board):
+        _add_card(kanban, board, "todo", 1)
+        _add_card(kanban, board, "todo", 2)
+        assert _exit_code(kanban.cmd_done, SimpleNamespace(root=str(board), card=["1,2"], message=None)) == 1
+
+    def test_single_card_string_keeps_old_contract(self, kanban, board, capsys):
+        _add_card(kanban, board, "doing", 6, criteria_met=True)
+        kanban.cmd_done(SimpleNamespace(root=str(board), card="6", message="Shipped"))
+        assert "Done: #6 — Shipped" in capsys.readouterr().out
+
+    def test_two_positionals_are_card_and_message(self, kanban, board, capsys):
+        _add_card(kanban, board, "doing", 2, criteria_met=True)
+        _add_card(kanban, board, "doing", 7, criteria_met=True)
+
+        code = _exit_code(kanban.cmd_done, SimpleNamespace(root=str(board), card=["2", "7"], message=None))
+
+        assert code == 0
+        assert _columns(board)["done"] == ["2"]
+        assert "Done: #2 — 7" in capsys.readouterr().out
+
+    def test_numeric_message_for_several_cards_via_flag(self, kanban, board, capsys):
+        _add_card(kanban, board, "doing", 2, criteria_met=True)
+        _add_card(kanban, board, "doing", 7, criteria_met=True)
+        args = kanban._build_parser().parse_args(["--root", str(board), "done", "2", "7", "-m", "42"])
+
+        assert _exit_code(kanban.cmd_done, args) == 0
+        assert _columns(board)["done"] == ["2", "7"]
+        assert capsys.readouterr().out.count("— 42") == 2
+
+    def test_one_board_lock_and_one_metrics_write(self, kanban, board):
+        for num in range(1, 6):
+            _add_card(kanban, board, "doing", num)
+        real_lock = kanban.board_lock
+        locks = []
+
+        @contextmanager
+        def counting_lock(root):
+            locks.append(root)
+            with real_lock(root):
+                yield
+
+        with patch.object(kanban, "board_lock", counting_lock), \
+                patch.object(kanban, "write_kanban_events") as write_events:
+            kanban.cmd_done(SimpleNamespace(root=str(board), card=["1..5"], message=None))
+
+        assert len(locks) == 1
+        write_events.assert_called_once()
+        assert [row[0] for row in write_events.call_args.args[0]] == ["1", "2", "3", "4", "5"]
+
+
+class TestBulkCancelDefer:
+    def test_cancel_list_with_reason_skips_missing(self, kanban, board, tmp_path, capsys):
+        _add_card(kanban, board, "todo", 1)
+        _add_card(kanban, board, "doing", 2)
+
+        code = _exit_code(kanban.cmd_cancel, SimpleNamespace(root=str(board), card=["1,2", "7", "Out of scope"], reason=None))
+
+        assert code == kanban.BULK_EXIT_PARTIAL
+        assert _columns(board)["canceled"] == ["1", "2"]
+        assert kanban.read_card(board / "canceled" / "1.json")["cancelReason"] == "Out of scope"
+        assert _events(tmp_path) == [("1", "canceled"), ("2", "canceled")]
+
+    def test_defer_continues_past_wrong_column(self, kanban, board, capsys):
+        _add_card(kanban, board, "doing", 1)
+        _add_card(kanban, board, "todo", 2)
+        _add_card(kanban, board, "doing", 3)
+
+        code = _exit_code(kanban.cmd_defer, SimpleNamespace(root=str(board), card=["1-3"]))
+
+        assert code == kanban.BULK_EXIT_PARTIAL
+        assert _columns(board)["todo"] == ["1", "2", "3"]
+        assert "Card #2 is in 'todo'" in capsys.readouterr().err
+
+    def test_start_accepts_ranges(self, kanban, board, tmp_path):
+        _add_card(kanban, board, "todo", 4)
+        _add_card(kanban, board, "todo", 5)
+        with patch.object(kanban, "write_kanban_event", side_effect=AssertionError("per-card write")):
+            kanban.cmd_start(SimpleNamespace(root=str(board), card=["4..5"], force=False))
+        assert _columns(board)["doing"] == ["4", "5"]
+        assert _events(tmp_path) == [("4", "start"), ("5", "start")]
+
+    def test_start_partial_success_exits_3(self, kanban, board, capsys):
+        _add_card(kanban, board, "todo", 1)
+        _add_card(kanban, board, "doing", 2)
+
+        code = _exit_code(kanban.cmd_start, SimpleNamespace(root=str(board), card=["1", "2"], force=False))
+
+        assert code == kanban.BULK_EXIT_PARTIAL
+        assert _columns(board)["doing"] == ["1", "2"]
+        assert "1 of 2 cards transitioned; failed: #2" in capsys.readouterr().err
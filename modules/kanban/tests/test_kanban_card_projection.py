@@ -0,0 +1,194 @@
+"""
+Tests for projection reads (read_card_fields / CardIndex) used by list and
+report views.
+
+Covers:
+- read_card_fields returns only the requested fields and migrates old
+  criteria schemas in memory without rewriting the card
+- CardIndex serves unchanged cards from cache across instances, re-decodes a
+  card after write_card replaces it, ignores a corrupt index file, prunes
+  deleted cards, and bypasses the cache for non-indexed fields
+- `kanban list`, `kanban show` and `kanban report` leave legacy cards on disk
+  byte-for-byte untouched
+"""
+
+import importlib.util
+import json
+import sys
+from pathlib import Path
+from types import SimpleNamespace
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+
+# ---------------------------------------------------------------------------
+# Module loader
+# ---------------------------------------------------------------------------
+
+_KANBAN_PATH = Path(__file__).parent.parent / "kanban.py"
+
+
+def load_kanban():
+    """Import kanban.py as a module with watchdog stubbed out."""
+    watchdog_stub = MagicMock()
+    sys.modules.setdefault("watchdog", watchdog_stub)
+    sys.modules.setdefault("watchdog.observers", watchdog_stub)
+    sys.modules.setdefault("watchdog.events", watchdog_stub)
+    watchdog_stub.events.FileSystemEventHandler = object
+
+    spec = importlib.util.spec_from_file_location("kanban_card_projection", _KANBAN_PATH)
+    mod = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(mod)
+    return mod
+
+
+@pytest.fixture(scope="module")
+def kanban():
+    return load_kanban()
+
+
+# ---------------------------------------------------------------------------
+# Helpers
+# ---------------------------------------------------------------------------
+
+def _setup_board(tmp_path):
+    """Create minimal kanban board directory structure."""
+    for col in ("todo", "doing", "done", "canceled"):
+        (tmp_path / col).mkdir(parents=True, exist_ok=True)
+    return tmp_path
+
+
+def _legacy_card(kanban, action="Do the thing"):
+    """A pre-split card: inline activity and the V3 dual-column criteria."""
+    now = kanban.now_iso()
+    return {
+        "action": action,
+        "intent": "Because",
+        "type": "work",
+        "session": "s",
+        "editFiles": ["src/a.py"],
+        "criteria": [{"text": "c1", "agent" + "_met": True, "reviewer" + "_met": False}],
+        "created": now,
+        "updated": now,
+        "activity": [{"timestamp": now, "message": f"entry {i}"} for i in range(50)],
+    }
+
+
+def _snapshot(board):
+    return {p.relative_to(board).as_posix(): p.read_bytes() for p in board.rglob("*.json")}
+
+
+# ---------------------------------------------------------------------------
+# Tests: read_card_fields
+# ---------------------------------------------------------------------------
+
+class TestReadCardFields:
+    def test_projects_and_migrates_without_writing(self, kanban, tmp_path):
+        path = tmp_path / "1.json"
+        path.write_text(json.dumps(_legacy_card(kanban)))
+        before = path.read_bytes()
+
+        card = kanban.read_card_fields(path, ("action", "criteria"))
+
+        assert set(card) == {"action", "criteria"}
+        assert card["criteria"] == [{"text": "c1", "met": True}]
+        assert path.read_bytes() == before
+        assert not (tmp_path / "1.activity.jsonl").exists()
+
+
+# ---------------------------------------------------------------------------
+# Tests: CardIndex
+# ---------------------------------------------------------------------------
+
+class TestCardIndex:
+    def test_unchanged_card_is_served_from_saved_index(self, kanban, tmp_path):
+        board = _setup_board(tmp_path)
+        path = board / "todo" / "1.json"
+        kanban.write_card(path, _legacy_card(kanban))
+        first = kanban.CardIndex(board)
+        assert first.read(path)["action"] == "Do the thing"
+        first.save()
+
+        with patch.object(kanban, "read_card_fields", side_effect=AssertionError("decoded")):
+            assert kanban.CardIndex(board).read(path, ("action", "session")) == {
+                "action": "Do the thing", "session": "s",
+            }
+
+    def test_write_card_invalidates_entry(self, kanban, tmp_path):
+        board = _setup_board(tmp_path)
+        path = board / "todo" / "1.json"
+        kanban.write_card(path, _legacy_card(kanban))
+        index = kanban.CardIndex(board)
+        index.read(path)
+        index.save()
+
+        card = kanban.read_card(path)
+        card["action"] = "Do the thinG"  # same size, so only the inode tells the change
+        kanban.write_card(path, card)
+
+        assert kanban.CardIndex(board).read(path)["action"] == card["action"]
+
+    def test_corrupt_index_is_ignored(self, kanban, tmp_path):
+        board = _setup_board(tmp_path)
+        path = board / "todo" / "1.json"
+        kanban.write_card(path, _legacy_card(kanban))
+        (board / ".card-index").write_text("{not json")
+        index = kanban.CardIndex(board)
+        assert index.read(path)["session"] == "s"
+        index.save()
+        assert json.loads((board / ".card-index").read_text())["version"] == kanban._CARD_INDEX_VERSION
+
+    def test_deleted_cards_are_pruned(self, kanban, tmp_path):
+        board = _setup_board(tmp_path)
+        for num in ("1", "2"):
+            kanban.write_card(board / "todo" / f"{num}.json", _legacy_card(kanban))
+        index = kanban.CardIndex(board)
+        for num in ("1", "2"):
+            index.read(board / "todo" / f"{num}.json")
+        index.save()
+
+        (board / "todo" / "2.json").unlink()
+        kanban.write_card(board / "todo" / "3.json", _legacy_card(kanban))
+        index = kanban.CardIndex(board)
+        index.read(board / "todo" / "3.json")
+        index.save()
+
+        cached = json.loads((board / ".card-index").read_text())["cards"]
+        assert sorted(cached) == ["todo/1.json", "todo/3.json"]
+
+    def test_non_indexed_field_bypasses_cache(self, kanban, tmp_path):
+        board = _setup_board(tmp_path)
+        path = board / "todo" / "1.json"
+        card = _legacy_card(kanban)
+        card["rejection_history"] = ["x"]
+        kanban.write_card(path, card)
+        index = kanban.CardIndex(board)
+        assert index.read(path, ("rejection_history",)) == {"rejection_history": ["x"]}
+        index.save()
+        assert not (board / ".card-index").exists()
+
+
+# ---------------------------------------------------------------------------
+# Tests: read-only commands never write cards
+# ---------------------------------------------------------------------------
+
+class TestReadOnlyViews:
+    def test_list_show_report_leave_legacy_cards_untouched(self, kanban, tmp_path, capsys):
+        board = _setup_board(tmp_path)
+        for num, col in (("1", "todo"), ("2", "doing"), ("3", "done")):
+            (board / col / f"{num}.json").write_text(json.dumps(_legacy_card(kanban, f"Card {num}")))
+        before = _snapshot(board)
+
+        kanban.cmd_list(SimpleNamespace(
+            root=str(board), output_style="simple", column=None, show_done=True,
+            show_canceled=False, show_all=False, since=None, until=None, session=None,
+            mine=False, hide_mine=False,
+        ))
+        kanban.cmd_show(SimpleNamespace(root=str(board), card="2", output_style="xml"))
+        kanban.cmd_report(SimpleNamespace(root=str(board), output_style="xml", from_date=None, to_date=None))
+
+        out = capsys.readouterr().out
+        assert "Card 1" in out and "entry 49" in out and "Card 3" in out
+        assert _snapshot(board) == before
+        assert not list(board.rglob("*.activity.jsonl"))
@@ -0,0 +1,234 @@
+"""
+Tests for split card storage: NNN.json header + append-only NNN.activity.jsonl.
+
+Covers:
+- New cards write the header without activity and seed the activity log
+- read_card omits activity by default; include_activity=True assembles it
+- Legacy single-file cards are migrated on first read (idempotently)
+- Activity appends never rewrite existing log lines or the header
+- move_card carries the log; a log stranded by an interrupted move is found
+  and moved back under the card lock, never out from under a live move
+- A torn trailing log line is skipped
+- criteria add's 'Completed' scrub rewrites the log; done/remove append
+- `kanban show` renders activity from the log
+"""
+
+import importlib.util
+import json
+import sys
+import threading
+import time
+from pathlib import Path
+from types import SimpleNamespace
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+
+# ---------------------------------------------------------------------------
+# Module loader
+# ---------------------------------------------------------------------------
+
+_KANBAN_PATH = Path(__file__).parent.parent / "kanban.py"
+
+
+def load_kanban():
+    """Import kanban.py as a module with watchdog stubbed out."""
+    watchdog_stub = MagicMock()
+    sys.modules.setdefault("watchdog", watchdog_stub)
+    sys.modules.setdefault("watchdog.observers", watchdog_stub)
+    sys.modules.setdefault("watchdog.events", watchdog_stub)
+    watchdog_stub.events.FileSystemEventHandler = object
+
+    spec = importlib.util.spec_from_file_location("kanban_card_storage", _KANBAN_PATH)
+    mod = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(mod)
+    return mod
+
+
+@pytest.fixture(scope="module")
+def kanban():
+    return load_kanban()
+
+
+# ---------------------------------------------------------------------------
+# Helpers
+# ---------------------------------------------------------------------------
+
+def _setup_board(tmp_path):
+    """Create minimal kanban board directory structure."""
+    for col in ("todo", "doing", "done", "canceled"):
+        (tmp_path / col).mkdir(parents=True, exist_ok=True)
+    return tmp_path
+
+
+def _legacy_card(activity, met=True):
+    return {
+        "action": "Do the thing",
+        "intent": "Because",
+        "type": "work",
+        "agent": "swe-devex",
+        "session": "s",
+        "editFiles": [],
+        "readFiles": [],
+        "criteria": [{"text": "c1", "mov_commands": [{"cmd": "true", "timeout": 5}], "met": met}],
+        "cycles": 0,
+        "created": "2026-01-01T00:00:00Z",
+        "updated": "2026-01-01T00:00:00Z",
+        "activity": activity,
+    }
+
+
+def _log_lines(card_path):
+    return card_path.with_name(card_path.stem + ".activity.jsonl").read_text().splitlines()
+
+
+# ---------------------------------------------------------------------------
+# Tests: format
+# ---------------------------------------------------------------------------
+
+class TestCardFormat:
+    def test_new_card_splits_header_and_log(self, kanban, tmp_path):
+        board = _setup_board(tmp_path)
+        num = kanban.create_card_in_column(board, "todo", kanban.make_card(action="A", intent="B"))
+        header = json.loads((board / "todo" / f"{num}.json").read_text())
+        assert "activity" not in header
+        assert [json.loads(l)["message"] for l in _log_lines(board / "todo" / f"{num}.json")] == ["Created"]
+
+    def test_read_card_projects_activity_on_request(self, kanban, tmp_path):
+        board = _setup_board(tmp_path)
+        num = kanban.create_card_in_column(board, "todo", kanban.make_card(action="A", intent="B"))
+        path = board / "todo" / f"{num}.json"
+        assert "activity" not in kanban.read_card(path)
+        assert [e["message"] for e in kanban.read_card(path, include_activity=True)["activity"]] == ["Created"]
+
+    def test_legacy_card_is_migrated_once(self, kanban, tmp_path):
+        board = _setup_board(tmp_path)
+        path = board / "doing" / "3.json"
+        entries = [{"timestamp": "2026-01-01T00:00:00Z", "message": "Created"}]
+        path.write_text(json.dumps(_legacy_card(entries)))
+
+        card = kanban.read_card(path, include_activity=True)
+        assert card["activity"] == entries
+        assert "activity" not in json.loads(path.read_text())
+        assert [json.loads(l) for l in _log_lines(path)] == entries
+
+        before = path.stat().st_mtime_ns
+        kanban.read_card(path)
+        assert path.stat().st_mtime_ns == before
+
+    def test_torn_trailing_line_is_skipped(self, kanban, tmp_path):
+        board = _setup_board(tmp_path)
+        path = board / "doing" / "4.json"
+        kanban.write_card(path, _legacy_card([{"timestamp": "t", "message": "Created"}]))
+        with open(path.with_name("4.activity.jsonl"), "a") as fh:
+            fh.write('{"timestamp": "t", "mess')
+        assert [e["message"] for e in kanban.read_card_activity(path)] == ["Created"]
+
+
+class TestActivityAppend:
+    def test_append_keeps_existing_lines_and_header(self, kanban, tmp_path):
+        board = _setup_board(tmp_path)
+        path = board / "doing" / "5.json"
+        kanban.write_card(path, _legacy_card([{"timestamp": "t", "message": f"m{i}"} for i in range(200)]))
+        header_before = path.read_text()
+        log_before = _log_lines(path)
+
+        kanban.append_card_activity(path, "one more")
+
+        assert path.read_text() == header_before
+        log_after = _log_lines(path)
+        assert log_after[:-1] == log_before
+        assert json.loads(log_after[-1])["message"] == "one more"
+
+    def test_done_appends_completion_entry(self, kanban, tmp_path):
+        board = _setup_board(tmp_path)
+        kanban.write_card(board / "doing" / "6.json", _legacy_card([{"timestamp": "t", "message": "Created"}]))
+        args = SimpleNamespace(root=str(board), card="6", message="Shipped")
+
+        with patch.object(kanban, "write_kanban_event"):
+            kanban.cmd_done(args)
+
+        done_path = board / "done" / "6.json"
+        assert not (board / "doing" / "6.activity.jsonl").exists()
+        assert [json.loads(l)["message"] for l in _log_lines(done_path)] == ["Created", "Shipped"]
+        assert "activity" not in json.loads(done_path.read_text())
+
+    def test_criteria_add_reopen_scrubs_completed_entry(self, kanban, tmp_path):
+        board = _setup_board(tmp_path)
+        entries = [{"timestamp": "t", "message": "Created"}, {"timestamp": "t", "message": "Completed"}]
+        card = _legacy_card(entries)
+        card["updated"] = kanban.now_iso()  # recent, so get_root's auto-archive leaves it in done/
+        kanban.write_card(board / "done" / "7.json", card)
+        args = SimpleNamespace(
+            root=str(board), card="7", text="More", mov_cmd=["true"], mov_timeout=[5], session="s",
+        )
+
+        with patch.object(kanban, "write_kanban_event"):
+            kanban.cmd_criteria_add(args)
+
+        assert [json.loads(l)["message"] for l in _log_lines(board / "doing" / "7.json")] == ["Created"]
+
+
+class TestMoveCard:
+    def test_move_carries_log(self, kanban, tmp_path):
+        board = _setup_board(tmp_path)
+        src = board / "todo" / "8.json"
+        kanban.write_card(src, _legacy_card([{"timestamp": "t", "message": "Created"}]))
+        target = kanban.move_card(src, board / "doing" / "8.json")
+        assert sorted(p.name for p in (board / "doing").iterdir()) == ["8.activity.jsonl", "8.json"]
+        assert list((board / "todo").iterdir()) == []
+        assert kanban.read_card_activity(target)[0]["message"] == "Created"
+
+    def test_stranded_log_is_recovered(self, kanban, tmp_path):
+        board = _setup_board(tmp_path)
+        src = board / "todo" / "9.json"
+        kanban.write_card(src, _legacy_card([{"timestamp": "t", "message": "Created"}]))
+        src.rename(board / "doing" / "9.json")  # interrupted: header moved, log not
+
+        assert kanban.read_card_activity(board / "doing" / "9.json")[0]["message"] == "Created"
+        assert (board / "doing" / "9.activity.jsonl").exists()
+        assert not (board / "todo" / "9.activity.jsonl").exists()
+
+    def test_log_of_a_move_in_progress_is_left_alone(self, kanban, tmp_path):
+        board = _setup_board(tmp_path)
+        src = board / "todo" / "12.json"
+        kanban.write_card(src, _legacy_card([{"timestamp": "t", "message": "Created"}]))
+        result = []
+
+        with kanban.card_lock(board, "12"):
+            src.rename(board / "doing" / "12.json")  # mover between its two renames
+            reader = threading.Thread(
+                target=lambda: result.append(kanban.read_card_activity(board / "doing" / "12.json")))
+            reader.start()
+            time.sleep(0.2)  # the reader waits on the card lock, not on our log
+            (board / "todo" / "12.activity.jsonl").rename(board / "doing" / "12.activity.jsonl")
+        reader.join(10)
+
+        assert result[0][0]["message"] == "Created"
+        assert sorted(p.name for p in (board / "doing").iterdir()) == ["12.activity.jsonl", "12.json"]
+        assert list((board / "todo").iterdir()) == []
+
+    def test_stale_path_does_not_pull_log_from_moved_card(self, kanban, tmp_path):
+        board = _setup_board(tmp_path)
+        src = board / "todo" / "13.json"
+        kanban.write_card(src, _legacy_card([{"timestamp": "t", "message": "Created"}]))
+        kanban.move_card(src, board / "doing" / "13.json")
+
+        assert kanban.read_card_activity(src)[0]["message"] == "Created"
+        assert sorted(p.name for p in (board / "doing").iterdir()) == ["13.activity.jsonl", "13.json"]
+
+    def test_list_glob_never_sees_log(self, kanban, tmp_path):
+        board = _setup_board(tmp_path)
+        kanban.write_card(board / "todo" / "10.json", _legacy_card([{"timestamp": "t", "message": "Created"}]))
+        assert [p.name for p in kanban.find_cards_in_column(board, "todo")] == ["10.json"]
+
+
+class TestShow:
+    def test_show_renders_activity(self, kanban, tmp_path, capsys):
+        board = _setup_board(tmp_path)
+        kanban.write_card(board / "doing" / "11.json", _legacy_card([{"timestamp": "t", "message": "Created"}]))
+        kanban.append_card_activity(board / "doing" / "11.json", "Halfway there")
+        kanban.cmd_show(SimpleNamespace(root=str(board), card="11", output_style="xml"))
+        out = capsys.readouterr().out
+        assert "Halfway there" in out
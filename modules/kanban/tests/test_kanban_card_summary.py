@@ -0,0 +1,180 @@
+"""
+Tests for the denormalized per-card summary block maintained by write_card.
+
+Covers:
+- write_card stores criteria_total / criteria_met / last_activity_at /
+  last_met_at, and last_met_at only moves when a criterion becomes met
+- card_summary computes a block in memory for legacy cards and for cards
+  whose criteria count no longer matches the stored block
+- read_card's migration write-back backfills the block; read-only views
+  never write it
+- the stranded/abandoned detectors read the block and still fail closed on
+  malformed criteria
+- show XML and detail views carry the met/total counts
+"""
+
+import importlib.util
+import json
+import sys
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+from types import SimpleNamespace
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+
+# ---------------------------------------------------------------------------
+# Module loader
+# ---------------------------------------------------------------------------
+
+_KANBAN_PATH = Path(__file__).parent.parent / "kanban.py"
+
+
+def load_kanban():
+    """Import kanban.py as a module with watchdog stubbed out."""
+    watchdog_stub = MagicMock()
+    sys.modules.setdefault("watchdog", watchdog_stub)
+    sys.modules.setdefault("watchdog.observers", watchdog_stub)
+    sys.modules.setdefault("watchdog.events", watchdog_stub)
+    watchdog_stub.events.FileSystemEventHandler = object
+
+    spec = importlib.util.spec_from_file_location("kanban_card_summary", _KANBAN_PATH)
+    mod = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(mod)
+    return mod
+
+
+@pytest.fixture(scope="module")
+def kanban():
+    return load_kanban()
+
+
+# ---------------------------------------------------------------------------
+# Helpers
+# ---------------------------------------------------------------------------
+
+def _setup_board(tmp_path):
+    """Create minimal kanban board directory structure."""
+    for col in ("todo", "doing", "done", "canceled"):
+        (tmp_path / col).mkdir(parents=True, exist_ok=True)
+    return tmp_path
+
+
+def _card(met, updated="2026-01-01T00:00:00Z"):
+    return {
+        "action": "Do the thing", "intent": "Because", "type": "work", "session": "s",
+        "criteria": [{"text": f"c{i}", "met": m} for i, m in enumerate(met)],
+        "created": "2026-01-01T00:00:00Z", "updated": updated,
+    }
+
+
+def _stored(path):
+    return json.loads(path.read_text()).get("summary")
+
+
+# ---------------------------------------------------------------------------
+# Tests: maintenance
+# ---------------------------------------------------------------------------
+
+class TestSummaryMaintenance:
+    def test_write_card_stores_block(self, kanban, tmp_path):
+        path = _setup_board(tmp_path) / "doing" / "1.json"
+        kanban.write_card(path, _card([True, False, False]))
+        assert _stored(path) == {
+            "criteria_total": 3, "criteria_met": 1,
+            "last_activity_at": "2026-01-01T00:00:00Z", "last_met_at": "2026-01-01T00:00:00Z",
+        }
+
+    def test_last_met_at_moves_only_when_a_criterion_is_met(self, kanban, tmp_path):
+        path = _setup_board(tmp_path) / "doing" / "1.json"
+        kanban.write_card(path, _card([False, False]))
+        assert _stored(path)["last_met_at"] is None
+
+        card = kanban.read_card(path)
+        card["criteria"][0]["met"], card["updated"] = True, "2026-01-02T00:00:00Z"
+        kanban.write_card(path, card)
+        assert _stored(path)["last_met_at"] == "2026-01-02T00:00:00Z"
+
+        card = kanban.read_card(path)
+        card["action"], card["updated"] = "Renamed", "2026-01-03T00:00:00Z"
+        kanban.write_card(path, card)
+        assert _stored(path)["last_met_at"] == "2026-01-02T00:00:00Z"
+        assert _stored(path)["last_activity_at"] == "2026-01-03T00:00:00Z"
+
+    def test_criteria_check_updates_block(self, kanban, tmp_path):
+        board = _setup_board(tmp_path)
+        card = _card([False, False])
+        for criterion in card["criteria"]:
+            criterion["mov_commands"] = [{"cmd": "true", "timeout": 5}]
+        kanban.write_card(board / "doing" / "4.json", card)
+        with patch.object(kanban, "write_kanban_event"):
+            kanban.cmd_criteria_check(SimpleNamespace(root=str(board), card="4", n=["1"], session=None))
+        assert _stored(board / "doing" / "4.json")["criteria_met"] == 1
+
+    def test_cards_without_criteria_get_no_block(self, kanban, tmp_path):
+        kanban.write_card(tmp_path / "7.json", {"action": "x"})
+        assert json.loads((tmp_path / "7.json").read_text()) == {"action": "x"}
+
+
+class TestBackfill:
+    def test_legacy_card_computed_in_memory(self, kanban):
+        summary = kanban.card_summary(_card([True, True]))
+        assert (summary["criteria_total"], summary["criteria_met"]) == (2, 2)
+
+    def test_hand_edited_criteria_count_is_recomputed(self, kanban):
+        card = _card([True])
+        card["summary"] = {"criteria_total": 2, "criteria_met": 2, "last_activity_at": "x", "last_met_at": "x"}
+        assert kanban.card_summary(card)["criteria_total"] == 1
+
+    def test_read_card_backfills_and_list_does_not(self, kanban, tmp_path, capsys):
+        board = _setup_board(tmp_path)
+        path = board / "doing" / "2.json"
+        path.write_text(json.dumps(_card([True])))
+
+        kanban.cmd_list(SimpleNamespace(
+            root=str(board), output_style="xml", column=None, show_done=False,
+            show_canceled=False, show_all=False, since=None, until=None, session=None,
+            mine=False, hide_mine=False,
+        ))
+        assert _stored(path) is None
+
+        kanban.read_card(path)
+        assert _stored(path)["criteria_met"] == 1
+
+
+# ---------------------------------------------------------------------------
+# Tests: consumers
+# ---------------------------------------------------------------------------
+
+class TestDetectors:
+    NOW = datetime(2026, 1, 1, 12, tzinfo=timezone.utc)
+
+    def test_detectors_read_block(self, kanban):
+        card = _card([False, False])
+        card["summary"] = {
+            "criteria_total": 2, "criteria_met": 2,
+            "last_activity_at": "2026-01-01T00:00:00Z", "last_met_at": "2026-01-01T00:00:00Z",
+        }
+        assert kanban.is_card_stranded(card, now=self.NOW)
+        assert not kanban.is_card_abandoned(card, now=self.NOW)
+
+    def test_detectors_without_block(self, kanban):
+        assert kanban.is_card_stranded(_card([True, True]), now=self.NOW)
+        assert kanban.is_card_abandoned(_card([False, False]), now=self.NOW)
+        assert not kanban.is_card_stranded(_card([True, True]), now=self.NOW - timedelta(hours=11, minutes=55))
+
+    def test_malformed_criteria_fail_closed(self, kanban):
+        card = _card([False])
+        card["criteria"].append("not a dict")
+        assert not kanban.is_card_stranded(card, now=self.NOW)
+        assert not kanban.is_card_abandoned(card, now=self.NOW)
+
+
+class TestRendering:
+    def test_show_xml_and_detail_carry_counts(self, kanban):
+        card = _card([True, False, False])
+        xml = kanban.format_card_xml(card, "3", "doing", include_details=True)
+        assert '<acceptance-criteria met-count="1" total="3">' in xml
+        line = kanban.format_card_line(card, "3", output_style="detail", column="doing")
+        assert "Acceptance Criteria (1/3 met)" in line
@@ -0,0 +1,201 @@
+"""
+Tests for the board generation journal and `kanban list --changed-since`.
+
+Covers:
+- write_card, create and move_card each bump the generation; writes outside a
+  board column do not; a torn last journal line is skipped
+- cards_changed_since reports changed card numbers, and returns None (full
+  board) for a cursor ahead of the journal or older than its floor
+- Compaction keeps each live card's latest entry, never moves the generation
+  backwards, and floors dropped cards
+- `kanban list --changed-since` XML emits only changed cards, a <gone>
+  section for cards that left the listed columns, and the new generation
+  while the stranded/abandoned sections still cover every doing card
+"""
+
+import importlib.util
+import re
+import sys
+from pathlib import Path
+from types import SimpleNamespace
+from unittest.mock import MagicMock
+
+import pytest
+
+
+# ---------------------------------------------------------------------------
+# Module loader
+# ---------------------------------------------------------------------------
+
+_KANBAN_PATH = Path(__file__).parent.parent / "kanban.py"
+
+
+def load_kanban():
+    """Import kanban.py as a module with watchdog stubbed out."""
+    watchdog_stub = MagicMock()
+    sys.modules.setdefault("watchdog", watchdog_stub)
+    sys.modules.setdefault("watchdog.observers", watchdog_stub)
+    sys.modules.setdefault("watchdog.events", watchdog_stub)
+    watchdog_stub.events.FileSystemEventHandler = object
+
+    spec = importlib.util.spec_from_file_location("kanban_changed_since", _KANBAN_PATH)
+    mod = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(mod)
+    return mod
+
+
+@pytest.fixture(scope="module")
+def kanban():
+    return load_kanban()
+
+
+# ---------------------------------------------------------------------------
+# Helpers
+# ---------------------------------------------------------------------------
+
+def _setup_board(tmp_path):
+    """Create minimal kanban board directory structure."""
+    for col in ("todo", "doing", "done", "canceled"):
+        (tmp_path / col).mkdir(parents=True, exist_ok=True)
+    return tmp_path
+
+
+def _new_card(kanban, board, col, action):
+    card = kanban.make_card(action=action, intent=f"{action} intent", session="s")
+    return kanban.create_card_in_column(board, col, card)
+
+
+def _list_xml(kanban, board, capsys, changed_since=None, **overrides):
+    args = SimpleNamespace(
+        root=str(board), output_style="xml", column=None, show_done=False,
+        show_canceled=False, show_all=False, since=None, until=None, session=None,
+        mine=False, hide_mine=False, changed_since=changed_since,
+    )
+    for key, value in overrides.items():
+        setattr(args, key, value)
+    kanban.cmd_list(args)
+    return capsys.readouterr().out
+
+
+# ---------------------------------------------------------------------------
+# Tests: journal
+# ---------------------------------------------------------------------------
+
+class TestGeneration:
+    def test_create_write_and_move_bump_generation(self, kanban, tmp_path):
+        board = _setup_board(tmp_path)
+        assert kanban.board_generation(board) == 0
+        num = _new_card(kanban, board, "todo", "A")
+        assert kanban.board_generation(board) == 1
+
+        path = board / "todo" / f"{num}.json"
+        kanban.write_card(path, kanban.read_card(path))
+        kanban.move_card(path, board / "doing" / path.name)
+        kanban.append_card_activity(board / "doing" / path.name, "note")
+
+        assert kanban.board_generation(board) == 3
+        assert kanban.cards_changed_since(board, 1) == (3, {str(num)})
+
+    def test_generation_is_the_last_intact_line(self, kanban, tmp_path):
+        board = _setup_board(tmp_path)
+        (board / ".generation.log").write_text(
+            "".join(f'{{"g": {g}, "n": "1"}}\n' for g in range(1, 300)) + '{"g": 300, "n'
+        )
+        assert kanban.board_generation(board) == 299
+
+    def test_writes_outside_a_board_are_not_journaled(self, kanban, tmp_path):
+        kanban.write_card(tmp_path / "7.json", {"action": "x"})
+        assert not list(tmp_path.parent.glob(".generation.log"))
+        assert not (tmp_path / ".generation.log").exists()
+
+    def test_unanswerable_cursor_means_full_board(self, kanban, tmp_path):
+        board = _setup_board(tmp_path)
+        _new_card(kanban, board, "todo", "A")
+        assert kanban.cards_changed_since(board, 5) == (1, None)
+        assert kanban.cards_changed_since(board, 1) == (1, set())
+
+
+class TestCompaction:
+    def test_keeps_latest_per_live_card_and_floors_the_rest(self, kanban, tmp_path, monkeypatch):
+        board = _setup_board(tmp_path)
+        monkeypatch.setattr(kanban, "_GENERATION_LOG_COMPACT_BYTES", 10**9)
+        keep = _new_card(kanban, board, "todo", "Keep")
+        gone = _new_card(kanban, board, "todo", "Gone")
+        for _ in range(5):
+            path = board / "todo" / f"{keep}.json"
+            kanban.write_card(path, kanban.read_card(path))
+        (board / "todo" / f"{gone}.json").unlink()
+        path = board / "todo" / f"{gone}.json"
+        kanban.record_card_change(path)  # trashed: journaled as its last change
+        before = kanban.board_generation(board)
+
+        with kanban._flock_exclusive(board / ".generation.lock"):
+            kanban._compact_generation_log(board)
+
+        lines = (board / ".generation.log").read_text().splitlines()
+        assert len(lines) == 2
+        assert kanban.board_generation(board) == before
+        assert kanban.cards_changed_since(board, 0) == (before, None)
+        assert kanban.cards_changed_since(board, before) == (before, set())
+
+    def test_compaction_triggers_on_size(self, kanban, tmp_path, monkeypatch):
+        board = _setup_board(tmp_path)
+        monkeypatch.setattr(kanban, "_GENERATION_LOG_COMPACT_BYTES", 200)
+        num = _new_card(kanban, board, "todo", "A")
+        path = board / "todo" / f"{num}.json"
+        for _ in range(20):
+            kanban.write_card(path, kanban.read_card(path))
+        assert (board / ".generation.log").stat().st_size <= 200
+        assert kanban.board_generation(board) == 21
+
+
+# ---------------------------------------------------------------------------
+# Tests: kanban list --changed-since
+# ---------------------------------------------------------------------------
+
+class TestListChangedSince:
+    def test_delta_lists_only_changed_and_gone_cards(self, kanban, tmp_path, capsys):
+        board = _setup_board(tmp_path)
+        a = _new_card(kanban, board, "todo", "A")
+        b = _new_card(kanban, board, "doing", "B")
+        c = _new_card(kanban, board, "doing", "C")
+        full = _list_xml(kanban, board, capsys)
+        generation = int(re.search(r'generation="(\d+)"', full).group(1))
+        assert generation == 3 and full.count("<c ") == 3
+
+        path = board / "todo" / f"{a}.json"
+        card = kanban.read_card(path)
+        card["intent"] = "A changed"
+        kanban.write_card(path, card)
+        kanban.move_card(board / "doing" / f"{c}.json", board / "done" / f"{c}.json")
+
+        delta = _list_xml(kanban, board, capsys, changed_since=generation)
+        assert f'generation="5" since="{generation}"' in delta
+        assert re.findall(r'<c n="(\d+)"', delta) == [str(a)]
+        assert "A changed" in delta
+        assert f'<gone>\n<card n="{c}"/>\n</gone>' in delta
+        assert f'n="{b}"' not in delta
+
+    def test_delta_still_reports_unchanged_stranded_cards(self, kanban, tmp_path, capsys, monkeypatch):
+        board = _setup_board(tmp_path)
+        stuck = _new_card(kanban, board, "doing", "Stuck")
+        fresh = _new_card(kanban, board, "doing", "Fresh")
+        monkeypatch.setattr(kanban, "is_card_stranded", lambda card, now=None: card.get("action") == "Stuck")
+
+        delta = _list_xml(kanban, board, capsys, changed_since=1)
+
+        assert re.findall(r'<c n="(\d+)"', delta) == [str(fresh)]
+        assert f'<stranded>\n<card n="{stuck}"' in delta
+
+    def test_delta_is_empty_when_nothing_changed(self, kanban, tmp_path, capsys):
+        board = _setup_board(tmp_path)
+        _new_card(kanban, board, "todo", "A")
+        delta = _list_xml(kanban, board, capsys, changed_since=1)
+        assert delta.splitlines() == ['<board generation="1" since="1">', "</board>"]
+
+    def test_stale_cursor_falls_back_to_full_board(self, kanban, tmp_path, capsys):
+        board = _setup_board(tmp_path)
+        _new_card(kanban, board, "todo", "A")
+        out = _list_xml(kanban, board, capsys, changed_since=99)
+        assert out.startswith('<board generation="1">')
+        assert out.count("<c ") == 1
@@ -0,0 +1,274 @@
+"""
+Tests for the compiled editFiles path-pattern index (EditFilesIndex) in kanban.py.
+
+Covers:
+- _compile_path_glob: fnmatch-compatible '*', '?', '[...]' (including '*'
+  crossing '/'), recursive '**/' and trailing '/**' semantics
+- EditFilesIndex.overlaps: literal equality, indexed glob matching a literal
+  query, glob query matching indexed literals, results in insertion order
+- EditFilesIndex.scope_overlaps: directory containment in both directions,
+  no false match on partial segment names
+- Equivalence with the pairwise fnmatch predicate the index replaced, over a
+  randomized corpus of paths and globs without '**'
+- check_file_conflicts / check_editfiles_overlap accept the indexed path and
+  report the same card and path the pairwise scan did
+- cmd_do reads each in-flight card from disk once per invocation
+"""
+
+import fnmatch
+import importlib.util
+import json
+import random
+import sys
+from pathlib import Path
+from types import SimpleNamespace
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+
+# ---------------------------------------------------------------------------
+# Module loader
+# ---------------------------------------------------------------------------
+
+_KANBAN_PATH = Path(__file__).parent.parent / "kanban.py"
+
+
+def load_kanban():
+    """Import kanban.py as a module with watchdog stubbed out."""
+    watchdog_stub = MagicMock()
+    sys.modules.setdefault("watchdog", watchdog_stub)
+    sys.modules.setdefault("watchdog.observers", watchdog_stub)
+    sys.modules.setdefault("watchdog.events", watchdog_stub)
+    watchdog_stub.events.FileSystemEventHandler = object
+
+    spec = importlib.util.spec_from_file_location("kanban_editfiles_index", _KANBAN_PATH)
+    mod = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(mod)
+    return mod
+
+
+@pytest.fixture(scope="module")
+def kanban():
+    return load_kanban()
+
+
+# ---------------------------------------------------------------------------
+# Helpers
+# ---------------------------------------------------------------------------
+
+def _setup_board(tmp_path):
+    """Create minimal kanban board directory structure."""
+    for col in ("todo", "doing", "done", "canceled"):
+        (tmp_path / col).mkdir(parents=True, exist_ok=True)
+    return tmp_path
+
+
+def _write_card(board_root, col, num, edit_files, session="sess-a"):
+    card = {
+        "action": f"Card {num}",
+        "intent": "In flight",
+        "type": "work",
+        "agent": "swe-devex",
+        "session": session,
+        "editFiles": edit_files,
+        "readFiles": [],
+        "criteria": [{"text": "check", "met": False}],
+        "cycles": 0,
+        "agent_launch_pending": False,
+        "created": "2026-01-01T00:00:00Z",
+        "updated": "2026-01-01T00:00:00Z",
+        "activity": [],
+    }
+    path = board_root / col / f"{num}.json"
+    path.write_text(json.dumps(card))
+    return path
+
+
+def _pairwise_overlap(a, b):
+    """The fnmatch predicate _globs_overlap used before the index existed."""
+    return a == b or fnmatch.fnmatch(b, a) or fnmatch.fnmatch(a, b)
+
+
+# ---------------------------------------------------------------------------
+# Tests: _compile_path_glob
+# ---------------------------------------------------------------------------
+
+class TestCompilePathGlob:
+    def test_star_crosses_slash_like_fnmatch(self, kanban):
+        regex = kanban._compile_path_glob("src/*.ts")
+        assert regex.match("src/foo.ts")
+        assert regex.match("src/nested/foo.ts")
+        assert not regex.match("lib/foo.ts")
+
+    def test_question_mark_and_brackets(self, kanban):
+        assert kanban._compile_path_glob("src/?oo.py").match("src/foo.py")
+        assert kanban._compile_path_glob("src/[fb]oo.py").match("src/boo.py")
+        assert not kanban._compile_path_glob("src/[!fb]oo.py").match("src/foo.py")
+
+    def test_unterminated_bracket_is_literal(self, kanban):
+        assert kanban._compile_path_glob("src/[foo").match("src/[foo")
+
+    def test_leading_double_star_matches_zero_or_more_directories(self, kanban):
+        regex = kanban._compile_path_glob("**/*.ts")
+        assert regex.match("foo.ts")
+        assert regex.match("src/a/b/foo.ts")
+        assert not regex.match("src/foo.py")
+
+    def test_inner_double_star_matches_zero_directories(self, kanban):
+        regex = kanban._compile_path_glob("src/**/x.py")
+        assert regex.match("src/x.py")
+        assert regex.match("src/a/b/x.py")
+        assert not regex.match("lib/x.py")
+
+    def test_trailing_double_star_matches_directory_and_descendants(self, kanban):
+        regex = kanban._compile_path_glob("src/**")
+        assert regex.match("src")
+        assert regex.match("src/a/b.py")
+        assert not regex.match("srcx/a.py")
+
+
+# ---------------------------------------------------------------------------
+# Tests: EditFilesIndex
+# ---------------------------------------------------------------------------
+
+class TestEditFilesIndexOverlaps:
+    def test_literal_equality(self, kanban):
+        index = kanban.EditFilesIndex([{"id": "1", "editFiles": ["src/foo.ts"]}])
+        assert [e for e, _ in index.overlaps("src/foo.ts")] == ["src/foo.ts"]
+        assert index.overlaps("src/bar.ts") == []
+
+    def test_indexed_glob_matches_literal_query(self, kanban):
+        index = kanban.EditFilesIndex([{"id": "1", "editFiles": ["src/*.ts"]}])
+        assert [e for e, _ in index.overlaps("src/foo.ts")] == ["src/*.ts"]
+
+    def test_glob_query_matches_indexed_literal(self, kanban):
+        index = kanban.EditFilesIndex([{"id": "1", "editFiles": ["src/foo.ts", "lib/foo.ts"]}])
+        assert [e for e, _ in index.overlaps("src/*.ts")] == ["src/foo.ts"]
+
+    def test_identical_globs_overlap(self, kanban):
+        index = kanban.EditFilesIndex([{"id": "1", "editFiles": ["src/*.ts"]}])
+        assert [e for e, _ in index.overlaps("src/*.ts")] == ["src/*.ts"]
+
+    def test_results_follow_card_then_entry_order(self, kanban):
+        first = {"id": "1", "editFiles": ["b.py", "a.py"]}
+        second = {"id": "2", "editFiles": ["a.py"]}
+        index = kanban.EditFilesIndex([first, second])
+        hits = index.overlaps("*.py")
+        assert [(e, o["id"]) for e, o in hits] == [("b.py", "1"), ("a.py", "1"), ("a.py", "2")]
+
+    def test_non_list_edit_files_is_ignored(self, kanban):
+        index = kanban.EditFilesIndex([{"id": "1", "editFiles": "src/foo.ts"}])
+        assert index.overlaps("src/foo.ts") == []
+
+
+class TestEditFilesIndexScopeOverlaps:
+    def test_directory_contains_entry(self, kanban):
+        index = kanban.EditFilesIndex([{"id": "1", "editFiles": ["modules/claude/foo.py"]}])
+        assert [e for e, _ in index.scope_overlaps("modules/")] == ["modules/claude/foo.py"]
+
+    def test_entry_contains_path(self, kanban):
+        index = kanban.EditFilesIndex([{"id": "1", "editFiles": ["modules/"]}])
+        assert [e for e, _ in index.scope_overlaps("modules/claude/foo.py")] == ["modules/"]
+
+    def test_partial_segment_is_not_containment(self, kanban):
+        index = kanban.EditFilesIndex([{"id": "1", "editFiles": ["modules-extra/foo.py"]}])
+        assert index.scope_overlaps("modules/") == []
+
+
+class TestEditFilesIndexEquivalence:
+    """The index must answer exactly what the pairwise predicates answered
+    for every pattern the old fnmatch code handled ('**' aside, which is now
+    a strict superset)."""
+
+    _SEGMENTS = ["src", "a", "b", "foo.ts", "bar.py", "*.ts", "*", "?oo.ts", "[ab]", "x*", "modules"]
+
+    def _random_path(self, rng):
+        return "/".join(rng.choice(self._SEGMENTS) for _ in range(rng.randint(1, 4)))
+
+    def test_matches_pairwise_predicates(self, kanban):
+        rng = random.Random(26)
+        for _ in range(3000):
+            query = self._random_path(rng)
+            entries = [self._random_path(rng) for _ in range(5)]
+            index = kanban.EditFilesIndex()
+            for pos, entry in enumerate(entries):
+                index.add(entry, pos)
+
+            got = {owner for _, owner in index.overlaps(query)}
+            expected = {pos for pos, entry in enumerate(entries) if _pairwise_overlap(query, entry)}
+            assert got == expected, (query, entries)
+
+            got_scope = {owner for _, owner in index.scope_overlaps(query)}
+            expected_scope = {
+                pos for pos, entry in enumerate(entries)
+                if kanban._mov_path_overlaps_editfile(query, entry)
+            }
+            assert got_scope == expected_scope, (query, entries)
+
+
+# ---------------------------------------------------------------------------
+# Tests: conflict helpers built on the index
+# ---------------------------------------------------------------------------
+
+class TestConflictHelpers:
+    def test_check_file_conflicts_reports_first_card_and_path(self, kanban, tmp_path):
+        board = _setup_board(tmp_path)
+        _write_card(board, "doing", "10", ["lib/other.py"])
+        _write_card(board, "doing", "11", ["src/*.ts"], session="sess-b")
+        _write_card(board, "doing", "12", ["README.md"])
+
+        result = kanban.check_file_conflicts(board, ["README.md", "src/foo.ts"], [])
+        assert result == ("11", "sess-b", "src/foo.ts")
+
+    def test_check_file_conflicts_read_files_never_conflict(self, kanban, tmp_path):
+        board = _setup_board(tmp_path)
+        _write_card(board, "doing", "10", ["src/foo.ts"])
+        assert kanban.check_file_conflicts(board, [], ["src/foo.ts"]) is None
+
+    def test_check_editfiles_overlap_accepts_prebuilt_index(self, kanban):
+        doing = [
+            {"id": "1", "session": "s1", "editFiles": ["src/*.ts"]},
+            {"id": "2", "session": "s2", "editFiles": ["docs/readme.md"]},
+            {"id": "3", "session": "s3", "editFiles": ["src/foo.ts"]},
+        ]
+        from_list = kanban.check_editfiles_overlap("9", ["src/foo.ts", "docs/readme.md"], doing)
+        from_index = kanban.check_editfiles_overlap(
+            "9", ["src/foo.ts", "docs/readme.md"], kanban.EditFilesIndex(doing),
+        )
+        assert from_list == from_index == [
+            ("1", "s1", ["src/foo.ts"]),
+            ("2", "s2", ["docs/readme.md"]),
+            ("3", "s3", ["src/foo.ts"]),
+        ]
+
+    def test_cmd_do_reads_each_inflight_card_once(self, kanban, tmp_path):
+        board = _setup_board(tmp_path)
+        _write_card(board, "doing", "10", ["lib/a.py"])
+        _write_card(board, "todo", "11", ["lib/b.py"])
+        card_json = json.dumps({
+            "action": "Edit c",
+            "intent": "Because",
+            "type": "work",
+            "editFiles": ["lib/c.py"],
+            "criteria": [{
+                "text": "check",
+                "mov_type": "programmatic",
+                "mov_commands": [{"cmd": "true", "timeout": 5}],
+            }],
+        })
+        args = SimpleNamespace(root=str(board), json_data=card_json, json_file=None, session="s", force=False)
+
+        real_read_card = kanban.read_card
+        reads = []
+
+        def counting_read_card(path):
+            reads.append(Path(path).name)
+            return real_read_card(path)
+
+        with patch.object(kanban, "write_kanban_event"), \
+                patch.object(kanban, "_mov_prepass_run_criterion", return_value=False), \
+                patch.object(kanban, "read_card", side_effect=counting_read_card):
+            kanban.cmd_do(args)
+
+        assert sorted(reads) == ["10.json", "11.json"]
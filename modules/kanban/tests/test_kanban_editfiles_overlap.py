@@ -169,21 +169,15 @@ class TestGlobsOverlap:
         assert result == ["src/foo.ts"]
 
     def test_double_star_glob_matches_nested_path(self, kanban):
-        """**/*.ts glob in list_a is tested against src/foo.ts in list_b.
-
-        NOTE: fnmatch does NOT treat '/' as a directory separator and does not
-        implement recursive '**' matching reliably. This test documents the
-        CURRENT behavior of the implementation. If fnmatch happens to match
-        '**/*.ts' against 'src/foo.ts' on this platform, that is incidental —
-        the '**' pattern is explicitly unsupported per the _globs_overlap
-        docstring. Do NOT rely on '**' patterns in editFiles; use explicit
-        prefixes (e.g. 'src/*.ts') instead.
+        """**/*.ts glob in list_a overlaps src/foo.ts in list_b.
+
+        '**' is recursive (see _compile_path_glob): a leading '**/' segment
+        matches zero or more directories, so the glob covers nested and
+        top-level .ts files alike.
         """
-        result = kanban._globs_overlap(["**/*.ts"], ["src/foo.ts"])
-        # We document whether ** accidentally matches — we do not assert a specific
-        # value here because fnmatch behavior with ** is platform-incidental.
-        # The important assertion: the result is a list (never raises).
-        assert isinstance(result, list)
+        assert kanban._globs_overlap(["**/*.ts"], ["src/foo.ts"]) == ["**/*.ts"]
+        assert kanban._globs_overlap(["**/*.ts"], ["foo.ts"]) == ["**/*.ts"]
+        assert kanban._globs_overlap(["**/*.ts"], ["src/foo.py"]) == []
 
     def test_no_match_returns_empty(self, kanban):
         """Paths that don't overlap return empty list."""
@@ -0,0 +1,167 @@
+"""
+Tests for CLI startup cost: lazy imports and the fast-path dispatcher.
+
+Covers:
+- `python -X importtime` regression: hot commands (`status`, `criteria
+  check`) never import argparse, watchdog, sqlite3, html, difflib, termios,
+  tty, dataclasses or inspect, and kanban's own top-level imports stay
+  within a time budget
+- _fast_parse produces exactly the Namespace argparse would for the
+  grammar it accepts
+- Anything outside that grammar (help, --watch, unknown or abbreviated
+  flags, wrong arity, dash-leading values) falls through to argparse
+"""
+
+import importlib.util
+import json
+import os
+import re
+import subprocess
+import sys
+from pathlib import Path
+from unittest.mock import MagicMock
+
+import pytest
+
+
+# ---------------------------------------------------------------------------
+# Module loader
+# ---------------------------------------------------------------------------
+
+_KANBAN_PATH = Path(__file__).parent.parent / "kanban.py"
+
+
+def load_kanban():
+    """Import kanban.py as a module with watchdog stubbed out."""
+    watchdog_stub = MagicMock()
+    sys.modules.setdefault("watchdog", watchdog_stub)
+    sys.modules.setdefault("watchdog.observers", watchdog_stub)
+    sys.modules.setdefault("watchdog.events", watchdog_stub)
+    watchdog_stub.events.FileSystemEventHandler = object
+
+    spec = importlib.util.spec_from_file_location("kanban_import_budget", _KANBAN_PATH)
+    mod = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(mod)
+    return mod
+
+
+@pytest.fixture(scope="module")
+def kanban():
+    return load_kanban()
+
+
+# Modules the hot path must never pay for (see the import note at the top of
+# kanban.py). tempfile is allowed for `criteria check`: it writes the card.
+_HEAVY_MODULES = {
+    "argparse", "watchdog", "sqlite3", "html", "difflib", "termios", "tty",
+    "dataclasses", "inspect", "tempfile",
+}
+
+# Cumulative import time of kanban.py's own top-level imports. Generous: the
+# point is to catch a heavy module creeping back in, not to benchmark.
+_IMPORT_BUDGET_MS = float(os.environ.get("KANBAN_IMPORT_BUDGET_MS", "150"))
+
+_IMPORTTIME_RE = re.compile(r"^import time:\s+(\d+) \|\s+(\d+) \|( *)(\S+)$")
+
+
+# ---------------------------------------------------------------------------
+# Helpers
+# ---------------------------------------------------------------------------
+
+def _setup_board(tmp_path):
+    root = tmp_path / ".kanban"
+    for col in ("todo", "doing", "done", "canceled"):
+        (root / col).mkdir(parents=True, exist_ok=True)
+    card = {
+        "action": "A", "intent": "B", "type": "work", "session": "s",
+        "editFiles": [], "readFiles": [],
+        "criteria": [{"text": "c", "mov_commands": [{"cmd": "true", "timeout": 5}], "met": False}],
+        "cycles": 0, "created": "2026-01-01T00:00:00Z", "updated": "2026-01-01T00:00:00Z",
+    }
+    (root / "doing" / "1.json").write_text(json.dumps(card))
+    return root
+
+
+def _importtime(root, *argv):
+    """Run the kanban CLI under -X importtime; return ({module: (self_us, cum_us, depth)}, proc)."""
+    proc = subprocess.run(
+        [sys.executable, "-X", "importtime", str(_KANBAN_PATH), "--root", str(root), *argv],
+        capture_output=True, text=True, cwd=root.parent,
+        env={**os.environ, "KANBAN_AGENT": "", "CLAUDE_SESSION_ID": "import-budget"},
+    )
+    modules = {}
+    for line in proc.stderr.splitlines():
+        m = _IMPORTTIME_RE.match(line)
+        if m:
+            modules[m.group(4)] = (int(m.group(1)), int(m.group(2)), len(m.group(3)))
+    return modules, proc
+
+
+def _top_level_cost_ms(modules):
+    """Cumulative time of top-level imports made after interpreter startup."""
+    startup = {"encodings", "site", "_frozen_importlib_external", "zipimport", "_signal", "io",
+               "encodings.utf_8", "_codecs_jp", "encodings.latin_1", "_distutils_hack"}
+    return sum(cum for name, (_, cum, depth) in modules.items() if depth == 1 and name not in startup) / 1000
+
+
+# ---------------------------------------------------------------------------
+# Tests: import budget
+# ---------------------------------------------------------------------------
+
+class TestImportBudget:
+    @pytest.mark.parametrize("argv, allowed", [
+        (("status", "1"), set()),
+        (("criteria", "check", "1", "1"), {"tempfile"}),
+    ])
+    def test_hot_commands_skip_heavy_modules(self, tmp_path, argv, allowed):
+        root = _setup_board(tmp_path)
+        modules, proc = _importtime(root, *argv)
+        assert proc.returncode == 0, proc.stderr[-2000:]
+        assert not (_HEAVY_MODULES - allowed) & {name.split(".")[0] for name in modules}
+        assert _top_level_cost_ms(modules) < _IMPORT_BUDGET_MS
+
+    def test_full_parser_still_serves_other_commands(self, tmp_path):
+        root = _setup_board(tmp_path)
+        modules, proc = _importtime(root, "list", "--output-style=simple")
+        assert proc.returncode == 0, proc.stderr[-2000:]
+        assert "argparse" in modules and "watchdog" not in {n.split(".")[0] for n in modules}
+
+
+# ---------------------------------------------------------------------------
+# Tests: _fast_parse
+# ---------------------------------------------------------------------------
+
+class TestFastParse:
+    @pytest.mark.parametrize("argv", [
+        ["status", "12"],
+        ["--root", "/tmp/b", "status", "12"],
+        ["--root=/tmp/b", "show", "7", "--output-style", "simple"],
+        ["show", "7", "--output-style=detail", "--session", "wise-cedar"],
+        ["done", "3"],
+        ["done", "3", "Shipped it", "--hide-mine"],
+        ["done", "3", "-"],
+        ["criteria", "check", "4", "1", "2", "3"],
+        ["ac", "uncheck", "4", "first crit", "--session=s", "--only-mine"],
+    ])
+    def test_matches_argparse(self, kanban, argv):
+        fast = kanban._fast_parse(argv)
+        assert fast is not None
+        assert vars(fast) == vars(kanban._build_parser().parse_args(argv))
+
+    @pytest.mark.parametrize("argv", [
+        [],
+        ["list"],
+        ["status"],
+        ["status", "1", "2"],
+        ["status", "--help"],
+        ["show", "1", "--watch"],
+        ["show", "1", "--output-style", "bogus"],
+        ["status", "1", "--sess", "x"],
+        ["done", "1", "--", "msg"],
+        ["criteria", "check", "1"],
+        ["criteria", "add", "1", "text"],
+        ["status", "1", "--session"],
+        ["status", "1", "--root", "/tmp"],
+    ])
+    def test_falls_through_to_argparse(self, kanban, argv):
+        assert kanban._fast_parse(argv) is None
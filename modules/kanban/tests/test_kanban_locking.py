@@ -0,0 +1,291 @@
+"""
+Tests for atomic card writes and advisory locking in kanban.py.
+
+Covers:
+- write_card replaces atomically: no temp files left behind, mode preserved,
+  and a failed write leaves the previous card intact
+- board_lock / card_lock are re-entrant within a thread and exclusive across
+  processes
+- read_card's migration write-back re-reads under the card lock instead of
+  clobbering a concurrent update
+- update_card / locked_card resolve the card's current path under the lock
+- archiving a card removes its lock file, and a waiter on the removed file
+  retries on a fresh one instead of locking an orphan
+- Stress: 32 concurrent `kanban` processes against one board — every
+  criterion check lands (no lost updates), every `kanban todo` gets a unique
+  number, and no reader ever sees torn JSON
+"""
+
+import importlib.util
+import fcntl
+import json
+import multiprocessing
+import os
+import subprocess
+import sys
+import textwrap
+import threading
+import time
+from pathlib import Path
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+
+# ---------------------------------------------------------------------------
+# Module loader
+# ---------------------------------------------------------------------------
+
+_KANBAN_PATH = Path(__file__).parent.parent / "kanban.py"
+
+
+def load_kanban():
+    """Import kanban.py as a module with watchdog stubbed out."""
+    watchdog_stub = MagicMock()
+    sys.modules.setdefault("watchdog", watchdog_stub)
+    sys.modules.setdefault("watchdog.observers", watchdog_stub)
+    sys.modules.setdefault("watchdog.events", watchdog_stub)
+    watchdog_stub.events.FileSystemEventHandler = object
+
+    spec = importlib.util.spec_from_file_location("kanban_locking", _KANBAN_PATH)
+    mod = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(mod)
+    return mod
+
+
+@pytest.fixture(scope="module")
+def kanban():
+    return load_kanban()
+
+
+# Runs kanban.main() in a child process with watchdog stubbed, so the stress
+# test exercises the real CLI entry point without a watchdog install.
+_RUNNER = textwrap.dedent(f"""
+    import importlib.util, sys
+    from unittest.mock import MagicMock
+    stub = MagicMock()
+    stub.events.FileSystemEventHandler = object
+    for name in ("watchdog", "watchdog.observers", "watchdog.events"):
+        sys.modules[name] = stub
+    spec = importlib.util.spec_from_file_location("kanban", {str(_KANBAN_PATH)!r})
+    mod = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(mod)
+    sys.argv = ["kanban"] + sys.argv[1:]
+    mod.main()
+""")
+
+
+# ---------------------------------------------------------------------------
+# Helpers
+# ---------------------------------------------------------------------------
+
+def _setup_board(tmp_path):
+    """Create minimal kanban board directory structure."""
+    root = tmp_path / ".kanban"
+    for col in ("todo", "doing", "done", "canceled", "archive", "scratchpad"):
+        (root / col).mkdir(parents=True, exist_ok=True)
+    return root
+
+
+def _card(n_criteria):
+    return {
+        "action": "Shared card",
+        "intent": "Contended",
+        "type": "work",
+        "agent": "swe-devex",
+        "session": "s",
+        "editFiles": [],
+        "readFiles": [],
+        "criteria": [
+            {"text": f"criterion {i}", "mov_commands": [{"cmd": "true", "timeout": 10}], "met": False}
+            for i in range(n_criteria)
+        ],
+        "cycles": 0,
+        "agent_launch_pending": False,
+        "created": "2026-01-01T00:00:00Z",
+        "updated": "2026-01-01T00:00:00Z",
+        "activity": [],
+    }
+
+
+def _hold_card_lock(root, num, ready, release):
+    kanban = load_kanban()
+    with kanban.card_lock(Path(root), num):
+        ready.set()
+        release.wait(10)
+
+
+# ---------------------------------------------------------------------------
+# Tests: atomic writes
+# ---------------------------------------------------------------------------
+
+class TestWriteCard:
+    def test_no_temp_files_left_and_mode_preserved(self, kanban, tmp_path):
+        path = tmp_path / "7.json"
+        path.write_text("{}")
+        path.chmod(0o640)
+        kanban.write_card(path, {"action": "x"})
+        assert json.loads(path.read_text()) == {"action": "x"}
+        assert [p.name for p in tmp_path.iterdir()] == ["7.json"]
+        assert path.stat().st_mode & 0o777 == 0o640
+
+    def test_failed_write_keeps_previous_card(self, kanban, tmp_path):
+        path = tmp_path / "7.json"
+        kanban.write_card(path, {"action": "old"})
+        with pytest.raises(TypeError):
+            kanban.write_card(path, {"action": object()})
+        assert json.loads(path.read_text()) == {"action": "old"}
+        assert [p.name for p in tmp_path.iterdir()] == ["7.json"]
+
+
+# ---------------------------------------------------------------------------
+# Tests: locks
+# ---------------------------------------------------------------------------
+
+class TestLocks:
+    def test_locks_are_reentrant_in_one_thread(self, kanban, tmp_path):
+        with kanban.board_lock(tmp_path):
+            with kanban.card_lock(tmp_path, "3"):
+                with kanban.card_lock(tmp_path, "3"):
+                    with kanban.board_lock(tmp_path):
+                        pass
+        assert (tmp_path / ".locks" / "3.lock").exists()
+
+    def test_card_lock_excludes_other_processes(self, kanban, tmp_path):
+        ctx = multiprocessing.get_context("fork")
+        ready, release = ctx.Event(), ctx.Event()
+        holder = ctx.Process(target=_hold_card_lock, args=(str(tmp_path), "5", ready, release))
+        holder.start()
+        try:
+            assert ready.wait(10)
+            timer = threading.Timer(0.3, release.set)
+            start = time.monotonic()
+            timer.start()
+            with kanban.card_lock(tmp_path, "5"):
+                waited = time.monotonic() - start
+            timer.join()
+        finally:
+            release.set()
+            holder.join(10)
+        assert waited >= 0.25
+
+    def test_migration_write_back_does_not_clobber_concurrent_update(self, kanban, tmp_path):
+        root = _setup_board(tmp_path)
+        path = root / "doing" / "9.json"
+        legacy = _card(1)
+        legacy["criteria"][0].pop("met")
+        path.write_text(json.dumps(legacy))
+
+        real_loads = json.loads
+        calls = []
+
+        def loads_then_concurrent_update(text, *a, **kw):
+            card = real_loads(text, *a, **kw)
+            if not calls:
+                # Another agent lands an update between our first read and
+                # the migration write-back.
+                updated = real_loads(text)
+                updated["action"] = "concurrently renamed"
+                path.write_text(json.dumps(updated))
+            calls.append(1)
+            return card
+
+        with patch.object(kanban.json, "loads", side_effect=loads_then_concurrent_update):
+            card = kanban.read_card(path)
+
+        on_disk = json.loads(path.read_text())
+        assert on_disk["action"] == card["action"] == "concurrently renamed"
+        assert on_disk["criteria"][0]["met"] is False
+
+    def test_update_card_follows_moved_card(self, kanban, tmp_path):
+        root = _setup_board(tmp_path)
+        kanban.write_card(root / "todo" / "4.json", _card(1))
+        (root / "todo" / "4.json").rename(root / "doing" / "4.json")
+
+        path, card = kanban.update_card(root, "4", lambda c: c.__setitem__("agent", "swe-backend"))
+        assert path == root / "doing" / "4.json"
+        assert json.loads(path.read_text())["agent"] == "swe-backend"
+
+
+    def test_archive_removes_lock_file(self, kanban, tmp_path):
+        root = _setup_board(tmp_path)
+        card = dict(_card(0), created="2025-03-01T00:00:00Z", updated="2025-03-01T00:00:00Z")
+        kanban.write_card(root / "done" / "6.json", card)
+        with kanban.card_lock(root, "6"):
+            pass
+
+        kanban.auto_archive_old_cards(root)
+
+        assert (root / "archive" / "2025-03" / "6.json").exists()
+        assert not (root / ".locks" / "6.lock").exists()
+
+    def test_waiter_on_discarded_lock_retries(self, kanban, tmp_path):
+        acquired = threading.Event()
+
+        def waiter():
+            with kanban.card_lock(tmp_path, "8"):
+                acquired.set()
+                release.wait(10)
+
+        release = threading.Event()
+        with kanban.card_lock(tmp_path, "8"):
+            thread = threading.Thread(target=waiter)
+            thread.start()
+            time.sleep(0.2)  # let the waiter open the file and block on it
+            kanban.discard_card_lock(tmp_path, "8")
+        try:
+            assert acquired.wait(10)
+            # The waiter holds the lock file now on disk, not the unlinked one.
+            with open(tmp_path / ".locks" / "8.lock", "a") as fh:
+                with pytest.raises(BlockingIOError):
+                    fcntl.flock(fh, fcntl.LOCK_EX | fcntl.LOCK_NB)
+        finally:
+            release.set()
+            thread.join(10)
+
+
+# ---------------------------------------------------------------------------
+# Tests: stress
+# ---------------------------------------------------------------------------
+
+class TestConcurrentWriters:
+    WRITERS = 32
+
+    def _kanban(self, root, *argv):
+        return subprocess.Popen(
+            [sys.executable, "-c", _RUNNER, "--root", str(root), *argv],
+            stdout=subprocess.PIPE, stderr=subprocess.PIPE, text=True,
+            env={**os.environ, "KANBAN_AGENT": "", "CLAUDE_SESSION_ID": "stress"},
+        )
+
+    def test_32_writers_lose_no_updates(self, tmp_path):
+        root = _setup_board(tmp_path)
+        checkers = self.WRITERS // 2
+        (root / "doing" / "1.json").write_text(json.dumps(_card(checkers)))
+
+        procs = [self._kanban(root, "criteria", "check", "1", str(i + 1)) for i in range(checkers)]
+        for i in range(self.WRITERS - checkers):
+            card = {
+                "action": f"Queued {i}", "intent": "Stress", "type": "work",
+                "editFiles": [f"stress/{i}.py"],
+                "criteria": [{"text": "c", "mov_commands": [{"cmd": "true", "timeout": 5}]}],
+            }
+            procs.append(self._kanban(root, "todo", json.dumps(card), "--session", "stress"))
+
+        torn_reads = 0
+        while any(p.poll() is None for p in procs):
+            try:
+                json.loads((root / "doing" / "1.json").read_text())
+            except json.JSONDecodeError:
+                torn_reads += 1
+        outputs = [p.communicate() for p in procs]
+        failures = [(p.args[4:], out, err) for p, (out, err) in zip(procs, outputs) if p.returncode != 0]
+        assert not failures
+
+        shared = json.loads((root / "doing" / "1.json").read_text())
+        assert [c["met"] for c in shared["criteria"]] == [True] * checkers
+        assert torn_reads == 0
+
+        created = sorted(int(p.stem) for p in (root / "todo").glob("*.json"))
+        assert created == list(range(2, 2 + self.WRITERS - checkers))
+        assert not list(root.rglob("*.tmp"))
@@ -0,0 +1,123 @@
+"""
+Tests for the card render cache behind `kanban show --output-style=xml`.
+
+Covers:
+- a show stores the XML and sorted editFiles in root/.render-cache/N.render,
+  and the next show of the unchanged card prints it without decoding the card
+- write_card, an appended activity entry and a column move each invalidate
+  the entry; a corrupt entry is ignored and rewritten
+- the cache never adds a "*.json" file to the board
+"""
+
+import importlib.util
+import json
+import sys
+from pathlib import Path
+from types import SimpleNamespace
+from unittest.mock import MagicMock
+
+import pytest
+
+
+# ---------------------------------------------------------------------------
+# Module loader
+# ---------------------------------------------------------------------------
+
+_KANBAN_PATH = Path(__file__).parent.parent / "kanban.py"
+
+
+def load_kanban():
+    """Import kanban.py as a module with watchdog stubbed out."""
+    watchdog_stub = MagicMock()
+    sys.modules.setdefault("watchdog", watchdog_stub)
+    sys.modules.setdefault("watchdog.observers", watchdog_stub)
+    sys.modules.setdefault("watchdog.events", watchdog_stub)
+    watchdog_stub.events.FileSystemEventHandler = object
+
+    spec = importlib.util.spec_from_file_location("kanban_render_cache", _KANBAN_PATH)
+    mod = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(mod)
+    return mod
+
+
+@pytest.fixture(scope="module")
+def kanban():
+    return load_kanban()
+
+
+# ---------------------------------------------------------------------------
+# Helpers
+# ---------------------------------------------------------------------------
+
+@pytest.fixture
+def board(kanban, tmp_path):
+    for col in ("todo", "doing", "done", "canceled"):
+        (tmp_path / col).mkdir()
+    now = kanban.now_iso()
+    kanban.write_card(tmp_path / "doing" / "7.json", {
+        "action": "Cache renders", "intent": "Fewer forks", "type": "work", "session": "s",
+        "editFiles": ["src/b.py", "src/a.py"], "criteria": [{"text": "c1", "met": False}],
+        "created": now, "updated": now, "activity": [{"timestamp": now, "message": "created"}],
+    })
+    return tmp_path
+
+
+def _show(kanban, board, capsys):
+    kanban.cmd_show(SimpleNamespace(root=str(board), card="7", output_style="xml"))
+    return capsys.readouterr().out
+
+
+def _entry(board):
+    return json.loads((board / ".render-cache" / "7.render").read_text())
+
+
+# ---------------------------------------------------------------------------
+# Tests
+# ---------------------------------------------------------------------------
+
+class TestRenderCache:
+    def test_show_stores_render_and_serves_it_next_time(self, kanban, board, capsys, monkeypatch):
+        first = _show(kanban, board, capsys)
+
+        entry = _entry(board)
+        assert entry["path"] == "doing/7.json"
+        assert entry["xml"] + "\n" == first
+        assert entry["editFiles"] == ["src/a.py", "src/b.py"]
+        assert entry["key"] == kanban.card_render_key(board / "doing" / "7.json")
+
+        monkeypatch.setattr(kanban, "read_card", lambda *a, **k: pytest.fail("decoded a cached card"))
+        assert _show(kanban, board, capsys) == first
+
+    def test_write_card_invalidates(self, kanban, board, capsys):
+        _show(kanban, board, capsys)
+        path = board / "doing" / "7.json"
+        card = kanban.read_card(path)
+        card["action"] = "Renamed"
+        kanban.write_card(path, card)
+
+        assert "<action>Renamed</action>" in _show(kanban, board, capsys)
+
+    def test_appended_activity_invalidates(self, kanban, board, capsys):
+        _show(kanban, board, capsys)
+        kanban.append_card_activity(board / "doing" / "7.json", "rechecked")
+
+        assert "rechecked" in _show(kanban, board, capsys)
+
+    def test_column_move_invalidates(self, kanban, board, capsys):
+        _show(kanban, board, capsys)
+        kanban.move_card(board / "doing" / "7.json", board / "done" / "7.json")
+
+        assert 'status="done"' in _show(kanban, board, capsys)
+        assert _entry(board)["path"] == "done/7.json"
+
+    def test_corrupt_entry_is_rewritten(self, kanban, board, capsys):
+        (board / ".render-cache").mkdir()
+        (board / ".render-cache" / "7.render").write_text("{torn")
+
+        assert "<action>Cache renders</action>" in _show(kanban, board, capsys)
+        assert _entry(board)["version"] == kanban._RENDER_CACHE_VERSION
+
+    def test_no_json_names_added(self, kanban, board, capsys):
+        before = sorted(p.relative_to(board) for p in board.rglob("*.json"))
+        _show(kanban, board, capsys)
+        assert sorted(p.relative_to(board) for p in board.rglob("*.json")) == before
@@ -0,0 +1,165 @@
+"""
+Tests for `kanban search` and its FTS5 index (§ Full-text search).
+
+Covers:
+- The index spans every column and archive month and matches action,
+  intent, criteria, comments, activity messages and file paths
+- Incremental sync re-indexes only cards changed since the last search
+  (via the board generation journal), follows moves, and drops trashed cards
+- An unanswerable journal cursor and --rebuild fall back to a full rebuild
+- Column / session / type / date filters
+- Punctuation in free-text queries never trips FTS5 syntax
+"""
+
+import importlib.util
+import json
+import re
+import sys
+from pathlib import Path
+from types import SimpleNamespace
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+
+# ---------------------------------------------------------------------------
+# Module loader
+# ---------------------------------------------------------------------------
+
+_KANBAN_PATH = Path(__file__).parent.parent / "kanban.py"
+
+
+def load_kanban():
+    """Import kanban.py as a module with watchdog stubbed out."""
+    watchdog_stub = MagicMock()
+    sys.modules.setdefault("watchdog", watchdog_stub)
+    sys.modules.setdefault("watchdog.observers", watchdog_stub)
+    sys.modules.setdefault("watchdog.events", watchdog_stub)
+    watchdog_stub.events.FileSystemEventHandler = object
+
+    spec = importlib.util.spec_from_file_location("kanban_search", _KANBAN_PATH)
+    mod = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(mod)
+    return mod
+
+
+@pytest.fixture(scope="module")
+def kanban():
+    return load_kanban()
+
+
+# ---------------------------------------------------------------------------
+# Helpers
+# ---------------------------------------------------------------------------
+
+def _setup_board(tmp_path):
+    """Create minimal kanban board directory structure."""
+    for col in ("todo", "doing", "done", "canceled", "archive"):
+        (tmp_path / col).mkdir(parents=True, exist_ok=True)
+    return tmp_path
+
+
+def _card(kanban, action, intent, session="s", card_type="work", edit_files=(), criteria=("c",), updated=None):
+    card = kanban.make_card(action=action, intent=intent, session=session, edit_files=list(edit_files))
+    card["type"] = card_type
+    card["criteria"] = [{"text": text, "mov_commands": [{"cmd": "true", "timeout": 5}], "met": False} for text in criteria]
+    if updated:
+        card["updated"] = updated
+    return card
+
+
+def _search(kanban, board, capsys, *query, **overrides):
+    args = SimpleNamespace(
+        root=str(board), query=list(query), column=None, session=None, type=None,
+        since=None, until=None, limit=20, rebuild=False, output_style="xml",
+    )
+    for key, value in overrides.items():
+        setattr(args, key, value)
+    kanban.cmd_search(args)
+    return capsys.readouterr().out
+
+
+def _hits(out):
+    return [int(n) for n in re.findall(r'<c n="(\d+)"', out)]
+
+
+@pytest.fixture
+def board(kanban, tmp_path):
+    board = _setup_board(tmp_path)
+    kanban.write_card(board / "todo" / "1.json", _card(
+        kanban, "Rewrite the tokenizer", "Faster parsing", edit_files=["src/lexer/tokenizer.py"]))
+    doing = _card(kanban, "Fix flaky test", "CI stability", session="other", criteria=("retry budget respected",))
+    doing["comments"] = [{"timestamp": "2026-01-01T00:00:00Z", "text": "Saw EADDRINUSE on port 8080"}]
+    kanban.write_card(board / "doing" / "2.json", doing)
+    kanban.append_card_activity(board / "doing" / "2.json", "Bisected to commit deadbeef")
+    (board / "archive" / "2025-11").mkdir()
+    kanban.write_card(board / "archive" / "2025-11" / "3.json", _card(
+        kanban, "Old tokenizer cleanup", "History", card_type="research", updated="2025-11-02T00:00:00Z"))
+    return board
+
+
+# ---------------------------------------------------------------------------
+# Tests: matching
+# ---------------------------------------------------------------------------
+
+class TestSearchMatching:
+    def test_spans_columns_and_archive(self, kanban, board, capsys):
+        out = _search(kanban, board, capsys, "tokenizer")
+        assert sorted(_hits(out)) == [1, 3]
+        assert 's="archive" month="2025-11"' in out
+
+    @pytest.mark.parametrize("query, expected", [
+        (("retry", "budget"), [2]),             # criteria text
+        (("EADDRINUSE",), [2]),                 # comment
+        (("deadbeef",), [2]),                   # activity message
+        (("src/lexer/tokenizer.py",), [1]),     # editFiles path, punctuation intact
+        (("tokeni*",), [1, 3]),                 # prefix
+        (('"unbalanced',), []),                 # stray quote is literal, not syntax
+    ])
+    def test_fields_and_query_syntax(self, kanban, board, capsys, query, expected):
+        assert sorted(_hits(_search(kanban, board, capsys, *query))) == expected
+
+    def test_filters(self, kanban, board, capsys):
+        assert _hits(_search(kanban, board, capsys, "tokenizer", column=["archive"])) == [3]
+        assert _hits(_search(kanban, board, capsys, "tokenizer", type="research")) == [3]
+        assert _hits(_search(kanban, board, capsys, "flaky", session="s")) == []
+        assert _hits(_search(kanban, board, capsys, "tokenizer", since="2026-01-01T00:00:00Z")) == [1]
+
+
+# ---------------------------------------------------------------------------
+# Tests: incremental sync
+# ---------------------------------------------------------------------------
+
+class TestSearchSync:
+    def test_reindexes_only_changed_cards(self, kanban, board, capsys):
+        _search(kanban, board, capsys, "tokenizer")
+        path = board / "todo" / "1.json"
+        card = kanban.read_card(path)
+        card["intent"] = "Zero-copy parsing"
+        kanban.write_card(path, card)
+
+        with patch.object(kanban, "_index_card", wraps=kanban._index_card) as index_card:
+            assert _hits(_search(kanban, board, capsys, "zero", "copy")) == [1]
+        assert [c.args[1].name for c in index_card.call_args_list] == ["1.json"]
+
+    def test_follows_moves_and_drops_trashed_cards(self, kanban, board, capsys):
+        _search(kanban, board, capsys, "tokenizer")
+        kanban.move_card(board / "todo" / "1.json", board / "doing" / "1.json")
+        (board / "doing" / "2.json").unlink()
+        kanban.record_card_change(board / "doing" / "2.json")
+
+        assert 'n="1" ses="s" s="doing"' in _search(kanban, board, capsys, "tokenizer", column=["doing"])
+        assert _hits(_search(kanban, board, capsys, "flaky")) == []
+
+    def test_unanswerable_cursor_rebuilds(self, kanban, board, capsys):
+        _search(kanban, board, capsys, "tokenizer")
+        (board / ".generation.log").unlink()  # journal lost: cursor is now ahead of it
+        (board / "todo" / "4.json").write_text(json.dumps(_card(kanban, "Hand-written card", "Manual")))
+
+        assert _hits(_search(kanban, board, capsys, "hand", "written")) == [4]
+
+    def test_rebuild_flag_picks_up_unjournaled_edits(self, kanban, board, capsys):
+        _search(kanban, board, capsys, "tokenizer")
+        (board / "todo" / "5.json").write_text(json.dumps(_card(kanban, "Edited outside kanban", "Manual")))
+        assert _hits(_search(kanban, board, capsys, "outside")) == []
+        assert _hits(_search(kanban, board, capsys, "outside", rebuild=True)) == [5]
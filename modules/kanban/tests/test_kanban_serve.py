@@ -0,0 +1,225 @@
+"""
+Tests for `kanban serve`: the per-board JSON-RPC server and its CLI client.
+
+Covers:
+- a served list renders exactly what a direct list renders
+- the in-memory board follows the server's own transitions and writes made
+  by other processes, with no watchdog event needed
+- JSON-RPC errors: unknown method, bad params, unparseable line
+- the client round-trips over the socket and falls back to direct file
+  access when no server answers
+- `criteria check` is never served; a reply timeout runs a read directly and
+  reports a transition as possibly run
+- a second server on the same board is refused
+"""
+
+import importlib.util
+import json
+import os
+import socket
+import sys
+import threading
+import time
+from pathlib import Path
+from types import SimpleNamespace
+from unittest.mock import MagicMock
+
+import pytest
+
+
+# ---------------------------------------------------------------------------
+# Module loader
+# ---------------------------------------------------------------------------
+
+_KANBAN_PATH = Path(__file__).parent.parent / "kanban.py"
+
+
+def load_kanban():
+    """Import kanban.py as a module with watchdog stubbed out."""
+    watchdog_stub = MagicMock()
+    sys.modules.setdefault("watchdog", watchdog_stub)
+    sys.modules.setdefault("watchdog.observers", watchdog_stub)
+    sys.modules.setdefault("watchdog.events", watchdog_stub)
+    watchdog_stub.events.FileSystemEventHandler = object
+
+    spec = importlib.util.spec_from_file_location("kanban_serve", _KANBAN_PATH)
+    mod = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(mod)
+    return mod
+
+
+@pytest.fixture(scope="module")
+def kanban():
+    return load_kanban()
+
+
+# ---------------------------------------------------------------------------
+# Helpers
+# ---------------------------------------------------------------------------
+
+def _setup_board(tmp_path):
+    """Create minimal kanban board directory structure."""
+    root = tmp_path / ".kanban"
+    for col in ("todo", "doing", "done", "canceled", "archive", "scratchpad"):
+        (root / col).mkdir(parents=True, exist_ok=True)
+    return root
+
+
+def _add_card(kanban, root, col, num, action):
+    card = kanban.make_card(action=action, intent=action, edit_files=[f"src/{num}.py"], session="s")
+    kanban.write_card(root / col / f"{num}.json", card)
+
+
+def _request(method, *args, cwd=None):
+    return {
+        "jsonrpc": "2.0", "id": 7, "method": method,
+        "params": {"args": list(args), "cwd": cwd or os.getcwd(), "env": dict(os.environ)},
+    }
+
+
+@pytest.fixture
+def board(kanban, tmp_path, monkeypatch):
+    monkeypatch.setattr(kanban, "_METRICS_DB_PATH", tmp_path / "claudit.db")
+    monkeypatch.delenv("KANBAN_NO_SERVE", raising=False)
+    return _setup_board(tmp_path)
+
+
+@pytest.fixture
+def running_server(kanban, board):
+    server = kanban.BoardServer(board)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    deadline = time.monotonic() + 5
+    while not server.socket_path.exists():
+        assert time.monotonic() < deadline, "server never bound its socket"
+        time.sleep(0.01)
+    yield server
+    server.stop()
+    thread.join(5)
+
+
+# ---------------------------------------------------------------------------
+# Tests: request handling
+# ---------------------------------------------------------------------------
+
+class TestBoardServer:
+    def test_served_list_matches_direct_list(self, kanban, board, capsys):
+        _add_card(kanban, board, "todo", 1, "Queued work")
+        _add_card(kanban, board, "doing", 2, "Active work")
+        direct_args = kanban._build_parser().parse_args(["--root", str(board), "list", "--output-style", "xml"])
+        kanban.cmd_list(direct_args)
+        direct = capsys.readouterr().out
+
+        response = kanban.BoardServer(board).handle(_request("list", "--output-style", "xml"))
+
+        assert response["id"] == 7
+        assert response["result"] == {"stdout": direct, "stderr": "", "exit_code": 0}
+
+    def test_own_transition_is_visible_to_next_list(self, kanban, board):
+        _add_card(kanban, board, "todo", 1, "Queued work")
+        server = kanban.BoardServer(board)
+
+        started = server.handle(_request("start", "1"))["result"]
+        listed = server.handle(_request("list", "--output-style", "xml"))["result"]["stdout"]
+
+        assert started["exit_code"] == 0 and "Started: #1" in started["stdout"]
+        assert (board / "doing" / "1.json").exists()
+        assert '<c n="1" ses="s" s="doing">' in listed
+        assert [num for num, _ in server.model.column("doing")] == ["1"]
+        assert server.model.column("todo") == []
+
+    def test_write_by_another_process_is_picked_up(self, kanban, board):
+        server = kanban.BoardServer(board)
+        server.handle(_request("list"))
+        _add_card(kanban, board, "doing", 5, "Written directly")
+
+        listed = server.handle(_request("list", "--output-style", "xml"))["result"]["stdout"]
+
+        assert "Written directly" in listed
+
+    def test_command_errors_come_back_as_exit_codes(self, kanban, board):
+        result = kanban.BoardServer(board).handle(_request("show", "99"))["result"]
+        assert result["exit_code"] == 1
+        assert "No card found" in result["stderr"]
+
+    def test_environment_and_cwd_are_restored(self, kanban, board, tmp_path):
+        before = (os.getcwd(), dict(os.environ))
+        request = _request("status", "1", cwd=str(tmp_path))
+        request["params"]["env"] = {"PATH": os.environ.get("PATH", ""), "KANBAN_SESSION": "other"}
+        kanban.BoardServer(board).handle(request)
+        assert (os.getcwd(), dict(os.environ)) == before
+
+    @pytest.mark.parametrize("request_obj, code", [
+        ({"jsonrpc": "2.0", "id": 1, "method": "clean", "params": {"args": []}}, -32601),
+        ({"jsonrpc": "2.0", "id": 1, "method": "list", "params": {"args": "--watch"}}, -32602),
+        ({"jsonrpc": "2.0", "id": 1, "method": "list", "params": {"args": ["--watch"]}}, -32602),
+        ({"id": 1, "method": "list"}, -32600),
+        ({"jsonrpc": "2.0", "id": 1, "method": "criteria", "params": {"args": ["check", "3", "1"]}}, -32601),
+    ])
+    def test_invalid_requests(self, kanban, board, request_obj, code):
+        assert kanban.BoardServer(board).handle(request_obj)["error"]["code"] == code
+
+
+# ---------------------------------------------------------------------------
+# Tests: socket and client
+# ---------------------------------------------------------------------------
+
+class TestServeSocket:
+    def test_ping_and_parse_error(self, kanban, running_server, board):
+        assert kanban._serve_call(running_server.socket_path, "ping")["result"]["root"] == str(board)
+        with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as sock:
+            sock.connect(str(running_server.socket_path))
+            sock.sendall(b"{not json\n")
+            assert json.loads(sock.makefile("rb").readline())["error"]["code"] == -32700
+
+    def test_socket_is_private(self, running_server):
+        assert running_server.socket_path.stat().st_mode & 0o077 == 0
+
+    def test_client_round_trip(self, kanban, running_server, board, capsys):
+        _add_card(kanban, board, "doing", 3, "Through the socket")
+        assert kanban._serve_client(["--root", str(board), "show", "3", "--output-style", "xml"]) == 0
+        assert "Through the socket" in capsys.readouterr().out
+
+    def test_client_leaves_other_commands_alone(self, kanban, running_server, board):
+        assert kanban._serve_client(["--root", str(board), "report"]) is None
+        assert kanban._serve_client(["--root", str(board), "list", "--watch"]) is None
+
+    def test_client_falls_back_without_server(self, kanban, board):
+        assert kanban._serve_client(["--root", str(board), "list"]) is None
+        stale = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        stale.bind(str(board / ".serve.sock"))
+        stale.close()  # bound but never listening: connect is refused
+        assert kanban._serve_client(["--root", str(board), "list"]) is None
+
+    def test_client_opt_out(self, kanban, running_server, board, monkeypatch):
+        monkeypatch.setenv("KANBAN_NO_SERVE", "1")
+        assert kanban._serve_client(["--root", str(board), "list"]) is None
+
+    def test_second_server_is_refused(self, kanban, running_server, board, capsys):
+        with pytest.raises(SystemExit) as exc:
+            kanban.cmd_serve(SimpleNamespace(root=str(board)))
+        assert exc.value.code == 1
+        assert "already running" in capsys.readouterr().err
+
+    def test_criteria_check_runs_directly(self, kanban, running_server, board):
+        assert kanban._serve_client(["--root", str(board), "criteria", "check", "3", "1"]) is None
+        assert kanban._serve_client(["--root", str(board), "ac", "--session", "s", "check", "3", "1"]) is None
+
+
+class TestServeTimeout:
+    @pytest.fixture
+    def silent_server(self, board, kanban, monkeypatch):
+        """A socket that accepts connections and never answers."""
+        monkeypatch.setattr(kanban, "_SERVE_REPLY_TIMEOUT", 0.2)
+        listener = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        listener.bind(str(board / ".serve.sock"))
+        listener.listen(4)
+        yield listener
+        listener.close()
+
+    def test_read_falls_back_to_direct(self, kanban, board, silent_server):
+        assert kanban._serve_client(["--root", str(board), "list"]) is None
+
+    def test_transition_is_reported_not_retried(self, kanban, board, silent_server, capsys):
+        assert kanban._serve_client(["--root", str(board), "done", "3"]) == 1
+        assert "may or may not have run" in capsys.readouterr().err
@@ -0,0 +1,118 @@
+"""
+Tests for session-name storage: sessions.json snapshot + sessions.jsonl log.
+
+Covers:
+- a new session appends one log line; the snapshot is not rewritten
+- legacy boards with only sessions.json keep resolving
+- rename appends and wins over the earlier mapping
+- concurrent new sessions (separate processes) all land with unique names
+- the log is compacted into the snapshot past the size threshold
+- the parsed mapping is memoized until either file changes
+"""
+
+import importlib.util
+import json
+import multiprocessing
+import sys
+from pathlib import Path
+from types import SimpleNamespace
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+
+# ---------------------------------------------------------------------------
+# Module loader
+# ---------------------------------------------------------------------------
+
+_KANBAN_PATH = Path(__file__).parent.parent / "kanban.py"
+
+
+def load_kanban():
+    """Import kanban.py as a module with watchdog stubbed out."""
+    watchdog_stub = MagicMock()
+    sys.modules.setdefault("watchdog", watchdog_stub)
+    sys.modules.setdefault("watchdog.observers", watchdog_stub)
+    sys.modules.setdefault("watchdog.events", watchdog_stub)
+    watchdog_stub.events.FileSystemEventHandler = object
+
+    spec = importlib.util.spec_from_file_location("kanban_sessions", _KANBAN_PATH)
+    mod = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(mod)
+    return mod
+
+
+@pytest.fixture(scope="module")
+def kanban():
+    return load_kanban()
+
+
+# ---------------------------------------------------------------------------
+# Helpers
+# ---------------------------------------------------------------------------
+
+def _resolve_in_child(root, prefix, queue):
+    queue.put((prefix, load_kanban().resolve_session_name(prefix, Path(root))))
+
+
+# ---------------------------------------------------------------------------
+# Tests
+# ---------------------------------------------------------------------------
+
+class TestSessionNames:
+    def test_new_session_appends_to_log(self, kanban, tmp_path):
+        name = kanban.resolve_session_name("abcdef01", tmp_path)
+        assert [json.loads(l) for l in (tmp_path / "sessions.jsonl").read_text().splitlines()] == [
+            {"p": "abcdef01", "name": name},
+        ]
+        assert not (tmp_path / "sessions.json").exists()
+        assert kanban.resolve_session_name("abcdef01", tmp_path) == name
+
+    def test_legacy_snapshot_still_resolves(self, kanban, tmp_path):
+        (tmp_path / "sessions.json").write_text(json.dumps({"abcdef01": "swift-quartz"}))
+        assert kanban.resolve_session_name("abcdef01", tmp_path) == "swift-quartz"
+        assert not (tmp_path / "sessions.jsonl").exists()
+
+    def test_rename_appends_and_wins(self, kanban, tmp_path):
+        kanban.resolve_session_name("abcdef01", tmp_path)
+        kanban.cmd_rename(SimpleNamespace(root=str(tmp_path), session="abcdef01", new_name="my-name"))
+        assert kanban.resolve_session_name("abcdef01", tmp_path) == "my-name"
+
+    def test_rename_refuses_a_taken_name(self, kanban, tmp_path):
+        taken = kanban.resolve_session_name("abcdef01", tmp_path)
+        with pytest.raises(SystemExit):
+            kanban.cmd_rename(SimpleNamespace(root=str(tmp_path), session="12345678", new_name=taken))
+
+    def test_concurrent_new_sessions_are_all_kept(self, kanban, tmp_path):
+        ctx = multiprocessing.get_context("fork")
+        queue = ctx.Queue()
+        # Every prefix seeds the same adjective-noun pair, so each allocation
+        # must see the others' to stay unique.
+        step = len(kanban._ADJECTIVES) * len(kanban._NOUNS)
+        prefixes = [f"{1 + i * step:08x}" for i in range(8)]
+        procs = [ctx.Process(target=_resolve_in_child, args=(str(tmp_path), p, queue)) for p in prefixes]
+        for proc in procs:
+            proc.start()
+        results = dict(queue.get(timeout=30) for _ in procs)
+        for proc in procs:
+            proc.join(10)
+
+        sessions = kanban._read_sessions(tmp_path)
+        assert {p: sessions[p] for p in prefixes} == results
+        assert len(set(results.values())) == len(prefixes)
+
+    def test_log_is_compacted(self, kanban, tmp_path):
+        with patch.object(kanban, "_SESSIONS_LOG_COMPACT_BYTES", 100):
+            names = {f"{i:08x}": kanban.resolve_session_name(f"{i:08x}", tmp_path) for i in range(1, 6)}
+        assert json.loads((tmp_path / "sessions.json").read_text()).items() <= names.items()
+        assert (tmp_path / "sessions.jsonl").stat().st_size < 100
+        assert {p: kanban.resolve_session_name(p, tmp_path) for p in names} == names
+
+    def test_mapping_is_memoized_until_files_change(self, kanban, tmp_path):
+        kanban.resolve_session_name("abcdef01", tmp_path)
+        kanban._read_sessions(tmp_path)
+        with patch.object(kanban.json, "loads", side_effect=AssertionError("re-parsed")):
+            kanban._read_sessions(tmp_path)
+        with open(tmp_path / "sessions.jsonl", "a") as fh:
+            fh.write(json.dumps({"p": "abcdef01", "name": "edited"}) + "\n")
+        assert kanban._read_sessions(tmp_path)["abcdef01"] == "edited"
@@ -0,0 +1,202 @@
+"""
+Tests for incremental watch mode (BoardModel / _paint_frame / coalescing).
+
+Covers:
+- BoardModel.apply patches modified, moved, created and deleted cards and
+  ignores paths outside the column directories
+- `kanban list` rendering from a BoardModel reads no cards from disk
+- _paint_frame rewrites only changed rows, skips identical frames, and falls
+  back to a full repaint when a line could wrap
+- _coalesce_events returns after a quiet window and is bounded under a
+  continuous event stream
+- Debounce window resolution: --debounce, then KANBAN_WATCH_DEBOUNCE_MS
+"""
+
+import importlib.util
+import io
+import os
+import sys
+import threading
+import time
+from pathlib import Path
+from types import SimpleNamespace
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+
+# ---------------------------------------------------------------------------
+# Module loader
+# ---------------------------------------------------------------------------
+
+_KANBAN_PATH = Path(__file__).parent.parent / "kanban.py"
+
+
+def load_kanban():
+    """Import kanban.py as a module with watchdog stubbed out."""
+    watchdog_stub = MagicMock()
+    sys.modules.setdefault("watchdog", watchdog_stub)
+    sys.modules.setdefault("watchdog.observers", watchdog_stub)
+    sys.modules.setdefault("watchdog.events", watchdog_stub)
+    watchdog_stub.events.FileSystemEventHandler = object
+
+    spec = importlib.util.spec_from_file_location("kanban_watch_incremental", _KANBAN_PATH)
+    mod = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(mod)
+    return mod
+
+
+@pytest.fixture(scope="module")
+def kanban():
+    return load_kanban()
+
+
+# ---------------------------------------------------------------------------
+# Helpers
+# ---------------------------------------------------------------------------
+
+def _setup_board(tmp_path):
+    """Create minimal kanban board directory structure."""
+    for col in ("todo", "doing", "done", "canceled", "scratchpad"):
+        (tmp_path / col).mkdir(parents=True, exist_ok=True)
+    return tmp_path
+
+
+def _write(kanban, board, col, num, action):
+    path = board / col / f"{num}.json"
+    kanban.write_card(path, kanban.make_card(action=action, intent="Because", session="s"))
+    return path
+
+
+def _list_args(board, model):
+    return SimpleNamespace(
+        root=str(board), output_style="simple", column=None, show_done=False,
+        show_canceled=False, show_all=False, since=None, until=None, session=None,
+        mine=False, hide_mine=False, _board_model=model,
+    )
+
+
+class _Terminal:
+    def __init__(self, columns=80, lines=24):
+        self.columns, self.lines = columns, lines
+
+
+def _paint(kanban, previous, frame, size=(80, 24)):
+    out = io.StringIO()
+    with patch.object(kanban.shutil, "get_terminal_size", return_value=_Terminal(*size)), \
+            patch.object(kanban.sys, "stdout", out):
+        kanban._paint_frame(previous, frame)
+    return out.getvalue()
+
+
+# ---------------------------------------------------------------------------
+# Tests: BoardModel
+# ---------------------------------------------------------------------------
+
+class TestBoardModel:
+    def test_apply_patches_modify_move_create_delete(self, kanban, tmp_path):
+        board = _setup_board(tmp_path)
+        one = _write(kanban, board, "todo", 1, "One")
+        two = _write(kanban, board, "todo", 2, "Two")
+        three = _write(kanban, board, "doing", 3, "Three")
+        model = kanban.BoardModel(board)
+
+        card = kanban.read_card(one)
+        card["action"] = "One (edited)"
+        kanban.write_card(one, card)
+        moved = kanban.move_card(two, board / "doing" / "2.json")
+        three.unlink()
+        _write(kanban, board, "todo", 4, "Four")
+
+        assert model.apply([str(one), str(two), str(moved), str(three), str(board / "todo" / "4.json")])
+        assert [(n, c["action"]) for n, c in model.column("todo")] == [("1", "One (edited)"), ("4", "Four")]
+        assert [n for n, _ in model.column("doing")] == ["2"]
+
+    def test_non_card_paths_are_ignored(self, kanban, tmp_path):
+        board = _setup_board(tmp_path)
+        _write(kanban, board, "todo", 1, "One")
+        model = kanban.BoardModel(board)
+        (board / "scratchpad" / "5.json").write_text("{}")
+        assert not model.apply([str(board / "scratchpad" / "5.json"), str(board / "sessions.json")])
+        assert [n for n, _ in model.column("todo")] == ["1"]
+
+    def test_list_renders_from_model_without_disk_reads(self, kanban, tmp_path, capsys):
+        board = _setup_board(tmp_path)
+        _write(kanban, board, "todo", 1, "Render me")
+        model = kanban.BoardModel(board)
+
+        with patch.object(kanban, "read_card_fields", side_effect=AssertionError("disk read")), \
+                patch.object(kanban, "read_card", side_effect=AssertionError("disk read")), \
+                patch.object(kanban, "get_root", side_effect=AssertionError("board scan")):
+            kanban.cmd_list(_list_args(board, model))
+
+        assert "Render me" in capsys.readouterr().out
+
+
+# ---------------------------------------------------------------------------
+# Tests: _paint_frame
+# ---------------------------------------------------------------------------
+
+class TestPaintFrame:
+    def test_first_frame_is_full_repaint(self, kanban):
+        assert _paint(kanban, None, ["a", "b"]).startswith("\033[2J\033[H")
+
+    def test_only_changed_rows_are_rewritten(self, kanban):
+        out = _paint(kanban, ["head", "row 1", "row 2"], ["head", "row 1*", "row 2"])
+        assert out == "\033[2;1H\033[2Krow 1*\033[4;1H"
+
+    def test_shrinking_frame_clears_below(self, kanban):
+        out = _paint(kanban, ["head", "row 1", "row 2"], ["head", "row 1"])
+        assert out == "\033[3;1H\033[J\033[3;1H"
+
+    def test_identical_frame_writes_nothing(self, kanban):
+        assert _paint(kanban, ["a"], ["a"]) == ""
+
+    def test_wrapping_line_forces_full_repaint(self, kanban):
+        out = _paint(kanban, ["a", "b"], ["a", "x" * 20], size=(20, 24))
+        assert out.startswith("\033[2J\033[H")
+
+
+# ---------------------------------------------------------------------------
+# Tests: coalescing and debounce
+# ---------------------------------------------------------------------------
+
+class TestCoalesce:
+    def test_returns_after_quiet_window(self, kanban):
+        event = threading.Event()
+        event.set()
+        start = time.monotonic()
+        kanban._coalesce_events(event, 0.05)
+        assert 0.04 <= time.monotonic() - start < 0.4
+        assert not event.is_set()
+
+    def test_bounded_under_continuous_events(self, kanban):
+        event = threading.Event()
+        stop = threading.Event()
+
+        def storm():
+            while not stop.is_set():
+                event.set()
+                time.sleep(0.005)
+
+        thread = threading.Thread(target=storm, daemon=True)
+        thread.start()
+        try:
+            start = time.monotonic()
+            kanban._coalesce_events(event, 0.02)
+            elapsed = time.monotonic() - start
+        finally:
+            stop.set()
+            thread.join()
+        assert elapsed < 0.02 * kanban._WATCH_MAX_COALESCE_WINDOWS + 0.3
+
+
+class TestDebounceResolution:
+    def test_flag_wins_over_env(self, kanban):
+        with patch.dict(os.environ, {"KANBAN_WATCH_DEBOUNCE_MS": "500"}):
+            assert kanban._watch_debounce_seconds(SimpleNamespace(debounce=250)) == 0.25
+            assert kanban._watch_debounce_seconds(SimpleNamespace(debounce=None)) == 0.5
+
+    def test_default_and_invalid_env(self, kanban):
+        with patch.dict(os.environ, {"KANBAN_WATCH_DEBOUNCE_MS": "soon"}):
+            assert kanban._watch_debounce_seconds(SimpleNamespace(debounce=None)) == 0.1